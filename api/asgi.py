@@ -0,0 +1,224 @@
+import asyncio
+import time
+from quart import Quart, Response, g, jsonify, make_response, request
+from quart_cors import cors
+import sys
+import os
+
+# Add parent dir to path so we can import src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.orders.async_client import AsyncBinanceClient
+from src.orders.pipeline import Order, OrderPipeline, PublishStage
+from src.orders.advanced.peg import start_pegged_order, list_pegged_orders, cancel_pegged_order
+from src.orders.kill_switch import panic_async
+from src.utils.coalesce import AsyncCoalescer
+from src.logger import get_logger, get_log_stats
+from src.metrics import METRICS
+from src.config import CONFIG
+from src.streams.event_bus import get_event_bus
+
+logger = get_logger("API_ASGI")
+app = cors(Quart(__name__), allow_origin="*") # Enable CORS for frontend
+
+# One pooled client shared by every request (respects DRY_RUN from .env/config)
+client = AsyncBinanceClient()
+
+# Identical concurrent reads share one upstream call and a short-lived cache
+reads = AsyncCoalescer(ttl=CONFIG.API_READ_CACHE_TTL)
+
+# Push channel to dashboards: order updates, fills, balances and log lines
+events = get_event_bus()
+events.attach_logs()
+user_stream = None
+
+# Validation and submission shared with the CLI; accepted orders are pushed to dashboards
+pipeline = OrderPipeline(client, extra_stages=[PublishStage(events)])
+
+@app.before_serving
+async def startup():
+    global user_stream
+    await client.open()
+    events.open()
+    if not client.dry_run:
+        # One upstream user-data subscription serves every connected dashboard
+        # and keeps the client's risk engine (fills, cancels, positions, marks) current
+        from src.streams.user_data import UserDataStream, attach_client_state
+        user_stream = UserDataStream(client, mark_prices=True)
+        attach_client_state(user_stream, client)
+        events.attach_user_stream(user_stream)
+        app.add_background_task(user_stream.run)
+
+@app.after_serving
+async def shutdown():
+    if user_stream is not None:
+        user_stream.stop()
+    events.close()
+    await client.close()
+
+@app.before_request
+async def start_timer():
+    g.started = time.perf_counter()
+
+@app.after_request
+async def record_latency(response):
+    started = getattr(g, "started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        METRICS.observe("api_request", time.perf_counter() - started, route=route, method=request.method)
+        if response.status_code >= 400:
+            METRICS.inc("api_errors", route=route, status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+async def metrics():
+    return Response(METRICS.render_prometheus(_gauges()), mimetype="text/plain; version=0.0.4")
+
+def _gauges():
+    limiter = client.rate_limiter.metrics()
+    gauges = {"rate_limit_queue_depth": limiter["queue_depth"]}
+    gauges.update({f"rate_limit_tokens_{name}": tokens for name, tokens in limiter["tokens"].items()})
+    logs = get_log_stats()
+    gauges["log_queue_depth"] = sum(s["queued"] for s in logs.values())
+    gauges["log_records_dropped"] = sum(s["dropped"] for s in logs.values())
+    gauges["event_subscribers"] = len(events.subscribers)
+    gauges["read_cache_hits"] = reads.cache_hits
+    gauges["read_coalesced"] = reads.coalesced
+    return gauges
+
+@app.route('/api/events', methods=['GET'])
+async def event_stream():
+    async def body():
+        async for chunk in events.sse_async():
+            yield chunk.encode()
+
+    response = await make_response(body(), 200, {"Content-Type": "text/event-stream", "Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.timeout = None  # streams stay open until the browser disconnects
+    return response
+
+@app.route('/api/ping', methods=['GET'])
+async def ping():
+    try:
+        upstream = await reads.get("ping", client.ping)
+        return jsonify({"status": "ok", "message": "Pong", "dry_run": client.dry_run, "serverTime": upstream.get("serverTime")})
+    except Exception as e:
+        logger.error(f"API: Ping Failed - {str(e)}")
+        return jsonify({"status": "error", "message": str(e), "dry_run": client.dry_run}), 502
+
+@app.route('/api/account', methods=['GET'])
+async def account():
+    try:
+        return jsonify(await reads.get("account", client.get_account))
+    except Exception as e:
+        logger.error(f"API: Account Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 502
+
+@app.route('/api/balance', methods=['GET'])
+async def balance():
+    asset = request.args.get('asset', 'USDT').upper()
+    try:
+        value = await reads.get(("balance", asset), lambda: client.get_balance(asset))
+        return jsonify({"asset": asset, "balance": value})
+    except Exception as e:
+        logger.error(f"API: Balance Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 502
+
+@app.route('/api/market', methods=['POST'])
+async def market_order():
+    try:
+        order = Order.from_dict({**await request.get_json(), "type": "MARKET"})
+        
+        logger.info(f"API: Market Order Request - {order.side} {order.quantity} {order.symbol}")
+        
+        response = await pipeline.run_async(order)
+        reads.invalidate()
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"API: Market Order Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/limit', methods=['POST'])
+async def limit_order():
+    try:
+        data = await request.get_json()
+        if data.get("peg"):
+            return jsonify(await asyncio.to_thread(_start_peg, data))
+        order = Order.from_dict({**data, "type": "LIMIT"})
+        
+        logger.info(f"API: Limit Order Request - {order.side} {order.quantity} {order.symbol} @ {order.price}")
+        
+        response = await pipeline.run_async(order)
+        reads.invalidate()
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"API: Limit Order Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+def _start_peg(data):
+    # Pegged orders reprice off the live book on the shared peg loop
+    order = Order.from_dict({**data, "type": "LIMIT"})
+    logger.info(f"API: Pegged Limit Order Request - {order.side} {order.quantity} {order.symbol} ({data['peg']})")
+    return start_pegged_order(
+        client, order.symbol, order.side, order.quantity, mode=data["peg"],
+        offset_ticks=int(data.get("offset_ticks", 0)),
+        limit_price=order.price,
+        max_chase_ticks=int(data["max_chase_ticks"]) if data.get("max_chase_ticks") is not None else None,
+        timeout=float(data["timeout"]) if data.get("timeout") else None
+    )
+
+@app.route('/api/pegs', methods=['GET'])
+async def pegs():
+    return jsonify({"pegs": list_pegged_orders()})
+
+@app.route('/api/pegs/<peg_id>', methods=['DELETE'])
+async def cancel_peg(peg_id):
+    try:
+        return jsonify(await asyncio.to_thread(cancel_pegged_order, peg_id))
+    except Exception as e:
+        logger.error(f"API: Peg Cancel Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/panic', methods=['POST'])
+async def panic_all():
+    try:
+        data = await request.get_json(silent=True) or {}
+        logger.warning(f"API: Kill Switch Request (flatten: {bool(data.get('flatten'))})")
+        response = await panic_async(client, flatten=bool(data.get("flatten")))
+        reads.invalidate()
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"API: Kill Switch Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/batch', methods=['POST'])
+async def batch_order():
+    try:
+        data = await request.get_json()
+        orders = data.get('orders') if isinstance(data, dict) else data
+        if not isinstance(orders, list) or not orders:
+            raise ValueError("Request body must contain a non-empty 'orders' list")
+        
+        logger.info(f"API: Batch Order Request - {len(orders)} orders")
+        
+        batch = await pipeline.run_batch_async([Order.from_dict(o) for o in orders])
+        reads.invalidate()
+        return jsonify({"results": [order.result(i) for i, order in enumerate(batch)]})
+    except Exception as e:
+        logger.error(f"API: Batch Order Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/stats', methods=['GET'])
+async def stats():
+    return jsonify({"coalescing": reads.stats(), "rate_limiter": client.rate_limiter.metrics(), "events": events.stats()})
+
+if __name__ == '__main__':
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    port = int(os.getenv("API_PORT", "5000"))
+    config = Config()
+    config.bind = [f"0.0.0.0:{port}"]
+    config.accesslog = None
+    print(f"Starting async (ASGI) API on port {port}...")
+    print(f"DRY_RUN Mode: {client.dry_run}")
+    asyncio.run(serve(app, config))
@@ -1,4 +1,5 @@
-from flask import Flask, jsonify, request
+import time
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 import sys
 import os
@@ -6,35 +7,108 @@ import os
 # Add parent dir to path so we can import src
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.orders.binance_client import BinanceClient
-from src.logger import get_logger
-from src.config import CONFIG
+from src.orders.router import AccountRouter
+from src.orders.pipeline import Order, OrderPipeline, PublishStage
+from src.orders.advanced.peg import start_pegged_order, list_pegged_orders, cancel_pegged_order
+from src.orders.kill_switch import panic
+from src.logger import get_logger, get_log_stats
+from src.metrics import METRICS
+from src.streams.event_bus import get_event_bus, start_user_stream_thread
 
 logger = get_logger("API_SERVER")
 app = Flask(__name__)
 CORS(app) # Enable CORS for frontend
 
-# Initialize Binance Client (respects DRY_RUN from .env/config)
-client = BinanceClient()
+# One client, rate-limit budget and worker per account (respects DRY_RUN and
+# BINANCE_ACCOUNTS from .env/config); reads use the default account
+router = AccountRouter.from_config()
+client = router.default_client
+
+# Push channel to dashboards: order updates, fills, balances and log lines
+events = get_event_bus()
+events.attach_logs()
+
+# One user-data stream per live account keeps its risk engine (fills, cancels,
+# positions, mark prices) current; the default account's also feeds dashboards
+user_streams = {} if client.dry_run else {
+    tag: start_user_stream_thread(events if worker.client is client else None, worker.client)
+    for tag, worker in router.workers.items()
+}
+
+# Orders take the same pipeline as the CLI (validation, risk, submission) on
+# their account's worker; accepted orders are also pushed to dashboards
+pipelines = {tag: OrderPipeline(worker.client, extra_stages=[PublishStage(events)]) for tag, worker in router.workers.items()}
+
+def _run(account, fn):
+    tag = router.route(account)
+    return router.submit(lambda c: fn(pipelines[tag]), tag).result()
+
+@app.before_request
+def start_timer():
+    g.started = time.perf_counter()
+
+@app.after_request
+def record_latency(response):
+    started = g.get("started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        METRICS.observe("api_request", time.perf_counter() - started, route=route, method=request.method)
+        if response.status_code >= 400:
+            METRICS.inc("api_errors", route=route, status=response.status_code)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(METRICS.render_prometheus(_gauges()), mimetype="text/plain; version=0.0.4")
+
+def _gauges():
+    limiter = client.rate_limiter.metrics()
+    gauges = {"rate_limit_queue_depth": limiter["queue_depth"]}
+    gauges.update({f"rate_limit_tokens_{name}": tokens for name, tokens in limiter["tokens"].items()})
+    logs = get_log_stats()
+    gauges["log_queue_depth"] = sum(s["queued"] for s in logs.values())
+    gauges["log_records_dropped"] = sum(s["dropped"] for s in logs.values())
+    gauges["event_subscribers"] = len(events.subscribers)
+    return gauges
+
+@app.route('/api/events', methods=['GET'])
+def event_stream():
+    return Response(events.sse(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.route('/api/ping', methods=['GET'])
 def ping():
     logger.info("API: Ping request received")
     return jsonify({"status": "ok", "message": "Pong", "dry_run": client.dry_run})
 
+@app.route('/api/account', methods=['GET'])
+def account():
+    try:
+        return jsonify(client.get_account())
+    except Exception as e:
+        logger.error(f"API: Account Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 502
+
+@app.route('/api/balance', methods=['GET'])
+def balance():
+    asset = request.args.get('asset', 'USDT').upper()
+    try:
+        return jsonify({"asset": asset, "balance": client.get_balance(asset)})
+    except Exception as e:
+        logger.error(f"API: Balance Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 502
+
+@app.route('/api/accounts', methods=['GET'])
+def accounts():
+    return jsonify({"accounts": router.stats()})
+
 @app.route('/api/market', methods=['POST'])
 def market_order():
     try:
-        data = request.json
-        symbol = data.get('symbol')
-        side = data.get('side')
-        quantity = float(data.get('quantity'))
+        order = Order.from_dict({**request.json, "type": "MARKET"})
         
-        logger.info(f"API: Market Order Request - {side} {quantity} {symbol}")
+        logger.info(f"API: Market Order Request - {order.side} {order.quantity} {order.symbol}")
         
-        # Call existing logic
-        response = client.create_market_order(symbol, side, quantity)
-        return jsonify(response)
+        return jsonify(_run(order.account, lambda p: p.run(order)))
     except Exception as e:
         logger.error(f"API: Market Order Failed - {str(e)}")
         return jsonify({"error": str(e)}), 400
@@ -42,23 +116,72 @@ def market_order():
 @app.route('/api/limit', methods=['POST'])
 def limit_order():
     try:
-        data = request.json
-        symbol = data.get('symbol')
-        side = data.get('side')
-        quantity = float(data.get('quantity'))
-        price = float(data.get('price'))
+        if request.json.get("peg"):
+            return jsonify(_start_peg(request.json))
+        order = Order.from_dict({**request.json, "type": "LIMIT"})
         
-        logger.info(f"API: Limit Order Request - {side} {quantity} {symbol} @ {price}")
+        logger.info(f"API: Limit Order Request - {order.side} {order.quantity} {order.symbol} @ {order.price}")
         
-        # Call existing logic
-        response = client.create_limit_order(symbol, side, quantity, price)
-        return jsonify(response)
+        return jsonify(_run(order.account, lambda p: p.run(order)))
     except Exception as e:
         logger.error(f"API: Limit Order Failed - {str(e)}")
         return jsonify({"error": str(e)}), 400
 
+def _start_peg(data):
+    # Pegged orders reprice off the live book on the shared peg loop, through their account's client
+    order = Order.from_dict({**data, "type": "LIMIT"})
+    logger.info(f"API: Pegged Limit Order Request - {order.side} {order.quantity} {order.symbol} ({data['peg']})")
+    return start_pegged_order(
+        router.client(order.account), order.symbol, order.side, order.quantity, mode=data["peg"],
+        offset_ticks=int(data.get("offset_ticks", 0)),
+        limit_price=order.price,
+        max_chase_ticks=int(data["max_chase_ticks"]) if data.get("max_chase_ticks") is not None else None,
+        timeout=float(data["timeout"]) if data.get("timeout") else None
+    )
+
+@app.route('/api/pegs', methods=['GET'])
+def pegs():
+    return jsonify({"pegs": list_pegged_orders()})
+
+@app.route('/api/pegs/<peg_id>', methods=['DELETE'])
+def cancel_peg(peg_id):
+    try:
+        return jsonify(cancel_pegged_order(peg_id))
+    except Exception as e:
+        logger.error(f"API: Peg Cancel Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/panic', methods=['POST'])
+def panic_all():
+    # Straight to the exchange on every account, not behind the account workers' queues
+    try:
+        data = request.get_json(silent=True) or {}
+        logger.warning(f"API: Kill Switch Request (flatten: {bool(data.get('flatten'))})")
+        return jsonify(panic(router, flatten=bool(data.get("flatten"))))
+    except Exception as e:
+        logger.error(f"API: Kill Switch Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/batch', methods=['POST'])
+def batch_order():
+    try:
+        data = request.json
+        orders = data.get('orders') if isinstance(data, dict) else data
+        account = data.get('account') if isinstance(data, dict) else None
+        if not isinstance(orders, list) or not orders:
+            raise ValueError("Request body must contain a non-empty 'orders' list")
+        
+        logger.info(f"API: Batch Order Request - {len(orders)} orders")
+        
+        batch = _run(account, lambda p: p.run_batch([Order.from_dict(o, account) for o in orders]))
+        return jsonify({"results": [order.result(i) for i, order in enumerate(batch)]})
+    except Exception as e:
+        logger.error(f"API: Batch Order Failed - {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
 if __name__ == '__main__':
     port = 5000
     print(f"Starting generic Flask API on port {port}...")
     print(f"DRY_RUN Mode: {client.dry_run}")
-    app.run(debug=True, port=port)
+    # No reloader: importing this module starts streams and workers, which a reloader child would start again
+    app.run(debug=True, use_reloader=False, port=port, threaded=True)
@@ -0,0 +1,113 @@
+"""
+Load test: Flask dev server vs the async (ASGI) server, both in dry-run mode.
+
+Usage:
+    python -m benchmarks.bench_api_load [--requests 2000] [--concurrency 50]
+    python -m benchmarks.bench_api_load --url http://localhost:5000   # bench a running server only
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SERVERS = {
+    "flask": [sys.executable, "-c", "from api.server import app; import os; app.run(port=int(os.environ['API_PORT']))"],
+    "asgi": [sys.executable, "api/asgi.py"],
+}
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+async def _run_load(url: str, path: str, total: int, concurrency: int, payload=None):
+    import aiohttp
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker(session):
+        nonlocal errors
+        for _ in counter:
+            start = time.perf_counter()
+            try:
+                if payload is None:
+                    async with session.get(url + path) as resp:
+                        await resp.read()
+                else:
+                    async with session.post(url + path, json=payload) as resp:
+                        await resp.read()
+                if resp.status >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "rps": total / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "errors": errors
+    }
+
+async def _wait_ready(url: str, timeout: float = 20.0) -> None:
+    import aiohttp
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url + "/api/ping") as resp:
+                    if resp.status == 200:
+                        return
+            except Exception:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+def bench(url: str, total: int, concurrency: int) -> None:
+    order = {"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.001}
+    for path, payload in (("/api/ping", None), ("/api/market", order)):
+        r = asyncio.run(_run_load(url, path, total, concurrency, payload))
+        print(f"  {path:<12} {r['rps']:>9.0f} req/s   p50 {r['p50_ms']:>7.2f} ms   p99 {r['p99_ms']:>7.2f} ms   errors {r['errors']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="API load test (dry-run)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--url", type=str, help="Benchmark an already running server instead")
+    args = parser.parse_args()
+
+    if args.url:
+        print(args.url)
+        bench(args.url.rstrip("/"), args.requests, args.concurrency)
+        return
+
+    for name, cmd in SERVERS.items():
+        port = _free_port()
+        env = dict(os.environ, DRY_RUN="true", API_PORT=str(port), BOT_LOGFILE=os.devnull, PYTHONPATH=ROOT)
+        proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        url = f"http://127.0.0.1:{port}"
+        try:
+            asyncio.run(_wait_ready(url))
+            print(f"{name} ({args.requests} requests, concurrency {args.concurrency})")
+            bench(url, args.requests, args.concurrency)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+if __name__ == "__main__":
+    main()
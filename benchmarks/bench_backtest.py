@@ -0,0 +1,43 @@
+"""
+Parameter-sweep throughput over a year of synthetic 1-minute klines.
+
+Usage:
+    python -m benchmarks.bench_backtest [--bars 525600] [--workers N]
+"""
+import argparse
+import tempfile
+import time
+import numpy as np
+from src.backtest.data import generate_klines, write_cache
+from src.backtest.sweep import run_sweep
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest sweep throughput")
+    parser.add_argument("--bars", type=int, default=525600)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--entry-every", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        write_cache(generate_klines(args.bars, seed=1), cache_dir)
+
+        start = time.perf_counter()
+        twap = run_sweep(
+            cache_dir, "twap", workers=args.workers, entry_every=args.entry_every,
+            slices=list(range(2, 34, 2)), intervals=[60 * m for m in (1, 2, 3, 5, 10, 15, 30, 60)]
+        )
+        elapsed = time.perf_counter() - start
+        print(f"twap: {len(twap):>5} combos x {args.bars} bars in {elapsed:6.2f}s")
+
+        start = time.perf_counter()
+        oco = run_sweep(
+            cache_dir, "oco", workers=args.workers, entry_every=args.entry_every,
+            tp_pcts=list(np.round(np.linspace(0.001, 0.02, 20), 4)),
+            stop_pcts=list(np.round(np.linspace(0.001, 0.02, 20), 4)),
+            horizons=[30, 60, 120, 240, 480]
+        )
+        elapsed = time.perf_counter() - start
+        print(f"oco : {len(oco):>5} combos x {args.bars} bars in {elapsed:6.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Cost of a local exchange-filter check: cached SymbolFilters lookup, step-size
+rounding and quantity validation, as run for every order before it is sent.
+
+Usage:
+    python -m benchmarks.bench_exchange_info [--lookups 100000]
+"""
+import argparse
+import os
+import time
+from src.utils.exchange_info import ExchangeInfoCache
+from src.utils.validation import validate_quantity
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "exchange_info.json")
+
+def main():
+    parser = argparse.ArgumentParser(description="Exchange filter lookup cost")
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    cache = ExchangeInfoCache.from_file(FIXTURE)
+    start = time.perf_counter()
+    for _ in range(args.lookups):
+        f = cache.get("BTCUSDT")
+        validate_quantity(f.round_quantity(0.0123), f)
+    elapsed = time.perf_counter() - start
+    print(f"{args.lookups} lookups + round + validate: {elapsed / args.lookups * 1e6:.2f}us each")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Offline execution backtest throughput: TWAP, VWAP and POV parents running
+side by side on one simulated scheduler while synthetic aggTrades are
+replayed through the simulated exchange. Reports replayed trades per second
+and mean slippage against market VWAP per algorithm.
+
+Usage:
+    python -m benchmarks.bench_execution [--trades 1000000] [--parents 300]
+"""
+import argparse
+import logging
+import time
+import numpy as np
+from src.backtest.execution import backtest_execution
+from src.orders.advanced.vwap import VolumeProfile
+
+def main():
+    parser = argparse.ArgumentParser(description="Execution algorithm backtest throughput")
+    parser.add_argument("--trades", type=int, default=1000000)
+    parser.add_argument("--parents", type=int, default=300, help="Parents per run (split evenly across algorithms)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rng = np.random.default_rng(7)
+    n = args.trades
+    trades = {
+        "time": (np.cumsum(rng.exponential(0.05, n)) * 1000).astype(np.int64),
+        "price": 30000 * np.exp(np.cumsum(rng.normal(0, 2e-5, n))),
+        "quantity": rng.exponential(0.5, n)
+    }
+    span = (trades["time"][-1] - trades["time"][0]) / 1000
+    # U-shaped intraday profile
+    buckets = np.arange(288)
+    profile = VolumeProfile((1.5 + np.cos(buckets / 288 * 2 * np.pi)).tolist())
+
+    per_algo = args.parents // 3
+    specs = []
+    for i in range(per_algo):
+        start = span * 0.5 * i / per_algo
+        specs.append({"algo": "twap", "quantity": 5.0, "slices": 20, "interval": 30, "start": start})
+        specs.append({"algo": "vwap", "side": "SELL", "quantity": 5.0, "slices": 20, "duration": 600, "profile": profile, "start": start})
+        specs.append({"algo": "pov", "quantity": 5.0, "rate": 0.02, "interval": 5, "start": start})
+
+    start = time.perf_counter()
+    results = backtest_execution(trades, "BTCUSDT", specs, fee=0.0)
+    elapsed = time.perf_counter() - start
+
+    children = sum(r["children"] for r in results)
+    print(f"{n} trades, {len(specs)} parents, {children} children in {elapsed:.2f}s ({n / elapsed:,.0f} trades/s)")
+    for algo in ("twap", "vwap", "pov"):
+        rows = [r for r in results if r["algo"] == algo]
+        done = sum(r["status"] == "completed" for r in rows)
+        slippage = np.mean([r["slippage_bps"] for r in rows])
+        participation = np.mean([r["participation"] for r in rows])
+        print(f"  {algo:5s} completed {done}/{len(rows)}  mean slippage {slippage:+6.2f} bps  participation {participation:.3f}")
+
+if __name__ == "__main__":
+    main()
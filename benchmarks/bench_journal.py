@@ -0,0 +1,59 @@
+"""
+Per-order cost of the order journal: the durable "submit" record (waits for
+the group-committed write + fsync) plus the "ack" record, for one thread and
+for several threads placing orders at once.
+
+Usage:
+    python -m benchmarks.bench_journal [--orders 2000] [--threads 8] [--no-fsync]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+from src.metrics import Histogram
+from src.orders.journal import OrderJournal, new_client_order_id
+
+def _place(journal, hist, count):
+    for _ in range(count):
+        start = time.perf_counter_ns()
+        cid = new_client_order_id()
+        journal.append("submit", cid, durable=True, symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+        journal.append("ack", cid, orderId=1, status="FILLED", executedQty="0.01", avgPrice="50000")
+        hist.record((time.perf_counter_ns() - start) // 1000)
+
+def run(threads, orders, fsync):
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = OrderJournal(os.path.join(tmp, "orders.jsonl"), fsync=fsync, compact_every=0)
+        hist = Histogram()
+        per_thread = orders // threads
+        workers = [threading.Thread(target=_place, args=(journal, hist, per_thread)) for _ in range(threads)]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+        journal.close()
+        s = hist.summary()
+        print(
+            f"{threads:2d} thread(s): {per_thread * threads / elapsed:9.0f} orders/s  "
+            f"p50 {s['p50']:6d}us  p99 {s['p99']:6d}us  "
+            f"({journal.records_written / journal.batches:.1f} records per write)"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Order journal latency")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--no-fsync", action="store_true")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"fsync: {not args.no_fsync}")
+    run(1, args.orders, not args.no_fsync)
+    run(args.threads, args.orders, not args.no_fsync)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Kill switch latency against a local stub exchange with a simulated round
+trip: a sequential cancel/close loop vs the parallel fan-out, with and
+without the risk engine already knowing the open symbols. Reports the time
+until the last cancel/close landed, in seconds and in round trips.
+
+Usage:
+    python -m benchmarks.bench_kill_switch [--symbols 50] [--positions 10] [--rtt 0.05]
+"""
+import argparse
+import logging
+import tempfile
+import threading
+import time
+from stub_server import StubBinanceServer
+from src.orders.binance_client import BinanceClient
+from src.orders.journal import OrderJournal
+from src.orders.kill_switch import panic
+from src.orders.rate_limiter import RateLimiter
+from src.orders.risk import RiskEngine
+
+def _exchange(symbols, positions, rtt):
+    stub = StubBinanceServer()
+    book = {"orders": set(symbols), "positions": dict(positions), "flat_at": 0.0}
+    lock = threading.Lock()
+
+    def delayed(fn):
+        def handler(q, h):
+            time.sleep(rtt)
+            with lock:
+                return fn(q)
+        return handler
+
+    def cancel_all(q):
+        book["orders"].discard(q["symbol"])
+        book["flat_at"] = time.perf_counter()
+        return 200, {"code": 200, "msg": "done"}
+
+    def new_order(q):
+        book["positions"].pop(q["symbol"], None)
+        book["flat_at"] = time.perf_counter()
+        return 200, {"orderId": 1, "status": "FILLED", "executedQty": q["quantity"]}
+
+    stub.route("GET", "/fapi/v1/openOrders", delayed(lambda q: (200, [{"symbol": s} for s in book["orders"]])))
+    stub.route("GET", "/fapi/v3/positionRisk", delayed(lambda q: (200, [{"symbol": s, "positionAmt": str(a)} for s, a in book["positions"].items()])))
+    stub.route("DELETE", "/fapi/v1/allOpenOrders", delayed(cancel_all))
+    stub.route("POST", "/fapi/v1/order", delayed(new_order))
+    return stub, book
+
+def _client(url, journal_dir, risk=None):
+    return BinanceClient("k", "s", dry_run=False, base_url=url, timeout=10, rate_limiter=RateLimiter(),
+                         journal=OrderJournal(f"{journal_dir}/orders.jsonl", fsync=False), risk=risk or RiskEngine())
+
+def _sequential(client):
+    for symbol in sorted({o["symbol"] for o in client.get_open_orders()}):
+        client.cancel_all_open_orders(symbol)
+    for p in client.get_positions():
+        amount = float(p["positionAmt"])
+        client.create_market_order(p["symbol"], "SELL" if amount > 0 else "BUY", abs(amount), reduce_only=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Kill switch latency")
+    parser.add_argument("--symbols", type=int, default=50, help="Symbols with open orders")
+    parser.add_argument("--positions", type=int, default=10, help="Symbols with an open position")
+    parser.add_argument("--rtt", type=float, default=0.05, help="Simulated round trip in seconds")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    positions = {s: 1.0 for s in symbols[:args.positions]}
+
+    def warm_risk():
+        risk = RiskEngine()
+        for i, symbol in enumerate(symbols):
+            risk.settle(risk.pre_trade(symbol, "BUY", 1.0, price=100.0), {"orderId": i, "status": "NEW", "executedQty": "0"})
+        for symbol in positions:
+            risk.settle(risk.pre_trade(symbol, "BUY", 1.0), {"status": "FILLED", "executedQty": "1.0"})
+        return risk
+
+    runs = {
+        "sequential loop": lambda url, d: _sequential(_client(url, d)),
+        "panic, cold state": lambda url, d: panic(_client(url, d), flatten=True),
+        "panic, known symbols": lambda url, d: panic(_client(url, d, warm_risk()), flatten=True),
+    }
+    print(f"{args.symbols} symbols with orders, {args.positions} positions, {args.rtt * 1000:.0f}ms round trip")
+    for name, run in runs.items():
+        stub, book = _exchange(symbols, positions, args.rtt)
+        with stub, tempfile.TemporaryDirectory() as journal_dir:
+            start = time.perf_counter()
+            run(stub.url, journal_dir)
+            total = time.perf_counter() - start
+        flat = book["flat_at"] - start
+        left = len(book["orders"]) + len(book["positions"])
+        print(f"  {name:22s} flat after {flat:6.3f}s ({flat / args.rtt:5.1f} RTT), returned after {total:6.3f}s, {left} left open")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Per-order logging overhead seen by the caller: synchronous handlers vs the
+queue listener, with eager f-strings vs lazy %-style arguments.
+
+Usage:
+    python -m benchmarks.bench_logging [--orders 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+RESPONSE = {
+    "orderId": 4066342951, "symbol": "BTCUSDT", "status": "FILLED", "clientOrderId": "x-Cb7ytekJ0123456789",
+    "price": "0", "avgPrice": "60012.30000", "origQty": "0.002", "executedQty": "0.002", "cumQuote": "120.02460",
+    "timeInForce": "GTC", "type": "MARKET", "reduceOnly": False, "side": "BUY", "positionSide": "BOTH",
+    "updateTime": 1700000000000
+}
+
+def _order_logs_eager(logger, n):
+    side, quantity, symbol = "BUY", 0.002, "BTCUSDT"
+    for _ in range(n):
+        logger.info(f"Received Market Order Request: {side} {quantity} {symbol}")
+        logger.info(f"Placing MARKET Order: {side} {quantity} {symbol} (ReduceOnly: False)")
+        logger.info(f"Market Order Placed: {RESPONSE.get('orderId')}")
+        logger.info(f"Market Order executed successfully: {RESPONSE}")
+
+def _order_logs_lazy(logger, n):
+    side, quantity, symbol = "BUY", 0.002, "BTCUSDT"
+    for _ in range(n):
+        logger.info("Received Market Order Request: %s %s %s", side, quantity, symbol)
+        logger.info("Placing MARKET Order: %s %s %s (ReduceOnly: %s)", side, quantity, symbol, False)
+        logger.info("Market Order Placed: %s", RESPONSE.get("orderId"))
+        logger.info("Market Order executed successfully: %s", RESPONSE)
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead per order")
+    parser.add_argument("--orders", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Queue size large enough that nothing is dropped, so both modes write every line
+    os.environ["BOT_LOG_QUEUE_SIZE"] = str(args.orders * 8 + 10)
+    from src.logger import get_logger, flush_logging
+
+    devnull = open(os.devnull, "w")
+    real_stdout = sys.stdout
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("sync", "queue"):
+            os.environ["BOT_LOG_MODE"] = mode
+            for style, fn in (("f-string", _order_logs_eager), ("lazy %", _order_logs_lazy)):
+                sys.stdout = devnull
+                try:
+                    logger = get_logger(f"bench.{mode}.{style}", logfile=os.path.join(tmp, f"{mode}.log"))
+                    start = time.perf_counter()
+                    fn(logger, args.orders)
+                    caller = time.perf_counter() - start
+                    flush_logging()
+                    total = time.perf_counter() - start
+                finally:
+                    sys.stdout = real_stdout
+                results.append((mode, style, caller, total))
+
+    print(f"{'mode':<6} {'style':<9} {'caller us/order':>16} {'drained us/order':>17}")
+    for mode, style, caller, total in results:
+        print(f"{mode:<6} {style:<9} {caller / args.orders * 1e6:>16.1f} {total / args.orders * 1e6:>17.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Cost of the latency instrumentation: raw span/record costs, and a dry-run
+place_market_order with metrics on vs off.
+
+Usage:
+    python -m benchmarks.bench_metrics [--iterations 50000]
+"""
+import argparse
+import logging
+import time
+from src.metrics import Histogram, METRICS
+
+def _per_call_ns(fn, iterations):
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - start) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics overhead")
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    hist = Histogram()
+    print(f"Histogram.record          : {_per_call_ns(lambda: hist.record(1234), n):8.0f} ns")
+
+    def span():
+        with METRICS.span("bench", stage="submit", symbol="BTCUSDT"):
+            pass
+    print(f"Registry.span (enter+exit): {_per_call_ns(span, n):8.0f} ns")
+
+    from src.orders.binance_client import BinanceClient
+    from src.orders.market_orders import place_market_order
+    # Keep logging out of the comparison
+    logging.disable(logging.CRITICAL)
+    client = BinanceClient(dry_run=True)
+    order = lambda: place_market_order(client, "BTCUSDT", "BUY", 0.01)
+    order()
+
+    timings = {}
+    for enabled in (False, True, False, True):
+        METRICS.enabled = enabled
+        timings.setdefault(enabled, []).append(_per_call_ns(order, n))
+    off, on = min(timings[False]), min(timings[True])
+    print(f"place_market_order off    : {off:8.0f} ns")
+    print(f"place_market_order on     : {on:8.0f} ns  (+{on - off:.0f} ns, {100 * (on - off) / off:.1f}%)")
+
+if __name__ == "__main__":
+    main()
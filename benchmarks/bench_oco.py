@@ -0,0 +1,53 @@
+"""
+Tick replay cost of the client-side OCO engine: many open OCOs on one
+symbol, a tick file that mostly stays between their levels, then one tick
+that crosses a single stop. Only crossed levels should be touched, so the
+time per tick stays flat as the number of open OCOs grows.
+
+Usage:
+    python -m benchmarks.bench_oco [--ocos 5000] [--ticks 10000]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from src.orders.advanced.oco import OcoManager, replay_ticks
+
+class _Client:
+    dry_run = False
+
+    def __init__(self):
+        self.next_id = 0
+
+    def create_limit_order(self, symbol, side, quantity, price, timeInForce="GTC", reduce_only=False):
+        self.next_id += 1
+        return {"orderId": self.next_id}
+
+    def cancel_order(self, symbol, order_id=None, orig_client_order_id=None):
+        return {"orderId": order_id}
+
+def main():
+    parser = argparse.ArgumentParser(description="OCO tick replay")
+    parser.add_argument("--ocos", type=int, default=5000, help="Open OCO pairs")
+    parser.add_argument("--ticks", type=int, default=10000, help="Ticks that cross no level")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    manager = OcoManager(_Client())
+    for i in range(args.ocos):
+        manager.submit("BTCUSDT", "SELL", 0.01, 200.0 + i * 0.01, 100.0 - i * 0.01, 99.0 - i * 0.01)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ticks.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("timestamp,symbol,price\n")
+            f.writelines(f"{t},BTCUSDT,150\n" for t in range(args.ticks))
+            f.write(f"{args.ticks + 1},BTCUSDT,99.995\n")
+        start = time.perf_counter()
+        count = replay_ticks(manager, path)
+        elapsed = time.perf_counter() - start
+    print(f"{args.ocos} open OCOs, {count} ticks replayed in {elapsed * 1000:.1f}ms ({elapsed / count * 1e6:.2f}us/tick)")
+    print(f"still open: {manager.open_count('BTCUSDT')}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Peg engine cost and amend suppression: many pegged orders on one event loop,
+repriced against the simulated exchange while a random-walk quote stream
+moves the book. Reports quote updates handled per second and how many
+amends were sent or deferred by the debounce, against amending every
+order on every quote.
+
+Usage:
+    python -m benchmarks.bench_peg [--pegs 500] [--symbols 10] [--quotes 20000] [--min-interval 0.005]
+"""
+import argparse
+import asyncio
+import logging
+import random
+import time
+from src.orders.advanced.peg import PegEngine
+from src.sim.client import SimulatedBinanceClient
+from src.sim.exchange import SimulatedExchange
+from src.streams.order_book import BestPriceCache
+
+TICK = 0.1
+
+async def run(args):
+    rng = random.Random(5)
+    exchange, cache = SimulatedExchange(), BestPriceCache()
+    symbols = [f"SYM{n}USDT" for n in range(args.symbols)]
+    mids = {s: 1000 for s in symbols}
+    for s in symbols:
+        cache.update(s, (mids[s] - 1) * TICK, 1.0, (mids[s] + 1) * TICK, 1.0)
+
+    engine = PegEngine(SimulatedBinanceClient(exchange, "trader"), cache, min_interval=args.min_interval, threshold_ticks=args.threshold)
+    for n in range(args.pegs):
+        await engine.place(symbols[n % len(symbols)], "BUY" if n % 2 else "SELL", 1.0, mode=rng.choice(("best", "mid")),
+                           offset_ticks=rng.randint(0, 3), tick_size=TICK)
+
+    start = time.perf_counter()
+    for n in range(args.quotes):
+        symbol = symbols[n % len(symbols)]
+        mids[symbol] += rng.choice((-1, 0, 0, 1))
+        mid = mids[symbol]
+        cache.update(symbol, (mid - 1) * TICK, 1.0, (mid + 1) * TICK, 1.0)
+        engine.on_quote(symbol)
+        if n % 100 == 0:
+            await asyncio.sleep(0)
+    await asyncio.sleep(args.min_interval * 2)
+    elapsed = time.perf_counter() - start
+
+    evaluations = args.quotes * args.pegs // len(symbols)
+    stats = engine.stats()
+    print(f"pegs {args.pegs} on {len(symbols)} symbols, {args.quotes} quote updates in {elapsed:.2f}s")
+    print(f"  {args.quotes / elapsed:10.0f} quotes/s   {evaluations / elapsed:10.0f} peg evaluations/s")
+    print(f"  amends sent {stats['amends']}  deferred {stats['deferred']}  failed {stats['failed']}")
+    print(f"  amend-on-every-quote would send {evaluations} ({evaluations / max(stats['amends'], 1):.1f}x more)")
+    await engine.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Peg engine throughput")
+    parser.add_argument("--pegs", type=int, default=500)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--quotes", type=int, default=20000)
+    parser.add_argument("--min-interval", type=float, default=0.005)
+    parser.add_argument("--threshold", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Dry-run throughput of the order pipeline: orders/second for the bare client
+call, one order at a time through OrderPipeline.run(), and batches through
+run_batch(), plus the mean time each stage took.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--orders 20000] [--batch 100]
+"""
+import argparse
+import logging
+import random
+import time
+from src.metrics import METRICS
+from src.orders.binance_client import BinanceClient
+from src.orders.pipeline import Order, OrderPipeline
+from src.orders.risk import RiskEngine, RiskLimits
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"]
+
+def _orders(count):
+    rng = random.Random(11)
+    return [
+        (rng.choice(SYMBOLS), rng.choice(("BUY", "SELL")), round(rng.uniform(0.001, 0.1), 3), rng.random() < 0.5)
+        for _ in range(count)
+    ]
+
+def _client():
+    # Every limit enabled but loose enough that nothing is rejected
+    limits = RiskLimits(max_position=1e9, max_notional=1e15, max_open_orders=1000000, price_band=0.5, max_order_rate=1e9)
+    return BinanceClient(dry_run=True, risk=RiskEngine(limits))
+
+def _report(label, count, elapsed):
+    print(f"{label:24s} {count / elapsed:10.0f} orders/s  {elapsed / count * 1e6:7.2f} us/order")
+
+def main():
+    parser = argparse.ArgumentParser(description="Order pipeline throughput")
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=100, help="Orders per run_batch() call")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    specs = _orders(args.orders)
+
+    client = _client()
+    start = time.perf_counter()
+    for symbol, side, quantity, is_limit in specs:
+        if is_limit:
+            client.create_limit_order(symbol, side, quantity, 50000.0)
+        else:
+            client.create_market_order(symbol, side, quantity)
+    _report("client only (no checks)", args.orders, time.perf_counter() - start)
+
+    pipeline = OrderPipeline(_client())
+    METRICS.reset()
+    start = time.perf_counter()
+    for symbol, side, quantity, is_limit in specs:
+        pipeline.run(Order(symbol, side, "LIMIT", quantity, 50000.0) if is_limit else Order(symbol, side, "MARKET", quantity))
+    _report("pipeline.run", args.orders, time.perf_counter() - start)
+    stages = {}
+    for h in METRICS.snapshot()["latency_us"]:
+        if h["name"] == "order_stage":
+            total, count = stages.get(h["labels"]["stage"], (0.0, 0))
+            stages[h["labels"]["stage"]] = (total + h["mean"] * h["count"], count + h["count"])
+    print("  per stage: " + "  ".join(f"{name} {total / count:.2f}us" for name, (total, count) in stages.items()))
+
+    pipeline = OrderPipeline(_client())
+    METRICS.reset()
+    start = time.perf_counter()
+    for lo in range(0, args.orders, args.batch):
+        pipeline.run_batch([
+            Order(symbol, side, "LIMIT", quantity, 50000.0) if is_limit else Order(symbol, side, "MARKET", quantity)
+            for symbol, side, quantity, is_limit in specs[lo:lo + args.batch]
+        ])
+    _report(f"pipeline.run_batch({args.batch})", args.orders, time.perf_counter() - start)
+    per_batch = {h["labels"]["stage"]: h["mean"] / args.batch for h in METRICS.snapshot()["latency_us"] if h["name"] == "batch_stage"}
+    print("  per stage: " + "  ".join(f"{name} {us:.2f}us" for name, us in per_batch.items()))
+
+if __name__ == "__main__":
+    main()
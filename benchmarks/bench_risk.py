@@ -0,0 +1,79 @@
+"""
+Cost of the pre-trade risk engine over a stream of orders: pre_trade() +
+settle() on their own, and dry-run place_market_order / place_limit_order
+with every limit enabled versus with the engine removed.
+
+Usage:
+    python -m benchmarks.bench_risk [--orders 10000]
+"""
+import argparse
+import logging
+import random
+import time
+from src.metrics import Histogram
+from src.orders.binance_client import BinanceClient
+from src.orders.limit_orders import place_limit_order
+from src.orders.market_orders import place_market_order
+from src.orders.risk import RiskEngine, RiskLimits
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"]
+
+def _limits():
+    # Loose enough that nothing is rejected; every check still runs
+    return RiskLimits(max_position=1e9, max_notional=1e15, max_open_orders=1000000, price_band=0.5, max_order_rate=1e9)
+
+def _orders(count):
+    rng = random.Random(7)
+    return [(rng.choice(SYMBOLS), rng.choice(("BUY", "SELL")), round(rng.uniform(0.001, 0.1), 3), rng.random() < 0.5) for _ in range(count)]
+
+def bench_engine(orders):
+    engine = RiskEngine(_limits())
+    for symbol in SYMBOLS:
+        engine.update_mark(symbol, 100.0)
+    hist = Histogram()
+    filled = {"status": "FILLED", "executedQty": "0"}
+    for i, (symbol, side, quantity, is_limit) in enumerate(orders):
+        start = time.perf_counter_ns()
+        reservation = engine.pre_trade(symbol, side, quantity, 100.0 if is_limit else None)
+        if is_limit:
+            engine.settle(reservation, {"status": "NEW", "orderId": i, "executedQty": "0"})
+            engine.update_order(i, quantity, "FILLED")
+        else:
+            filled["executedQty"] = quantity
+            engine.settle(reservation, filled)
+        hist.record(time.perf_counter_ns() - start)
+    s = hist.summary()
+    print(f"engine only:       p50 {s['p50'] / 1000:6.2f}us  p99 {s['p99'] / 1000:6.2f}us  mean {s['mean'] / 1000:6.2f}us")
+
+def bench_orders(orders, with_risk):
+    client = BinanceClient(dry_run=True, risk=RiskEngine(_limits()))
+    if not with_risk:
+        client.risk = None
+    hist = Histogram()
+    for symbol, side, quantity, is_limit in orders:
+        start = time.perf_counter_ns()
+        if is_limit:
+            place_limit_order(client, symbol, side, quantity, 50000.0)
+        else:
+            place_market_order(client, symbol, side, quantity)
+        hist.record(time.perf_counter_ns() - start)
+    s = hist.summary()
+    label = "orders, risk on:" if with_risk else "orders, risk off:"
+    print(f"{label:18s} p50 {s['p50'] / 1000:6.2f}us  p99 {s['p99'] / 1000:6.2f}us  mean {s['mean'] / 1000:6.2f}us")
+    return s["mean"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-trade risk check cost")
+    parser.add_argument("--orders", type=int, default=10000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    orders = _orders(args.orders)
+    print(f"{args.orders} orders")
+    bench_engine(orders)
+    off = bench_orders(orders, with_risk=False)
+    on = bench_orders(orders, with_risk=True)
+    print(f"risk overhead per order: {(on - off) / 1000:.2f}us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Client-side cost per order: sign + serialize + parse on the connector path
+(UMFutures param preparation, HMAC keyed per call, requests request
+preparation, json decode and header scan) vs FastOrderApi (pre-keyed HMAC
+copy, query template, orjson when installed, usage headers only). Then the
+same order placed end to end against a local stub exchange through each.
+
+Usage:
+    python -m benchmarks.bench_signing [--orders 20000] [--live 2000]
+"""
+import argparse
+import json
+import time
+import requests
+from binance.um_futures import UMFutures
+from stub_server import StubBinanceServer
+from src.orders.binance_client import FastOrderApi, build_limit_params
+
+SECRET = "x" * 64
+BODY = json.dumps({
+    "orderId": 4137893221, "symbol": "BTCUSDT", "status": "NEW", "clientOrderId": "bot-1a2b3c4d5e6f",
+    "price": "65000.10", "avgPrice": "0.00", "origQty": "0.001", "executedQty": "0", "cumQty": "0",
+    "cumQuote": "0", "timeInForce": "GTC", "type": "LIMIT", "reduceOnly": False, "closePosition": False,
+    "side": "BUY", "positionSide": "BOTH", "stopPrice": "0", "workingType": "CONTRACT_PRICE",
+    "priceProtect": False, "origType": "LIMIT", "priceMatch": "NONE", "selfTradePreventionMode": "NONE",
+    "goodTillDate": 0, "updateTime": 1700000000000
+}).encode()
+HEADERS = requests.structures.CaseInsensitiveDict({
+    "Content-Type": "application/json", "Content-Length": str(len(BODY)), "Server": "Tengine",
+    "x-mbx-used-weight-1m": "12", "x-mbx-order-count-10s": "3", "x-mbx-order-count-1m": "9",
+    "x-response-time": "3ms", "Date": "Mon, 01 Jan 2024 00:00:00 GMT"
+})
+
+def _params(i):
+    return build_limit_params("BTCUSDT", "BUY", 0.001, 65000.1, client_order_id=f"bot-{i:012x}")
+
+def _connector(connector, n):
+    session = requests.Session()
+    for i in range(n):
+        payload = dict(_params(i), timestamp=int(time.time() * 1000))
+        payload["signature"] = connector._get_sign(connector._prepare_params(payload))
+        session.prepare_request(requests.Request("POST", connector.base_url + "/fapi/v1/order", params=connector._prepare_params(payload)))
+        data = json.loads(BODY)
+        usage = {k.lower(): v for k, v in HEADERS.items() if k.lower().startswith(("x-mbx-used-weight", "x-mbx-order-count"))}
+    return data, usage
+
+def _fast(api, n):
+    for i in range(n):
+        f"{api._path}?{api.query(_params(i))}"
+        result = api.parse(200, BODY, HEADERS)
+    return result
+
+def _live(client, n):
+    for i in range(n):
+        client.new_order(**_params(i))
+
+def main():
+    parser = argparse.ArgumentParser(description="Order signing/serialization fast path")
+    parser.add_argument("--orders", type=int, default=20000, help="Orders signed and parsed per path")
+    parser.add_argument("--live", type=int, default=2000, help="Orders sent to the stub exchange per path (0 skips)")
+    args = parser.parse_args()
+
+    connector = UMFutures("k", SECRET, base_url="https://fapi.binance.com", show_limit_usage=True)
+    api = FastOrderApi(connector, SECRET)
+    print(f"sign + serialize + parse, {args.orders} orders ({api._loads.__module__} decoder)")
+    results = {}
+    for name, run in (("connector", lambda: _connector(connector, args.orders)), ("fast path", lambda: _fast(api, args.orders))):
+        start = time.perf_counter()
+        run()
+        results[name] = (time.perf_counter() - start) / args.orders
+        print(f"  {name:10s} {results[name] * 1e6:7.2f} us/order")
+    print(f"  speedup    {results['connector'] / results['fast path']:7.2f}x")
+
+    if args.live:
+        with StubBinanceServer() as stub:
+            stub.route("POST", "/fapi/v1/order", lambda q, h: (200, json.loads(BODY), {"X-MBX-ORDER-COUNT-10S": "1"}))
+            connector = UMFutures("k", SECRET, base_url=stub.url, timeout=5, show_limit_usage=True)
+            clients = {"connector": connector, "fast path": FastOrderApi(UMFutures("k", SECRET, base_url=stub.url, timeout=5), SECRET)}
+            print(f"new_order round trip against the stub, {args.live} orders")
+            for name, client in clients.items():
+                _live(client, 50)
+                start = time.perf_counter()
+                _live(client, args.live)
+                print(f"  {name:10s} {(time.perf_counter() - start) / args.live * 1e6:7.1f} us/order")
+
+if __name__ == "__main__":
+    main()
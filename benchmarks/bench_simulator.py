@@ -0,0 +1,62 @@
+"""
+Throughput of the simulated exchange.
+
+Usage:
+    python -m benchmarks.bench_simulator [--orders 200000] [--seed 7]
+"""
+import argparse
+import random
+import time
+from src.sim.exchange import SimulatedExchange
+from src.sim.client import SimulatedBinanceClient
+
+def _orders(count: int, seed: int):
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(count):
+        side = "BUY" if rng.random() < 0.5 else "SELL"
+        # Mostly passive limits around 100.0, with some crossing and some market orders
+        if rng.random() < 0.1:
+            orders.append((side, "MARKET", round(rng.uniform(0.001, 0.05), 3), None))
+        else:
+            offset = rng.randint(-5, 20) * 0.1
+            price = 100.0 - offset if side == "BUY" else 100.0 + offset
+            orders.append((side, "LIMIT", round(rng.uniform(0.001, 0.05), 3), round(price, 1)))
+    return orders
+
+def bench_exchange(orders):
+    exchange = SimulatedExchange()
+    exchange.feed_tick("BTCUSDT", 100.0)
+    accounts = ["a", "b", "c", "d"]
+    start = time.perf_counter()
+    for i, (side, order_type, qty, price) in enumerate(orders):
+        exchange.submit(accounts[i & 3], "BTCUSDT", side, order_type, qty, price)
+    elapsed = time.perf_counter() - start
+    return elapsed, exchange
+
+def bench_client(orders):
+    client = SimulatedBinanceClient()
+    client.exchange.feed_tick("BTCUSDT", 100.0)
+    start = time.perf_counter()
+    for side, order_type, qty, price in orders:
+        if order_type == "MARKET":
+            client.create_market_order("BTCUSDT", side, qty)
+        else:
+            client.create_limit_order("BTCUSDT", side, qty, price)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated exchange throughput")
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    orders = _orders(args.orders, args.seed)
+    elapsed, exchange = bench_exchange(orders)
+    resting = sum(len(e.resting) for e in exchange.engines.values())
+    print(f"exchange.submit : {args.orders / elapsed:>10,.0f} orders/s  ({exchange.trades} trades, {resting} resting)")
+    elapsed = bench_client(orders)
+    print(f"client (dicts)  : {args.orders / elapsed:>10,.0f} orders/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+CLI startup cost: wall time per invocation of `python -m src.cli`, with and
+without the daemon, next to a bare interpreter, plus the import time of the
+CLI module itself.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ORDER = ["--dry-run", "market", "BTCUSDT", "BUY", "0.001"]
+
+def _wall_ms(cmd, env, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def _import_us(module, env):
+    """Cumulative import time of `module` as reported by -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env=env, capture_output=True, text=True)
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup time")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, BOT_DAEMON_SOCKET=os.path.join(tmp, "bot.sock"), BOT_LOGFILE=os.path.join(tmp, "bot.log"), DRY_RUN="true")
+        cli = [sys.executable, "-m", "src.cli"]
+
+        print(f"import src.cli            : {_import_us('src.cli', env) / 1000:7.1f} ms")
+        print(f"python -c pass            : {_wall_ms([sys.executable, '-c', 'pass'], env, args.runs):7.1f} ms")
+        print(f"cli --help                : {_wall_ms(cli + ['--help'], env, args.runs):7.1f} ms")
+        print(f"cli market (in-process)   : {_wall_ms(cli + ORDER, env, args.runs):7.1f} ms")
+
+        daemon = subprocess.Popen([sys.executable, "-m", "src.daemon"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.time() + 10
+            while not os.path.exists(env["BOT_DAEMON_SOCKET"]) and time.time() < deadline:
+                time.sleep(0.05)
+            print(f"cli market (--daemon)     : {_wall_ms(cli + ['--daemon'] + ORDER, env, args.runs):7.1f} ms")
+        finally:
+            subprocess.run([sys.executable, "-m", "src.daemon", "stop"], env=env, stdout=subprocess.DEVNULL)
+            daemon.wait(timeout=10)
+
+if __name__ == "__main__":
+    main()
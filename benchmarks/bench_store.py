@@ -0,0 +1,81 @@
+"""
+Column store size and speed on synthetic 1m klines: append throughput,
+compression ratio, a full scan, a one-day range read through the time index,
+and opening the memory-mapped view, for the zlib and raw codecs.
+
+Usage:
+    python -m benchmarks.bench_store [--bars 1000000] [--chunk 50000]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+from src.backtest.data import generate_klines
+from src.backtest.store import ColumnStore, SCHEMAS
+
+def _columns(bars):
+    k = generate_klines(bars, seed=1)
+    # Prices and volume as the exchange reports them (tick / lot size precision)
+    columns = {name: np.round(k[name], 1) for name in ("open", "high", "low", "close")}
+    columns["open_time"] = k["open_time"] + 1_700_000_000_000
+    columns["volume"] = np.round(k["volume"], 3)
+    columns["close_time"] = columns["open_time"] + 59_999
+    columns["quote_volume"] = np.round(columns["volume"] * columns["close"], 2)
+    columns["trades"] = (columns["volume"] * 40).astype(np.int64)
+    columns["taker_buy_volume"] = np.round(columns["volume"] / 2, 3)
+    columns["taker_buy_quote_volume"] = np.round(columns["quote_volume"] / 2, 2)
+    return columns
+
+def run(codec, columns, chunk, tmp):
+    path = os.path.join(tmp, codec)
+    store = ColumnStore(path, "klines", codec=codec)
+    bars = len(columns["open_time"])
+    start = time.perf_counter()
+    for lo in range(0, bars, chunk):
+        store.append({name: values[lo:lo + chunk] for name, values in columns.items()})
+    write = time.perf_counter() - start
+
+    store = ColumnStore(path)
+    start = time.perf_counter()
+    data = store.read(columns=["close"])
+    scan = time.perf_counter() - start
+    assert np.array_equal(data["close"], columns["close"])
+
+    day_start = int(columns["open_time"][bars // 2])
+    start = time.perf_counter()
+    for _ in range(100):
+        day = store.read(day_start, day_start + 86_400_000, columns=["close"])
+    window = (time.perf_counter() - start) / 100
+    assert len(day["close"]) == 1440
+
+    store.mmap()
+    start = time.perf_counter()
+    mapped = ColumnStore(path).mmap()
+    open_mmap = time.perf_counter() - start
+    assert float(mapped["close"][-1]) == float(columns["close"][-1])
+
+    s = store.stats()
+    print(
+        f"{codec:5s} {s['bytes'] / 1e6:8.1f} MB  ratio {s['ratio']:5.2f}  "
+        f"append {bars / write / 1e6:5.2f} M rows/s  scan(close) {scan * 1e3:7.1f} ms  "
+        f"1-day range {window * 1e6:7.0f} us  mmap open {open_mmap * 1e3:5.2f} ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Column store benchmark")
+    parser.add_argument("--bars", type=int, default=1000000)
+    parser.add_argument("--chunk", type=int, default=50000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    columns = _columns(args.bars)
+    raw = args.bars * sum(np.dtype(dtype).itemsize for _, dtype in SCHEMAS["klines"]["columns"])
+    print(f"{args.bars} klines, {raw / 1e6:.1f} MB as plain arrays, {args.chunk} rows per chunk")
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in ("zlib", "raw"):
+            run(codec, columns, args.chunk, tmp)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Loggers, default journals and kline caches are set up from config; keep test runs from writing into the repo
+_scratch = tempfile.mkdtemp(prefix="bot-tests-")
+os.environ.setdefault("BOT_LOGFILE", os.path.join(_scratch, "bot.log"))
+os.environ.setdefault("ORDER_JOURNAL", os.path.join(_scratch, "orders.jsonl"))
+os.environ.setdefault("KLINE_CACHE_DIR", os.path.join(_scratch, "klines"))
@@ -9,6 +9,13 @@ function App() {
   const [response, setResponse] = useState(null)
   const [loading, setLoading] = useState(false)
   const [ping, setPing] = useState(null)
+  const [streamStatus, setStreamStatus] = useState('connecting')
+  const [orders, setOrders] = useState({})
+  const [fills, setFills] = useState([])
+  const [balances, setBalances] = useState({})
+  const [logs, setLogs] = useState([])
+
+  const MAX_FEED = 100
 
   const API_BASE = import.meta.env.VITE_API_BASE || 'http://localhost:5000'
 
@@ -16,6 +23,32 @@ function App() {
     checkPing()
   }, [])
 
+  // Live updates pushed by the API (/api/events, Server-Sent Events)
+  useEffect(() => {
+    const source = new EventSource(`${API_BASE}/api/events`)
+    const parse = (handler) => (e) => handler(JSON.parse(e.data))
+
+    source.onopen = () => setStreamStatus('live')
+    source.onerror = () => setStreamStatus('reconnecting')
+    source.addEventListener('order', parse(order => {
+      setOrders(prev => {
+        const next = { ...prev, [order.orderId ?? order.clientOrderId]: order }
+        const keys = Object.keys(next)
+        if (keys.length > MAX_FEED) delete next[keys[0]]
+        return next
+      })
+    }))
+    source.addEventListener('fill', parse(fill => setFills(prev => [fill, ...prev].slice(0, MAX_FEED))))
+    source.addEventListener('balance', parse(b => setBalances(prev => ({ ...prev, [b.asset]: b }))))
+    source.addEventListener('log', parse(log => setLogs(prev => [log, ...prev].slice(0, MAX_FEED))))
+    source.addEventListener('dropped', parse(d => setLogs(prev => [
+      { ts: Date.now() / 1000, level: 'WARNING', msg: `${d.count} events dropped (dashboard too slow)` },
+      ...prev
+    ].slice(0, MAX_FEED))))
+
+    return () => source.close()
+  }, [])
+
   const checkPing = async () => {
     try {
       const res = await fetch(`${API_BASE}/api/ping`)
@@ -57,6 +90,26 @@ function App() {
     }
   }
 
+  // Kill switch: cancels every open order on every symbol and account
+  const handlePanic = async (flatten) => {
+    const what = flatten ? 'cancel ALL open orders and CLOSE ALL positions' : 'cancel ALL open orders'
+    if (!window.confirm(`Kill switch: ${what} on every account?`)) return
+    setLoading(true)
+    setResponse(null)
+    try {
+      const res = await fetch(`${API_BASE}/api/panic`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ flatten })
+      })
+      setResponse(await res.json())
+    } catch (err) {
+      setResponse({ error: 'Network Error', details: err.message })
+    } finally {
+      setLoading(false)
+    }
+  }
+
   return (
     <div className="container">
       {/* Header / Status Bar */}
@@ -147,6 +200,15 @@ function App() {
               Limit {side}
             </button>
           </div>
+
+          <div className="btn-group" style={{ marginTop: '1rem' }}>
+            <button className="btn btn-sell" disabled={loading} onClick={() => handlePanic(false)}>
+              Cancel All
+            </button>
+            <button className="btn btn-sell" disabled={loading} onClick={() => handlePanic(true)}>
+              Panic: Cancel &amp; Flatten
+            </button>
+          </div>
         </div>
 
         {/* Console / Response Card */}
@@ -178,6 +240,45 @@ function App() {
             )}
           </div>
         </div>
+
+        {/* Live Feed Card */}
+        <div className="card">
+          <div className="card-header">
+            <span className={`status-indicator ${streamStatus === 'live' ? 'status-online' : 'status-offline'}`}></span>
+            Live Feed
+          </div>
+          <div className="market-overview">
+            {Object.values(balances).map(b => (
+              <div className="market-item" key={b.asset}>
+                <span className="market-label">{b.asset} Balance</span>
+                <span className="market-value">{b.walletBalance}</span>
+              </div>
+            ))}
+          </div>
+          <div className="json-response">
+            {Object.values(orders).reverse().map(o => (
+              <div key={o.orderId ?? o.clientOrderId}>
+                {o.symbol} {o.side} {o.type} {o.status} {o.executedQty ?? 0}/{o.origQty ?? o.quantity} @ {o.avgPrice || o.price || 'MKT'}
+              </div>
+            ))}
+            {fills.map((f, i) => (
+              <div key={`fill-${i}`}>FILL {f.symbol} {f.side} {f.quantity} @ {f.price}</div>
+            ))}
+            {Object.keys(orders).length === 0 && fills.length === 0 && <div>No orders yet.</div>}
+          </div>
+        </div>
+
+        {/* Log Card */}
+        <div className="card">
+          <div className="card-header">Bot Log</div>
+          <div className="json-response">
+            {logs.map((l, i) => (
+              <div key={i}>
+                {new Date(l.ts * 1000).toLocaleTimeString()} {l.level} {l.msg}
+              </div>
+            ))}
+          </div>
+        </div>
       </div>
     </div>
   )
@@ -0,0 +1 @@
+# backtest package
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+# Leading columns of Binance kline CSVs (data.binance.vision and /fapi/v1/klines)
+COLUMNS = ("open_time", "open", "high", "low", "close", "volume")
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        logger.error("numpy not installed. Backtesting requires it.")
+        raise ImportError("Please install 'numpy' to run backtests.")
+    return np
+
+class Klines:
+    """
+    Column arrays for one symbol's klines (open_time in ms, prices, volume).
+
+    Arrays loaded from a cache directory are read-only memory maps, so several
+    processes sweeping the same data share the OS page cache instead of each
+    holding a copy.
+    """
+
+    def __init__(self, columns: Dict[str, "np.ndarray"], path: Optional[str] = None):
+        self.columns = columns
+        self.path = path
+        self._typical = None
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __len__(self) -> int:
+        return len(self.columns["close"])
+
+    @property
+    def bar_seconds(self) -> float:
+        """Bar length inferred from the first two open times."""
+        times = self.columns["open_time"]
+        return float(times[1] - times[0]) / 1000.0 if len(times) > 1 else 60.0
+
+    @property
+    def typical(self) -> "np.ndarray":
+        """(high + low + close) / 3: the fill price assumed for an order worked during a bar."""
+        if self._typical is None:
+            self._typical = (self.columns["high"] + self.columns["low"] + self.columns["close"]) / 3.0
+        return self._typical
+
+def read_klines_csv(path: str) -> Dict[str, "np.ndarray"]:
+    """Parses a kline CSV (with or without header) into column arrays."""
+    np = _numpy()
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline()
+    skip = 0 if first[:1].isdigit() else 1
+    raw = np.loadtxt(path, delimiter=",", usecols=range(len(COLUMNS)), skiprows=skip, dtype=np.float64, ndmin=2)
+    columns = {name: np.ascontiguousarray(raw[:, i]) for i, name in enumerate(COLUMNS)}
+    columns["open_time"] = columns["open_time"].astype(np.int64)
+    return columns
+
+def write_cache(columns: Dict[str, "np.ndarray"], cache_dir: str, source_mtime: float = 0.0) -> None:
+    """Writes one .npy file per column plus a meta.json describing the source."""
+    np = _numpy()
+    os.makedirs(cache_dir, exist_ok=True)
+    for name in COLUMNS:
+        np.save(os.path.join(cache_dir, f"{name}.npy"), columns[name])
+    meta = {"rows": int(len(columns["close"])), "columns": list(COLUMNS), "source_mtime": source_mtime}
+    tmp = os.path.join(cache_dir, "meta.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(cache_dir, "meta.json"))
+
+def load_cache(cache_dir: str) -> Klines:
+    np = _numpy()
+    columns = {name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r") for name in COLUMNS}
+    return Klines(columns, cache_dir)
+
+def default_cache_dir(path: str) -> str:
+    """
+    Cache directory for a kline CSV: under KLINE_CACHE_DIR (default
+    ~/.cache/binance-bot/klines), never next to the CSV, so caches of files
+    in the repository stay out of the tree.
+    """
+    from ..config import CONFIG
+    root = CONFIG.KLINE_CACHE_DIR or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "binance-bot", "klines"
+    )
+    path = os.path.abspath(path)
+    # Same-named CSVs in different directories get their own cache
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(root, f"{os.path.basename(path)}-{digest}")
+
+def load_klines(path: str, cache_dir: Optional[str] = None) -> Klines:
+    """
+    Loads klines, memory-mapped from the columnar cache.
+
+    Args:
+        path: A kline CSV, a cache directory written by write_cache, or a
+            ColumnStore of downloaded klines.
+        cache_dir: Where to keep the cache for a CSV (default: default_cache_dir(path)).
+            It is rebuilt whenever the CSV is newer than the cache.
+
+    Returns:
+        Klines backed by read-only memory maps.
+    """
+    if os.path.isdir(path):
+        if os.path.isfile(os.path.join(path, "index.json")):
+            from .store import ColumnStore
+            return ColumnStore(path, "klines").to_klines()
+        return load_cache(path)
+
+    cache_dir = cache_dir or default_cache_dir(path)
+    mtime = os.path.getmtime(path)
+    meta_path = os.path.join(cache_dir, "meta.json")
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            fresh = json.load(f).get("source_mtime") == mtime
+    except (OSError, ValueError):
+        fresh = False
+    if not fresh:
+        logger.info(f"Building kline cache {cache_dir} from {path}")
+        write_cache(read_klines_csv(path), cache_dir, mtime)
+    return load_cache(cache_dir)
+
+def generate_klines(bars: int, start_price: float = 30000.0, volatility: float = 0.0008, start_time: int = 0,
+                    bar_seconds: int = 60, seed: Optional[int] = None) -> Dict[str, "np.ndarray"]:
+    """Synthetic random-walk klines for benchmarks and offline experiments."""
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, volatility, bars)))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    wick = np.abs(rng.normal(0.0, volatility / 2, (2, bars))) * close
+    return {
+        "open_time": start_time + np.arange(bars, dtype=np.int64) * bar_seconds * 1000,
+        "open": open_,
+        "high": np.maximum(open_, close) + wick[0],
+        "low": np.minimum(open_, close) - wick[1],
+        "close": close,
+        "volume": rng.gamma(2.0, 5.0, bars)
+    }
@@ -0,0 +1,238 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from ..config import CONFIG
+from ..logger import get_logger
+from ..orders.rate_limiter import RateLimiter, PRIORITY_QUERY, call_limited, get_rate_limiter
+from .data import _numpy
+from .store import ColumnStore, SCHEMAS
+
+logger = get_logger(__name__)
+
+# Rows per request (the maximum for both endpoints)
+PAGE_LIMIT = 1000
+
+# aggTrades only accepts startTime/endTime windows shorter than an hour
+_AGG_WINDOW_MS = 3600 * 1000 - 1
+
+def parse_time(value: Any) -> int:
+    """Milliseconds since the epoch from an int, or an ISO date/datetime string (UTC)."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"Invalid time: {value!r} (use epoch ms or an ISO date)")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+def dataset_path(root: str, kind: str, symbol: str, interval: Optional[str] = None) -> str:
+    """<root>/klines/<interval>/<SYMBOL> or <root>/aggTrades/<SYMBOL>."""
+    if kind == "klines":
+        return os.path.join(root, "klines", interval or "1m", symbol)
+    return os.path.join(root, kind, symbol)
+
+def klines_to_columns(rows: List[List[Any]]) -> Dict[str, "np.ndarray"]:
+    """/fapi/v1/klines rows -> store columns."""
+    np = _numpy()
+    names = [name for name, _ in SCHEMAS["klines"]["columns"]]
+    # Response rows: open time, OHLCV, close time, quote volume, trades, taker buy base/quote, ignore
+    table = np.array([row[:11] for row in rows], dtype=np.float64).reshape(-1, 11)
+    return {name: table[:, i] for i, name in enumerate(names)}
+
+def agg_trades_to_columns(trades: List[Dict[str, Any]]) -> Dict[str, "np.ndarray"]:
+    """/fapi/v1/aggTrades objects -> store columns."""
+    np = _numpy()
+    return {
+        "agg_id": np.array([t["a"] for t in trades], dtype=np.int64),
+        "price": np.array([t["p"] for t in trades], dtype=np.float64),
+        "quantity": np.array([t["q"] for t in trades], dtype=np.float64),
+        "first_id": np.array([t["f"] for t in trades], dtype=np.int64),
+        "last_id": np.array([t["l"] for t in trades], dtype=np.int64),
+        "time": np.array([t["T"] for t in trades], dtype=np.int64),
+        "buyer_maker": np.array([t["m"] for t in trades], dtype=np.uint8)
+    }
+
+class _Buffer:
+    """Pages waiting to be written as one chunk."""
+
+    def __init__(self, store: ColumnStore, chunk_rows: int):
+        self.store = store
+        self.chunk_rows = chunk_rows
+        self.pages: List[Dict[str, "np.ndarray"]] = []
+        self.rows = 0
+        self.written = 0
+
+    def add(self, columns: Dict[str, "np.ndarray"]) -> None:
+        self.pages.append(columns)
+        self.rows += len(next(iter(columns.values())))
+        if self.rows >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pages:
+            return
+        np = _numpy()
+        merged = {name: np.concatenate([p[name] for p in self.pages]) for name in self.pages[0]}
+        self.written += self.store.append(merged)
+        self.pages, self.rows = [], 0
+
+class HistoryDownloader:
+    """
+    Downloads klines or aggregate trades for many symbols into ColumnStores.
+
+    Symbols run concurrently on a thread pool, each with its own HTTP session;
+    every request goes through the shared RateLimiter (request weight) and
+    re-syncs it from the response headers. Each symbol resumes after the last
+    key already in its store, and pages are written in chunks of `chunk_rows`,
+    so an interrupted download loses at most one unwritten chunk.
+
+    Args:
+        root: Data directory (see dataset_path()).
+        base_url: REST base URL (default: BINANCE_BASE_URL). Market data needs no API key.
+        rate_limiter: Limiter to draw weight from (default: the process-wide one).
+        workers: Symbols downloaded at once.
+        chunk_rows: Rows per chunk file.
+        codec: Chunk codec for new stores ("zlib" or "raw").
+        connector_factory: Builds a connector with klines()/agg_trades() (tests pass their own).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        workers: int = 4,
+        chunk_rows: int = 50000,
+        codec: str = "zlib",
+        timeout: Optional[float] = None,
+        connector_factory: Optional[Callable[[], Any]] = None
+    ):
+        self.root = root
+        self.base_url = base_url or CONFIG.BINANCE_BASE_URL
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.workers = workers
+        self.chunk_rows = chunk_rows
+        self.codec = codec
+        self.timeout = timeout or CONFIG.HTTP_TIMEOUT
+        self.connector_factory = connector_factory or self._connector
+
+    def _connector(self):
+        try:
+            from binance.um_futures import UMFutures
+        except ImportError:
+            logger.error("binance-connector-python not installed. Downloading requires it.")
+            raise ImportError("Please install 'binance-futures-connector' to download market data.")
+        return UMFutures(base_url=self.base_url, timeout=self.timeout, show_limit_usage=True)
+
+    def _call(self, endpoint: str, fn, **params) -> Any:
+        return call_limited(self.rate_limiter, endpoint, fn, PRIORITY_QUERY, **params)
+
+    def download(
+        self,
+        symbols: Sequence[str],
+        kind: str = "klines",
+        start: Any = None,
+        end: Any = None,
+        interval: str = "1m"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Downloads [start, end) for every symbol, resuming where each store left off.
+
+        Args:
+            symbols: Symbols to fetch.
+            kind: "klines" or "aggTrades".
+            start: First time (epoch ms or ISO date). Required for symbols with no data yet.
+            end: End time, exclusive (default: now).
+            interval: Kline interval.
+
+        Returns:
+            Symbol -> {"rows": rows added, "total": rows stored} or {"error": message}.
+        """
+        if kind not in SCHEMAS:
+            raise ValueError(f"Unknown dataset kind: {kind}. Must be one of {', '.join(SCHEMAS)}.")
+        start_ms = parse_time(start) if start is not None else None
+        end_ms = parse_time(end) if end is not None else int(time.time() * 1000)
+
+        def run(symbol):
+            store = ColumnStore(dataset_path(self.root, kind, symbol, interval), kind, codec=self.codec)
+            try:
+                if kind == "klines":
+                    added = self._download_klines(store, symbol, interval, start_ms, end_ms)
+                else:
+                    added = self._download_agg_trades(store, symbol, start_ms, end_ms)
+            except Exception as e:
+                logger.error(f"Download {kind} {symbol} failed after {store.rows} rows: {e}")
+                return symbol, {"error": str(e), "total": store.rows}
+            logger.info(f"Downloaded {added} {kind} rows for {symbol} ({store.rows} stored)")
+            return symbol, {"rows": added, "total": store.rows}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(symbols))), thread_name_prefix="download") as pool:
+            return dict(pool.map(run, symbols))
+
+    def _download_klines(self, store: ColumnStore, symbol: str, interval: str, start_ms: Optional[int], end_ms: int) -> int:
+        cursor = store.last_key + 1 if store.last_key is not None else start_ms
+        if cursor is None:
+            raise ValueError(f"No stored klines for {symbol}; a start time is required")
+        connector = self.connector_factory()
+        buffer = _Buffer(store, self.chunk_rows)
+        try:
+            while cursor < end_ms:
+                rows = self._call("klines", connector.klines, symbol=symbol, interval=interval, startTime=cursor, endTime=end_ms - 1, limit=PAGE_LIMIT)
+                if not rows:
+                    break
+                columns = klines_to_columns(rows)
+                # Keep closed bars only; the open one would otherwise block its own update on resume
+                closed = columns["close_time"] < time.time() * 1000
+                if not closed.all():
+                    columns = {name: values[closed] for name, values in columns.items()}
+                if len(columns["open_time"]):
+                    buffer.add(columns)
+                cursor = int(rows[-1][0]) + 1
+                if len(rows) < PAGE_LIMIT or not closed.all():
+                    break
+        finally:
+            buffer.flush()
+        return buffer.written
+
+    def _download_agg_trades(self, store: ColumnStore, symbol: str, start_ms: Optional[int], end_ms: int) -> int:
+        connector = self.connector_factory()
+        buffer = _Buffer(store, self.chunk_rows)
+        from_id = store.last_key + 1 if store.last_key is not None else None
+        if from_id is None and start_ms is None:
+            raise ValueError(f"No stored aggTrades for {symbol}; a start time is required")
+        window = start_ms
+        try:
+            while True:
+                if from_id is None:
+                    # Find the first trade: hour-long windows until one has data, then page by id
+                    if window >= end_ms:
+                        break
+                    trades = self._call("agg_trades", connector.agg_trades, symbol=symbol, startTime=window, endTime=min(window + _AGG_WINDOW_MS, end_ms - 1), limit=PAGE_LIMIT)
+                    window += _AGG_WINDOW_MS + 1
+                    if not trades:
+                        continue
+                    caught_up = False
+                else:
+                    trades = self._call("agg_trades", connector.agg_trades, symbol=symbol, fromId=from_id, limit=PAGE_LIMIT)
+                    if not trades:
+                        break
+                    caught_up = len(trades) < PAGE_LIMIT
+                columns = agg_trades_to_columns(trades)
+                inside = columns["time"] < end_ms
+                if not inside.all():
+                    columns = {name: values[inside] for name, values in columns.items()}
+                if len(columns["agg_id"]):
+                    buffer.add(columns)
+                from_id = int(trades[-1]["a"]) + 1
+                if caught_up or not inside.all():
+                    break
+        finally:
+            buffer.flush()
+        return buffer.written
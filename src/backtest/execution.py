@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Sequence
+from ..logger import get_logger
+from .data import _numpy
+
+logger = get_logger(__name__)
+
+ALGOS = ("twap", "vwap", "pov")
+
+def _make_parent(spec: Dict[str, Any], client, symbol: str, scheduler, volume, start_time: float):
+    from ..orders.advanced.pov import PovExecution
+    from ..orders.advanced.twap import TwapExecution
+    from ..orders.advanced.vwap import VwapExecution
+
+    algo = spec.get("algo")
+    side = spec.get("side", "BUY")
+    quantity = float(spec["quantity"])
+    if algo == "twap":
+        return TwapExecution(client, symbol, side, quantity, int(spec["slices"]), float(spec["interval"]), scheduler=scheduler)
+    if algo == "vwap":
+        return VwapExecution(client, symbol, side, quantity, float(spec["duration"]), int(spec["slices"]), spec["profile"],
+                             start_time=start_time, scheduler=scheduler)
+    if algo == "pov":
+        return PovExecution(client, symbol, side, quantity, float(spec["rate"]), volume, float(spec.get("interval", 5.0)),
+                            float(spec.get("min_quantity", 0.0)), spec.get("max_duration"), scheduler)
+    raise ValueError(f"Unknown algo: {algo}. Must be one of {', '.join(ALGOS)}.")
+
+def backtest_execution(trades: Dict[str, Any], symbol: str, specs: Sequence[Dict[str, Any]], fee: float = 0.0004) -> List[Dict[str, Any]]:
+    """
+    Runs TWAP, VWAP and POV parents side by side against recorded trades.
+
+    The trades (ColumnStore "aggTrades" columns: "time" in ms, "price",
+    "quantity") are replayed in order on a SimulatedClock scheduler. Every
+    child is a market order on a SimulatedExchange, filled at the last trade
+    price before it fires, and POV parents size from the replayed volume, so
+    the live execution classes run unchanged. Each parent trades from its own
+    account.
+
+    Args:
+        trades: Trade columns, oldest first.
+        symbol: Symbol the trades belong to.
+        specs: One dict per parent: "algo", "quantity", optional "side" (BUY)
+            and "start" (seconds after the first trade), plus
+            twap: "slices", "interval"; vwap: "slices", "duration", "profile"
+            (VolumeProfile); pov: "rate" and optional "interval",
+            "min_quantity", "max_duration".
+        fee: Taker fee rate of the simulated exchange.
+
+    Returns:
+        Per spec: status, filled quantity, average fill price, the market VWAP
+        over the parent's lifetime, slippage against it in basis points
+        (positive = worse) and the parent's share of market volume.
+    """
+    from ..orders.advanced.pov import TradeVolume
+    from ..orders.advanced.scheduler import Scheduler, SimulatedClock
+    from ..sim.client import SimulatedBinanceClient
+    from ..sim.exchange import SimulatedExchange
+
+    np = _numpy()
+    times = np.asarray(trades["time"], dtype=np.int64)
+    prices = np.asarray(trades["price"], dtype=np.float64)
+    quantities = np.asarray(trades["quantity"], dtype=np.float64)
+    if not len(times):
+        raise ValueError("No trades to replay")
+
+    t0 = times[0] / 1000.0
+    scheduler = Scheduler(SimulatedClock(t0))
+    exchange = SimulatedExchange(maker_fee=fee, taker_fee=fee)
+    volume = TradeVolume()
+    parents = []
+    for i, spec in enumerate(specs):
+        start = t0 + float(spec.get("start", 0.0))
+        parent = _make_parent(spec, SimulatedBinanceClient(exchange, f"parent-{i}"), symbol, scheduler, volume, start)
+        scheduler.call_at(start, parent.start)
+        parents.append(parent)
+
+    feed, add, next_due = exchange.feed_tick, volume.add, scheduler.next_due
+    due = next_due()
+    for t_ms, price, qty in zip(times.tolist(), prices.tolist(), quantities.tolist()):
+        # Timers due before this trade fire first, against the previous trade's price
+        if due is not None and due < t_ms / 1000.0:
+            scheduler.advance(t_ms / 1000.0 - scheduler.time())
+            due = next_due()
+        feed(symbol, price, qty, t_ms)
+        add(symbol, qty, t_ms)
+    logger.info(f"Replayed {len(times)} {symbol} trades for {len(parents)} parents")
+
+    cum_value = np.concatenate(([0.0], np.cumsum(prices * quantities)))
+    cum_volume = np.concatenate(([0.0], np.cumsum(quantities)))
+    done = {}
+    for order in exchange.orders.values():
+        filled, cost = done.get(order.account, (0.0, 0.0))
+        done[order.account] = (filled + order.filled, cost + order.cost)
+
+    results = []
+    end_ms = int(times[-1])
+    for i, (spec, parent) in enumerate(zip(specs, parents)):
+        filled, cost = done.get(f"parent-{i}", (0.0, 0.0))
+        lo = int(np.searchsorted(times, int((parent.started_at or t0) * 1000), "left"))
+        hi = int(np.searchsorted(times, int(parent.finished_at * 1000) if parent.finished_at else end_ms, "right"))
+        market_volume = cum_volume[hi] - cum_volume[lo]
+        market_vwap = (cum_value[hi] - cum_value[lo]) / market_volume if market_volume > 0 else 0.0
+        avg_price = cost / filled if filled else 0.0
+        sign = 1.0 if parent.side == "BUY" else -1.0
+        results.append({
+            "algo": parent.algo,
+            "side": parent.side,
+            "status": parent.status,
+            "quantity": parent.total_quantity,
+            "filled": filled,
+            "children": parent.slices_sent,
+            "avg_price": avg_price,
+            "market_vwap": market_vwap,
+            "slippage_bps": sign * (avg_price - market_vwap) / market_vwap * 1e4 if filled and market_vwap else 0.0,
+            "participation": filled / market_volume if market_volume > 0 else 0.0,
+            "seconds": ((parent.finished_at or end_ms / 1000.0) - (parent.started_at or t0))
+        })
+    return results
@@ -0,0 +1,342 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from ..logger import get_logger
+from .data import COLUMNS, Klines, _numpy
+
+logger = get_logger(__name__)
+
+# (column, numpy dtype) per dataset kind. "key" is unique and increasing (used
+# to resume downloads), "time" is the millisecond timestamp the index is built on.
+SCHEMAS = {
+    "klines": {
+        "columns": (
+            ("open_time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+            ("volume", "<f8"), ("close_time", "<i8"), ("quote_volume", "<f8"), ("trades", "<i8"),
+            ("taker_buy_volume", "<f8"), ("taker_buy_quote_volume", "<f8")
+        ),
+        "key": "open_time",
+        "time": "open_time"
+    },
+    "aggTrades": {
+        "columns": (
+            ("agg_id", "<i8"), ("price", "<f8"), ("quantity", "<f8"), ("first_id", "<i8"),
+            ("last_id", "<i8"), ("time", "<i8"), ("buyer_maker", "|u1")
+        ),
+        "key": "agg_id",
+        "time": "time"
+    }
+}
+
+CODECS = ("zlib", "raw")
+
+_MAGIC = b"TBCS"
+_ALIGN = 64
+
+def _aligned(size: int) -> int:
+    return -(-size // _ALIGN) * _ALIGN
+
+def _shuffle(data: "np.ndarray") -> bytes:
+    """Groups byte i of every value together, which makes floats compress far better."""
+    np = _numpy()
+    return np.ascontiguousarray(data.view(np.uint8).reshape(-1, data.itemsize).T).tobytes()
+
+def _unshuffle(buf: bytes, dtype: str, rows: int) -> "np.ndarray":
+    np = _numpy()
+    dt = np.dtype(dtype)
+    return np.ascontiguousarray(np.frombuffer(buf, np.uint8).reshape(dt.itemsize, rows).T).view(dt).reshape(rows)
+
+def _encode(values: "np.ndarray", codec: str, level: int) -> Tuple[bytes, Optional[str]]:
+    np = _numpy()
+    if codec == "raw":
+        return values.tobytes(), None
+    if values.dtype.kind == "i":
+        # Timestamps and ids grow in small steps: store deltas
+        return zlib.compress(_shuffle(np.diff(values, prepend=values.dtype.type(0))), level), "delta"
+    if values.dtype.itemsize > 1:
+        return zlib.compress(_shuffle(values), level), "shuffle"
+    return zlib.compress(values.tobytes(), level), None
+
+def _decode(buf, dtype: str, rows: int, codec: str, transform: Optional[str]) -> "np.ndarray":
+    np = _numpy()
+    if codec == "raw":
+        # A view straight onto the mapped file
+        return np.frombuffer(buf, dtype=dtype, count=rows)
+    data = zlib.decompress(buf)
+    if transform is None:
+        return np.frombuffer(data, dtype=dtype, count=rows)
+    values = _unshuffle(data, dtype, rows)
+    if transform == "delta":
+        values = np.cumsum(values, dtype=values.dtype)
+    return values
+
+def write_chunk(path: str, columns: Dict[str, "np.ndarray"], schema: Sequence[Tuple[str, str]], codec: str = "zlib", level: int = 1) -> int:
+    """
+    Writes one chunk file and returns its size.
+
+    Layout: magic, header length (u32), JSON header, then one block per column
+    starting on a 64-byte boundary. Raw blocks can be mapped as arrays in place.
+    """
+    np = _numpy()
+    rows = len(columns[schema[0][0]])
+    blocks = []
+    for name, dtype in schema:
+        values = np.ascontiguousarray(columns[name], dtype=dtype)
+        data, transform = _encode(values, codec, level)
+        blocks.append((name, dtype, data, transform))
+
+    # Block offsets are relative to the first 64-byte boundary after the header
+    header = {"rows": rows, "codec": codec, "columns": {}}
+    offset = 0
+    for name, dtype, data, transform in blocks:
+        header["columns"][name] = {"dtype": dtype, "offset": offset, "length": len(data), "transform": transform}
+        offset += _aligned(len(data))
+    header_bytes = json.dumps(header).encode()
+    base = _aligned(len(_MAGIC) + 4 + len(header_bytes))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes)
+        for name, dtype, data, transform in blocks:
+            f.seek(base + header["columns"][name]["offset"])
+            f.write(data)
+        size = f.tell()
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return size
+
+class Chunk:
+    """A memory-mapped chunk file. Column reads decode (zlib) or view (raw) one block."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != _MAGIC:
+            raise ValueError(f"Not a column store chunk: {path}")
+        (length,) = struct.unpack_from("<I", self._map, 4)
+        self.header = json.loads(self._map[8:8 + length])
+        self._base = _aligned(8 + length)
+        self.rows = self.header["rows"]
+        self.codec = self.header["codec"]
+
+    def column(self, name: str) -> "np.ndarray":
+        meta = self.header["columns"][name]
+        offset = self._base + meta["offset"]
+        buf = memoryview(self._map)[offset:offset + meta["length"]]
+        return _decode(buf, meta["dtype"], self.rows, self.codec, meta["transform"])
+
+class ColumnStore:
+    """
+    Append-only, chunked columnar store for one dataset (e.g. BTCUSDT 1m klines).
+
+    Each append() writes an immutable chunk file (zlib with delta/byte-shuffle
+    filters, or raw for zero-copy reads) and then atomically replaces
+    index.json, which lists the chunks with their key and time ranges. A
+    crash between the two leaves an orphan chunk that is ignored and removed
+    on the next open. Rows whose key is not above the last stored key are
+    dropped, so re-appending overlapping pages after a resume is harmless.
+
+    Args:
+        path: Dataset directory.
+        kind: "klines" or "aggTrades" (see SCHEMAS); read from index.json for an existing store.
+        codec: "zlib" (compact) or "raw" (chunk columns are views onto the mapped files).
+        level: zlib compression level (1 is about 4x faster to write than 6 and barely larger).
+    """
+
+    def __init__(self, path: str, kind: Optional[str] = None, codec: str = "zlib", level: int = 1):
+        self.path = path
+        self.index_path = os.path.join(path, "index.json")
+        self._lock = threading.Lock()
+        self._chunks: Dict[str, Chunk] = {}
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.index = json.load(f)
+            if kind is not None and kind != self.index["kind"]:
+                raise ValueError(f"{path} holds {self.index['kind']}, not {kind}")
+            self._remove_orphans()
+        else:
+            if kind not in SCHEMAS:
+                raise ValueError(f"Unknown dataset kind: {kind}. Must be one of {', '.join(SCHEMAS)}.")
+            if codec not in CODECS:
+                raise ValueError(f"Unknown codec: {codec}. Must be one of {', '.join(CODECS)}.")
+            os.makedirs(path, exist_ok=True)
+            self.index = {"kind": kind, "codec": codec, "level": level, "rows": 0, "last_key": None, "chunks": []}
+
+        self.kind = self.index["kind"]
+        schema = SCHEMAS[self.kind]
+        self.schema = schema["columns"]
+        self.key = schema["key"]
+        self.time = schema["time"]
+        self._starts = [c["start"] for c in self.index["chunks"]]
+
+    @property
+    def rows(self) -> int:
+        return self.index["rows"]
+
+    @property
+    def last_key(self) -> Optional[int]:
+        return self.index["last_key"]
+
+    def _remove_orphans(self) -> None:
+        known = {c["file"] for c in self.index["chunks"]}
+        for name in os.listdir(self.path):
+            if name.startswith("chunk-") and name not in known:
+                logger.warning(f"Column store {self.path}: removing unindexed {name}")
+                os.unlink(os.path.join(self.path, name))
+
+    def append(self, columns: Dict[str, "np.ndarray"]) -> int:
+        """
+        Appends rows (sorted by key) as a new chunk.
+
+        Returns:
+            Rows written (after dropping ones already stored).
+        """
+        np = _numpy()
+        with self._lock:
+            keys = np.asarray(columns[self.key], dtype=np.int64)
+            skip = 0
+            if self.last_key is not None:
+                skip = int(np.searchsorted(keys, self.last_key, side="right"))
+            if skip >= len(keys):
+                return 0
+            rows = {name: np.asarray(columns[name], dtype=dtype)[skip:] for name, dtype in self.schema}
+            times = rows[self.time]
+
+            number = len(self.index["chunks"])
+            name = f"chunk-{number:06d}.col"
+            size = write_chunk(os.path.join(self.path, name), rows, self.schema, self.index["codec"], self.index.get("level", 1))
+            entry = {
+                "file": name,
+                "rows": int(len(times)),
+                "first_key": int(rows[self.key][0]),
+                "last_key": int(rows[self.key][-1]),
+                "start": int(times[0]),
+                "end": int(times[-1]),
+                "bytes": size
+            }
+            index = dict(self.index, chunks=self.index["chunks"] + [entry])
+            index["rows"] += entry["rows"]
+            index["last_key"] = entry["last_key"]
+            self._write_index(index)
+            self.index = index
+            self._starts.append(entry["start"])
+            return entry["rows"]
+
+    def _write_index(self, index: Dict) -> None:
+        tmp = f"{self.index_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+
+    def _chunk(self, name: str) -> Chunk:
+        chunk = self._chunks.get(name)
+        if chunk is None:
+            chunk = self._chunks[name] = Chunk(os.path.join(self.path, name))
+        return chunk
+
+    def _select(self, start: Optional[int], end: Optional[int]) -> List[Dict]:
+        chunks = self.index["chunks"]
+        lo = 0 if start is None else max(0, bisect.bisect_right(self._starts, start) - 1)
+        hi = len(chunks) if end is None else bisect.bisect_left(self._starts, end)
+        return [c for c in chunks[lo:hi] if start is None or c["end"] >= start]
+
+    def iter_chunks(self, start: Optional[int] = None, end: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, "np.ndarray"]]:
+        """
+        Yields the rows with start <= time < end, one chunk at a time (the
+        time column is always included).
+
+        Only the chunks overlapping the range are opened (the index is
+        binary-searched on chunk start times), and only the requested columns
+        are decoded.
+        """
+        np = _numpy()
+        names = list(columns or [name for name, _ in self.schema])
+        if self.time not in names:
+            names.append(self.time)
+        for entry in self._select(start, end):
+            chunk = self._chunk(entry["file"])
+            times = chunk.column(self.time)
+            lo = 0 if start is None or entry["start"] >= start else int(np.searchsorted(times, start, side="left"))
+            hi = len(times) if end is None or entry["end"] < end else int(np.searchsorted(times, end, side="left"))
+            if lo >= hi:
+                continue
+            yield {name: (times if name == self.time else chunk.column(name))[lo:hi] for name in names}
+
+    def read(self, start: Optional[int] = None, end: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> Dict[str, "np.ndarray"]:
+        """
+        Rows with start <= time < end as one array per column (the time column
+        is always included). No copy is made when a single raw chunk covers the range.
+        """
+        np = _numpy()
+        parts = list(self.iter_chunks(start, end, columns))
+        names = list(columns or [name for name, _ in self.schema])
+        if self.time not in names:
+            names.append(self.time)
+        dtypes = dict(self.schema)
+        if not parts:
+            return {name: np.empty(0, dtype=dtypes[name]) for name in names}
+        if len(parts) == 1:
+            return {name: parts[0][name] for name in names}
+        return {name: np.concatenate([p[name] for p in parts]) for name in names}
+
+    def mmap(self, columns: Optional[Sequence[str]] = None) -> Dict[str, "np.ndarray"]:
+        """
+        The whole dataset as read-only memory-mapped arrays.
+
+        Decoded columns are written once to "<path>/mmap/<column>.npy" and
+        rebuilt only after new chunks are appended, so every later call (and
+        every process) maps the same files without copying.
+        """
+        np = _numpy()
+        names = list(columns or [name for name, _ in self.schema])
+        cache_dir = os.path.join(self.path, "mmap")
+        stamp_path = os.path.join(cache_dir, "stamp.json")
+        stamp = {"rows": self.rows, "last_key": self.last_key}
+        with self._lock:
+            try:
+                with open(stamp_path, "r", encoding="utf-8") as f:
+                    fresh = json.load(f) == stamp
+            except (OSError, ValueError):
+                fresh = False
+            if not fresh:
+                logger.info(f"Building memory-mapped columns for {self.path} ({self.rows} rows)")
+                os.makedirs(cache_dir, exist_ok=True)
+                data = self.read()
+                for name, _ in self.schema:
+                    np.save(os.path.join(cache_dir, f"{name}.npy"), data[name])
+                with open(f"{stamp_path}.tmp", "w", encoding="utf-8") as f:
+                    json.dump(stamp, f)
+                os.replace(f"{stamp_path}.tmp", stamp_path)
+        return {name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r") for name in names}
+
+    def to_klines(self) -> Klines:
+        """Memory-mapped Klines for the backtester."""
+        if self.kind != "klines":
+            raise ValueError(f"{self.path} holds {self.kind}, not klines")
+        return Klines(self.mmap(COLUMNS), self.path)
+
+    def stats(self) -> Dict[str, object]:
+        stored = sum(c["bytes"] for c in self.index["chunks"])
+        raw = self.rows * sum(_numpy().dtype(dtype).itemsize for _, dtype in self.schema)
+        return {
+            "kind": self.kind,
+            "rows": self.rows,
+            "chunks": len(self.index["chunks"]),
+            "bytes": stored,
+            "ratio": round(raw / stored, 2) if stored else None,
+            "start": self.index["chunks"][0]["start"] if self.index["chunks"] else None,
+            "end": self.index["chunks"][-1]["end"] if self.index["chunks"] else None
+        }
+
+def is_store(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, "index.json"))
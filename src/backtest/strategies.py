@@ -0,0 +1,181 @@
+from typing import Any, Dict, Iterable, List
+from .data import Klines, _numpy
+
+def _entries(klines: Klines, span: int, entry_every: int):
+    """Bar indices where a run can start and still have `span` bars after it."""
+    np = _numpy()
+    return np.arange(0, max(len(klines) - span, 0), entry_every, dtype=np.int64)
+
+def _strided_cumsum(values, step: int):
+    """out[i] = values[i] + values[i - step] + values[i - 2*step] + ..."""
+    np = _numpy()
+    n = len(values)
+    rows = -(-n // step)
+    padded = np.zeros(rows * step)
+    padded[:n] = values
+    return padded.reshape(rows, step).cumsum(axis=0).ravel()[:n]
+
+def twap_slippage(klines: Klines, slices: int, interval_seconds: float, side: str = "BUY", entry_every: int = 1, _sums=None):
+    """
+    Implementation shortfall of a TWAP parent started at every `entry_every` bar.
+
+    Slice k fills at the typical price of the bar k * interval after the start;
+    the benchmark is the open of the start bar (arrival price).
+
+    Returns:
+        Cost in basis points per start (positive = worse than arrival).
+    """
+    np = _numpy()
+    step = _interval_bars(klines, interval_seconds)
+    span = (slices - 1) * step
+    starts = _entries(klines, span, entry_every)
+    # Strided prefix sums make every slice count O(starts) for a given interval
+    sums = _sums if _sums is not None else _strided_cumsum(klines.typical, step)
+    total = sums[starts + span] - np.where(starts >= step, sums[np.maximum(starts - step, 0)], 0.0)
+    arrival = np.asarray(klines.open)[starts]
+    sign = 1.0 if side == "BUY" else -1.0
+    return sign * (total / slices - arrival) / arrival * 1e4
+
+def _interval_bars(klines: Klines, interval_seconds: float) -> int:
+    return max(1, int(round(interval_seconds / klines.bar_seconds)))
+
+def summarize_twap(costs, slices: int, interval_seconds: float) -> Dict[str, Any]:
+    np = _numpy()
+    return {
+        "slices": slices,
+        "interval_seconds": interval_seconds,
+        "samples": int(len(costs)),
+        "mean_bps": float(costs.mean()) if len(costs) else 0.0,
+        "std_bps": float(costs.std()) if len(costs) else 0.0,
+        "p95_bps": float(np.percentile(costs, 95)) if len(costs) else 0.0
+    }
+
+def sweep_twap(klines: Klines, slices: Iterable[int], intervals: Iterable[float], side: str = "BUY", entry_every: int = 1) -> List[Dict[str, Any]]:
+    """Evaluates every (slices, interval_seconds) combination."""
+    results = []
+    for interval in intervals:
+        sums = _strided_cumsum(klines.typical, _interval_bars(klines, interval))
+        for s in slices:
+            results.append(summarize_twap(twap_slippage(klines, s, interval, side, entry_every, sums), s, interval))
+    return results
+
+def _sparse_table(values, levels: int, upward: bool):
+    """table[k][i] = max (or min) of values[i:i + 2**k]."""
+    np = _numpy()
+    reduce = np.maximum if upward else np.minimum
+    table = [np.asarray(values, dtype=np.float64)]
+    for k in range(1, levels):
+        prev, half = table[-1], 1 << (k - 1)
+        table.append(reduce(prev[:-half], prev[half:]))
+    return table
+
+def first_crossings(klines: Klines, entries, thresholds: Iterable[float], horizon: int, upward: bool):
+    """
+    Bar offset (1..horizon) at which price first moves `threshold` (a fraction of
+    the entry close) up or down from each entry, or horizon + 1 if it never does.
+
+    Uses a sparse table of range max/min and binary lifting: each entry skips
+    whole power-of-two blocks that stay below the target, so a threshold costs
+    O(log horizon) vector passes over the entries rather than a window scan.
+
+    Returns:
+        int32 array of shape (len(thresholds), len(entries)).
+    """
+    np = _numpy()
+    thresholds = list(thresholds)
+    levels = max(1, int(horizon).bit_length())
+    table = _sparse_table(klines.high if upward else klines.low, levels, upward)
+    entries = np.asarray(entries, dtype=np.int64)
+    ref = np.asarray(klines.close)[entries]
+    limit = entries + horizon
+    out = np.empty((len(thresholds), len(entries)), dtype=np.int32)
+
+    for t, threshold in enumerate(thresholds):
+        target = ref * (1.0 + threshold) if upward else ref * (1.0 - threshold)
+        pos = entries + 1
+        for k in range(levels - 1, -1, -1):
+            size = 1 << k
+            fits = pos + size - 1 <= limit
+            block = table[k][np.minimum(pos, len(table[k]) - 1)]
+            below = block < target if upward else block > target
+            pos = np.where(fits & below, pos + size, pos)
+        out[t] = pos - entries
+    return out
+
+def oco_returns(klines: Klines, entries, tp_hits, stop_hits, tp_pct: float, stop_pct: float, horizon: int, side: str = "SELL", fee: float = 0.0004):
+    """
+    Per-trade return of an OCO exit from the crossing times of its two legs.
+
+    A stop and take-profit inside the same bar count as a stop (conservative).
+    Positions neither leg closes within `horizon` bars exit at that bar's close.
+
+    Returns:
+        (returns, outcome) where outcome is 1 = take profit, -1 = stop, 0 = expired.
+    """
+    np = _numpy()
+    close = np.asarray(klines.close)
+    tp = tp_hits <= horizon
+    stop = (stop_hits <= horizon) & (stop_hits <= tp_hits)
+    tp &= ~stop
+    drift = close[entries + horizon] / close[entries] - 1.0
+    if side == "BUY":
+        drift = -drift
+    returns = np.where(tp, tp_pct, np.where(stop, -stop_pct, drift)) - 2 * fee
+    outcome = tp.astype(np.int8) - stop.astype(np.int8)
+    return returns, outcome
+
+def sweep_oco(
+    klines: Klines,
+    tp_pcts: Iterable[float],
+    stop_pcts: Iterable[float],
+    horizons: Iterable[int],
+    side: str = "SELL",
+    entry_every: int = 1,
+    fee: float = 0.0004
+) -> List[Dict[str, Any]]:
+    """
+    Evaluates every (take profit, stop, horizon) combination of an OCO exit
+    placed at each entry bar, protecting a long (side SELL) or a short (side BUY).
+
+    Crossing times are computed once per threshold, so each combination only
+    costs a few element-wise operations over the entries.
+    """
+    np = _numpy()
+    tp_pcts, stop_pcts, horizons = list(tp_pcts), list(stop_pcts), list(horizons)
+    max_horizon = max(horizons)
+    entries = _entries(klines, max_horizon, entry_every)
+    # Protecting a long: TP is above the entry, the stop below; reversed for a short
+    tp_hits = first_crossings(klines, entries, tp_pcts, max_horizon, upward=side == "SELL")
+    stop_hits = first_crossings(klines, entries, stop_pcts, max_horizon, upward=side != "SELL")
+
+    close = np.asarray(klines.close)
+    n = len(entries)
+    results = []
+    for h in horizons:
+        drift = close[entries + h] / close[entries] - 1.0
+        if side == "BUY":
+            drift = -drift
+        drift_wins = drift > 2 * fee
+        tp_within = [hits <= h for hits in tp_hits]
+        stop_within = [hits <= h for hits in stop_hits]
+        for i, tp_pct in enumerate(tp_pcts):
+            for j, stop_pct in enumerate(stop_pcts):
+                # Same rules as oco_returns, aggregated without materializing per-trade returns
+                stop = stop_within[j] & (stop_hits[j] <= tp_hits[i])
+                tp = tp_within[i] & ~stop
+                expired = ~(tp | stop)
+                tp_count = int(np.count_nonzero(tp))
+                stop_count = int(np.count_nonzero(stop))
+                total = tp_count * tp_pct - stop_count * stop_pct + float(drift @ expired) - n * 2 * fee
+                wins = (tp_count if tp_pct > 2 * fee else 0) + int(np.count_nonzero(drift_wins & expired))
+                results.append({
+                    "tp_pct": tp_pct,
+                    "stop_pct": stop_pct,
+                    "horizon": h,
+                    "trades": n,
+                    "tp_rate": tp_count / n if n else 0.0,
+                    "stop_rate": stop_count / n if n else 0.0,
+                    "mean_return": total / n if n else 0.0,
+                    "win_rate": wins / n if n else 0.0
+                })
+    return results
@@ -0,0 +1,73 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+from ..logger import get_logger
+from .data import Klines, load_klines
+from .strategies import sweep_twap, sweep_oco
+
+logger = get_logger(__name__)
+
+# Per-worker klines, memory-mapped once by _init_worker
+_worker_klines: Optional[Klines] = None
+
+def _init_worker(cache_dir: str) -> None:
+    global _worker_klines
+    _worker_klines = load_klines(cache_dir)
+
+def _run_part(task):
+    kind, kwargs = task
+    if kind == "twap":
+        return sweep_twap(_worker_klines, **kwargs)
+    return sweep_oco(_worker_klines, **kwargs)
+
+def _split(values: List[Any], parts: int) -> List[List[Any]]:
+    return [chunk for chunk in (values[i::parts] for i in range(parts)) if chunk]
+
+def run_sweep(
+    path: str,
+    kind: str,
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    **params
+) -> List[Dict[str, Any]]:
+    """
+    Runs a TWAP or OCO parameter sweep across a process pool.
+
+    The kline cache is built (if needed) in the calling process, then every
+    worker memory-maps the same files. The grid is split on one axis
+    (intervals for TWAP, take-profit levels for OCO) so each worker computes
+    its crossing times once for its share.
+
+    Args:
+        path: Kline CSV or cache directory.
+        kind: "twap" (params: slices, intervals, side, entry_every) or
+            "oco" (params: tp_pcts, stop_pcts, horizons, side, entry_every, fee).
+        workers: Process count (default: CPU count; 1 runs in-process).
+        cache_dir: Cache location for a CSV source.
+
+    Returns:
+        One summary dict per parameter combination.
+    """
+    if kind not in ("twap", "oco"):
+        raise ValueError(f"Unknown sweep kind: {kind}. Must be twap or oco.")
+    klines = load_klines(path, cache_dir)
+    split_key = "intervals" if kind == "twap" else "tp_pcts"
+    values = list(params.pop(split_key))
+    workers = min(workers or os.cpu_count() or 1, len(values))
+    combos = len(values) * (
+        len(params["slices"]) if kind == "twap" else len(params["stop_pcts"]) * len(params["horizons"])
+    )
+    logger.info(f"Running {kind} sweep: {combos} combinations over {len(klines)} bars on {workers} worker(s)")
+
+    if workers <= 1:
+        fn = sweep_twap if kind == "twap" else sweep_oco
+        return fn(klines, **{split_key: values}, **params)
+
+    tasks = [(kind, {split_key: part, **params}) for part in _split(values, workers)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(klines.path,)) as pool:
+        return list(itertools.chain.from_iterable(pool.map(_run_part, tasks)))
+
+def best(results: List[Dict[str, Any]], key: str, top: int = 10, reverse: bool = False) -> List[Dict[str, Any]]:
+    """Top results by `key` (ascending unless reverse, e.g. lowest mean_bps or highest mean_return)."""
+    return sorted(results, key=lambda r: r[key], reverse=reverse)[:top]
@@ -1,72 +1,238 @@
 import argparse
+import os
 import sys
 import json
-from .orders.market_orders import place_market_order
-from .orders.limit_orders import place_limit_order
-from .orders.binance_client import BinanceClient
-from .logger import get_logger
 
-logger = get_logger(__name__)
+# Order modules (and through them config, logging and the connector) are
+# imported only once a command actually runs, so `--help` and commands
+# forwarded to the daemon start in milliseconds.
 
-def main():
+def _logger():
+    from .logger import get_logger
+    return get_logger(__name__)
+
+def build_parser() -> argparse.ArgumentParser:
     # Parent parser for shared arguments
     parent_parser = argparse.ArgumentParser(add_help=False)
     parent_parser.add_argument("--dry-run", action="store_true", help="Force dry-run mode (no real trades)")
+    parent_parser.add_argument("--metrics", action="store_true", help="Print per-stage latency histograms and counters after the command")
+    parent_parser.add_argument("--daemon", action="store_true", help="Run the command in the background daemon (also enabled by BOT_DAEMON=true)")
+    # Subcommands accept the same flags but must not reset ones given before the subcommand
+    sub_parent = argparse.ArgumentParser(add_help=False)
+    for action in parent_parser._actions:
+        sub_parent.add_argument(*action.option_strings, action="store_true", default=argparse.SUPPRESS, help=action.help)
 
     parser = argparse.ArgumentParser(description="Tushar Binance Bot CLI", parents=[parent_parser])
     
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Market Order Parser
-    market_parser = subparsers.add_parser("market", help="Place a Market Order", parents=[parent_parser])
+    market_parser = subparsers.add_parser("market", help="Place a Market Order", parents=[sub_parent])
     market_parser.add_argument("symbol", type=str, help="Trading symbol (e.g. BTCUSDT)")
     market_parser.add_argument("side", type=str, choices=["BUY", "SELL"], help="Order side (BUY/SELL)")
     market_parser.add_argument("quantity", type=float, help="Order quantity")
 
     # Limit Order Parser
-    limit_parser = subparsers.add_parser("limit", help="Place a Limit Order", parents=[parent_parser])
+    limit_parser = subparsers.add_parser("limit", help="Place a Limit Order", parents=[sub_parent])
     limit_parser.add_argument("symbol", type=str, help="Trading symbol (e.g. BTCUSDT)")
     limit_parser.add_argument("side", type=str, choices=["BUY", "SELL"], help="Order side (BUY/SELL)")
     limit_parser.add_argument("quantity", type=float, help="Order quantity")
-    limit_parser.add_argument("price", type=float, help="Limit price")
+    limit_parser.add_argument("price", type=float, nargs="?", help="Limit price (with --peg: optional worst price the order may be moved to)")
+    limit_parser.add_argument("--peg", type=str, choices=["best", "mid"], default=None, help="Keep the order pegged to the best bid/ask or the mid, repricing as the book moves")
+    limit_parser.add_argument("--offset-ticks", type=int, default=0, help="Pegged: ticks behind the peg price (default 0)")
+    limit_parser.add_argument("--max-chase-ticks", type=int, default=None, help="Pegged: max ticks the order may move from its first price")
+    limit_parser.add_argument("--timeout", type=float, default=None, help="Pegged: seconds before an unfilled order is cancelled (default: wait for the fill)")
+
+    # Batch Order Parser
+    batch_parser = subparsers.add_parser("batch", help="Place many orders via batchOrders", parents=[sub_parent])
+    batch_source = batch_parser.add_mutually_exclusive_group(required=True)
+    batch_source.add_argument("--file", type=str, help="CSV (symbol,side,type,quantity,price) or JSONL file of orders")
+    batch_source.add_argument("--orders", type=str, help="JSON list of orders")
+    batch_parser.add_argument("--workers", type=int, default=8, help="Concurrent batch requests (default 8)")
+
+    # Kill switch
+    panic_parser = subparsers.add_parser("panic", help="Kill switch: cancel every open order on every symbol and account", parents=[sub_parent])
+    panic_parser.add_argument("--flatten", action="store_true", help="Also close every position with reduce-only market orders")
+    panic_parser.add_argument("--workers", type=int, default=None, help="Requests in flight at once (default KILL_SWITCH_WORKERS)")
+
+    # Backtest Parser (offline, never touches the exchange)
+    backtest_parser = subparsers.add_parser("backtest", help="Sweep TWAP/OCO parameters over historical klines")
+    backtest_parser.add_argument("strategy", type=str, choices=["twap", "oco"], help="Strategy to evaluate")
+    backtest_parser.add_argument("--data", type=str, default="fixtures/klines_BTCUSDT_1m.csv", help="Kline CSV or cache directory")
+    backtest_parser.add_argument("--side", type=str, choices=["BUY", "SELL"], help="TWAP side, or OCO exit side (default BUY / SELL)")
+    backtest_parser.add_argument("--slices", type=str, default="2,4,8,16", help="TWAP slice counts (comma-separated)")
+    backtest_parser.add_argument("--intervals", type=str, default="60,300,900", help="TWAP intervals in seconds (comma-separated)")
+    backtest_parser.add_argument("--tp", type=str, default="0.002,0.005,0.01", help="OCO take-profit distances as fractions")
+    backtest_parser.add_argument("--stop", type=str, default="0.002,0.005,0.01", help="OCO stop distances as fractions")
+    backtest_parser.add_argument("--horizons", type=str, default="60,240", help="OCO holding horizons in bars")
+    backtest_parser.add_argument("--entry-every", type=int, default=1, help="Start a run every N bars")
+    backtest_parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    backtest_parser.add_argument("--top", type=int, default=10, help="Number of results to print")
+
+    # Download Parser (public market data into the column store)
+    download_parser = subparsers.add_parser("download", help="Download klines or aggregate trades into the local column store")
+    download_parser.add_argument("symbols", type=str, help="Symbols (comma-separated, e.g. BTCUSDT,ETHUSDT)")
+    download_parser.add_argument("--kind", type=str, choices=["klines", "aggTrades"], default="klines", help="Dataset (default klines)")
+    download_parser.add_argument("--interval", type=str, default="1m", help="Kline interval (default 1m)")
+    download_parser.add_argument("--start", type=str, default=None, help="Start (ISO date or epoch ms); needed only for symbols with no data yet")
+    download_parser.add_argument("--end", type=str, default=None, help="End, exclusive (default: now)")
+    download_parser.add_argument("--dir", type=str, default="data", help="Data directory (default: data)")
+    download_parser.add_argument("--workers", type=int, default=4, help="Symbols downloaded at once (default 4)")
+    download_parser.add_argument("--codec", type=str, choices=["zlib", "raw"], default="zlib", help="Chunk codec for new datasets")
+
+    return parser
+
+def execute(args, client) -> dict:
+    """Runs an order command with `client` and returns the response to print."""
+    if args.command == "market":
+        from .orders.market_orders import place_market_order
+        return place_market_order(
+            client=client,
+            symbol=args.symbol,
+            side=args.side,
+            quantity=args.quantity
+        )
+
+    if args.command == "limit" and getattr(args, "peg", None):
+        from .orders.advanced.peg import place_pegged_order
+        return place_pegged_order(
+            client,
+            symbol=args.symbol,
+            side=args.side,
+            quantity=args.quantity,
+            mode=args.peg,
+            offset_ticks=args.offset_ticks,
+            limit_price=args.price,
+            max_chase_ticks=args.max_chase_ticks,
+            timeout=args.timeout
+        )
+
+    if args.command == "limit":
+        if args.price is None:
+            raise ValueError("price is required unless --peg is given")
+        from .orders.limit_orders import place_limit_order
+        return place_limit_order(
+            client=client,
+            symbol=args.symbol,
+            side=args.side,
+            quantity=args.quantity,
+            price=args.price
+        )
 
-    args = parser.parse_args()
+    if args.command == "batch":
+        from .orders.batch_orders import place_batch_orders, load_orders_file
+        orders = load_orders_file(args.file) if args.file else json.loads(args.orders)
+        return place_batch_orders(client, orders, max_workers=args.workers)
+
+    if args.command == "panic":
+        from .orders.kill_switch import panic
+        from .orders.router import AccountRouter, load_accounts
+        if len(load_accounts(client.dry_run)) == 1:
+            # The one account is this client, whose risk engine already knows the open symbols
+            return panic(client, flatten=args.flatten, max_workers=args.workers)
+        router = AccountRouter.from_config(dry_run=client.dry_run)
+        try:
+            return panic(router, flatten=args.flatten, max_workers=args.workers)
+        finally:
+            router.close()
+
+    raise ValueError(f"Unknown command: {args.command}")
+
+def _use_daemon(args) -> bool:
+    return args.daemon or os.getenv("BOT_DAEMON", "").lower() in ("true", "1", "yes", "on")
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         sys.exit(1)
 
+    if args.command == "backtest":
+        run_backtest(args)
+        return
+
+    if args.command == "download":
+        run_download(args)
+        return
+
+    if _use_daemon(args):
+        from .daemon import send_command
+        try:
+            reply = send_command(vars(args))
+        except OSError as e:
+            print(f"Daemon not reachable ({e}); running in-process", file=sys.stderr)
+        else:
+            if reply.get("error"):
+                print(f"Error: {reply['error']}")
+                sys.exit(1)
+            if reply.get("response"):
+                print(json.dumps(reply["response"], indent=2))
+            if args.metrics:
+                print(json.dumps(reply.get("metrics"), indent=2))
+            return
+
     # Initialize Client
     try:
+        from .orders.binance_client import BinanceClient
+        from .metrics import METRICS
         # If --dry-run is present, pass True. Otherwise pass None to let config decide.
         dry_run_override = True if args.dry_run else None
         client = BinanceClient(dry_run=dry_run_override)
-        
-        response = None
-
-        if args.command == "market":
-            response = place_market_order(
-                client=client,
-                symbol=args.symbol,
-                side=args.side,
-                quantity=args.quantity
-            )
-            
-        elif args.command == "limit":
-            response = place_limit_order(
-                client=client,
-                symbol=args.symbol,
-                side=args.side,
-                quantity=args.quantity,
-                price=args.price
-            )
+
+        response = execute(args, client)
 
         # Output the result
         if response:
             print(json.dumps(response, indent=2))
+        if args.metrics:
+            print(json.dumps(METRICS.snapshot(), indent=2))
             
     except Exception as e:
-        logger.error(f"Command failed: {e}")
+        _logger().error(f"Command failed: {e}")
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def run_backtest(args):
+    from .backtest.sweep import run_sweep, best
+
+    def floats(value):
+        return [float(v) for v in value.split(",") if v.strip()]
+
+    try:
+        if args.strategy == "twap":
+            results = run_sweep(
+                args.data, "twap", workers=args.workers,
+                slices=[int(v) for v in floats(args.slices)], intervals=floats(args.intervals),
+                side=args.side or "BUY", entry_every=args.entry_every
+            )
+            top = best(results, "mean_bps", args.top)
+        else:
+            results = run_sweep(
+                args.data, "oco", workers=args.workers,
+                tp_pcts=floats(args.tp), stop_pcts=floats(args.stop), horizons=[int(v) for v in floats(args.horizons)],
+                side=args.side or "SELL", entry_every=args.entry_every
+            )
+            top = best(results, "mean_return", args.top, reverse=True)
+        print(json.dumps(top, indent=2))
+    except Exception as e:
+        _logger().error(f"Backtest failed: {e}")
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def run_download(args):
+    from .backtest.download import HistoryDownloader
+
+    try:
+        downloader = HistoryDownloader(args.dir, workers=args.workers, codec=args.codec)
+        symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+        results = downloader.download(symbols, kind=args.kind, start=args.start, end=args.end, interval=args.interval)
+        print(json.dumps(results, indent=2))
+        if any("error" in r for r in results.values()):
+            sys.exit(1)
+    except Exception as e:
+        _logger().error(f"Download failed: {e}")
         print(f"Error: {e}")
         sys.exit(1)
 
@@ -2,11 +2,18 @@ import os
 from dataclasses import dataclass
 from typing import Optional
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+_dotenv_loaded = False
+
+def _load_dotenv() -> None:
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    _dotenv_loaded = True
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
 
 @dataclass
 class BotConfig:
@@ -16,8 +23,44 @@ class BotConfig:
     BOT_LOGFILE: str
     DEFAULT_SYMBOL: str
     DEFAULT_QUANTITY: float
+    BINANCE_BASE_URL: str = "https://fapi.binance.com"
+    BINANCE_ACCOUNTS: str = ""
+    HTTP_POOL_SIZE: int = 20
+    BINANCE_WS_URL: str = "wss://fstream.binance.com"
+    EXCHANGE_INFO_CACHE: str = ".exchange_info.json"
+    EXCHANGE_INFO_TTL: float = 3600.0
+    RATE_LIMIT_SAFETY: float = 0.9
+    RATE_LIMIT_SHARED_FILE: str = ""
+    API_READ_CACHE_TTL: float = 0.5
+    ACCOUNT_STATE_TTL: float = 300.0
+    BOT_LOG_MODE: str = "queue"
+    BOT_LOG_FORMAT: str = "text"
+    BOT_LOG_QUEUE_SIZE: int = 10000
+    BOT_LOG_OVERFLOW: str = "drop"
+    ORDER_JOURNAL: str = ".order_journal.jsonl"
+    ORDER_JOURNAL_FSYNC: bool = True
+    HTTP_TIMEOUT: float = 10.0
+    ORDER_RETRY_ATTEMPTS: int = 3
+    ORDER_RETRY_BASE_DELAY: float = 0.2
+    ORDER_RETRY_MAX_DELAY: float = 2.0
+    ORDER_HEDGE_URL: str = ""
+    ORDER_HEDGE_AFTER: Optional[float] = 0.5
+    RISK_MAX_POSITION: float = 0.0
+    RISK_MAX_NOTIONAL: float = 0.0
+    RISK_MAX_OPEN_ORDERS: int = 0
+    RISK_PRICE_BAND: float = 0.0
+    RISK_MAX_ORDER_RATE: float = 0.0
+    API_EVENT_INTERVAL: float = 0.25
+    API_EVENT_MAX_PENDING: int = 500
+    PEG_MIN_INTERVAL: float = 0.5
+    PEG_THRESHOLD_TICKS: int = 1
+    VWAP_PROFILE_DAYS: int = 10
+    KLINE_CACHE_DIR: str = ""
+    KILL_SWITCH_WORKERS: int = 64
+    ORDER_FAST_PATH: bool = True
 
 def load_config() -> BotConfig:
+    _load_dotenv()
     dry_run_str = os.getenv("DRY_RUN", "true").lower()
     dry_run = dry_run_str in ("true", "1", "yes", "on")
 
@@ -36,13 +79,179 @@ def load_config() -> BotConfig:
     except ValueError:
         raise ValueError("DEFAULT_QUANTITY must be a positive float.")
 
+    try:
+        pool_size = int(os.getenv("HTTP_POOL_SIZE", "20"))
+        if pool_size <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("HTTP_POOL_SIZE must be a positive integer.")
+
+    try:
+        exchange_info_ttl = float(os.getenv("EXCHANGE_INFO_TTL", "3600"))
+    except ValueError:
+        raise ValueError("EXCHANGE_INFO_TTL must be a number of seconds.")
+
+    try:
+        rate_limit_safety = float(os.getenv("RATE_LIMIT_SAFETY", "0.9"))
+        if not 0 < rate_limit_safety <= 1:
+            raise ValueError
+    except ValueError:
+        raise ValueError("RATE_LIMIT_SAFETY must be a fraction in (0, 1].")
+
+    try:
+        api_read_cache_ttl = float(os.getenv("API_READ_CACHE_TTL", "0.5"))
+        if api_read_cache_ttl < 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("API_READ_CACHE_TTL must be a non-negative number of seconds.")
+
+    try:
+        account_state_ttl = float(os.getenv("ACCOUNT_STATE_TTL", "300"))
+        if account_state_ttl <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("ACCOUNT_STATE_TTL must be a positive number of seconds.")
+
+    log_mode = os.getenv("BOT_LOG_MODE", "queue").lower()
+    if log_mode not in ("queue", "sync"):
+        raise ValueError("BOT_LOG_MODE must be 'queue' or 'sync'.")
+    log_format = os.getenv("BOT_LOG_FORMAT", "text").lower()
+    if log_format not in ("text", "json"):
+        raise ValueError("BOT_LOG_FORMAT must be 'text' or 'json'.")
+    log_overflow = os.getenv("BOT_LOG_OVERFLOW", "drop").lower()
+    if log_overflow not in ("drop", "block"):
+        raise ValueError("BOT_LOG_OVERFLOW must be 'drop' or 'block'.")
+    try:
+        log_queue_size = int(os.getenv("BOT_LOG_QUEUE_SIZE", "10000"))
+        if log_queue_size <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("BOT_LOG_QUEUE_SIZE must be a positive integer.")
+
+    try:
+        http_timeout = float(os.getenv("HTTP_TIMEOUT", "10"))
+        if http_timeout <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("HTTP_TIMEOUT must be a positive number of seconds.")
+
+    try:
+        retry_attempts = int(os.getenv("ORDER_RETRY_ATTEMPTS", "3"))
+        if retry_attempts <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("ORDER_RETRY_ATTEMPTS must be a positive integer.")
+
+    try:
+        retry_base_delay = float(os.getenv("ORDER_RETRY_BASE_DELAY", "0.2"))
+        retry_max_delay = float(os.getenv("ORDER_RETRY_MAX_DELAY", "2"))
+        if retry_base_delay < 0 or retry_max_delay < retry_base_delay:
+            raise ValueError
+    except ValueError:
+        raise ValueError("ORDER_RETRY_BASE_DELAY and ORDER_RETRY_MAX_DELAY must be seconds with base <= max.")
+
+    try:
+        hedge_after_str = os.getenv("ORDER_HEDGE_AFTER", "0.5")
+        hedge_after = float(hedge_after_str) if hedge_after_str else None
+        if hedge_after is not None and hedge_after <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("ORDER_HEDGE_AFTER must be a positive number of seconds.")
+
+    # Pre-trade risk limits; 0 disables a limit
+    try:
+        risk_max_position = float(os.getenv("RISK_MAX_POSITION", "0"))
+        risk_max_notional = float(os.getenv("RISK_MAX_NOTIONAL", "0"))
+        risk_max_open_orders = int(os.getenv("RISK_MAX_OPEN_ORDERS", "0"))
+        risk_price_band = float(os.getenv("RISK_PRICE_BAND", "0"))
+        risk_max_order_rate = float(os.getenv("RISK_MAX_ORDER_RATE", "0"))
+        if min(risk_max_position, risk_max_notional, risk_max_open_orders, risk_price_band, risk_max_order_rate) < 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("RISK_* limits must be non-negative numbers (0 disables a limit).")
+
+    try:
+        api_event_interval = float(os.getenv("API_EVENT_INTERVAL", "0.25"))
+        api_event_max_pending = int(os.getenv("API_EVENT_MAX_PENDING", "500"))
+        if api_event_interval < 0 or api_event_max_pending <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("API_EVENT_INTERVAL must be non-negative seconds and API_EVENT_MAX_PENDING a positive integer.")
+
+    try:
+        peg_min_interval = float(os.getenv("PEG_MIN_INTERVAL", "0.5"))
+        peg_threshold_ticks = int(os.getenv("PEG_THRESHOLD_TICKS", "1"))
+        if peg_min_interval < 0 or peg_threshold_ticks <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("PEG_MIN_INTERVAL must be non-negative seconds and PEG_THRESHOLD_TICKS a positive integer.")
+
+    try:
+        vwap_profile_days = int(os.getenv("VWAP_PROFILE_DAYS", "10"))
+        if vwap_profile_days <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("VWAP_PROFILE_DAYS must be a positive integer.")
+
+    try:
+        kill_switch_workers = int(os.getenv("KILL_SWITCH_WORKERS", "64"))
+        if kill_switch_workers <= 0:
+            raise ValueError
+    except ValueError:
+        raise ValueError("KILL_SWITCH_WORKERS must be a positive integer.")
+
+    order_journal_fsync = os.getenv("ORDER_JOURNAL_FSYNC", "true").lower() in ("true", "1", "yes", "on")
+    order_fast_path = os.getenv("ORDER_FAST_PATH", "true").lower() in ("true", "1", "yes", "on")
+
     return BotConfig(
         BINANCE_API_KEY=api_key,
         BINANCE_API_SECRET=api_secret,
         DRY_RUN=dry_run,
         BOT_LOGFILE=os.getenv("BOT_LOGFILE", "bot.log"),
         DEFAULT_SYMBOL=os.getenv("DEFAULT_SYMBOL", "BTCUSDT"),
-        DEFAULT_QUANTITY=default_quantity
+        DEFAULT_QUANTITY=default_quantity,
+        BINANCE_BASE_URL=os.getenv("BINANCE_BASE_URL", "https://fapi.binance.com"),
+        BINANCE_ACCOUNTS=os.getenv("BINANCE_ACCOUNTS", ""),
+        HTTP_POOL_SIZE=pool_size,
+        BINANCE_WS_URL=os.getenv("BINANCE_WS_URL", "wss://fstream.binance.com"),
+        EXCHANGE_INFO_CACHE=os.getenv("EXCHANGE_INFO_CACHE", ".exchange_info.json"),
+        EXCHANGE_INFO_TTL=exchange_info_ttl,
+        KLINE_CACHE_DIR=os.getenv("KLINE_CACHE_DIR", ""),
+        RATE_LIMIT_SAFETY=rate_limit_safety,
+        RATE_LIMIT_SHARED_FILE=os.getenv("RATE_LIMIT_SHARED_FILE", ""),
+        API_READ_CACHE_TTL=api_read_cache_ttl,
+        ACCOUNT_STATE_TTL=account_state_ttl,
+        BOT_LOG_MODE=log_mode,
+        BOT_LOG_FORMAT=log_format,
+        BOT_LOG_QUEUE_SIZE=log_queue_size,
+        BOT_LOG_OVERFLOW=log_overflow,
+        ORDER_JOURNAL=os.getenv("ORDER_JOURNAL", ".order_journal.jsonl"),
+        ORDER_JOURNAL_FSYNC=order_journal_fsync,
+        HTTP_TIMEOUT=http_timeout,
+        ORDER_RETRY_ATTEMPTS=retry_attempts,
+        ORDER_RETRY_BASE_DELAY=retry_base_delay,
+        ORDER_RETRY_MAX_DELAY=retry_max_delay,
+        ORDER_HEDGE_URL=os.getenv("ORDER_HEDGE_URL", ""),
+        ORDER_HEDGE_AFTER=hedge_after,
+        RISK_MAX_POSITION=risk_max_position,
+        RISK_MAX_NOTIONAL=risk_max_notional,
+        RISK_MAX_OPEN_ORDERS=risk_max_open_orders,
+        RISK_PRICE_BAND=risk_price_band,
+        RISK_MAX_ORDER_RATE=risk_max_order_rate,
+        API_EVENT_INTERVAL=api_event_interval,
+        API_EVENT_MAX_PENDING=api_event_max_pending,
+        PEG_MIN_INTERVAL=peg_min_interval,
+        PEG_THRESHOLD_TICKS=peg_threshold_ticks,
+        VWAP_PROFILE_DAYS=vwap_profile_days,
+        KILL_SWITCH_WORKERS=kill_switch_workers,
+        ORDER_FAST_PATH=order_fast_path
     )
 
-CONFIG: BotConfig = load_config()
+def __getattr__(name: str):
+    # CONFIG is built on first access (reading .env and validating the
+    # environment), so importing this module - e.g. for `--help` - costs nothing
+    if name == "CONFIG":
+        config = load_config()
+        globals()["CONFIG"] = config
+        return config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
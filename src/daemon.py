@@ -0,0 +1,164 @@
+"""
+Warm background process for the CLI.
+
+`python -m src.daemon` loads config, logging and the exchange connector once
+and listens on a Unix socket. `python -m src.cli --daemon ...` (or any CLI
+call with BOT_DAEMON=true) parses its arguments locally, sends them here and
+prints the reply, so each call skips interpreter-level imports and client
+construction.
+
+Protocol: one JSON object per connection in each direction, newline-terminated.
+Requests are the CLI's parsed arguments ({"command": "market", ...}) or
+{"command": "ping"} / {"command": "shutdown"}; replies carry "response",
+"metrics" or "error".
+
+Usage:
+    python -m src.daemon [start|stop|status] [--socket PATH]
+"""
+import json
+import os
+import socket
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+def default_socket_path() -> str:
+    path = os.getenv("BOT_DAEMON_SOCKET")
+    if path:
+        return path
+    return os.path.join(os.getenv("XDG_RUNTIME_DIR") or "/tmp", f"binance-bot-{os.getuid()}.sock")
+
+def send_command(request: Dict[str, Any], path: Optional[str] = None, timeout: float = 60.0) -> Dict[str, Any]:
+    """
+    Sends one request to the daemon and returns its reply.
+
+    Raises:
+        OSError: If no daemon is listening on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path or default_socket_path())
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as reply:
+            line = reply.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection without replying")
+    return json.loads(line)
+
+class BotDaemon:
+    """
+    Serves CLI commands from one long-lived process.
+
+    Clients are built once per dry-run setting and reused, so rate-limit
+    state, exchange info, the account cache and the connector's keep-alive
+    session stay warm between calls.
+
+    Args:
+        path: Unix socket path (created with mode 0600).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        from .logger import get_logger
+        self.logger = get_logger(__name__)
+        self.path = path or default_socket_path()
+        self.server = None
+        self._clients: Dict[bool, Any] = {}
+        self._lock = threading.Lock()
+
+    def client(self, dry_run: bool):
+        with self._lock:
+            client = self._clients.get(dry_run)
+            if client is None:
+                from .orders.binance_client import BinanceClient
+                client = BinanceClient(dry_run=True if dry_run else None)
+                self._clients[dry_run] = client
+            return client
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        import argparse
+        from .cli import execute
+        from .metrics import METRICS
+
+        command = request.get("command")
+        if command == "ping":
+            return {"response": {"status": "ok", "pid": os.getpid()}}
+        if command == "shutdown":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"response": {"status": "stopping"}}
+
+        args = argparse.Namespace(**request)
+        try:
+            reply = {"response": execute(args, self.client(bool(args.dry_run)))}
+        except Exception as e:
+            self.logger.error(f"Daemon command failed: {e}")
+            return {"error": str(e)}
+        if request.get("metrics"):
+            reply["metrics"] = METRICS.snapshot()
+        return reply
+
+    def serve_forever(self) -> None:
+        import socketserver
+
+        if os.path.exists(self.path):
+            try:
+                send_command({"command": "ping"}, self.path, timeout=1.0)
+            except OSError:
+                os.unlink(self.path)  # stale socket from a previous run
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    reply = daemon.handle(json.loads(line))
+                except ValueError as e:
+                    reply = {"error": f"Bad request: {e}"}
+                self.wfile.write(json.dumps(reply, default=str).encode() + b"\n")
+
+        # Preload what every command needs before accepting connections
+        self.client(True)
+        old_umask = os.umask(0o177)
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon_threads = True
+        self.logger.info(f"Daemon listening on {self.path} (pid {os.getpid()})")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self.logger.info("Daemon stopped")
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Background daemon for the bot CLI")
+    parser.add_argument("action", nargs="?", choices=["start", "stop", "status"], default="start")
+    parser.add_argument("--socket", type=str, default=None, help="Unix socket path (default: BOT_DAEMON_SOCKET or a per-user path)")
+    args = parser.parse_args(argv)
+    path = args.socket or default_socket_path()
+
+    if args.action == "start":
+        try:
+            BotDaemon(path).serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    try:
+        reply = send_command({"command": "shutdown" if args.action == "stop" else "ping"}, path, timeout=5.0)
+    except OSError:
+        print(f"No daemon listening on {path}")
+        sys.exit(1)
+    print(json.dumps(reply["response"]))
+
+if __name__ == "__main__":
+    main()
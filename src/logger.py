@@ -1,51 +1,219 @@
+import atexit
+import json
 import logging
+import queue
 import sys
 import os
-from typing import Optional
-from logging.handlers import RotatingFileHandler
+import threading
+from typing import Any, Dict, List, Optional
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # Default log format
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Attributes every LogRecord has; anything else was passed via `extra=` and goes into JSON output
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, plus exc and any `extra=` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+_IMMUTABLE = (str, int, float, bool, bytes, type(None))
+
+def _immutable(args: Any) -> bool:
+    """True when `args` (a log call's arguments) cannot change after the call."""
+    if isinstance(args, _IMMUTABLE):
+        return True
+    if isinstance(args, tuple):
+        return all(_immutable(a) for a in args)
+    return False
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to a background QueueListener without formatting them.
+
+    The queue is bounded. When it is full, records below ERROR are dropped
+    (and counted) under the "drop" policy, or the caller waits for room under
+    the "block" policy. ERROR and above always wait rather than being lost.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop"):
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting (msg % args, tracebacks) happens on the listener thread,
+        # unless an argument could change before then: a dict or list passed
+        # to the log call is rendered now, as it was when the call was made
+        if record.args and not _immutable(record.args):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block" or record.levelno >= logging.ERROR:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+# Queue handlers (and their listeners) per log file, shared by every logger in the process
+_queue_handlers: Dict[str, BoundedQueueHandler] = {}
+_listeners: Dict[str, QueueListener] = {}
+_queue_lock = threading.Lock()
+
+# Extra handlers fed every record (e.g. the dashboard event bus), and the
+# loggers that write directly (BOT_LOG_MODE=sync) so they can be attached late
+_extra_handlers: List[logging.Handler] = []
+_sync_loggers: List[logging.Logger] = []
+
+def _make_formatter() -> logging.Formatter:
+    if os.getenv("BOT_LOG_FORMAT", "text").lower() == "json":
+        return JsonFormatter()
+    return logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+def _make_file_handler(logfile: str, formatter: logging.Formatter) -> logging.Handler:
+    file_handler = RotatingFileHandler(
+        logfile,
+        maxBytes=5 * 1024 * 1024,  # 5 MB
+        backupCount=5,
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(formatter)
+    return file_handler
+
+def _get_queue_handler(logfile: str) -> BoundedQueueHandler:
+    """Returns the queue handler for `logfile`, starting its listener on first use."""
+    with _queue_lock:
+        handler = _queue_handlers.get(logfile)
+        if handler is not None:
+            return handler
+
+        formatter = _make_formatter()
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        file_handler = _make_file_handler(logfile, formatter)
+
+        log_queue = queue.Queue(maxsize=int(os.getenv("BOT_LOG_QUEUE_SIZE", "10000")))
+        handler = BoundedQueueHandler(log_queue, os.getenv("BOT_LOG_OVERFLOW", "drop").lower())
+        listener = QueueListener(log_queue, console_handler, file_handler, *_extra_handlers, respect_handler_level=True)
+        listener.start()
+        _queue_handlers[logfile] = handler
+        _listeners[logfile] = listener
+        return handler
+
+def add_log_handler(handler: logging.Handler) -> None:
+    """
+    Feeds every bot log record to `handler` as well, for current and future loggers.
+
+    In queue mode the handler runs on the background writer thread, so it
+    never slows down the code that logs.
+    """
+    with _queue_lock:
+        if handler in _extra_handlers:
+            return
+        _extra_handlers.append(handler)
+        for listener in _listeners.values():
+            listener.handlers = listener.handlers + (handler,)
+        for logger in _sync_loggers:
+            logger.addHandler(handler)
+
+def remove_log_handler(handler: logging.Handler) -> None:
+    with _queue_lock:
+        if handler not in _extra_handlers:
+            return
+        _extra_handlers.remove(handler)
+        for listener in _listeners.values():
+            listener.handlers = tuple(h for h in listener.handlers if h is not handler)
+        for logger in _sync_loggers:
+            logger.removeHandler(handler)
+
+def flush_logging() -> None:
+    """Blocks until every record queued so far has been written."""
+    with _queue_lock:
+        handlers = list(_queue_handlers.values())
+    for handler in handlers:
+        handler.queue.join()
+
+def shutdown_logging() -> None:
+    """Flushes queued records and stops the background writers (runs at interpreter exit)."""
+    with _queue_lock:
+        for listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+        _queue_handlers.clear()
+
+atexit.register(shutdown_logging)
+
+def get_log_stats() -> Dict[str, Dict[str, int]]:
+    """Queue depth and dropped-record counts per log file (queue mode only)."""
+    with _queue_lock:
+        return {
+            logfile: {"queued": handler.queue.qsize(), "dropped": handler.dropped}
+            for logfile, handler in _queue_handlers.items()
+        }
+
 def get_logger(name: str, logfile: Optional[str] = None, level: int = logging.INFO) -> logging.Logger:
     """
     Returns a configured logger with rotating file handler and console handler.
-    
+
+    With BOT_LOG_MODE=queue (the default) the logger only enqueues records; one
+    background listener per log file formats them and does the console and file
+    I/O. BOT_LOG_MODE=sync attaches the handlers directly to the logger.
+
     Args:
         name: Name of the logger.
         logfile: Path to the log file. If None, uses environment variable or default.
         level: Logging level.
-        
+
     Returns:
         Configured logging.Logger instance.
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
     logger.propagate = False
-    
+
     # Avoid adding duplicate handlers
     if logger.handlers:
         return logger
-        
-    formatter = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
-    
+
+    # File Handler
+    if logfile is None:
+        logfile = os.getenv("BOT_LOGFILE", "bot.log")
+
+    if os.getenv("BOT_LOG_MODE", "queue").lower() == "queue":
+        logger.addHandler(_get_queue_handler(logfile))
+        return logger
+
+    formatter = _make_formatter()
+
     # Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
-    
-    # File Handler
-    if logfile is None:
-        logfile = os.getenv("BOT_LOGFILE", "bot.log")
-        
-    file_handler = RotatingFileHandler(
-        logfile,
-        maxBytes=5 * 1024 * 1024,  # 5 MB
-        backupCount=5,
-        encoding="utf-8"
-    )
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
+
+    logger.addHandler(_make_file_handler(logfile, formatter))
+
+    with _queue_lock:
+        for handler in _extra_handlers:
+            logger.addHandler(handler)
+        _sync_loggers.append(logger)
+
     return logger
@@ -0,0 +1,223 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Sub-bucket resolution: 2**(SUB_BUCKET_BITS - 1) buckets per power of two (~3% relative error)
+SUB_BUCKET_BITS = 6
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _bucket_index(value: int) -> int:
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    if shift <= 0:
+        return value
+    return shift * _HALF + (value >> shift)
+
+def _bucket_value(index: int) -> int:
+    """Upper bound of the values that land in bucket `index`."""
+    shift = max(0, (index >> (SUB_BUCKET_BITS - 1)) - 1)
+    return ((index - shift * _HALF + 1) << shift) - 1
+
+class Histogram:
+    """
+    HDR-style log-linear histogram of integer values (we record microseconds).
+
+    Values are counted in buckets that are exact below 2**SUB_BUCKET_BITS and
+    then keep a fixed relative precision, so recording is an index computation
+    plus an increment, and percentiles need no stored samples.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (64 * _HALF)
+        self.count = 0
+        self.total = 0
+        self.min = float("inf")
+        self.max = 0
+        self._lock = threading.Lock()
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        index = value if shift <= 0 else shift * _HALF + (value >> shift)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+            if value < self.min:
+                self.min = value
+
+    def percentile(self, pct: float) -> int:
+        """Value at or below which `pct` percent of recordings fall (bucket upper bound)."""
+        with self._lock:
+            if not self.count:
+                return 0
+            target = max(1, int(self.count * pct / 100.0 + 0.5))
+            seen = 0
+            for index, n in enumerate(self.counts):
+                if n:
+                    seen += n
+                    if seen >= target:
+                        return min(_bucket_value(index), self.max)
+            return self.max
+
+    def summary(self, percentiles: Iterable[float] = (50, 90, 99, 99.9)) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0,
+            "max": self.max,
+            **{f"p{p:g}": self.percentile(p) for p in percentiles}
+        }
+
+class _Span:
+    """Context manager returned by Registry.span (monotonic clock, microsecond resolution)."""
+
+    __slots__ = ("registry", "name", "labels", "start")
+
+    def __init__(self, registry: "Registry", name: str, labels: Dict[str, Any]):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = (time.perf_counter_ns() - self.start) // 1000
+        self.registry.histogram(self.name, **self.labels).record(elapsed)
+        if exc_type is not None:
+            self.registry.inc(f"{self.name}_errors", error=exc_type.__name__, **self.labels)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+_NULL_SPAN = _NullSpan()
+
+class Registry:
+    """
+    Process-wide latency histograms (microseconds) and counters, keyed by name
+    and labels (stage, symbol, endpoint, ...).
+
+    Args:
+        enabled: When False, spans and records are no-ops.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self.counters: Dict[Tuple[str, LabelKey], int] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        # Labels are keyed in call order; call sites pass them consistently
+        key = (name, tuple(labels.items()))
+        hist = self.histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(key, Histogram())
+        return hist
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Records a duration measured by the caller."""
+        if self.enabled:
+            hist = self.histograms.get((name, tuple(labels.items())))
+            if hist is None:
+                hist = self.histogram(name, **labels)
+            hist.record(int(seconds * 1e6))
+
+    def span(self, name: str, **labels):
+        """Times the enclosed block into histogram `name`; exceptions also count `<name>_errors`."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, labels)
+
+    def inc(self, name: str, value: int = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, tuple(labels.items()))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict view (used by the CLI dump and JSON endpoints)."""
+        with self._lock:
+            histograms = list(self.histograms.items())
+            counters = list(self.counters.items())
+        return {
+            "latency_us": [
+                {"name": name, "labels": {k: str(v) for k, v in labels}, **hist.summary()}
+                for (name, labels), hist in sorted(histograms, key=_sort_key)
+            ],
+            "counters": [
+                {"name": name, "labels": {k: str(v) for k, v in labels}, "value": value}
+                for (name, labels), value in sorted(counters, key=_sort_key)
+            ]
+        }
+
+    def render_prometheus(self, extra_gauges: Optional[Dict[str, float]] = None) -> str:
+        """
+        Prometheus text exposition format. Histograms are exported as summaries
+        (quantiles in seconds, plus _sum and _count); counters get a _total suffix.
+        """
+        with self._lock:
+            histograms = sorted(self.histograms.items(), key=_sort_key)
+            counters = sorted(self.counters.items(), key=_sort_key)
+
+        lines = []
+        typed = set()
+        for (name, labels), hist in histograms:
+            metric = f"bot_{name}_seconds"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            for q in (0.5, 0.9, 0.99, 0.999):
+                lines.append(f"{metric}{_labels(labels, quantile=q)} {hist.percentile(q * 100) / 1e6:.6f}")
+            lines.append(f"{metric}_sum{_labels(labels)} {hist.total / 1e6:.6f}")
+            lines.append(f"{metric}_count{_labels(labels)} {hist.count}")
+        for (name, labels), value in counters:
+            metric = f"bot_{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_labels(labels)} {value}")
+        for name, value in (extra_gauges or {}).items():
+            lines.append(f"# TYPE bot_{name} gauge")
+            lines.append(f"bot_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+def _sort_key(item) -> Tuple[str, str]:
+    name, labels = item[0]
+    return name, str(sorted((k, str(v)) for k, v in labels))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(labels: LabelKey, **extra) -> str:
+    pairs = sorted((k, str(v)) for k, v in labels) + [(k, str(v)) for k, v in extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+METRICS = Registry(enabled=os.getenv("METRICS_ENABLED", "true").lower() in ("true", "1", "yes", "on"))
+
+def get_metrics() -> Registry:
+    return METRICS
@@ -0,0 +1,189 @@
+import threading
+import time
+from typing import Any, Dict, Tuple
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+class AccountState:
+    """
+    In-memory account snapshot indexed by asset and symbol.
+
+    Loaded once from get_account(), then kept current by incremental updates
+    (user-data ACCOUNT_UPDATE / ORDER_TRADE_UPDATE events and order fills).
+    A full re-sync only happens when the TTL expires or drift is flagged, so
+    pre-trade checks are dictionary lookups instead of REST calls.
+
+    Args:
+        client: BinanceClient whose get_account() provides snapshots.
+        ttl: Seconds between forced re-syncs.
+        drift_tolerance: Absolute difference that counts as drift when a re-sync
+            is compared with the incrementally maintained state.
+    """
+
+    def __init__(self, client, ttl: float = 300.0, drift_tolerance: float = 1e-6):
+        self.client = client
+        self.ttl = ttl
+        self.drift_tolerance = drift_tolerance
+        # asset -> {"walletBalance", "availableBalance", "crossWalletBalance", "updateTime"}
+        self.balances: Dict[str, Dict[str, float]] = {}
+        # (symbol, positionSide) -> {"positionAmt", "entryPrice", "updateTime"}
+        self.positions: Dict[Tuple[str, str], Dict[str, float]] = {}
+        # orderId -> cumulative filled quantity already applied
+        self._applied_fills: Dict[Any, float] = {}
+        self.synced_at = 0.0
+        self.stale = True
+        self.syncs = 0
+        self.drift_events = 0
+        self._lock = threading.RLock()
+
+    def sync(self) -> None:
+        """Reloads the full account snapshot and reports drift from the incremental state."""
+        account = self.client.get_account()
+        balances = {
+            a["asset"]: {
+                "walletBalance": float(a.get("walletBalance", 0)),
+                "availableBalance": float(a.get("availableBalance", a.get("walletBalance", 0))),
+                "crossWalletBalance": float(a.get("crossWalletBalance", a.get("walletBalance", 0))),
+                "updateTime": a.get("updateTime", 0)
+            }
+            for a in account.get("assets", [])
+        }
+        positions = {
+            (p["symbol"], p.get("positionSide", "BOTH")): {
+                "positionAmt": float(p.get("positionAmt", 0)),
+                "entryPrice": float(p.get("entryPrice", 0)),
+                "updateTime": p.get("updateTime", 0)
+            }
+            for p in account.get("positions", [])
+        }
+
+        with self._lock:
+            if self.syncs:
+                self._check_drift(balances, positions)
+            self.balances = balances
+            self.positions = positions
+            self._applied_fills.clear()
+            self.synced_at = time.monotonic()
+            self.stale = False
+            self.syncs += 1
+        logger.debug(f"Account state synced: {len(balances)} assets, {len(positions)} positions")
+
+    def _check_drift(self, balances, positions) -> None:
+        for asset, fresh in balances.items():
+            cached = self.balances.get(asset)
+            if cached and abs(cached["walletBalance"] - fresh["walletBalance"]) > self.drift_tolerance:
+                self.drift_events += 1
+                logger.warning(f"Account drift on {asset}: cached {cached['walletBalance']} vs exchange {fresh['walletBalance']}")
+        for key, fresh in positions.items():
+            cached = self.positions.get(key)
+            if cached and abs(cached["positionAmt"] - fresh["positionAmt"]) > self.drift_tolerance:
+                self.drift_events += 1
+                logger.warning(f"Position drift on {key[0]}: cached {cached['positionAmt']} vs exchange {fresh['positionAmt']}")
+
+    def _ensure_fresh(self) -> None:
+        if self.stale or time.monotonic() - self.synced_at > self.ttl:
+            self.sync()
+
+    def mark_stale(self) -> None:
+        """Forces a re-sync on next access (e.g. after a user-data stream disconnect)."""
+        self.stale = True
+
+    def balance(self, asset: str = "USDT") -> float:
+        self._ensure_fresh()
+        entry = self.balances.get(asset)
+        return entry["walletBalance"] if entry else 0.0
+
+    def available(self, asset: str = "USDT") -> float:
+        self._ensure_fresh()
+        entry = self.balances.get(asset)
+        return entry["availableBalance"] if entry else 0.0
+
+    def position(self, symbol: str, position_side: str = "BOTH") -> float:
+        self._ensure_fresh()
+        entry = self.positions.get((symbol, position_side))
+        return entry["positionAmt"] if entry else 0.0
+
+    def apply_event(self, data: Dict[str, Any]) -> None:
+        """Applies a user-data stream event (register with UserDataStream.add_listener)."""
+        event = data.get("e")
+        if event == "ACCOUNT_UPDATE":
+            event_time = data.get("E", 0)
+            a = data.get("a", {})
+            with self._lock:
+                for b in a.get("B", []):
+                    entry = self.balances.setdefault(b["a"], {"availableBalance": 0.0})
+                    entry["walletBalance"] = float(b.get("wb", 0))
+                    entry["crossWalletBalance"] = float(b.get("cw", 0))
+                    entry["updateTime"] = event_time
+                for p in a.get("P", []):
+                    self.positions[(p["s"], p.get("ps", "BOTH"))] = {
+                        "positionAmt": float(p.get("pa", 0)),
+                        "entryPrice": float(p.get("ep", 0)),
+                        "updateTime": event_time
+                    }
+        elif event == "ORDER_TRADE_UPDATE":
+            o = data.get("o", {})
+            self.apply_fill(o.get("i"), o.get("s"), o.get("S"), float(o.get("z", 0)), float(o.get("ap", 0)), o.get("ps", "BOTH"), data.get("E", 0))
+        elif event == "listenKeyExpired":
+            self.mark_stale()
+
+    def apply_fill(
+        self,
+        order_id: Any,
+        symbol: str,
+        side: str,
+        cumulative_qty: float,
+        price: float,
+        position_side: str = "BOTH",
+        event_time: int = 0
+    ) -> None:
+        """
+        Applies an order's cumulative fill to the position, counting only the part
+        not seen before. Fills older than the position's last absolute update
+        (from ACCOUNT_UPDATE or a snapshot) are already reflected and ignored.
+        """
+        if not symbol or cumulative_qty <= 0:
+            return
+        with self._lock:
+            previous = self._applied_fills.get(order_id, 0.0)
+            delta = cumulative_qty - previous
+            if delta <= 0:
+                return
+            self._applied_fills[order_id] = cumulative_qty
+            key = (symbol, position_side)
+            entry = self.positions.setdefault(key, {"positionAmt": 0.0, "entryPrice": 0.0, "updateTime": 0})
+            if event_time and event_time <= entry["updateTime"]:
+                return
+            signed = delta if side == "BUY" else -delta
+            old_amt = entry["positionAmt"]
+            new_amt = old_amt + signed
+            if old_amt == 0 or (old_amt > 0) == (signed > 0):
+                # Opening or adding: volume-weighted entry price
+                total = abs(old_amt) + abs(signed)
+                entry["entryPrice"] = (entry["entryPrice"] * abs(old_amt) + price * abs(signed)) / total if total else 0.0
+            elif new_amt == 0 or (new_amt > 0) != (old_amt > 0):
+                entry["entryPrice"] = price if new_amt else 0.0
+            entry["positionAmt"] = new_amt
+            if event_time:
+                entry["updateTime"] = event_time
+
+    def apply_order_response(self, response: Dict[str, Any]) -> None:
+        """Applies the fill reported in a REST order response (RESULT responses carry executedQty)."""
+        executed = float(response.get("executedQty", 0) or 0)
+        if executed > 0:
+            self.apply_fill(
+                response.get("orderId"), response.get("symbol"), response.get("side"), executed,
+                float(response.get("avgPrice", 0) or response.get("price", 0) or 0),
+                response.get("positionSide", "BOTH"), response.get("updateTime", 0)
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "balances": {k: dict(v) for k, v in self.balances.items()},
+                "positions": {f"{s}:{ps}": dict(v) for (s, ps), v in self.positions.items() if v["positionAmt"]},
+                "synced_at": self.synced_at,
+                "syncs": self.syncs,
+                "drift_events": self.drift_events
+            }
@@ -1,9 +1,323 @@
-from typing import Dict, Any
-from ...utils.validation import validate_symbol, validate_quantity, validate_price
+import bisect
+import itertools
+import json
+import threading
+import time
+import uuid
+import weakref
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from ...utils.validation import validate_price
 from ...logger import get_logger
+from ..pipeline import Order, ValidateStage
+from ..risk import submit_with_risk
+from .parent import FINISHED_RETENTION
 
 logger = get_logger(__name__)
 
+# Checks shared with single orders, run on the take-profit leg
+_PARENT_CHECKS = ValidateStage(exchange_filters=False)
+
+class OcoPair:
+    """State of one client-side OCO: a resting take-profit limit and a locally watched stop."""
+
+    __slots__ = (
+        "oco_id", "symbol", "side", "quantity", "take_profit_price", "stop_price",
+        "stop_limit_price", "tp_order_id", "stop_order_id", "tp_executed", "status", "finished_at", "entries"
+    )
+
+    def __init__(self, symbol: str, side: str, quantity: float, take_profit_price: float, stop_price: float, stop_limit_price: float):
+        self.oco_id = f"oco-{uuid.uuid4().hex[:12]}"
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.take_profit_price = take_profit_price
+        self.stop_price = stop_price
+        self.stop_limit_price = stop_limit_price
+        self.tp_order_id = None
+        self.stop_order_id = None
+        # Take-profit quantity the exchange has reported filled; the stop only closes the rest
+        self.tp_executed = 0.0
+        self.status = "pending"
+        self.finished_at: Optional[float] = None
+        # Index entries owned by this pair, so both legs can be removed together
+        self.entries: List[Tuple[str, tuple]] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != "entries"}
+
+class _TriggerIndex:
+    """
+    Price-sorted trigger levels for one symbol.
+
+    `above` holds levels that fire when price >= level, `below` levels that
+    fire when price <= level. Both lists are sorted ascending, so a tick only
+    slices off the crossed prefix/suffix instead of scanning every open OCO.
+    """
+
+    __slots__ = ("above", "below")
+
+    def __init__(self):
+        self.above: List[tuple] = []
+        self.below: List[tuple] = []
+
+    def add(self, direction: str, entry: tuple) -> None:
+        bisect.insort(getattr(self, direction), entry)
+
+    def remove(self, direction: str, entry: tuple) -> None:
+        levels = getattr(self, direction)
+        i = bisect.bisect_left(levels, entry)
+        if i < len(levels) and levels[i] == entry:
+            del levels[i]
+
+    def pop_crossed(self, price: float) -> List[tuple]:
+        crossed = []
+        i = bisect.bisect_right(self.above, (price, float("inf")))
+        if i:
+            crossed.extend(self.above[:i])
+            del self.above[:i]
+        j = bisect.bisect_left(self.below, (price, -1))
+        if j < len(self.below):
+            crossed.extend(self.below[j:])
+            del self.below[j:]
+        return crossed
+
+    def __len__(self) -> int:
+        return len(self.above) + len(self.below)
+
+class OcoManager:
+    """
+    Client-side OCO engine.
+
+    submit() places the take-profit leg as a resting limit order and registers
+    two trigger levels. on_price() is fed from a price stream (or a replayed
+    tick file): when the stop level is crossed the take-profit is cancelled and
+    the stop-limit order is sent. Reaching the take-profit level only means the
+    limit may fill, so the stop stays armed until on_order_update() sees the
+    take-profit FILLED on the user-data stream.
+
+    Args:
+        client: Client the legs are sent through.
+        clock: Monotonic time source (finished pairs are dropped FINISHED_RETENTION seconds after they end).
+    """
+
+    def __init__(self, client, clock: Callable[[], float] = time.monotonic):
+        self.client = client
+        self.clock = clock
+        self.pairs: Dict[str, OcoPair] = {}
+        # Open take-profit orderId -> oco_id, for user-data stream fills
+        self._by_order: Dict[Any, str] = {}
+        self._index: Dict[str, _TriggerIndex] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def submit(self, symbol: str, side: str, quantity: float, take_profit_price: float, stop_price: float, stop_limit_price: float) -> OcoPair:
+        pair = OcoPair(symbol, side, quantity, take_profit_price, stop_price, stop_limit_price)
+        response = submit_with_risk(
+            self.client, symbol, side, quantity, take_profit_price,
+            lambda: self.client.create_limit_order(symbol, side, quantity, take_profit_price, reduce_only=True),
+            reduce_only=True
+        )
+        pair.tp_order_id = response.get("orderId")
+        pair.status = "open"
+
+        # SELL closes a long: TP sits above the market, stop below. BUY is the mirror image.
+        tp_dir, stop_dir = ("above", "below") if side == "SELL" else ("below", "above")
+        tp_entry = (take_profit_price, next(self._seq), pair.oco_id, "tp")
+        stop_entry = (stop_price, next(self._seq), pair.oco_id, "stop")
+        pair.entries = [(tp_dir, tp_entry), (stop_dir, stop_entry)]
+
+        with self._lock:
+            self._prune()
+            self.pairs[pair.oco_id] = pair
+            self._by_order[pair.tp_order_id] = pair.oco_id
+            index = self._index.setdefault(symbol, _TriggerIndex())
+            index.add(tp_dir, tp_entry)
+            index.add(stop_dir, stop_entry)
+
+        logger.info(f"OCO {pair.oco_id} open: {side} {quantity} {symbol} TP={take_profit_price} Stop={stop_price}")
+        return pair
+
+    def _prune(self) -> None:
+        """Drops pairs finished more than FINISHED_RETENTION seconds ago (caller holds _lock)."""
+        now = self.clock()
+        for oco_id, pair in list(self.pairs.items()):
+            if pair.finished_at is not None and now - pair.finished_at > FINISHED_RETENTION:
+                del self.pairs[oco_id]
+
+    def _finish(self, pair: OcoPair, status: str) -> None:
+        """Removes both legs of `pair` from the indexes and marks it done (caller holds _lock)."""
+        self._detach(pair)
+        pair.status = status
+        pair.finished_at = self.clock()
+
+    def _detach(self, pair: OcoPair) -> None:
+        index = self._index.get(pair.symbol)
+        if index is not None:
+            for direction, entry in pair.entries:
+                index.remove(direction, entry)
+        pair.entries = []
+        self._by_order.pop(pair.tp_order_id, None)
+
+    def cancel(self, oco_id: str) -> Dict[str, Any]:
+        with self._lock:
+            pair = self.pairs.get(oco_id)
+            if pair is None or pair.status != "open":
+                raise ValueError(f"No open OCO with id: {oco_id}")
+            self._finish(pair, "cancelled")
+        self.client.cancel_order(pair.symbol, order_id=pair.tp_order_id)
+        logger.info(f"OCO {oco_id} cancelled")
+        return pair.to_dict()
+
+    def disarm_all(self) -> int:
+        """
+        Drops the trigger levels of every open pair without touching the
+        exchange (the kill switch cancels the resting take-profits itself).
+
+        Returns:
+            Number of pairs disarmed.
+        """
+        with self._lock:
+            pairs = [p for p in self.pairs.values() if p.status == "open"]
+            for pair in pairs:
+                self._finish(pair, "cancelled")
+        return len(pairs)
+
+    def on_price(self, symbol: str, price: float) -> List[OcoPair]:
+        """Evaluates a price tick and fires every OCO whose level it crossed."""
+        index = self._index.get(symbol)
+        if index is None or not len(index):
+            return []
+
+        fired = []
+        reached = []
+        with self._lock:
+            for entry in index.pop_crossed(price):
+                _, _, oco_id, kind = entry
+                pair = self.pairs[oco_id]
+                if pair.status != "open":
+                    continue
+                if kind == "tp":
+                    # The limit is only marketable now; it has not necessarily filled
+                    pair.entries = [e for e in pair.entries if e[1] != entry]
+                    reached.append(pair)
+                    continue
+                self._finish(pair, "stop_triggered")
+                fired.append(pair)
+
+        for pair in reached:
+            logger.info(f"OCO {pair.oco_id} take-profit reached at {price}; stop stays armed until the fill is confirmed")
+        for pair in fired:
+            self._fire_stop(pair)
+        return fired
+
+    def on_order_update(self, order: Dict[str, Any]) -> Optional[OcoPair]:
+        """
+        Applies the "o" payload of an ORDER_TRADE_UPDATE event. A FILLED
+        take-profit closes its pair and drops the stop; partial fills shrink
+        what the stop will close.
+
+        Returns:
+            The pair the update belongs to, or None.
+        """
+        with self._lock:
+            oco_id = self._by_order.get(order.get("i"))
+            pair = self.pairs.get(oco_id) if oco_id else None
+            if pair is None or pair.status != "open":
+                return None
+            pair.tp_executed = float(order.get("z") or 0)
+            if order.get("X") != "FILLED":
+                return pair
+            self._finish(pair, "tp_filled")
+        logger.info(f"OCO {pair.oco_id} take-profit {pair.tp_order_id} filled; stop leg dropped")
+        return pair
+
+    def apply_event(self, data: Dict[str, Any]) -> None:
+        """Applies a stream event (register with UserDataStream.add_listener or a market-data FanOut)."""
+        event = data.get("e")
+        if event == "ORDER_TRADE_UPDATE":
+            self.on_order_update(data.get("o", {}))
+        elif event == "markPriceUpdate":
+            self.on_price(data["s"], float(data["p"]))
+        elif event == "bookTicker":
+            self.on_price(data["s"], (float(data["b"]) + float(data["a"])) / 2)
+
+    def _fire_stop(self, pair: OcoPair) -> None:
+        logger.info(f"OCO {pair.oco_id} stop hit; cancelling TP {pair.tp_order_id} and sending stop-limit @ {pair.stop_limit_price}")
+        try:
+            self.client.cancel_order(pair.symbol, order_id=pair.tp_order_id)
+        except Exception as e:
+            # The TP may have filled in the meantime; the stop leg must still go out
+            logger.error(f"OCO {pair.oco_id} failed to cancel TP: {e}")
+        quantity = pair.quantity - pair.tp_executed
+        try:
+            # Protective exit: exempt from the price band, order rate and open-order limits
+            response = submit_with_risk(
+                self.client, pair.symbol, pair.side, quantity, pair.stop_limit_price,
+                lambda: self.client.create_limit_order(pair.symbol, pair.side, quantity, pair.stop_limit_price, reduce_only=True),
+                reduce_only=True, protective=True
+            )
+            pair.stop_order_id = response.get("orderId")
+        except Exception as e:
+            pair.status = "failed"
+            logger.error(f"OCO {pair.oco_id} failed to send stop-limit: {e}")
+
+    def open_count(self, symbol: Optional[str] = None) -> int:
+        with self._lock:
+            return sum(1 for p in self.pairs.values() if p.status == "open" and (symbol is None or p.symbol == symbol))
+
+def replay_ticks(manager: OcoManager, path: str) -> int:
+    """
+    Feeds a recorded tick file into an OcoManager.
+
+    Accepts CSV lines "timestamp,symbol,price" (a header row is skipped) or
+    JSON lines with "s"/"symbol" and "p"/"price" keys.
+
+    Returns:
+        Number of ticks replayed.
+    """
+    count = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                tick = json.loads(line)
+                symbol = tick.get("s") or tick.get("symbol")
+                price = tick.get("p") or tick.get("price")
+            else:
+                parts = line.split(",")
+                if len(parts) < 3 or parts[0] == "timestamp":
+                    continue
+                symbol, price = parts[1], parts[2]
+            manager.on_price(symbol, float(price))
+            count += 1
+    return count
+
+# One manager per client, so each account's legs go out through its own client
+_managers: "weakref.WeakKeyDictionary[Any, OcoManager]" = weakref.WeakKeyDictionary()
+_managers_lock = threading.Lock()
+
+def get_oco_manager(client) -> OcoManager:
+    """Returns the OcoManager of `client`, creating it on first use."""
+    with _managers_lock:
+        manager = _managers.get(client)
+        if manager is None:
+            manager = _managers[client] = OcoManager(client)
+        return manager
+
+def route_event(client, data: Dict[str, Any]) -> None:
+    """Passes a stream event to the OcoManager of `client`, if it has one."""
+    manager = _managers.get(client)
+    if manager is not None:
+        manager.apply_event(data)
+
+def disarm_all() -> int:
+    """Disarms the open pairs of every client's OcoManager; returns how many were disarmed."""
+    with _managers_lock:
+        managers = list(_managers.values())
+    return sum(manager.disarm_all() for manager in managers)
+
 def place_oco_order(
     client,
     symbol: str,
@@ -11,10 +325,11 @@ def place_oco_order(
     quantity: float,
     take_profit_price: float,
     stop_price: float,
-    stop_limit_price: float
+    stop_limit_price: float,
+    manager: Optional[OcoManager] = None
 ) -> Dict[str, Any]:
     """
-    Places an OCO (One-Cancels-the-Other) order (Skeleton Implementation).
+    Places an OCO (One-Cancels-the-Other) order.
     
     Args:
         client: BinanceClient instance.
@@ -24,34 +339,19 @@ def place_oco_order(
         take_profit_price: Price for the take profit order.
         stop_price: Trigger price for the stop order.
         stop_limit_price: Limit price for the stop order.
+        manager: OcoManager to register with (defaults to the client's own).
         
     Returns:
-        Structured response (mock for now).
+        Dry-run details, or the state of the opened OCO pair.
     """
     logger.info(f"Received OCO Order Request: {side} {quantity} {symbol}")
     logger.info(f"Params: TP={take_profit_price}, Stop={stop_price}, StopLimit={stop_limit_price}")
 
-    # 1. Validate Symbol
-    if not validate_symbol(symbol):
-        error_msg = f"Invalid symbol: {symbol}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-
-    # 2. Validate Side
-    if side not in ["BUY", "SELL"]:
-        error_msg = f"Invalid side: {side}. Must be BUY or SELL."
-        logger.error(error_msg)
-        raise ValueError(error_msg)
+    # 1. Validate Symbol, Side, Quantity and Take-Profit Price
+    _PARENT_CHECKS.process(Order(symbol, side, "LIMIT", quantity, take_profit_price, reduce_only=True))
 
-    # 3. Validate Quantity
-    if not validate_quantity(quantity):
-        error_msg = f"Invalid quantity: {quantity}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-
-    # 4. Validate Prices
+    # 2. Validate Stop Prices
     for p_name, p_val in [
-        ("take_profit_price", take_profit_price), 
         ("stop_price", stop_price), 
         ("stop_limit_price", stop_limit_price)
     ]:
@@ -60,6 +360,17 @@ def place_oco_order(
             logger.error(error_msg)
             raise ValueError(error_msg)
 
+    # 3. Validate price ordering (SELL closes a long: TP above stop; BUY the reverse)
+    if (side == "SELL" and take_profit_price <= stop_price) or (side == "BUY" and take_profit_price >= stop_price):
+        error_msg = f"Invalid OCO prices for {side}: take_profit_price={take_profit_price}, stop_price={stop_price}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    # 4. Pre-trade risk limits on the take-profit leg (the protective stop leg is exempt when it fires)
+    risk = getattr(client, "risk", None)
+    if risk is not None:
+        risk.check(symbol, side, quantity, take_profit_price, reduce_only=True)
+
     # Dry-run logic
     if client.dry_run:
         logger.info("Dry-run mode: Returning mock OCO response.")
@@ -76,6 +387,6 @@ def place_oco_order(
             }
         }
 
-    # Live mode logic (Not implemented yet)
-    logger.warning("OCO live trading is not yet implemented.")
-    return {"status": "todo", "detail": "OCO live trading not implemented yet"}
+    manager = manager or get_oco_manager(client)
+    pair = manager.submit(symbol, side, quantity, take_profit_price, stop_price, stop_limit_price)
+    return {"action": "oco-order", **pair.to_dict()}
@@ -0,0 +1,268 @@
+import math
+import random
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from ...logger import get_logger
+from ...utils.exchange_info import get_exchange_info_cache
+from ..retry import client_order_id
+from ..risk import submit_with_risk
+from .scheduler import Scheduler, get_scheduler
+
+logger = get_logger(__name__)
+
+# Running (and finished) parents of every algorithm, keyed by parent_id
+_parents: Dict[str, "ParentOrder"] = {}
+_parents_lock = threading.Lock()
+
+# Seconds a finished parent stays in the registry (for progress lookups) before it is dropped
+FINISHED_RETENTION = 3600.0
+
+# Quantity left below this counts as fully done (float noise from summing fills)
+QTY_EPSILON = 1e-9
+
+def filled_quantity(response: Dict[str, Any], requested: float) -> float:
+    """
+    Extracts the filled quantity the exchange reports in an order response.
+
+    Dry-run responses have no exchange behind them and count as fully filled;
+    anything else counts only its executedQty.
+    """
+    if response.get("status") == "dry-run":
+        return requested
+    try:
+        return float(response.get("executedQty", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+class ParentOrder:
+    """
+    A parent order worked as a series of child market orders on the shared
+    Scheduler.
+
+    Subclasses decide how big each child is (_slice_quantity), when the next
+    one is due (_next_delay) and when the parent is done (_finished). The base
+    class sends children through the client's pre-trade risk check, carries
+    anything a child fails to fill into the next one, and keeps the fill log,
+    so TWAP, VWAP and POV parents differ only in their sizing rule and many of
+    them can run side by side on one scheduler.
+
+    Args:
+        client: BinanceClient instance (dry-run or live), or a SimulatedBinanceClient.
+        symbol, side, total_quantity: The parent order.
+        interval_seconds: Seconds between children.
+        scheduler: Scheduler to run on (defaults to the process-wide one).
+        jitter: Fraction of interval_seconds to randomize each gap by (0.2 = +/-20%).
+        rng: Optional random.Random for reproducible jitter.
+    """
+
+    algo = "parent"
+    # Whether a child sized 0 still counts as a slice (TWAP) or is skipped until there is something to send (POV)
+    count_empty_slices = True
+
+    def __init__(
+        self,
+        client,
+        symbol: str,
+        side: str,
+        total_quantity: float,
+        interval_seconds: float,
+        scheduler: Optional[Scheduler] = None,
+        jitter: float = 0.0,
+        rng: Optional[random.Random] = None
+    ):
+        self.parent_id = f"{self.algo}-{uuid.uuid4().hex[:12]}"
+        self.client = client
+        self.symbol = symbol
+        self.side = side
+        self.total_quantity = total_quantity
+        self.interval_seconds = interval_seconds
+        self.scheduler = scheduler or get_scheduler()
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+        self.status = "pending"
+        self.filled_quantity = 0.0
+        self.slices_sent = 0
+        self.fills: List[Dict[str, Any]] = []
+        self.started_at = None
+        self.finished_at = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def remaining_quantity(self) -> float:
+        return max(0.0, self.total_quantity - self.filled_quantity)
+
+    def start(self) -> "ParentOrder":
+        with self._lock:
+            self.status = "running"
+            self.started_at = self.scheduler.time()
+            self._on_start()
+            self._timer = self.scheduler.call_later(0, self._run_slice)
+        logger.info(f"{self.algo.upper()} {self.parent_id} started: {self.side} {self.total_quantity} {self.symbol}")
+        return self
+
+    def cancel(self) -> Dict[str, Any]:
+        with self._lock:
+            if self.status == "running":
+                self.status = "cancelled"
+                self.finished_at = self.scheduler.time()
+                if self._timer is not None:
+                    self._timer.cancel()
+        logger.info(f"{self.algo.upper()} {self.parent_id} cancelled after {self.slices_sent} slices")
+        return self.progress()
+
+    def progress(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "parent_id": self.parent_id,
+                "algo": self.algo,
+                "status": self.status,
+                "symbol": self.symbol,
+                "side": self.side,
+                "total_quantity": self.total_quantity,
+                "filled_quantity": self.filled_quantity,
+                "remaining_quantity": self.remaining_quantity,
+                "slices_sent": self.slices_sent,
+                **self._progress(),
+                "fills": list(self.fills)
+            }
+
+    # Hooks
+
+    def _on_start(self) -> None:
+        """Called under the lock when the parent starts."""
+
+    def _progress(self) -> Dict[str, Any]:
+        """Algorithm-specific progress fields."""
+        return {}
+
+    def _slice_quantity(self) -> float:
+        raise NotImplementedError
+
+    def _next_delay(self) -> float:
+        if self.jitter <= 0:
+            return self.interval_seconds
+        return self.interval_seconds * (1 + self.rng.uniform(-self.jitter, self.jitter))
+
+    def _finished(self) -> Optional[str]:
+        """Final status once the parent is done ("completed", "partial", "expired"), else None."""
+        return "completed" if self.remaining_quantity <= QTY_EPSILON else None
+
+    def _out_of_slices(self) -> str:
+        """Final status when the schedule has run out: "partial" if quantity is left unfilled."""
+        return "completed" if self.remaining_quantity <= QTY_EPSILON else "partial"
+
+    # Children
+
+    def _tradable(self, quantity: float) -> Tuple[float, Optional[str]]:
+        """
+        Rounds a child down to the symbol's step size. Returns 0 and the reason
+        when the rounded child is below minQty or minNotional; what is not sent
+        stays in remaining_quantity and goes out with a later child.
+        """
+        filters = get_exchange_info_cache().get(self.symbol)
+        if filters is None:
+            # No exchange info: still strip float noise (0.1 + 0.2 style) before it goes on the wire
+            return math.floor(quantity * 1e8 + 1e-6) / 1e8, None
+        quantity = filters.round_quantity(quantity)
+        if quantity <= 0 or quantity < filters.market_min_qty:
+            return 0.0, "below_min_qty"
+        risk = getattr(self.client, "risk", None)
+        mark = risk.exposure(self.symbol)["mark"] if risk is not None else 0.0
+        if mark and not filters.check_notional(quantity, mark):
+            return 0.0, "below_min_notional"
+        return min(quantity, filters.market_max_qty), None
+
+    def _send(self, quantity: float, slice_no: int) -> Dict[str, Any]:
+        # Deterministic per slice, so a retried or re-run slice cannot be placed twice
+        cid = client_order_id(self.parent_id, slice_no)
+        response = submit_with_risk(
+            self.client, self.symbol, self.side, quantity, None,
+            lambda: self.client.create_market_order(self.symbol, self.side, quantity, client_order_id=cid)
+        )
+        if response.get("status") == "NEW" and response.get("orderId") is not None and hasattr(self.client, "query_order"):
+            # ACK response: the market order has not reported its fill yet, so ask for it
+            try:
+                return self.client.query_order(self.symbol, order_id=response["orderId"])
+            except Exception as e:
+                logger.warning(f"{self.algo.upper()} {self.parent_id}: fill of order {response['orderId']} unknown ({e})")
+        return response
+
+    def _run_slice(self) -> None:
+        with self._lock:
+            if self.status != "running":
+                return
+            quantity = self._slice_quantity()
+            slice_no = self.slices_sent + 1
+        skipped = None
+        if quantity > 0:
+            quantity, skipped = self._tradable(quantity)
+        skip = quantity <= 0 and not self.count_empty_slices
+
+        fill = 0.0
+        error = None
+        if skipped is not None:
+            logger.info(f"{self.algo.upper()} {self.parent_id} slice {slice_no} not sent ({skipped}); left in the remainder")
+        if quantity > 0:
+            try:
+                response = self._send(quantity, slice_no)
+                fill = min(quantity, filled_quantity(response, quantity))
+            except Exception as e:
+                logger.error(f"{self.algo.upper()} {self.parent_id} slice {slice_no} failed: {e}")
+                error = str(e)
+
+        with self._lock:
+            if not skip:
+                self.slices_sent = slice_no
+                self.filled_quantity += fill
+                self.fills.append({
+                    "slice": slice_no,
+                    "time": self.scheduler.time(),
+                    "requested": quantity,
+                    "filled": fill,
+                    "error": error,
+                    "skipped": skipped
+                })
+            if self.status != "running":
+                return
+            status = self._finished()
+            if status is not None:
+                self.status = status
+                self.finished_at = self.scheduler.time()
+                logger.info(f"{self.algo.upper()} {self.parent_id} {status}: filled {self.filled_quantity}/{self.total_quantity}, {self.remaining_quantity} left")
+                return
+            self._timer = self.scheduler.call_later(self._next_delay(), self._run_slice)
+
+def _prune() -> None:
+    """Drops parents finished more than FINISHED_RETENTION seconds ago (caller holds _parents_lock)."""
+    expired = [
+        parent_id for parent_id, p in _parents.items()
+        if p.finished_at is not None and p.scheduler.time() - p.finished_at > FINISHED_RETENTION
+    ]
+    for parent_id in expired:
+        del _parents[parent_id]
+
+def start_parent(parent: ParentOrder) -> ParentOrder:
+    """Starts a parent order and registers it so it can be looked up by id."""
+    with _parents_lock:
+        _prune()
+        _parents[parent.parent_id] = parent
+    return parent.start()
+
+def get_parent(parent_id: str) -> Optional[ParentOrder]:
+    with _parents_lock:
+        return _parents.get(parent_id)
+
+def list_parents(algo: Optional[str] = None) -> List[Dict[str, Any]]:
+    with _parents_lock:
+        _prune()
+        parents = list(_parents.values())
+    return [p.progress() for p in parents if algo is None or p.algo == algo]
+
+def cancel_parent(parent_id: str) -> Dict[str, Any]:
+    parent = get_parent(parent_id)
+    if parent is None:
+        raise ValueError(f"Unknown parent order id: {parent_id}")
+    return parent.cancel()
@@ -0,0 +1,705 @@
+import asyncio
+import inspect
+import math
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+from ...config import CONFIG
+from ...logger import get_logger
+from ...utils.exchange_info import get_exchange_info_cache
+from ..pipeline import Order, ValidateStage, get_pipeline
+from .parent import FINISHED_RETENTION
+
+logger = get_logger(__name__)
+
+PEG_MODES = ("best", "mid")
+FINAL_STATUSES = ("FILLED", "CANCELED", "EXPIRED", "REJECTED", "EXPIRED_IN_MATCH")
+
+# Symbol, side and quantity checks before any stream is opened
+_CHECKS = ValidateStage(exchange_filters=False)
+
+# Seconds start_pegged_order() waits for the order to be placed
+START_TIMEOUT = 30.0
+
+# Live pegs, keyed by peg_id: (loop, engine, peg); finished ones are kept FINISHED_RETENTION seconds
+_active: Dict[str, Any] = {}
+_active_lock = threading.Lock()
+
+async def _call(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Calls a sync or async client method. Sync methods (blocking HTTP plus any
+    rate-limiter wait) run on a worker thread so the loop keeps serving
+    quotes and the other pegs.
+    """
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args, **kwargs)
+    result = await asyncio.to_thread(fn, *args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+def _decimals(tick: float) -> int:
+    text = f"{tick:.10f}".rstrip("0")
+    return len(text.split(".")[1]) if "." in text else 0
+
+class PegOrder:
+    """
+    A resting LIMIT order kept at a price derived from the best bid/ask.
+
+    Prices are tracked in whole ticks (`ticks`), so comparing the current
+    price with a new target never needs float tolerance.
+    """
+
+    __slots__ = (
+        "peg_id", "symbol", "side", "quantity", "mode", "offset_ticks", "limit_price", "max_chase_ticks",
+        "tick_size", "decimals", "order_id", "ticks", "initial_ticks", "status", "executed_qty",
+        "amends", "last_amend", "inflight", "pending", "timer", "finished", "finished_at", "error"
+    )
+
+    def __init__(self, symbol: str, side: str, quantity: float, mode: str, offset_ticks: int,
+                 limit_price: Optional[float], max_chase_ticks: Optional[int], tick_size: float):
+        self.peg_id = f"peg-{uuid.uuid4().hex[:12]}"
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.mode = mode
+        self.offset_ticks = offset_ticks
+        self.limit_price = limit_price
+        self.max_chase_ticks = max_chase_ticks
+        self.tick_size = tick_size
+        self.decimals = _decimals(tick_size)
+        self.order_id = None
+        self.ticks: Optional[int] = None
+        self.initial_ticks: Optional[int] = None
+        self.status = "pending"
+        self.executed_qty = 0.0
+        self.amends = 0
+        self.last_amend = float("-inf")
+        self.inflight = False
+        self.pending = False
+        self.timer = None
+        self.finished: Optional[asyncio.Event] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def price(self) -> Optional[float]:
+        return None if self.ticks is None else round(self.ticks * self.tick_size, self.decimals)
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "peg_id": self.peg_id,
+            "status": self.status,
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": self.quantity,
+            "executed_qty": self.executed_qty,
+            "mode": self.mode,
+            "offset_ticks": self.offset_ticks,
+            "limit_price": self.limit_price,
+            "max_chase_ticks": self.max_chase_ticks,
+            "order_id": self.order_id,
+            "price": self.price,
+            "amends": self.amends,
+            "error": self.error
+        }
+
+class PegEngine:
+    """
+    Keeps resting LIMIT orders pegged to the local best bid/ask.
+
+    Every quote update (on_quote / on_event, usually fed from a
+    MarketDataStream's FanOut) recomputes each pegged order's target price
+    from the BestPriceCache; an order is amended in place with modify_order
+    only when the target moved by at least `threshold_ticks`, and at most once
+    per `min_interval` seconds. A quote burst inside that interval collapses
+    into one deferred amend at the latest price, and at most `max_inflight`
+    amend requests are outstanding at once, so the engine never outruns the
+    rate limiter. Fills are picked up from modify/query responses and from
+    ORDER_TRADE_UPDATE events.
+
+    Targets:
+        "best": BUY joins the bid (SELL the ask), `offset_ticks` behind it.
+        "mid":  the mid price, rounded away from the spread, `offset_ticks` behind it.
+    Either way the order stays passive (a BUY never reaches the ask), never
+    goes past `limit_price`, and never chases more than `max_chase_ticks` from
+    where it was first placed.
+
+    Args:
+        client: BinanceClient, AsyncBinanceClient or SimulatedBinanceClient. Sync
+            clients are called on worker threads. An AsyncBinanceClient must be
+            open on the loop the engine runs on.
+        quotes: BestPriceCache to read best bid/ask from.
+        min_interval: Minimum seconds between amends of one order (default PEG_MIN_INTERVAL).
+        threshold_ticks: Minimum target move, in ticks, worth an amend (default PEG_THRESHOLD_TICKS).
+        max_inflight: Max concurrent amend requests.
+        time_in_force: For the initial order ("GTX" = post-only).
+        clock: Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        client,
+        quotes,
+        min_interval: Optional[float] = None,
+        threshold_ticks: Optional[int] = None,
+        max_inflight: int = 16,
+        time_in_force: str = "GTX",
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.client = client
+        self.quotes = quotes
+        self.min_interval = CONFIG.PEG_MIN_INTERVAL if min_interval is None else min_interval
+        self.threshold_ticks = CONFIG.PEG_THRESHOLD_TICKS if threshold_ticks is None else threshold_ticks
+        self.max_inflight = max_inflight
+        self.time_in_force = time_in_force
+        self.clock = clock
+        self.orders: Dict[str, PegOrder] = {}
+        self.amends = 0
+        self.deferred = 0
+        self.failed = 0
+        self._by_symbol: Dict[str, List[PegOrder]] = {}
+        self._by_order_id: Dict[Any, PegOrder] = {}
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._tasks = set()
+
+    # Pricing
+
+    def target_ticks(self, peg: PegOrder) -> Optional[int]:
+        """The price `peg` should rest at, in ticks (None without a quote)."""
+        quote = self.quotes.get(peg.symbol)
+        if quote is None:
+            return None
+        bid, _, ask, _, _ = quote
+        tick = peg.tick_size
+        bid_ticks, ask_ticks = round(bid / tick), round(ask / tick)
+        buy = peg.side == "BUY"
+        if peg.mode == "mid":
+            half = (bid_ticks + ask_ticks) / 2
+            ticks = math.floor(half) - peg.offset_ticks if buy else math.ceil(half) + peg.offset_ticks
+        else:
+            ticks = bid_ticks - peg.offset_ticks if buy else ask_ticks + peg.offset_ticks
+
+        if buy:
+            ticks = min(ticks, ask_ticks - 1)
+            if peg.limit_price is not None:
+                ticks = min(ticks, math.floor(peg.limit_price / tick + 1e-9))
+            if peg.max_chase_ticks is not None and peg.initial_ticks is not None:
+                ticks = min(ticks, peg.initial_ticks + peg.max_chase_ticks)
+        else:
+            ticks = max(ticks, bid_ticks + 1)
+            if peg.limit_price is not None:
+                ticks = max(ticks, math.ceil(peg.limit_price / tick - 1e-9))
+            if peg.max_chase_ticks is not None and peg.initial_ticks is not None:
+                ticks = max(ticks, peg.initial_ticks - peg.max_chase_ticks)
+        return ticks
+
+    # Lifecycle
+
+    async def place(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        mode: str = "best",
+        offset_ticks: int = 0,
+        limit_price: Optional[float] = None,
+        max_chase_ticks: Optional[int] = None,
+        tick_size: Optional[float] = None
+    ) -> PegOrder:
+        """
+        Places a pegged LIMIT order at the current target price (through the order pipeline).
+
+        Raises:
+            ValueError: On invalid parameters, an unknown tick size or no quote yet.
+        """
+        if mode not in PEG_MODES:
+            raise ValueError(f"Invalid peg mode: {mode}. Must be best or mid.")
+        if offset_ticks < 0 or (max_chase_ticks is not None and max_chase_ticks < 0):
+            raise ValueError("offset_ticks and max_chase_ticks must be non-negative")
+        if tick_size is None:
+            filters = get_exchange_info_cache().get(symbol)
+            tick_size = filters.tick_size if filters is not None else None
+        if not tick_size or tick_size <= 0:
+            raise ValueError(f"Unknown tick size for {symbol}; pass tick_size")
+
+        peg = PegOrder(symbol, side, quantity, mode, offset_ticks, limit_price, max_chase_ticks, tick_size)
+        target = self.target_ticks(peg)
+        if target is None:
+            raise ValueError(f"No best bid/ask for {symbol} yet")
+        peg.ticks = peg.initial_ticks = target
+        peg.finished = asyncio.Event()
+
+        order = Order(symbol, side, "LIMIT", quantity, peg.price, time_in_force=self.time_in_force)
+        pipeline = get_pipeline(self.client)
+        response = await _call(pipeline.run_async if inspect.iscoroutinefunction(self.client.create_limit_order) else pipeline.run, order)
+        peg.quantity = order.quantity
+        peg.order_id = response.get("orderId")
+        peg.status = "NEW"
+        self.orders[peg.peg_id] = peg
+        self._by_symbol.setdefault(symbol, []).append(peg)
+        if peg.order_id is not None:
+            self._by_order_id[peg.order_id] = peg
+        logger.info(f"Peg {peg.peg_id} placed: {side} {peg.quantity} {symbol} @ {peg.price} ({mode}, offset {offset_ticks})")
+        self._apply(peg, response)
+        return peg
+
+    async def cancel(self, peg_id: str) -> Dict[str, Any]:
+        """Cancels a pegged order and stops repricing it."""
+        peg = self.orders[peg_id]
+        if not peg.done:
+            try:
+                response = await _call(self.client.cancel_order, peg.symbol, order_id=peg.order_id)
+            except Exception as e:
+                logger.warning(f"Peg {peg_id}: cancel failed ({e}); querying order")
+                await self._refresh(peg)
+            else:
+                self._apply(peg, response)
+            if not peg.done:
+                self._finish(peg, "CANCELED")
+        return peg.progress()
+
+    async def wait(self, peg_id: str, timeout: Optional[float] = None) -> bool:
+        """Waits until the pegged order fills or ends; False on timeout."""
+        peg = self.orders[peg_id]
+        try:
+            await asyncio.wait_for(peg.finished.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self) -> None:
+        """Cancels every live pegged order."""
+        for peg_id in [p for p, peg in self.orders.items() if not peg.done]:
+            await self.cancel(peg_id)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # Events
+
+    def on_quote(self, symbol: str) -> None:
+        """Re-evaluates every pegged order on `symbol` (call after the quote cache was updated)."""
+        for peg in self._by_symbol.get(symbol, ()):
+            self._evaluate(peg)
+
+    def on_event(self, data: Dict[str, Any]) -> None:
+        """Handles a market-data or user-data event (FanOut / UserDataStream listener)."""
+        if data.get("e") == "ORDER_TRADE_UPDATE":
+            o = data.get("o", {})
+            peg = self._by_order_id.get(o.get("i"))
+            if peg is not None:
+                self._apply(peg, {"status": o.get("X"), "executedQty": o.get("z")})
+            return
+        symbol = data.get("s")
+        if symbol in self._by_symbol:
+            self.on_quote(symbol)
+
+    async def follow(self, stream) -> None:
+        """Consumes a MarketDataStream's FanOut until cancelled."""
+        sub = stream.fanout.subscribe()
+        try:
+            async for message in sub:
+                self.on_event(message)
+        finally:
+            sub.close()
+
+    def _evaluate(self, peg: PegOrder) -> None:
+        if peg.done or peg.ticks is None:
+            return
+        if peg.inflight:
+            peg.pending = True
+            return
+        target = self.target_ticks(peg)
+        if target is None or abs(target - peg.ticks) < self.threshold_ticks:
+            return
+        wait = peg.last_amend + self.min_interval - self.clock()
+        if wait > 0:
+            # One deferred re-check at the end of the interval, at whatever the quote is then
+            if peg.timer is None:
+                self.deferred += 1
+                peg.timer = asyncio.get_running_loop().call_later(wait, self._deferred, peg)
+            return
+        peg.inflight = True
+        task = asyncio.get_running_loop().create_task(self._amend(peg, target))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _deferred(self, peg: PegOrder) -> None:
+        peg.timer = None
+        self._evaluate(peg)
+
+    async def _amend(self, peg: PegOrder, target: int) -> None:
+        if self._inflight is None:
+            self._inflight = asyncio.Semaphore(self.max_inflight)
+        try:
+            async with self._inflight:
+                if peg.done:
+                    return
+                price = round(target * peg.tick_size, peg.decimals)
+                try:
+                    response = await _call(self.client.modify_order, peg.symbol, peg.side, peg.quantity, price, order_id=peg.order_id)
+                except Exception as e:
+                    response = {"code": getattr(e, "error_code", -1), "msg": str(e)}
+                peg.last_amend = self.clock()
+                if "code" in response and "orderId" not in response:
+                    # Usually filled or cancelled in the meantime
+                    self.failed += 1
+                    logger.warning(f"Peg {peg.peg_id}: amend to {price} rejected ({response.get('msg')}); querying order")
+                    await self._refresh(peg)
+                    return
+                peg.ticks = target
+                peg.amends += 1
+                self.amends += 1
+                logger.debug("Peg %s amended to %s", peg.peg_id, price)
+                self._apply(peg, response)
+        finally:
+            peg.inflight = False
+            if peg.pending:
+                peg.pending = False
+                self._evaluate(peg)
+
+    async def _refresh(self, peg: PegOrder) -> None:
+        try:
+            response = await _call(self.client.query_order, peg.symbol, order_id=peg.order_id)
+        except Exception as e:
+            logger.warning(f"Peg {peg.peg_id}: order query failed ({e})")
+            return
+        if "code" in response and "orderId" not in response:
+            peg.error = response.get("msg")
+            self._finish(peg, "EXPIRED")
+        else:
+            self._apply(peg, response)
+
+    def _apply(self, peg: PegOrder, response: Dict[str, Any]) -> None:
+        status = response.get("status")
+        if status == "dry-run" or status is None:
+            return
+        try:
+            peg.executed_qty = float(response.get("executedQty") or peg.executed_qty)
+        except (TypeError, ValueError):
+            pass
+        if status in FINAL_STATUSES:
+            self._finish(peg, status)
+        else:
+            peg.status = status
+
+    def _finish(self, peg: PegOrder, status: str) -> None:
+        if peg.done:
+            return
+        peg.status = status
+        peg.finished_at = self.clock()
+        if peg.timer is not None:
+            peg.timer.cancel()
+            peg.timer = None
+        pegs = self._by_symbol.get(peg.symbol)
+        if pegs is not None and peg in pegs:
+            pegs.remove(peg)
+            if not pegs:
+                del self._by_symbol[peg.symbol]
+        self._by_order_id.pop(peg.order_id, None)
+        if peg.finished is not None:
+            peg.finished.set()
+        logger.info(f"Peg {peg.peg_id} {status}: {peg.executed_qty}/{peg.quantity} {peg.symbol} after {peg.amends} amends")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "live": sum(1 for p in self.orders.values() if not p.done),
+            "amends": self.amends,
+            "deferred": self.deferred,
+            "failed": self.failed
+        }
+
+# One-shot helpers (CLI, REST API)
+
+def _check(symbol: str, side: str, quantity: float, mode: str, limit_price: Optional[float]) -> None:
+    error = _CHECKS.check(Order(symbol, side, "LIMIT", quantity, 1 if limit_price is None else limit_price))
+    if error is None and mode not in PEG_MODES:
+        error = f"Invalid peg mode: {mode}. Must be best or mid."
+    if error is not None:
+        logger.error(error)
+        raise ValueError(error)
+
+def _dry_run_plan(symbol, side, quantity, mode, offset_ticks, limit_price, max_chase_ticks) -> Dict[str, Any]:
+    return {
+        "status": "dry-run",
+        "action": "peg_order",
+        "payload": {
+            "symbol": symbol,
+            "side": side,
+            "quantity": quantity,
+            "mode": mode,
+            "offsetTicks": offset_ticks,
+            "limitPrice": limit_price,
+            "maxChaseTicks": max_chase_ticks
+        }
+    }
+
+class _PegRuntime:
+    """
+    The background event loop every live peg runs on: one PegEngine and one
+    user-data stream per account client, and one bookTicker stream per symbol
+    shared by all pegs on it (stopped when the last of them ends). Sync
+    clients are called on worker threads; an AsyncBinanceClient opened on
+    another loop is cloned and the copy opened on this one.
+
+    Args:
+        market_stream: Factory symbol -> stream with `fanout`, run() and stop()
+            updating the given BestPriceCache (default: a bookTicker-only MarketDataStream).
+        user_stream: Factory client -> UserDataStream following that account.
+    """
+
+    def __init__(self, market_stream: Optional[Callable] = None, user_stream: Optional[Callable] = None):
+        from ...streams.order_book import BestPriceCache
+
+        self.quotes = BestPriceCache()
+        self.market_stream = market_stream or self._market_stream
+        self.user_stream = user_stream or self._user_stream
+        self.engines: Dict[int, PegEngine] = {}
+        self._clones: List[Any] = []
+        self._engine_lock: Optional[asyncio.Lock] = None
+        self._symbols: Dict[str, List[Any]] = {}
+        self._tasks = set()
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="peg-engine", daemon=True).start()
+
+    def _market_stream(self, symbol: str):
+        from ...streams.market_data import MarketDataStream
+        return MarketDataStream([symbol], best=self.quotes, depth=False)
+
+    @staticmethod
+    def _user_stream(client):
+        from ..async_client import AsyncBinanceClient
+        from ...streams.user_data import UserDataStream
+        return UserDataStream(AsyncBinanceClient(client.key, client.secret, dry_run=False, base_url=client.base_url, journaled=False))
+
+    def submit(self, coro) -> "asyncio.Future":
+        """Schedules `coro` on the peg loop (returns a concurrent.futures.Future)."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def _spawn(self, coro) -> "asyncio.Task":
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def engine(self, client) -> PegEngine:
+        """The PegEngine for `client`'s account, started with its user-data stream on first use."""
+        if self._engine_lock is None:
+            self._engine_lock = asyncio.Lock()
+        async with self._engine_lock:
+            engine = self.engines.get(id(client))
+            if engine is None:
+                order_client = client
+                if hasattr(client, "clone") and inspect.iscoroutinefunction(client.create_limit_order):
+                    order_client = await client.clone().open()
+                    self._clones.append(order_client)
+                engine = self.engines[id(client)] = PegEngine(order_client, self.quotes)
+                stream = self.user_stream(client)
+                stream.add_listener(engine.on_event)
+                self._spawn(self._run_user(stream))
+        return engine
+
+    @staticmethod
+    async def _run_user(stream) -> None:
+        await stream.client.open()
+        try:
+            await stream.run()
+        finally:
+            await stream.client.close()
+
+    def watch(self, symbol: str) -> None:
+        """Follows `symbol`'s best bid/ask until a matching unwatch()."""
+        entry = self._symbols.get(symbol)
+        if entry is None:
+            stream = self.market_stream(symbol)
+            entry = self._symbols[symbol] = [stream, [self._spawn(stream.run()), self._spawn(self._follow(stream))], 0]
+        entry[2] += 1
+
+    def unwatch(self, symbol: str) -> None:
+        entry = self._symbols[symbol]
+        entry[2] -= 1
+        if entry[2] == 0:
+            del self._symbols[symbol]
+            stream, tasks, _ = entry
+            stream.stop()
+            for task in tasks:
+                task.cancel()
+            # A later peg must not be placed off this stream's last quote
+            self.quotes.quotes.pop(symbol, None)
+
+    async def _follow(self, stream) -> None:
+        sub = stream.fanout.subscribe()
+        try:
+            async for message in sub:
+                for engine in list(self.engines.values()):
+                    engine.on_event(message)
+        finally:
+            sub.close()
+
+    def stop(self) -> None:
+        """Stops every stream and the loop; live pegs are left resting as they are."""
+        async def shutdown():
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for clone in self._clones:
+                await clone.close()
+
+        self.submit(shutdown()).result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+_runtime: Optional[_PegRuntime] = None
+_runtime_lock = threading.Lock()
+
+def _get_runtime() -> _PegRuntime:
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = _PegRuntime()
+        return _runtime
+
+def _prune() -> None:
+    """Drops pegs finished more than FINISHED_RETENTION seconds ago (caller holds _active_lock)."""
+    for peg_id, (loop, engine, peg) in list(_active.items()):
+        if peg.finished_at is not None and engine.clock() - peg.finished_at > FINISHED_RETENTION:
+            del _active[peg_id]
+            loop.call_soon_threadsafe(engine.orders.pop, peg_id, None)
+
+async def _run_peg(runtime: _PegRuntime, client, symbol: str, side: str, quantity: float, mode: str, offset_ticks: int,
+                   limit_price: Optional[float], max_chase_ticks: Optional[int], timeout: Optional[float],
+                   on_start: Optional[Callable[[PegEngine, PegOrder], None]]) -> Dict[str, Any]:
+    engine = await runtime.engine(client)
+    runtime.watch(symbol)
+    try:
+        deadline = time.monotonic() + 10
+        while runtime.quotes.get(symbol) is None:
+            if time.monotonic() > deadline:
+                raise ValueError(f"No best bid/ask for {symbol} within 10s")
+            await asyncio.sleep(0.05)
+        peg = await engine.place(symbol, side, quantity, mode, offset_ticks, limit_price, max_chase_ticks)
+        with _active_lock:
+            _prune()
+            _active[peg.peg_id] = (runtime.loop, engine, peg)
+        if on_start is not None:
+            on_start(engine, peg)
+        if not await engine.wait(peg.peg_id, timeout):
+            logger.info(f"Peg {peg.peg_id} timed out after {timeout}s; cancelling")
+            await engine.cancel(peg.peg_id)
+        return peg.progress()
+    except Exception as e:
+        logger.error(f"Peg on {symbol} failed: {e}")
+        raise
+    finally:
+        runtime.unwatch(symbol)
+
+async def run_pegged_order(
+    client,
+    symbol: str,
+    side: str,
+    quantity: float,
+    mode: str = "best",
+    offset_ticks: int = 0,
+    limit_price: Optional[float] = None,
+    max_chase_ticks: Optional[int] = None,
+    timeout: Optional[float] = None,
+    on_start: Optional[Callable[[PegEngine, PegOrder], None]] = None
+) -> Dict[str, Any]:
+    """
+    Runs one live pegged order end to end for `client`'s account on the
+    shared peg loop: places it once the symbol has a quote and reprices it
+    until it fills, is cancelled, or `timeout` seconds pass (then it is
+    cancelled). Can be awaited from any event loop.
+
+    Returns:
+        The PegOrder's final progress().
+    """
+    runtime = _get_runtime()
+    future = runtime.submit(_run_peg(runtime, client, symbol, side, quantity, mode, offset_ticks, limit_price, max_chase_ticks, timeout, on_start))
+    return await asyncio.wrap_future(future)
+
+def place_pegged_order(
+    client,
+    symbol: str,
+    side: str,
+    quantity: float,
+    mode: str = "best",
+    offset_ticks: int = 0,
+    limit_price: Optional[float] = None,
+    max_chase_ticks: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Places a pegged LIMIT order and blocks until it is done (CLI).
+
+    Args:
+        client: BinanceClient; in dry-run mode only the plan is returned.
+        symbol, side, quantity: The order.
+        mode: "best" or "mid".
+        offset_ticks: Ticks behind the peg price.
+        limit_price: Worst price the order may be moved to.
+        max_chase_ticks: Max ticks the order may move from its first price.
+        timeout: Seconds before an unfilled order is cancelled (None = wait for the fill).
+
+    Raises:
+        ValueError: If validation fails.
+    """
+    _check(symbol, side, quantity, mode, limit_price)
+    if client.dry_run:
+        return _dry_run_plan(symbol, side, quantity, mode, offset_ticks, limit_price, max_chase_ticks)
+    runtime = _get_runtime()
+    return runtime.submit(_run_peg(runtime, client, symbol, side, quantity, mode, offset_ticks, limit_price, max_chase_ticks, timeout, None)).result()
+
+def start_pegged_order(client, symbol: str, side: str, quantity: float, mode: str = "best", offset_ticks: int = 0,
+                       limit_price: Optional[float] = None, max_chase_ticks: Optional[int] = None,
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Like place_pegged_order, but returns as soon as the order is placed
+    (REST API); the peg keeps running on the shared peg loop. Track it with
+    list_pegged_orders() and stop it with cancel_pegged_order().
+
+    Raises:
+        ValueError: If validation or placing the order fails.
+        TimeoutError: If the order was not placed within START_TIMEOUT seconds.
+    """
+    _check(symbol, side, quantity, mode, limit_price)
+    if client.dry_run:
+        return _dry_run_plan(symbol, side, quantity, mode, offset_ticks, limit_price, max_chase_ticks)
+
+    started = threading.Event()
+    result: Dict[str, Any] = {}
+
+    def on_start(engine, peg):
+        result.update(peg.progress())
+        started.set()
+
+    runtime = _get_runtime()
+    future = runtime.submit(_run_peg(runtime, client, symbol, side, quantity, mode, offset_ticks, limit_price, max_chase_ticks, timeout, on_start))
+    future.add_done_callback(lambda _: started.set())
+    if not started.wait(START_TIMEOUT):
+        future.cancel()
+        raise TimeoutError(f"Pegged order on {symbol} was not placed within {START_TIMEOUT}s")
+    if "peg_id" not in result:
+        raise ValueError(str(future.exception()))
+    return result
+
+def list_pegged_orders() -> List[Dict[str, Any]]:
+    with _active_lock:
+        _prune()
+        return [peg.progress() for _, _, peg in _active.values()]
+
+def cancel_pegged_order(peg_id: str) -> Dict[str, Any]:
+    """Cancels a peg started with start_pegged_order()."""
+    with _active_lock:
+        entry = _active.get(peg_id)
+    if entry is None:
+        raise ValueError(f"Unknown peg: {peg_id}")
+    loop, engine, peg = entry
+    if not peg.done:
+        asyncio.run_coroutine_threadsafe(engine.cancel(peg_id), loop).result(10)
+    return peg.progress()
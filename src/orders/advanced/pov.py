@@ -0,0 +1,209 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+from ...logger import get_logger
+from ..pipeline import Order, ValidateStage
+from .parent import QTY_EPSILON, ParentOrder, start_parent
+from .scheduler import Scheduler
+
+logger = get_logger(__name__)
+
+# Symbol, side and quantity checks for a parent order (no exchange lot filters)
+_PARENT_CHECKS = ValidateStage(exchange_filters=False)
+
+class TradeVolume:
+    """
+    Running traded volume per symbol, fed from the aggTrade stream (on_event)
+    or recorded trades (add).
+
+    total() is a cumulative counter, so any number of POV parents can measure
+    the volume since they started with one subtraction; calling the tracker as
+    (symbol, seconds) gives the volume of the trailing window and makes it a
+    TWAP volume_source.
+
+    Args:
+        window_seconds: Longest trailing window kept for __call__.
+    """
+
+    def __init__(self, window_seconds: float = 300.0):
+        self.window_seconds = window_seconds
+        self.totals: Dict[str, float] = {}
+        self._recent: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, symbol: str, quantity: float, time_ms: int) -> None:
+        t = time_ms / 1000.0
+        with self._lock:
+            self.totals[symbol] = self.totals.get(symbol, 0.0) + quantity
+            recent = self._recent.get(symbol)
+            if recent is None:
+                recent = self._recent[symbol] = deque()
+            recent.append((t, quantity))
+            cutoff = t - self.window_seconds
+            while recent[0][0] < cutoff:
+                recent.popleft()
+
+    def on_event(self, data: Dict[str, Any]) -> None:
+        """Handles an aggTrade event (FanOut / stream listener); ignores everything else."""
+        if data.get("e") == "aggTrade":
+            self.add(data["s"], float(data["q"]), data["T"])
+
+    def total(self, symbol: str) -> float:
+        return self.totals.get(symbol, 0.0)
+
+    def __call__(self, symbol: str, seconds: float) -> float:
+        with self._lock:
+            recent = self._recent.get(symbol)
+            if not recent:
+                return 0.0
+            cutoff = recent[-1][0] - seconds
+            return sum(q for t, q in recent if t >= cutoff)
+
+class PovExecution(ParentOrder):
+    """
+    A percentage-of-volume parent order: every `interval_seconds` it sends a
+    child that brings its filled quantity up to `participation_rate` times
+    the market volume traded since it started, so it speeds up and slows down
+    with the market. Children smaller than `min_quantity` wait for more
+    volume.
+
+    Args:
+        client, symbol, side, total_quantity: The parent order.
+        participation_rate: Target fraction of market volume (0, 1].
+        volume: TradeVolume fed with the symbol's trades.
+        interval_seconds: Seconds between checks.
+        min_quantity: Smallest child worth sending.
+        max_duration: Seconds after which an unfinished parent stops ("expired").
+        scheduler: Scheduler to run on (defaults to the process-wide one).
+    """
+
+    algo = "pov"
+    count_empty_slices = False
+
+    def __init__(self, client, symbol: str, side: str, total_quantity: float, participation_rate: float, volume: TradeVolume,
+                 interval_seconds: float = 5.0, min_quantity: float = 0.0, max_duration: Optional[float] = None,
+                 scheduler: Optional[Scheduler] = None):
+        super().__init__(client, symbol, side, total_quantity, interval_seconds, scheduler)
+        self.participation_rate = participation_rate
+        self.volume = volume
+        self.min_quantity = min_quantity
+        self.max_duration = max_duration
+        self._baseline = 0.0
+
+    def market_volume(self) -> float:
+        """Market volume traded since the parent started."""
+        return self.volume.total(self.symbol) - self._baseline
+
+    def _on_start(self) -> None:
+        self._baseline = self.volume.total(self.symbol)
+
+    def _progress(self) -> Dict[str, Any]:
+        return {"participation_rate": self.participation_rate, "market_volume": self.market_volume()}
+
+    def _slice_quantity(self) -> float:
+        quantity = min(self.remaining_quantity, self.participation_rate * self.market_volume() - self.filled_quantity)
+        # The last bit of the parent goes out even if it is below min_quantity
+        if quantity < self.min_quantity and quantity < self.remaining_quantity:
+            return 0.0
+        return quantity
+
+    def _finished(self) -> Optional[str]:
+        if self.remaining_quantity <= QTY_EPSILON:
+            return "completed"
+        if self.max_duration is not None and self.scheduler.time() - self.started_at >= self.max_duration:
+            return "expired"
+        return None
+
+_volume: Optional[TradeVolume] = None
+_volume_symbols = set()
+_volume_lock = threading.Lock()
+
+def get_trade_volume(symbols: Iterable[str] = ()) -> TradeVolume:
+    """
+    The process-wide TradeVolume, with a live aggTrade stream (on a background
+    thread) for every symbol not already followed.
+    """
+    global _volume
+    with _volume_lock:
+        if _volume is None:
+            _volume = TradeVolume()
+        new = [s for s in symbols if s not in _volume_symbols]
+        _volume_symbols.update(new)
+    if new:
+        _start_trade_stream_thread(_volume, new)
+    return _volume
+
+def _start_trade_stream_thread(volume: TradeVolume, symbols) -> None:
+    import asyncio
+    from ...streams.market_data import MarketDataStream
+
+    async def run():
+        stream = MarketDataStream(symbols, depth=False, trades=True)
+        sub = stream.fanout.subscribe()
+        task = asyncio.ensure_future(stream.run())
+        try:
+            async for message in sub:
+                volume.on_event(message)
+        finally:
+            task.cancel()
+
+    threading.Thread(target=lambda: asyncio.run(run()), name="trade-volume", daemon=True).start()
+    logger.info(f"Trade volume stream started for {', '.join(symbols)}")
+
+def execute_pov(
+    client,
+    symbol: str,
+    side: str,
+    total_quantity: float,
+    participation_rate: float,
+    interval_seconds: float = 5.0,
+    min_quantity: float = 0.0,
+    max_duration: Optional[float] = None,
+    volume: Optional[TradeVolume] = None,
+    scheduler: Optional[Scheduler] = None
+) -> Dict[str, Any]:
+    """
+    Executes a POV (Percentage of Volume) strategy.
+
+    Args:
+        client: BinanceClient instance.
+        symbol: Trading pair symbol.
+        side: "BUY" or "SELL".
+        total_quantity: Total quantity to trade.
+        participation_rate: Target fraction of market volume, in (0, 1].
+        interval_seconds: Seconds between child orders.
+        min_quantity: Smallest child worth sending.
+        max_duration: Seconds after which an unfinished parent stops.
+        volume: TradeVolume to size from (default: the live process-wide one).
+        scheduler: Scheduler to run on (defaults to the process-wide one).
+
+    Returns:
+        Dry-run plan, or the progress of the started execution (with its parent_id).
+    """
+    logger.info(f"Received POV Request: {side} {total_quantity} {symbol} at {participation_rate:.1%} of volume")
+    _PARENT_CHECKS.process(Order(symbol, side, "MARKET", total_quantity))
+    if not 0 < participation_rate <= 1:
+        error_msg = f"Invalid participation rate: {participation_rate}. Must be in (0, 1]."
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    if interval_seconds <= 0:
+        error_msg = f"Invalid interval: {interval_seconds}. Must be > 0."
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    risk = getattr(client, "risk", None)
+    if risk is not None:
+        risk.check(symbol, side, total_quantity)
+
+    if client.dry_run:
+        logger.info(f"Dry-run POV: {participation_rate:.1%} of volume every {interval_seconds}s")
+        return {
+            "status": "dry-run",
+            "action": "pov",
+            "participation_rate": participation_rate,
+            "interval_seconds": interval_seconds,
+            "max_duration": max_duration
+        }
+    execution = PovExecution(client, symbol, side, total_quantity, participation_rate, volume or get_trade_volume([symbol]),
+                             interval_seconds, min_quantity, max_duration, scheduler)
+    return {"action": "pov", **start_parent(execution).progress()}
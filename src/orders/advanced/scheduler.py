@@ -0,0 +1,155 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from ...logger import get_logger
+
+logger = get_logger(__name__)
+
+class Clock:
+    """Wall clock used by the scheduler in live mode (monotonic seconds)."""
+
+    def time(self) -> float:
+        return time.monotonic()
+
+class SimulatedClock(Clock):
+    """Manually advanced clock for tests and backtests."""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+class Timer:
+    """Handle for a scheduled callback."""
+
+    __slots__ = ("when", "callback", "args", "cancelled")
+
+    def __init__(self, when: float, callback: Callable, args: tuple):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+class Scheduler:
+    """
+    Heap-based timer scheduler shared by execution algorithms.
+
+    With the real Clock, one background thread sleeps until the next due timer
+    and hands callbacks to a small worker pool, so many parent orders can run
+    from one process without blocking the caller. With a SimulatedClock no
+    thread is started; call advance() to run due callbacks inline.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, max_workers: int = 8):
+        self.clock = clock or Clock()
+        self.simulated = isinstance(self.clock, SimulatedClock)
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._executor = None if self.simulated else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sched")
+
+    def time(self) -> float:
+        return self.clock.time()
+
+    def call_at(self, when: float, callback: Callable, *args) -> Timer:
+        timer = Timer(when, callback, args)
+        with self._cond:
+            heapq.heappush(self._heap, (when, next(self._seq), timer))
+            self._cond.notify()
+        if not self.simulated and not self._running:
+            self.start()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        return self.call_at(self.time() + max(0.0, delay), callback, *args)
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(1 for _, _, t in self._heap if not t.cancelled)
+
+    def next_due(self) -> Optional[float]:
+        """When the earliest pending timer is due (None if nothing is scheduled)."""
+        with self._cond:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def _pop_due(self, now: float) -> Optional[Timer]:
+        while self._heap and self._heap[0][0] <= now:
+            _, _, timer = heapq.heappop(self._heap)
+            if not timer.cancelled:
+                return timer
+        return None
+
+    def _run(self, timer: Timer) -> None:
+        try:
+            timer.callback(*timer.args)
+        except Exception:
+            logger.exception(f"Scheduled callback {timer.callback} failed")
+
+    def advance(self, seconds: float) -> None:
+        """Moves a SimulatedClock forward, running every timer that falls due on the way."""
+        if not self.simulated:
+            raise RuntimeError("advance() is only available with a SimulatedClock")
+        target = self.clock.now + seconds
+        while True:
+            with self._cond:
+                if not self._heap or self._heap[0][0] > target:
+                    break
+                when = self._heap[0][0]
+                self.clock.now = max(self.clock.now, when)
+                timer = self._pop_due(self.clock.now)
+            if timer is not None:
+                self._run(timer)
+        self.clock.now = target
+
+    def start(self) -> None:
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                now = self.time()
+                timer = self._pop_due(now)
+                if timer is None:
+                    wait = self._heap[0][0] - now if self._heap else None
+                    self._cond.wait(timeout=wait)
+                    continue
+            self._executor.submit(self._run, timer)
+
+_default_scheduler: Optional[Scheduler] = None
+_default_lock = threading.Lock()
+
+def get_scheduler() -> Scheduler:
+    """Returns the process-wide scheduler used by live execution algorithms."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = Scheduler()
+        return _default_scheduler
@@ -1,19 +1,101 @@
-from typing import Dict, Any
-from ...utils.validation import validate_symbol, validate_quantity
+import random
+from typing import Dict, Any, Callable, Optional
 from ...logger import get_logger
+from ..pipeline import Order, ValidateStage
+from .parent import ParentOrder, start_parent, get_parent, cancel_parent
+from .scheduler import Scheduler
 
 logger = get_logger(__name__)
 
+# Symbol, side and quantity checks for a parent order (no exchange lot filters)
+_PARENT_CHECKS = ValidateStage(exchange_filters=False)
+
+class TwapExecution(ParentOrder):
+    """
+    A live TWAP parent order.
+
+    Each slice is a market order sized as the remaining quantity divided by the
+    remaining slices, so anything a slice fails to fill is carried into the
+    next one. Slices are fired by the shared Scheduler rather than by sleeping
+    in the caller's thread.
+
+    Args:
+        client: BinanceClient instance (dry-run or live).
+        symbol, side, total_quantity, slices, interval_seconds: As for execute_twap.
+        scheduler: Scheduler to run on (defaults to the process-wide one).
+        jitter: Fraction of interval_seconds to randomize each gap by (0.2 = +/-20%).
+        participation_rate: Max fraction of market volume per slice (requires volume_source).
+        volume_source: Callable (symbol, seconds) -> traded volume over the last `seconds`.
+        rng: Optional random.Random for reproducible jitter.
+    """
+
+    algo = "twap"
+
+    def __init__(
+        self,
+        client,
+        symbol: str,
+        side: str,
+        total_quantity: float,
+        slices: int,
+        interval_seconds: float,
+        scheduler: Optional[Scheduler] = None,
+        jitter: float = 0.0,
+        participation_rate: Optional[float] = None,
+        volume_source: Optional[Callable[[str, float], float]] = None,
+        rng: Optional[random.Random] = None
+    ):
+        super().__init__(client, symbol, side, total_quantity, interval_seconds, scheduler, jitter, rng)
+        self.slices = slices
+        self.participation_rate = participation_rate
+        self.volume_source = volume_source
+
+    @property
+    def twap_id(self) -> str:
+        return self.parent_id
+
+    def _progress(self) -> Dict[str, Any]:
+        return {"twap_id": self.parent_id, "slices": self.slices}
+
+    def _slice_quantity(self) -> float:
+        slices_left = self.slices - self.slices_sent
+        quantity = self.remaining_quantity / slices_left
+        if self.participation_rate is not None and self.volume_source is not None:
+            market_volume = self.volume_source(self.symbol, self.interval_seconds)
+            quantity = min(quantity, self.participation_rate * market_volume)
+        return quantity
+
+    def _finished(self) -> Optional[str]:
+        if self.slices_sent >= self.slices:
+            return self._out_of_slices()
+        return super()._finished()
+
+def start_twap(client, symbol: str, side: str, total_quantity: float, slices: int, interval_seconds: float, **kwargs) -> TwapExecution:
+    """Starts a TwapExecution and registers it so it can be looked up by id."""
+    return start_parent(TwapExecution(client, symbol, side, total_quantity, slices, interval_seconds, **kwargs))
+
+def get_twap(twap_id: str) -> Optional[TwapExecution]:
+    return get_parent(twap_id)
+
+def cancel_twap(twap_id: str) -> Dict[str, Any]:
+    if get_parent(twap_id) is None:
+        raise ValueError(f"Unknown TWAP id: {twap_id}")
+    return cancel_parent(twap_id)
+
 def execute_twap(
     client,
     symbol: str,
     side: str,
     total_quantity: float,
     slices: int,
-    interval_seconds: int
+    interval_seconds: int,
+    jitter: float = 0.0,
+    participation_rate: Optional[float] = None,
+    volume_source: Optional[Callable[[str, float], float]] = None,
+    scheduler: Optional[Scheduler] = None
 ) -> Dict[str, Any]:
     """
-    Executes a TWAP (Time-Weighted Average Price) strategy (Skeleton).
+    Executes a TWAP (Time-Weighted Average Price) strategy.
     
     Args:
         client: BinanceClient instance.
@@ -22,32 +104,21 @@ def execute_twap(
         total_quantity: Total quantity to trade.
         slices: Number of order slices.
         interval_seconds: Seconds between slices.
+        jitter: Fraction of the interval to randomize each gap by.
+        participation_rate: Max fraction of market volume per slice.
+        volume_source: Callable (symbol, seconds) -> recent market volume.
+        scheduler: Scheduler to run on (defaults to the process-wide one).
         
     Returns:
-        Structured response or dry-run details.
+        Dry-run plan, or the progress of the started execution (with its twap_id).
     """
     logger.info(f"Received TWAP Request: {side} {total_quantity} {symbol}")
     logger.info(f"Strategy: {slices} slices every {interval_seconds}s")
     
-    # 1. Validate Symbol
-    if not validate_symbol(symbol):
-        error_msg = f"Invalid symbol: {symbol}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-        
-    # 2. Validate Side
-    if side not in ["BUY", "SELL"]:
-        error_msg = f"Invalid side: {side}. Must be BUY or SELL."
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-        
-    # 3. Validate Quantity
-    if not validate_quantity(total_quantity):
-        error_msg = f"Invalid total quantity: {total_quantity}"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
+    # 1. Validate Symbol, Side and Total Quantity
+    _PARENT_CHECKS.process(Order(symbol, side, "MARKET", total_quantity))
 
-    # 4. Validate Slices and Interval
+    # 2. Validate Slices and Interval
     if slices <= 0:
         error_msg = f"Invalid slices: {slices}. Must be > 0."
         logger.error(error_msg)
@@ -58,6 +129,21 @@ def execute_twap(
         logger.error(error_msg)
         raise ValueError(error_msg)
 
+    if not 0 <= jitter < 1:
+        error_msg = f"Invalid jitter: {jitter}. Must be in [0, 1)."
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    if participation_rate is not None and not 0 < participation_rate <= 1:
+        error_msg = f"Invalid participation rate: {participation_rate}. Must be in (0, 1]."
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    # 3. Pre-trade risk limits on the whole parent (each slice is checked again when it is sent)
+    risk = getattr(client, "risk", None)
+    if risk is not None:
+        risk.check(symbol, side, total_quantity)
+
     quantity_per_slice = total_quantity / slices
     
     # Dry-run logic
@@ -71,6 +157,11 @@ def execute_twap(
             "interval_seconds": interval_seconds
         }
         
-    # Live mode logic (Not implemented yet)
-    logger.warning("TWAP live execution not implemented yet.")
-    return {"status": "todo", "detail": "TWAP live execution not implemented yet"}
+    execution = start_twap(
+        client, symbol, side, total_quantity, slices, interval_seconds,
+        scheduler=scheduler,
+        jitter=jitter,
+        participation_rate=participation_rate,
+        volume_source=volume_source
+    )
+    return {"action": "twap", **execution.progress()}
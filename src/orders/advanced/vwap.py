@@ -0,0 +1,195 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+from ...config import CONFIG
+from ...logger import get_logger
+from ..pipeline import Order, ValidateStage
+from .parent import ParentOrder, start_parent
+from .scheduler import Scheduler
+
+logger = get_logger(__name__)
+
+DAY = 86400
+
+# Symbol, side and quantity checks for a parent order (no exchange lot filters)
+_PARENT_CHECKS = ValidateStage(exchange_filters=False)
+
+# (symbol, bucket_seconds) -> (profile, loaded_at)
+_profiles: Dict[Tuple[str, int], Tuple["VolumeProfile", float]] = {}
+_profiles_lock = threading.Lock()
+
+class VolumeProfile:
+    """
+    The share of a day's volume traded in each intraday bucket (UTC), averaged
+    over historical klines.
+
+    cumulative(t) is the expected volume traded up to epoch second `t` in
+    units of one average day (linear inside a bucket), so the share of
+    [t0, t1) is one subtraction at any horizon, including across midnight.
+
+    Args:
+        weights: Volume per bucket (any scale; normalized to sum to 1).
+        bucket_seconds: Bucket width; must divide a day.
+    """
+
+    def __init__(self, weights: Sequence[float], bucket_seconds: int = 300):
+        if DAY % bucket_seconds:
+            raise ValueError(f"bucket_seconds must divide a day: {bucket_seconds}")
+        if len(weights) != DAY // bucket_seconds:
+            raise ValueError(f"Expected {DAY // bucket_seconds} buckets, got {len(weights)}")
+        total = float(sum(weights))
+        n = len(weights)
+        # A profile with no volume at all degrades to a flat one (plain TWAP)
+        self.weights = [float(w) / total for w in weights] if total > 0 else [1.0 / n] * n
+        self.bucket_seconds = bucket_seconds
+        self._cum = [0.0]
+        for w in self.weights:
+            self._cum.append(self._cum[-1] + w)
+
+    @classmethod
+    def from_klines(cls, open_time_ms, volume, bucket_seconds: int = 300) -> "VolumeProfile":
+        """Builds a profile from kline open times (epoch ms) and volumes (e.g. ColumnStore columns)."""
+        from ...backtest.data import _numpy
+        np = _numpy()
+        buckets = (np.asarray(open_time_ms, dtype=np.int64) // 1000 % DAY) // bucket_seconds
+        weights = np.bincount(buckets, weights=np.asarray(volume, dtype=np.float64), minlength=DAY // bucket_seconds)
+        return cls(weights.tolist(), bucket_seconds)
+
+    def cumulative(self, t: float) -> float:
+        day, tod = divmod(t, DAY)
+        idx = int(tod // self.bucket_seconds)
+        return day + self._cum[idx] + self.weights[idx] * (tod - idx * self.bucket_seconds) / self.bucket_seconds
+
+    def share(self, start: float, end: float) -> float:
+        """Expected fraction of one day's volume traded in [start, end) (epoch seconds)."""
+        return self.cumulative(end) - self.cumulative(start)
+
+def get_volume_profile(symbol: str, data_dir: str = "data", days: Optional[int] = None, bucket_seconds: int = 300,
+                       ttl: float = DAY) -> VolumeProfile:
+    """
+    The intraday volume profile of `symbol`, cached in memory for `ttl` seconds.
+
+    Built from the last `days` days (default VWAP_PROFILE_DAYS) of klines in
+    the local column store under `data_dir`, downloading whatever is missing
+    first (downloads resume, so only the newest bars are fetched on refresh).
+    """
+    key = (symbol, bucket_seconds)
+    with _profiles_lock:
+        cached = _profiles.get(key)
+        if cached is not None and time.time() - cached[1] < ttl:
+            return cached[0]
+
+    from ...backtest.download import HistoryDownloader, dataset_path
+    from ...backtest.store import ColumnStore
+
+    days = days or CONFIG.VWAP_PROFILE_DAYS
+    interval = "5m" if bucket_seconds % 300 == 0 else "1m"
+    start_ms = (int(time.time()) // DAY - days) * DAY * 1000
+    result = HistoryDownloader(data_dir).download([symbol], kind="klines", start=start_ms, interval=interval)[symbol]
+    if "error" in result and not result.get("total"):
+        raise ValueError(f"No kline history for {symbol}: {result['error']}")
+    columns = ColumnStore(dataset_path(data_dir, "klines", symbol, interval)).read(start=start_ms, columns=["volume"])
+    profile = VolumeProfile.from_klines(columns["open_time"], columns["volume"], bucket_seconds)
+    logger.info(f"Volume profile for {symbol}: {len(columns['volume'])} bars over {days} days")
+    with _profiles_lock:
+        _profiles[key] = (profile, time.time())
+    return profile
+
+class VwapExecution(ParentOrder):
+    """
+    A VWAP parent order: `slices` children over `duration_seconds`, sized so
+    that the cumulative quantity tracks the expected cumulative market volume
+    from the intraday profile. Each child is the schedule target for the end
+    of its interval minus what has filled, so a short fill is made up by the
+    next child.
+
+    Args:
+        client, symbol, side, total_quantity: The parent order.
+        duration_seconds: Time to work the order over.
+        slices: Number of children.
+        profile: VolumeProfile of the symbol.
+        start_time: Epoch seconds the schedule starts at, for the profile lookup (default now).
+        scheduler: Scheduler to run on (defaults to the process-wide one).
+    """
+
+    algo = "vwap"
+
+    def __init__(self, client, symbol: str, side: str, total_quantity: float, duration_seconds: float, slices: int,
+                 profile: VolumeProfile, start_time: Optional[float] = None, scheduler: Optional[Scheduler] = None):
+        super().__init__(client, symbol, side, total_quantity, duration_seconds / slices, scheduler)
+        self.duration_seconds = duration_seconds
+        self.slices = slices
+        self.profile = profile
+        self.start_time = time.time() if start_time is None else start_time
+        self._window = profile.share(self.start_time, self.start_time + duration_seconds)
+
+    def target_quantity(self, slice_no: int) -> float:
+        """Cumulative quantity the schedule wants done by the end of slice `slice_no`."""
+        if slice_no >= self.slices:
+            return self.total_quantity
+        end = self.start_time + slice_no * self.interval_seconds
+        if self._window <= 0:
+            return self.total_quantity * slice_no / self.slices
+        return self.total_quantity * self.profile.share(self.start_time, end) / self._window
+
+    def _progress(self) -> Dict[str, Any]:
+        return {"slices": self.slices, "duration_seconds": self.duration_seconds}
+
+    def _slice_quantity(self) -> float:
+        return min(self.remaining_quantity, max(0.0, self.target_quantity(self.slices_sent + 1) - self.filled_quantity))
+
+    def _finished(self) -> Optional[str]:
+        if self.slices_sent >= self.slices:
+            return self._out_of_slices()
+        return super()._finished()
+
+def execute_vwap(
+    client,
+    symbol: str,
+    side: str,
+    total_quantity: float,
+    duration_seconds: float,
+    slices: int,
+    profile: Optional[VolumeProfile] = None,
+    scheduler: Optional[Scheduler] = None
+) -> Dict[str, Any]:
+    """
+    Executes a VWAP (Volume-Weighted Average Price) strategy.
+
+    Args:
+        client: BinanceClient instance.
+        symbol: Trading pair symbol.
+        side: "BUY" or "SELL".
+        total_quantity: Total quantity to trade.
+        duration_seconds: Time to work the order over.
+        slices: Number of child orders.
+        profile: Intraday volume profile (default: get_volume_profile(symbol)).
+        scheduler: Scheduler to run on (defaults to the process-wide one).
+
+    Returns:
+        Dry-run plan, or the progress of the started execution (with its parent_id).
+    """
+    logger.info(f"Received VWAP Request: {side} {total_quantity} {symbol} over {duration_seconds}s in {slices} slices")
+    _PARENT_CHECKS.process(Order(symbol, side, "MARKET", total_quantity))
+    if slices <= 0 or duration_seconds <= 0:
+        error_msg = f"Invalid schedule: {slices} slices over {duration_seconds}s. Both must be > 0."
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    risk = getattr(client, "risk", None)
+    if risk is not None:
+        risk.check(symbol, side, total_quantity)
+
+    execution = VwapExecution(client, symbol, side, total_quantity, duration_seconds, slices,
+                              profile or get_volume_profile(symbol), scheduler=scheduler)
+    if client.dry_run:
+        schedule = [execution.target_quantity(k) for k in range(slices + 1)]
+        logger.info(f"Dry-run VWAP: {slices} slices")
+        return {
+            "status": "dry-run",
+            "action": "vwap",
+            "slices": slices,
+            "interval_seconds": execution.interval_seconds,
+            "quantities": [b - a for a, b in zip(schedule, schedule[1:])]
+        }
+    return {"action": "vwap", **start_parent(execution).progress()}
@@ -0,0 +1,480 @@
+import asyncio
+import functools
+import hashlib
+import hmac
+import json
+import logging
+import time
+from typing import Optional, Dict, Any, List, Union
+from urllib.parse import urlencode
+from src.config import CONFIG
+from src.logger import get_logger
+from src.metrics import METRICS
+from .binance_client import BinanceClient, build_market_params, build_limit_params, _batch_param
+from .journal import OrderJournal, new_client_order_id, response_fields
+from .rate_limiter import RateLimiter, get_rate_limiter, ENDPOINT_COST, PRIORITY_CANCEL, PRIORITY_ORDER, PRIORITY_QUERY
+from .retry import OrderRetrier, RetryPolicy, ORDER_NOT_FOUND, UNKNOWN, classify_error
+from .risk import RiskEngine, RiskLimits
+
+logger = get_logger(__name__)
+
+class BinanceAPIError(RuntimeError):
+    """
+    An error response from the exchange, with the same attributes as the
+    connector's ClientError/ServerError so retry.classify_error() and the
+    journal treat sync and async failures alike.
+    """
+
+    def __init__(self, status_code: int, error_code: Optional[int], error_message: Any, header=None):
+        super().__init__(f"Binance API error {status_code}: {error_message}")
+        self.status_code = status_code
+        self.error_code = error_code
+        self.error_message = error_message
+        self.header = header
+
+class _Blocking:
+    """Blocking view of an AsyncBinanceClient for sync code on a worker thread (journal recovery)."""
+
+    def __init__(self, client: "AsyncBinanceClient", loop: asyncio.AbstractEventLoop):
+        self._client = client
+        self._loop = loop
+
+    def __getattr__(self, name: str):
+        method = getattr(self._client, name)
+
+        def call(*args, **kwargs):
+            return asyncio.run_coroutine_threadsafe(method(*args, **kwargs), self._loop).result()
+        return call
+
+def _encode_params(params: Dict[str, Any]) -> str:
+    """URL-encodes request params the way Binance expects (lowercase booleans, no None values)."""
+    cleaned = {}
+    for k, v in params.items():
+        if v is None:
+            continue
+        if isinstance(v, bool):
+            v = "true" if v else "false"
+        cleaned[k] = v
+    return urlencode(cleaned, True).replace("%40", "@")
+
+class AsyncBinanceClient:
+    """
+    Asyncio counterpart of BinanceClient.
+
+    Keeps one aiohttp session with a bounded keep-alive connection pool for the
+    lifetime of the client, so concurrent requests reuse warm TLS connections
+    instead of opening a new one per call. Use it as an async context manager,
+    or call open()/close() explicitly.
+
+    Like BinanceClient it carries a RiskEngine (`risk`, checked by
+    OrderPipeline's RiskStage), journals live orders to the write-ahead
+    OrderJournal (recovered on open()) and retries them with the same
+    newClientOrderId. Hedging to a second endpoint is sync-only.
+    """
+
+    BATCH_SIZE = BinanceClient.BATCH_SIZE
+
+    def __init__(
+        self,
+        key: Optional[str] = None,
+        secret: Optional[str] = None,
+        dry_run: Optional[bool] = None,
+        base_url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        recv_window: int = 5000,
+        rate_limiter: Optional[RateLimiter] = None,
+        risk: Optional[RiskEngine] = None,
+        journal: Optional[OrderJournal] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        journaled: bool = True
+    ):
+        self.key = key or CONFIG.BINANCE_API_KEY
+        self.secret = secret or CONFIG.BINANCE_API_SECRET
+        self.dry_run = dry_run if dry_run is not None else CONFIG.DRY_RUN
+        self.base_url = (base_url or CONFIG.BINANCE_BASE_URL).rstrip("/")
+        self.pool_size = pool_size or CONFIG.HTTP_POOL_SIZE
+        self.timeout = timeout or CONFIG.HTTP_TIMEOUT
+        self.recv_window = recv_window
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        # Pre-trade limits and exposure; positions arrive through set_position / user-data events
+        self.risk = risk or RiskEngine(RiskLimits.from_config())
+        self.retrier = OrderRetrier(retry_policy or RetryPolicy(
+            max_attempts=CONFIG.ORDER_RETRY_ATTEMPTS,
+            base_delay=CONFIG.ORDER_RETRY_BASE_DELAY,
+            max_delay=CONFIG.ORDER_RETRY_MAX_DELAY
+        ))
+        self.journal = journal
+        # journaled=False: a client that never places orders (e.g. the listen-key client of a
+        # user-data stream) must not open the ORDER_JOURNAL file another client writes to
+        if self.journal is None and journaled and not self.dry_run and CONFIG.ORDER_JOURNAL:
+            self.journal = OrderJournal(CONFIG.ORDER_JOURNAL, fsync=CONFIG.ORDER_JOURNAL_FSYNC)
+        self._recovered = False
+
+        self.session = None
+        self._connection_errors: tuple = ()
+
+        logger.info(f"Initializing AsyncBinanceClient (Dry Run: {self.dry_run}, Pool: {self.pool_size})")
+
+    def clone(self) -> "AsyncBinanceClient":
+        """
+        A client for another event loop (an aiohttp session only works on the
+        loop that opened it) sharing this one's credentials, rate limiter,
+        risk engine and journal. Its open() does not recover the journal again.
+        """
+        other = AsyncBinanceClient(
+            self.key, self.secret, self.dry_run, self.base_url, self.pool_size, self.timeout, self.recv_window,
+            self.rate_limiter, self.risk, self.journal, self.retrier.policy, journaled=False
+        )
+        other._recovered = True
+        return other
+
+    async def open(self) -> "AsyncBinanceClient":
+        if self.dry_run or self.session is not None:
+            return self
+
+        try:
+            import aiohttp
+        except ImportError:
+            logger.error("aiohttp not installed. Async live mode requires it.")
+            raise ImportError("Please install 'aiohttp' to run the async client in live mode.")
+
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_size,
+            keepalive_timeout=60,
+            ttl_dns_cache=300
+        )
+        headers = {"X-MBX-APIKEY": self.key} if self.key else {}
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._connection_errors = (aiohttp.ClientConnectionError,)
+        logger.info(f"Opened keep-alive session to {self.base_url}")
+        if self.journal is not None and not self._recovered:
+            self._recovered = True
+            try:
+                # recover() is blocking; it runs on a worker thread and calls back into this loop
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.journal.recover, _Blocking(self, loop))
+            except Exception:
+                logger.exception("Order journal recovery failed")
+        return self
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        self.retrier.close()
+
+    async def __aenter__(self) -> "AsyncBinanceClient":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def _sign(self, query: str) -> str:
+        return hmac.new(self.secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+
+    async def _request(self, method: str, path: str, params: Optional[Dict[str, Any]] = None, signed: bool = False, endpoint: str = "time", priority: int = PRIORITY_QUERY) -> Any:
+        if self.session is None:
+            await self.open()
+
+        weight, orders = ENDPOINT_COST[endpoint]
+        METRICS.observe("client_stage", await self.rate_limiter.acquire_async(weight, orders, priority), stage="rate_limit", endpoint=endpoint)
+
+        params = dict(params or {})
+        if signed:
+            params["recvWindow"] = self.recv_window
+            params["timestamp"] = int(time.time() * 1000)
+        query = _encode_params(params)
+        if signed:
+            with METRICS.span("client_stage", stage="sign", endpoint=endpoint):
+                query = f"{query}&signature={self._sign(query)}"
+
+        url = f"{self.base_url}{path}"
+        if query:
+            url = f"{url}?{query}"
+
+        with METRICS.span("client_stage", stage="request", endpoint=endpoint):
+            try:
+                async with self.session.request(method, url) as resp:
+                    self.rate_limiter.update_from_headers(resp.headers)
+                    if resp.status in (418, 429):
+                        self.rate_limiter.penalize(float(resp.headers.get("Retry-After", 60)))
+                    data = await resp.json(content_type=None)
+            except self._connection_errors as e:
+                # Dropped connections leave an order's fate open, like requests' ConnectionError
+                raise ConnectionError(str(e)) from e
+        if resp.status >= 400:
+            METRICS.inc("exchange_errors", status=resp.status, endpoint=endpoint)
+            code = data.get("code") if isinstance(data, dict) and resp.status < 500 else None
+            raise BinanceAPIError(resp.status, code, data.get("msg", data) if isinstance(data, dict) else data, resp.headers)
+        return data
+
+    async def ping(self) -> Dict[str, Any]:
+        logger.debug("Pinging Binance API...")
+        if self.dry_run:
+            return {"status": "dry-run", "serverTime": int(time.time() * 1000)}
+
+        try:
+            return await self._request("GET", "/fapi/v1/time")
+        except Exception:
+            logger.exception("Error during ping")
+            raise
+
+    async def get_account(self) -> Dict[str, Any]:
+        logger.debug("Fetching account information...")
+        if self.dry_run:
+            return {
+                "status": "dry-run",
+                "assets": [],
+                "positions": [],
+                "canDeposit": True,
+                "canTrade": True,
+                "canWithdraw": True,
+                "feeTier": 0,
+                "updateTime": int(time.time() * 1000)
+            }
+
+        try:
+            return await self._request("GET", "/fapi/v2/account", signed=True, endpoint="account")
+        except Exception:
+            logger.exception("Error fetching account info")
+            raise
+
+    async def get_order_book(self, symbol: str, limit: int = 1000) -> Dict[str, Any]:
+        logger.debug(f"Fetching depth snapshot for {symbol}...")
+        if self.dry_run:
+            return {"status": "dry-run", "lastUpdateId": 0, "bids": [], "asks": []}
+
+        try:
+            return await self._request("GET", "/fapi/v1/depth", {"symbol": symbol, "limit": limit}, endpoint="depth")
+        except Exception:
+            logger.exception(f"Error fetching depth for {symbol}")
+            raise
+
+    async def new_listen_key(self) -> Dict[str, Any]:
+        if self.dry_run:
+            return {"status": "dry-run", "listenKey": "dry-run"}
+        return await self._request("POST", "/fapi/v1/listenKey", endpoint="listen_key")
+
+    async def keepalive_listen_key(self, listen_key: str) -> Dict[str, Any]:
+        if self.dry_run:
+            return {"status": "dry-run"}
+        return await self._request("PUT", "/fapi/v1/listenKey", {"listenKey": listen_key}, endpoint="listen_key")
+
+    async def get_balance(self, asset: str = "USDT") -> float:
+        account = await self.get_account()
+        if self.dry_run:
+            # Mock balance for dry run
+            return 10000.0
+
+        for bal in account.get("assets", []):
+            if bal.get("asset") == asset:
+                return float(bal.get("walletBalance", 0.0))
+        return 0.0
+
+    async def create_market_order(self, symbol: str, side: str, quantity: float, reduce_only: bool = False, client_order_id: Optional[str] = None, priority: int = PRIORITY_ORDER) -> Dict[str, Any]:
+        logger.info("Placing MARKET Order: %s %s %s (ReduceOnly: %s)", side, quantity, symbol, reduce_only)
+
+        if self.dry_run:
+            return {
+                "status": "dry-run",
+                "action": "create_market_order",
+                "payload": build_market_params(symbol, side, quantity, reduce_only, client_order_id)
+            }
+
+        cid = client_order_id or new_client_order_id()
+        await self._journal_submit(cid, symbol, side, "MARKET", quantity)
+        params = build_market_params(symbol, side, quantity, reduce_only, cid)
+        try:
+            response = await self._place(params, priority)
+            logger.info("Market Order Placed: %s", response.get("orderId"))
+            self._journal_result(params, response)
+            return response
+        except Exception as e:
+            self._journal_result(params, error=e)
+            logger.exception(f"Failed to place market order: {side} {symbol}")
+            raise
+
+    async def create_limit_order(self, symbol: str, side: str, quantity: float, price: float, timeInForce: str = "GTC", reduce_only: bool = False, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        logger.info("Placing LIMIT Order: %s %s %s @ %s (ReduceOnly: %s)", side, quantity, symbol, price, reduce_only)
+
+        if self.dry_run:
+            return {
+                "status": "dry-run",
+                "action": "create_limit_order",
+                "payload": build_limit_params(symbol, side, quantity, price, timeInForce, reduce_only, client_order_id)
+            }
+
+        cid = client_order_id or new_client_order_id()
+        await self._journal_submit(cid, symbol, side, "LIMIT", quantity, price)
+        params = build_limit_params(symbol, side, quantity, price, timeInForce, reduce_only, cid)
+        try:
+            response = await self._place(params)
+            logger.info("Limit Order Placed: %s", response.get("orderId"))
+            self._journal_result(params, response)
+            return response
+        except Exception as e:
+            self._journal_result(params, error=e)
+            logger.exception(f"Failed to place limit order: {side} {symbol} @ {price}")
+            raise
+
+    async def _place(self, params: Dict[str, Any], priority: int = PRIORITY_ORDER) -> Dict[str, Any]:
+        """Sends a new order through the retrier (same newClientOrderId on every attempt)."""
+        send = functools.partial(self._request, "POST", "/fapi/v1/order", signed=True, endpoint="order", priority=priority)
+        return await self.retrier.submit_async(params, send, self._lookup_order)
+
+    async def _lookup_order(self, symbol: str, client_order_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.query_order(symbol, orig_client_order_id=client_order_id)
+        except Exception as e:
+            if getattr(e, "error_code", None) == ORDER_NOT_FOUND:
+                return None
+            raise
+
+    async def _journal_submit(self, cid: str, symbol: str, side: str, order_type: str, quantity: float, price: Optional[float] = None) -> None:
+        """Journals the intent to place order `cid` before it is sent (the fsync wait runs off the event loop)."""
+        if self.journal is not None:
+            append = functools.partial(self.journal.append, "submit", cid, durable=True, symbol=symbol, side=side, type=order_type, quantity=quantity, price=price)
+            await asyncio.get_running_loop().run_in_executor(None, append)
+
+    def _journal_result(self, params: Dict[str, Any], response: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None) -> None:
+        cid = params.get("newClientOrderId")
+        if self.journal is None or not cid:
+            return
+        if error is None and "code" not in response:
+            self.journal.append("ack", cid, **response_fields(response))
+        elif error is None:
+            self.journal.append("error", cid, status="REJECTED", error=response.get("msg"))
+        elif classify_error(error) == UNKNOWN:
+            # The order may be live; left open for recovery
+            self.journal.append("error", cid, error=str(error))
+        else:
+            self.journal.append("error", cid, status="REJECTED", error=str(error))
+
+    async def modify_order(self, symbol: str, side: str, quantity: float, price: float, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """Async counterpart of BinanceClient.modify_order."""
+        logger.info("Modifying Order: %s %s %s %s @ %s", symbol, order_id or orig_client_order_id, side, quantity, price)
+        params = {"symbol": symbol, "side": side, "quantity": quantity, "price": str(price), "orderId": order_id, "origClientOrderId": orig_client_order_id}
+
+        if self.dry_run:
+            return {"status": "dry-run", "action": "modify_order", "payload": params}
+
+        return await self._request("PUT", "/fapi/v1/order", params, signed=True, endpoint="modify_order", priority=PRIORITY_ORDER)
+
+    async def cancel_order(self, symbol: str, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        logger.info("Cancelling Order: %s %s", symbol, order_id or orig_client_order_id)
+        params = {"symbol": symbol, "orderId": order_id, "origClientOrderId": orig_client_order_id}
+
+        if self.dry_run:
+            return {"status": "dry-run", "action": "cancel_order", "payload": params}
+
+        try:
+            response = await self._request("DELETE", "/fapi/v1/order", params, signed=True, endpoint="cancel_order", priority=PRIORITY_CANCEL)
+            logger.info("Order Cancelled: %s", response.get("orderId"))
+            return response
+        except Exception:
+            logger.exception(f"Failed to cancel order: {symbol} {order_id or orig_client_order_id}")
+            raise
+
+    async def cancel_all_open_orders(self, symbol: str, priority: int = PRIORITY_CANCEL) -> Dict[str, Any]:
+        """Async counterpart of BinanceClient.cancel_all_open_orders."""
+        logger.info("Cancelling all open orders: %s", symbol)
+        if self.dry_run:
+            return {"status": "dry-run", "action": "cancel_all_open_orders", "payload": {"symbol": symbol}}
+
+        try:
+            return await self._request("DELETE", "/fapi/v1/allOpenOrders", {"symbol": symbol}, signed=True, endpoint="cancel_all", priority=priority)
+        except Exception:
+            logger.exception(f"Failed to cancel open orders: {symbol}")
+            raise
+
+    async def get_open_orders(self, symbol: Optional[str] = None, priority: int = PRIORITY_QUERY) -> List[Dict[str, Any]]:
+        if self.dry_run:
+            return []
+        return await self._request("GET", "/fapi/v1/openOrders", {"symbol": symbol}, signed=True,
+                                   endpoint="open_orders" if symbol else "open_orders_all", priority=priority)
+
+    async def get_positions(self, priority: int = PRIORITY_QUERY) -> List[Dict[str, Any]]:
+        """Async counterpart of BinanceClient.get_positions."""
+        if self.dry_run:
+            return []
+        positions = await self._request("GET", "/fapi/v3/positionRisk", signed=True, endpoint="position_risk", priority=priority)
+        return [p for p in positions if float(p.get("positionAmt", 0) or 0)]
+
+    async def query_order(self, symbol: str, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        params = {"symbol": symbol, "orderId": order_id, "origClientOrderId": orig_client_order_id}
+        if self.dry_run:
+            return {"status": "dry-run", "action": "query_order", "payload": params}
+        return await self._request("GET", "/fapi/v1/order", params, signed=True, endpoint="query_order")
+
+    async def create_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Async counterpart of BinanceClient.create_batch_orders (at most BATCH_SIZE orders)."""
+        if len(orders) > self.BATCH_SIZE:
+            raise ValueError(f"batchOrders accepts at most {self.BATCH_SIZE} orders, got {len(orders)}")
+        logger.info("Placing BATCH of %d orders", len(orders))
+
+        if self.dry_run:
+            return [
+                {"status": "dry-run", "action": "create_batch_orders", "payload": params}
+                for params in orders
+            ]
+
+        if self.journal is not None:
+            orders = [
+                params if params.get("newClientOrderId") else {**params, "newClientOrderId": new_client_order_id()}
+                for params in orders
+            ]
+            await asyncio.get_running_loop().run_in_executor(None, self.journal.append_submits, orders)
+        try:
+            batch = json.dumps([{k: _batch_param(v) for k, v in params.items()} for params in orders], separators=(",", ":"))
+            response = await self._request("POST", "/fapi/v1/batchOrders", {"batchOrders": batch}, signed=True, endpoint="batch_orders", priority=PRIORITY_ORDER)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Batch Placed: %s", [r.get("orderId", r.get("code")) for r in response])
+            for params, r in zip(orders, response):
+                self._journal_result(params, r)
+            return response
+        except Exception as e:
+            for params in orders:
+                self._journal_result(params, error=e)
+            logger.exception(f"Failed to place batch of {len(orders)} orders")
+            raise
+
+    async def submit_orders(self, orders: List[Dict[str, Any]]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Submits many orders concurrently over the shared connection pool.
+
+        Args:
+            orders: List of dicts with keys "type" ("MARKET" or "LIMIT"), "symbol",
+                "side", "quantity", and "price" / "timeInForce" / "reduce_only" as needed.
+
+        Returns:
+            One entry per order, in input order: the API response, or the
+            exception raised for that order (other orders are unaffected).
+        """
+        logger.info("Submitting %d orders concurrently", len(orders))
+        tasks = []
+        for order in orders:
+            order_type = order.get("type", "MARKET").upper()
+            if order_type == "MARKET":
+                tasks.append(self.create_market_order(
+                    order["symbol"], order["side"], order["quantity"],
+                    reduce_only=order.get("reduce_only", False)
+                ))
+            elif order_type == "LIMIT":
+                tasks.append(self.create_limit_order(
+                    order["symbol"], order["side"], order["quantity"], order["price"],
+                    timeInForce=order.get("timeInForce", "GTC"),
+                    reduce_only=order.get("reduce_only", False)
+                ))
+            else:
+                tasks.append(self._reject(ValueError(f"Unsupported order type: {order_type}")))
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _reject(error: Exception):
+        raise error
@@ -0,0 +1,58 @@
+import csv
+import json
+from typing import Dict, Any, List
+from ..logger import get_logger
+from .pipeline import Order, get_pipeline
+
+logger = get_logger(__name__)
+
+def load_orders_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Reads orders from a CSV (header: symbol,side,type,quantity[,price,reduce_only])
+    or JSONL file (one order object per line).
+
+    Args:
+        path: Path to a .csv, .jsonl or .json file.
+
+    Returns:
+        List of raw order dicts (not yet validated).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            return [{k.strip(): v.strip() for k, v in row.items() if v is not None and v.strip()} for row in csv.DictReader(f)]
+        if path.lower().endswith(".json"):
+            return json.load(f)
+        return [json.loads(line) for line in f if line.strip()]
+
+def place_batch_orders(client, orders: List[Dict[str, Any]], max_workers: int = 8) -> List[Dict[str, Any]]:
+    """
+    Runs orders through the client's OrderPipeline as one batch: each is
+    validated and risk-checked, then the survivors are submitted as
+    concurrent batchOrders calls of up to BinanceClient.BATCH_SIZE orders each.
+
+    Args:
+        client: Instance of BinanceClient.
+        orders: Raw order dicts with symbol, side, type (default MARKET), quantity,
+            and price for LIMIT orders (see Order.from_dict).
+        max_workers: Number of batch requests in flight at once.
+
+    Returns:
+        One result per input order, in input order:
+        {"index": i, "status": "ok", "response": {...}} or {"index": i, "status": "error", "error": "..."}.
+    """
+    logger.info("Received Batch Order Request: %d orders", len(orders))
+    return _results(get_pipeline(client).run_batch([Order.from_dict(o) for o in orders], max_workers))
+
+async def place_batch_orders_async(client, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    place_batch_orders for an AsyncBinanceClient: chunks are submitted
+    concurrently with asyncio.gather over the client's connection pool.
+    """
+    logger.info("Received Batch Order Request: %d orders", len(orders))
+    return _results(await get_pipeline(client).run_batch_async([Order.from_dict(o) for o in orders]))
+
+def _results(orders: List[Order]) -> List[Dict[str, Any]]:
+    results = [order.result(i) for i, order in enumerate(orders)]
+    ok = sum(1 for r in results if r["status"] == "ok")
+    logger.info("Batch complete: %d/%d accepted", ok, len(results))
+    return results
@@ -1,37 +1,266 @@
+import functools
+import hashlib
+import hmac
+import json
 import logging
+import re
 import time
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List
+from urllib.parse import quote_plus, urlsplit
 from src.config import CONFIG
 from src.logger import get_logger
+from src.utils.exchange_info import get_exchange_info_cache
+from src.orders.account_state import AccountState
+from src.orders.journal import OrderJournal, new_client_order_id, response_fields
+from src.orders.retry import OrderRetrier, RetryPolicy, ORDER_NOT_FOUND, UNKNOWN, classify_error
+from src.orders.risk import RiskEngine, RiskLimits
+from src.orders.rate_limiter import RateLimiter, call_limited, get_rate_limiter, PRIORITY_CANCEL, PRIORITY_ORDER, PRIORITY_QUERY
 
 logger = get_logger(__name__)
 
+def build_market_params(symbol: str, side: str, quantity: float, reduce_only: bool = False, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+    """Order parameters for a MARKET order, shared by the sync and async clients."""
+    params = {
+        "symbol": symbol,
+        "side": side,
+        "type": "MARKET",
+        "quantity": quantity,
+        "reduceOnly": reduce_only
+    }
+    if client_order_id:
+        params["newClientOrderId"] = client_order_id
+    return params
+
+def build_limit_params(symbol: str, side: str, quantity: float, price: float, timeInForce: str = "GTC", reduce_only: bool = False, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+    """Order parameters for a LIMIT order, shared by the sync and async clients."""
+    params = {
+        "symbol": symbol,
+        "side": side,
+        "type": "LIMIT",
+        "quantity": quantity,
+        "price": str(price),
+        "timeInForce": timeInForce,
+        "reduceOnly": reduce_only
+    }
+    if client_order_id:
+        params["newClientOrderId"] = client_order_id
+    return params
+
+def _batch_param(value: Any) -> str:
+    """batchOrders entries are sent as JSON strings; booleans must be lowercase."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+# Characters urlencode() leaves as they are; anything else in a value is percent-encoded
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.~@-]")
+
+def _query_value(value: Any) -> str:
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    value = str(value)
+    return quote_plus(value, safe="@") if _UNSAFE.search(value) else value
+
+def _json_loads():
+    """orjson.loads when installed (several times faster on order responses), else json.loads."""
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        return json.loads
+
+class FastOrderApi:
+    """
+    Lean signed REST calls for the order endpoints (new, modify, cancel,
+    query), with the same method signatures and return shape as the
+    connector's UMFutures methods.
+
+    The connector re-keys HMAC with the secret, url-encodes the parameters
+    twice (once to sign, once more inside requests) and runs requests' full
+    request preparation on every call. Here the secret is keyed into an HMAC
+    object once and copied per request, the query is filled into a
+    pre-encoded template per parameter set, the request goes straight to the
+    urllib3 pool behind the connector's session, the body is decoded with
+    orjson when available, and only the rate-limit usage headers are read.
+
+    Args:
+        connector: UMFutures whose session (connection pool, API-key header),
+            base URL and timeout are reused.
+        secret: API secret.
+    """
+
+    ORDER_PATH = "/fapi/v1/order"
+    USAGE_HEADERS = ("x-mbx-used-weight-1m", "x-mbx-order-count-10s", "x-mbx-order-count-1m")
+
+    def __init__(self, connector, secret: str):
+        import urllib3
+        from binance.error import ClientError, ServerError
+        self._errors = (ClientError, ServerError)
+        self._urllib3 = urllib3
+        base_url = connector.base_url
+        self._path = urlsplit(base_url).path.rstrip("/") + self.ORDER_PATH
+        self._pool = connector.session.get_adapter(base_url).poolmanager.connection_from_url(base_url)
+        self._headers = dict(connector.session.headers)
+        self._timeout = connector.timeout
+        self._mac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+        self._loads = _json_loads()
+        # Parameter names -> "a={}&b={}&timestamp={}"
+        self._templates: Dict[tuple, str] = {}
+
+    def query(self, params: Dict[str, Any]) -> str:
+        """The signed query string for `params` (None values dropped, timestamp appended)."""
+        if None in params.values():
+            params = {k: v for k, v in params.items() if v is not None}
+        keys = tuple(params)
+        template = self._templates.get(keys)
+        if template is None:
+            template = self._templates[keys] = "".join(f"{quote_plus(k)}={{}}&" for k in keys) + "timestamp={}"
+        query = template.format(*map(_query_value, params.values()), int(time.time() * 1000))
+        mac = self._mac.copy()
+        mac.update(query.encode())
+        return f"{query}&signature={mac.hexdigest()}"
+
+    def parse(self, status: int, body: bytes, headers) -> Dict[str, Any]:
+        """Connector-shaped result ({"limit_usage", "data"}) or the connector's ClientError / ServerError."""
+        client_error, server_error = self._errors
+        if status >= 500:
+            raise server_error(status, body.decode(errors="replace"))
+        try:
+            data = self._loads(body)
+        except ValueError:
+            if status >= 400:
+                raise client_error(status, None, body.decode(errors="replace"), headers)
+            data = body.decode(errors="replace")
+        if status >= 400:
+            raise client_error(status, data.get("code"), data.get("msg"), headers)
+        usage = {}
+        for name in self.USAGE_HEADERS:
+            value = headers.get(name)
+            if value is not None:
+                usage[name] = value
+        return {"limit_usage": usage, "data": data}
+
+    def _request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{self._path}?{self.query(params)}"
+        try:
+            response = self._pool.urlopen(method, url, headers=self._headers, timeout=self._timeout, retries=False, redirect=False)
+        except self._urllib3.exceptions.HTTPError as e:
+            # Same exception types as the connector path, so retries classify them alike
+            import requests
+            if isinstance(e, self._urllib3.exceptions.TimeoutError):
+                raise requests.exceptions.Timeout(e)
+            raise requests.exceptions.ConnectionError(e)
+        return self.parse(response.status, response.data, response.headers)
+
+    def new_order(self, **params) -> Dict[str, Any]:
+        return self._request("POST", params)
+
+    def modify_order(self, symbol: str, side: str, quantity: float, price: float, orderId: Optional[int] = None, origClientOrderId: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        params = {"symbol": symbol, "side": side, "quantity": quantity, "price": price}
+        return self._request("PUT", self._with_order_id(params, orderId, origClientOrderId, kwargs))
+
+    def cancel_order(self, symbol: str, orderId: Optional[int] = None, origClientOrderId: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        return self._request("DELETE", self._with_order_id({"symbol": symbol}, orderId, origClientOrderId, kwargs))
+
+    def query_order(self, symbol: str, orderId: Optional[int] = None, origClientOrderId: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        return self._request("GET", self._with_order_id({"symbol": symbol}, orderId, origClientOrderId, kwargs))
+
+    @staticmethod
+    def _with_order_id(params: Dict[str, Any], order_id, orig_client_order_id, extra: Dict[str, Any]) -> Dict[str, Any]:
+        # As in the connector: orderId wins when both are given
+        if order_id:
+            params["orderId"] = order_id
+        elif orig_client_order_id is not None:
+            params["origClientOrderId"] = orig_client_order_id
+        else:
+            raise ValueError("Either orderId or origClientOrderId is required")
+        params.update((k, v) for k, v in extra.items() if v is not None)
+        return params
+
 class BinanceClient:
-    def __init__(self, key: Optional[str] = None, secret: Optional[str] = None, dry_run: Optional[bool] = None):
+    # Binance accepts at most this many orders per batchOrders call
+    BATCH_SIZE = 5
+
+    def __init__(self, key: Optional[str] = None, secret: Optional[str] = None, dry_run: Optional[bool] = None, base_url: Optional[str] = None, rate_limiter: Optional[RateLimiter] = None, journal: Optional[OrderJournal] = None, retry_policy: Optional[RetryPolicy] = None, hedge_base_url: Optional[str] = None, timeout: Optional[float] = None, risk: Optional[RiskEngine] = None):
         self.key = key or CONFIG.BINANCE_API_KEY
         self.secret = secret or CONFIG.BINANCE_API_SECRET
         self.dry_run = dry_run if dry_run is not None else CONFIG.DRY_RUN
+        self.base_url = base_url or CONFIG.BINANCE_BASE_URL
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        # Balances/positions served from memory; see AccountState
+        self.account_state = AccountState(self, ttl=CONFIG.ACCOUNT_STATE_TTL)
+        # Write-ahead log of live orders; see OrderJournal
+        self.journal = journal
+        # Idempotent order retries (same newClientOrderId on every attempt); see OrderRetrier
+        self.retrier = OrderRetrier(retry_policy or RetryPolicy(
+            max_attempts=CONFIG.ORDER_RETRY_ATTEMPTS,
+            base_delay=CONFIG.ORDER_RETRY_BASE_DELAY,
+            max_delay=CONFIG.ORDER_RETRY_MAX_DELAY,
+            hedge_after=CONFIG.ORDER_HEDGE_AFTER
+        ))
+        # Pre-trade limits and incrementally tracked exposure; see RiskEngine
+        self.risk = risk or RiskEngine(RiskLimits.from_config(), position_source=self.get_position)
+        self.hedge_base_url = hedge_base_url if hedge_base_url is not None else CONFIG.ORDER_HEDGE_URL
+        self.timeout = timeout or CONFIG.HTTP_TIMEOUT
         
         self.client = None
+        self.hedge_client = None
+        # Order endpoints: FastOrderApi, or the connector itself with ORDER_FAST_PATH=false
+        self.order_api = None
+        self.hedge_order_api = None
         
         logger.info(f"Initializing BinanceClient (Dry Run: {self.dry_run})")
         
         if not self.dry_run:
             try:
                 from binance.um_futures import UMFutures
-                self.client = UMFutures(key=self.key, secret=self.secret)
+                self.client = UMFutures(key=self.key, secret=self.secret, base_url=self.base_url, timeout=self.timeout, show_limit_usage=True)
+                self._size_pool(self.client)
                 logger.info("Connected to Binance UMFutures Client")
+                if self.hedge_base_url:
+                    self.hedge_client = UMFutures(key=self.key, secret=self.secret, base_url=self.hedge_base_url, timeout=self.timeout, show_limit_usage=True)
+                    self._size_pool(self.hedge_client)
+                    logger.info(f"Hedging slow orders to {self.hedge_base_url}")
+                self.order_api = FastOrderApi(self.client, self.secret) if CONFIG.ORDER_FAST_PATH else self.client
+                if self.hedge_client is not None:
+                    self.hedge_order_api = FastOrderApi(self.hedge_client, self.secret) if CONFIG.ORDER_FAST_PATH else self.hedge_client
+                get_exchange_info_cache().set_loader(self.get_exchange_info)
             except ImportError:
                 logger.error("binance-connector-python not installed. Live mode requires it.")
                 raise ImportError("Please install 'binance-connector' to run in live mode.")
 
+            if self.journal is None and CONFIG.ORDER_JOURNAL:
+                self.journal = OrderJournal(CONFIG.ORDER_JOURNAL, fsync=CONFIG.ORDER_JOURNAL_FSYNC)
+            if self.journal is not None:
+                try:
+                    self.journal.recover(self)
+                except Exception:
+                    logger.exception("Order journal recovery failed")
+
+    @staticmethod
+    def _size_pool(connector) -> None:
+        """Keeps up to HTTP_POOL_SIZE warm connections for concurrent callers (batches, kill switch)."""
+        from requests.adapters import HTTPAdapter
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CONFIG.HTTP_POOL_SIZE)
+        connector.session.mount("https://", adapter)
+        connector.session.mount("http://", adapter)
+
+    def _call(self, endpoint: str, fn, priority: int = PRIORITY_QUERY, **params) -> Any:
+        """
+        Runs a connector call through the shared rate limiter and feeds the
+        X-MBX-* usage headers of the response back into it.
+        """
+        return call_limited(self.rate_limiter, endpoint, fn, priority, **params)
+
     def ping(self) -> Dict[str, Any]:
         logger.debug("Pinging Binance API...")
         if self.dry_run:
             return {"status": "dry-run", "serverTime": int(time.time() * 1000)}
         
         try:
-            return self.client.time()
+            return self._call("time", self.client.time)
         except Exception as e:
             logger.exception("Error during ping")
             raise
@@ -51,84 +280,280 @@ class BinanceClient:
             }
         
         try:
-            return self.client.account()
+            return self._call("account", self.client.account)
         except Exception as e:
             logger.exception("Error fetching account info")
             raise
 
+    def get_exchange_info(self) -> Dict[str, Any]:
+        logger.debug("Fetching exchange info...")
+        if self.dry_run:
+            return {"status": "dry-run", "symbols": []}
+
+        try:
+            return self._call("exchange_info", self.client.exchange_info)
+        except Exception as e:
+            logger.exception("Error fetching exchange info")
+            raise
+
     def get_balance(self, asset: str = "USDT") -> float:
-        account = self.get_account()
         if self.dry_run:
             # Mock balance for dry run
             return 10000.0
         
-        for bal in account.get("assets", []):
-            if bal.get("asset") == asset:
-                return float(bal.get("walletBalance", 0.0))
-        return 0.0
+        return self.account_state.balance(asset)
+
+    def get_position(self, symbol: str, position_side: str = "BOTH") -> float:
+        if self.dry_run:
+            return 0.0
+
+        return self.account_state.position(symbol, position_side)
 
-    def create_market_order(self, symbol: str, side: str, quantity: float, reduce_only: bool = False) -> Dict[str, Any]:
-        logger.info(f"Placing MARKET Order: {side} {quantity} {symbol} (ReduceOnly: {reduce_only})")
+    def create_market_order(self, symbol: str, side: str, quantity: float, reduce_only: bool = False, client_order_id: Optional[str] = None, priority: int = PRIORITY_ORDER) -> Dict[str, Any]:
+        logger.info("Placing MARKET Order: %s %s %s (ReduceOnly: %s)", side, quantity, symbol, reduce_only)
         
         if self.dry_run:
             return {
                 "status": "dry-run",
                 "action": "create_market_order",
-                "payload": {
-                    "symbol": symbol,
-                    "side": side,
-                    "type": "MARKET",
-                    "quantity": quantity,
-                    "reduceOnly": reduce_only
-                }
+                "payload": build_market_params(symbol, side, quantity, reduce_only, client_order_id)
             }
         
+        cid = client_order_id or new_client_order_id()
+        self._journal_submit(cid, symbol, side, "MARKET", quantity)
+        params = build_market_params(symbol, side, quantity, reduce_only, cid)
         try:
-            params = {
-                "symbol": symbol,
-                "side": side,
-                "type": "MARKET",
-                "quantity": quantity,
-                "reduceOnly": reduce_only
-            }
-            response = self.client.new_order(**params)
-            logger.info(f"Market Order Placed: {response.get('orderId')}")
+            response = self._place(params, priority)
+            logger.info("Market Order Placed: %s", response.get("orderId"))
+            self._journal_result(params, response)
+            self.account_state.apply_order_response(response)
             return response
         except Exception as e:
+            self._journal_result(params, error=e)
             logger.exception(f"Failed to place market order: {side} {symbol}")
             raise
 
-    def create_limit_order(self, symbol: str, side: str, quantity: float, price: float, timeInForce: str = "GTC", reduce_only: bool = False) -> Dict[str, Any]:
-        logger.info(f"Placing LIMIT Order: {side} {quantity} {symbol} @ {price} (ReduceOnly: {reduce_only})")
+    def create_limit_order(self, symbol: str, side: str, quantity: float, price: float, timeInForce: str = "GTC", reduce_only: bool = False, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        logger.info("Placing LIMIT Order: %s %s %s @ %s (ReduceOnly: %s)", side, quantity, symbol, price, reduce_only)
         
         if self.dry_run:
             return {
                 "status": "dry-run",
                 "action": "create_limit_order",
+                "payload": build_limit_params(symbol, side, quantity, price, timeInForce, reduce_only, client_order_id)
+            }
+        
+        cid = client_order_id or new_client_order_id()
+        self._journal_submit(cid, symbol, side, "LIMIT", quantity, price)
+        params = build_limit_params(symbol, side, quantity, price, timeInForce, reduce_only, cid)
+        try:
+            response = self._place(params)
+            logger.info("Limit Order Placed: %s", response.get("orderId"))
+            self._journal_result(params, response)
+            self.account_state.apply_order_response(response)
+            return response
+        except Exception as e:
+            self._journal_result(params, error=e)
+            logger.exception(f"Failed to place limit order: {side} {symbol} @ {price}")
+            raise
+
+    def modify_order(self, symbol: str, side: str, quantity: float, price: float, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Amends a resting LIMIT order's price and/or quantity in place
+        (PUT /fapi/v1/order). The order keeps its id but loses queue priority.
+        """
+        logger.info("Modifying Order: %s %s %s %s @ %s", symbol, order_id or orig_client_order_id, side, quantity, price)
+
+        if self.dry_run:
+            return {
+                "status": "dry-run",
+                "action": "modify_order",
                 "payload": {
                     "symbol": symbol,
                     "side": side,
-                    "type": "LIMIT",
                     "quantity": quantity,
                     "price": str(price),
-                    "timeInForce": timeInForce,
-                    "reduceOnly": reduce_only
+                    "orderId": order_id,
+                    "origClientOrderId": orig_client_order_id
                 }
             }
-        
+
+        try:
+            response = self._call("modify_order", self.order_api.modify_order, PRIORITY_ORDER, symbol=symbol, side=side, quantity=quantity, price=str(price), orderId=order_id, origClientOrderId=orig_client_order_id)
+            self.account_state.apply_order_response(response)
+            return response
+        except Exception as e:
+            logger.exception(f"Failed to modify order: {symbol} {order_id or orig_client_order_id} @ {price}")
+            raise
+
+    def create_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Places up to BATCH_SIZE orders in one batchOrders request.
+
+        Args:
+            orders: Order params as built by build_market_params / build_limit_params.
+
+        Returns:
+            One response per order, in order. Rejected orders come back as
+            {"code": ..., "msg": ...} entries rather than raising.
+        """
+        if len(orders) > self.BATCH_SIZE:
+            raise ValueError(f"batchOrders accepts at most {self.BATCH_SIZE} orders, got {len(orders)}")
+        logger.info("Placing BATCH of %d orders", len(orders))
+
+        if self.dry_run:
+            return [
+                {"status": "dry-run", "action": "create_batch_orders", "payload": params}
+                for params in orders
+            ]
+
+        if self.journal is not None:
+            orders = [
+                params if params.get("newClientOrderId") else {**params, "newClientOrderId": new_client_order_id()}
+                for params in orders
+            ]
+            # One disk wait for the whole batch; raises (nothing sent) if any intent was not written
+            self.journal.append_submits(orders)
+        try:
+            batch = [{k: _batch_param(v) for k, v in params.items()} for params in orders]
+            response = self._call("batch_orders", self.client.new_batch_order, PRIORITY_ORDER, batchOrders=batch)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Batch Placed: %s", [r.get("orderId", r.get("code")) for r in response])
+            for params, r in zip(orders, response):
+                self._journal_result(params, r)
+                self.account_state.apply_order_response(r)
+            return response
+        except Exception as e:
+            for params in orders:
+                self._journal_result(params, error=e)
+            logger.exception(f"Failed to place batch of {len(orders)} orders")
+            raise
+
+    def _place(self, params: Dict[str, Any], priority: int = PRIORITY_ORDER) -> Dict[str, Any]:
+        """Sends a new order through the retrier (and the hedge endpoint, if configured)."""
+        send = self._send_order
+        hedge = self._send_hedge if self.hedge_client is not None else None
+        if priority != PRIORITY_ORDER:
+            send = functools.partial(send, priority=priority)
+            hedge = hedge and functools.partial(hedge, priority=priority)
+        return self.retrier.submit(params, send, self._lookup_order, hedge)
+
+    def _send_order(self, params: Dict[str, Any], priority: int = PRIORITY_ORDER) -> Dict[str, Any]:
+        return self._call("order", self.order_api.new_order, priority, **params)
+
+    def _send_hedge(self, params: Dict[str, Any], priority: int = PRIORITY_ORDER) -> Dict[str, Any]:
+        return self._call("order", self.hedge_order_api.new_order, priority, **params)
+
+    def _lookup_order(self, symbol: str, client_order_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.query_order(symbol, orig_client_order_id=client_order_id)
+        except Exception as e:
+            if getattr(e, "error_code", None) == ORDER_NOT_FOUND:
+                return None
+            raise
+
+    def _journal_submit(self, cid: str, symbol: str, side: str, order_type: str, quantity: float, price: Optional[float] = None) -> None:
+        """Journals the intent to place order `cid` before it is sent."""
+        if self.journal is not None:
+            self.journal.append("submit", cid, durable=True, symbol=symbol, side=side, type=order_type, quantity=quantity, price=price)
+
+    def _journal_result(self, params: Dict[str, Any], response: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None) -> None:
+        cid = params.get("newClientOrderId")
+        if self.journal is None or not cid:
+            return
+        if error is None and "code" not in response:
+            self.journal.append("ack", cid, **response_fields(response))
+        elif error is None:
+            self.journal.append("error", cid, status="REJECTED", error=response.get("msg"))
+        elif classify_error(error) == UNKNOWN:
+            # Timeout, 5xx, "send status unknown" or duplicate client id: the
+            # order may be live, so it is left open for recovery
+            self.journal.append("error", cid, error=str(error))
+        else:
+            # The exchange answered with a final error: the order was rejected
+            self.journal.append("error", cid, status="REJECTED", error=str(error))
+
+    def get_open_orders(self, symbol: Optional[str] = None, priority: int = PRIORITY_QUERY) -> List[Dict[str, Any]]:
+        logger.debug(f"Fetching open orders for {symbol or 'all symbols'}...")
+        if self.dry_run:
+            return []
+
         try:
-            params = {
-                "symbol": symbol,
-                "side": side,
-                "type": "LIMIT",
-                "quantity": quantity,
-                "price": str(price),
-                "timeInForce": timeInForce,
-                "reduceOnly": reduce_only
+            if symbol is None:
+                # One call for every symbol, at the higher all-symbols weight
+                return self._call("open_orders_all", self.client.get_orders, priority)
+            return self._call("open_orders", self.client.get_orders, priority, symbol=symbol)
+        except Exception as e:
+            logger.exception(f"Error fetching open orders for {symbol}")
+            raise
+
+    def get_positions(self, priority: int = PRIORITY_QUERY) -> List[Dict[str, Any]]:
+        """Every open position (non-zero positionAmt), straight from the exchange."""
+        logger.debug("Fetching open positions...")
+        if self.dry_run:
+            return []
+
+        try:
+            positions = self._call("position_risk", self.client.get_position_risk, priority)
+        except Exception:
+            logger.exception("Error fetching positions")
+            raise
+        return [p for p in positions if float(p.get("positionAmt", 0) or 0)]
+
+    def query_order(self, symbol: str, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        logger.debug(f"Querying order {symbol} {order_id or orig_client_order_id}...")
+        if self.dry_run:
+            return {
+                "status": "dry-run",
+                "action": "query_order",
+                "payload": {
+                    "symbol": symbol,
+                    "orderId": order_id,
+                    "origClientOrderId": orig_client_order_id
+                }
+            }
+
+        return self._call("query_order", self.order_api.query_order, symbol=symbol, orderId=order_id, origClientOrderId=orig_client_order_id)
+
+    def cancel_order(self, symbol: str, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        logger.info("Cancelling Order: %s %s", symbol, order_id or orig_client_order_id)
+
+        if self.dry_run:
+            return {
+                "status": "dry-run",
+                "action": "cancel_order",
+                "payload": {
+                    "symbol": symbol,
+                    "orderId": order_id,
+                    "origClientOrderId": orig_client_order_id
+                }
             }
-            response = self.client.new_order(**params)
-            logger.info(f"Limit Order Placed: {response.get('orderId')}")
+
+        try:
+            response = self._call("cancel_order", self.order_api.cancel_order, PRIORITY_CANCEL, symbol=symbol, orderId=order_id, origClientOrderId=orig_client_order_id)
+            logger.info("Order Cancelled: %s", response.get("orderId"))
+            self.risk.update_order(response.get("orderId"), response.get("executedQty"), response.get("status"), int(response.get("updateTime") or 0))
             return response
         except Exception as e:
-            logger.exception(f"Failed to place limit order: {side} {symbol} @ {price}")
+            logger.exception(f"Failed to cancel order: {symbol} {order_id or orig_client_order_id}")
+            raise
+
+    def cancel_all_open_orders(self, symbol: str, priority: int = PRIORITY_CANCEL) -> Dict[str, Any]:
+        """Cancels every open order on `symbol` in one request."""
+        logger.info("Cancelling all open orders: %s", symbol)
+
+        if self.dry_run:
+            return {
+                "status": "dry-run",
+                "action": "cancel_all_open_orders",
+                "payload": {"symbol": symbol}
+            }
+
+        try:
+            response = self._call("cancel_all", self.client.cancel_open_orders, priority, symbol=symbol)
+            logger.info("All Orders Cancelled: %s", symbol)
+            self.risk.cancel_symbol(symbol)
+            return response
+        except Exception as e:
+            logger.exception(f"Failed to cancel open orders: {symbol}")
             raise
@@ -0,0 +1,376 @@
+import bisect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+# Order states that can no longer change on the exchange
+TERMINAL_STATUSES = {"FILLED", "CANCELED", "EXPIRED", "EXPIRED_IN_MATCH", "REJECTED", "NOT_FOUND"}
+
+# Binance error code for "Order does not exist"
+ORDER_NOT_FOUND = -2013
+
+# Fields copied from journal records into the indexed order state
+_STATE_FIELDS = (
+    "symbol", "side", "type", "quantity", "price", "orderId", "status",
+    "executedQty", "avgPrice", "error", "adopted"
+)
+
+def new_client_order_id(prefix: str = "tb") -> str:
+    """A unique newClientOrderId (Binance allows up to 36 chars of [.A-Za-z0-9:/_-])."""
+    return f"{prefix}-{uuid.uuid4().hex[:30]}"
+
+def response_fields(response: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of an order response worth journaling."""
+    return {k: response[k] for k in ("orderId", "status", "executedQty", "avgPrice", "symbol", "side", "type") if k in response}
+
+class OrderJournal:
+    """
+    Append-only JSONL write-ahead log of order lifecycle events.
+
+    Every order is keyed by its newClientOrderId. The intent is journaled (and
+    made durable) before the request goes out, so after a crash each in-flight
+    order can be looked up on the exchange. A single writer thread does group
+    commit: whatever was appended while the previous write/fsync ran goes out in
+    the next one, so concurrent orders share one fsync.
+
+    State is indexed in memory by client id, exchange order id, symbol and
+    creation time. compact() writes a snapshot of that state and truncates the
+    log; it also runs automatically every `compact_every` records.
+
+    Args:
+        path: Journal file. The snapshot lives next to it as "<path>.snapshot".
+        fsync: fsync each batch (survives power loss) or only flush to the OS
+            (survives a process crash).
+        compact_every: Records between automatic compactions (0 disables).
+        retention_seconds: Terminal orders older than this are dropped on compaction.
+    """
+
+    def __init__(self, path: str, fsync: bool = True, compact_every: int = 10000, retention_seconds: float = 7 * 86400):
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot"
+        self.fsync = fsync
+        self.compact_every = compact_every
+        self.retention_seconds = retention_seconds
+
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.by_order_id: Dict[Any, str] = {}
+        self.by_symbol: Dict[str, set] = defaultdict(set)
+        self._created: List[tuple] = []
+
+        self.seq = 0
+        self.batches = 0
+        self.records_written = 0
+        self._load()
+
+        self._synced_seq = self.seq
+        # (first seq, last seq, error) of recent batches that did not reach the file
+        self._failed = deque(maxlen=64)
+        self.write_errors = 0
+        self.last_error: Optional[str] = None
+        self._since_compact = 0
+        self._pending: List[bytes] = []
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._closed = False
+        self._file = open(self.path, "ab")
+        self._writer = threading.Thread(target=self._run, name="order-journal", daemon=True)
+        self._writer.start()
+
+    # Loading
+
+    def _load(self) -> None:
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            snapshot_seq = snapshot["seq"]
+            for state in snapshot["orders"]:
+                self._index(state)
+            self.seq = snapshot_seq
+
+        if not os.path.exists(self.path):
+            return
+        good = 0
+        replayed = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash; everything after it is discarded
+                    break
+                good += len(line)
+                if record["seq"] > snapshot_seq:
+                    self._apply(record)
+                    self.seq = record["seq"]
+                    replayed += 1
+        if good < os.path.getsize(self.path):
+            logger.warning(f"Order journal {self.path}: discarding torn tail after {good} bytes")
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+        logger.info(f"Order journal loaded: {len(self.orders)} orders ({replayed} records replayed)")
+
+    # Indexing
+
+    def _index(self, state: Dict[str, Any]) -> None:
+        cid = state["clientOrderId"]
+        if cid not in self.orders:
+            bisect.insort(self._created, (state.get("createdAt", 0), cid))
+        self.orders[cid] = state
+        if state.get("orderId") is not None:
+            self.by_order_id[state["orderId"]] = cid
+        if state.get("symbol"):
+            self.by_symbol[state["symbol"]].add(cid)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        cid = record["cid"]
+        state = self.orders.get(cid)
+        if state is None:
+            state = {"clientOrderId": cid, "createdAt": record["ts"], "status": "PENDING"}
+            self.orders[cid] = state
+            self._created.append((record["ts"], cid))
+        for key in _STATE_FIELDS:
+            if key in record:
+                state[key] = record[key]
+        state["updatedAt"] = record["ts"]
+        state["event"] = record["event"]
+        if record.get("orderId") is not None:
+            self.by_order_id[record["orderId"]] = cid
+        if state.get("symbol"):
+            self.by_symbol[state["symbol"]].add(cid)
+
+    # Writing
+
+    def append(self, event: str, client_order_id: str, durable: bool = False, **fields) -> int:
+        """
+        Journals one event for an order and updates the index.
+
+        Args:
+            event: "submit" (intent, before sending), "ack", "error" or "update".
+            client_order_id: The order's newClientOrderId.
+            durable: Wait until the record is on disk (use for "submit").
+            **fields: Order fields (symbol, side, status, orderId, executedQty, ...).
+
+        Returns:
+            The record's sequence number.
+
+        Raises:
+            OSError: With `durable`, when the record could not be written; the
+                order is marked REJECTED in memory and must not be sent.
+        """
+        with self._cond:
+            if self._closed:
+                raise ValueError("Order journal is closed")
+            self.seq += 1
+            seq = self.seq
+            record = {"seq": seq, "ts": int(time.time() * 1000), "event": event, "cid": client_order_id, **fields}
+            self._apply(record)
+            self._pending.append(json.dumps(record, separators=(",", ":"), default=str).encode() + b"\n")
+            self._cond.notify_all()
+            if durable:
+                self._wait_durable(seq, seq, [client_order_id])
+        return seq
+
+    def append_submits(self, orders: List[Dict[str, Any]]) -> None:
+        """
+        Journals the "submit" intents of a batch of orders with a single wait
+        for the disk, as append(durable=True) would for each of them.
+
+        Args:
+            orders: Order params (newClientOrderId, symbol, side, type, quantity, price).
+
+        Raises:
+            OSError: When any of the records could not be written; every order
+                of the batch is marked REJECTED in memory and none may be sent.
+        """
+        seqs = [
+            self.append("submit", params["newClientOrderId"], symbol=params["symbol"], side=params["side"],
+                        type=params["type"], quantity=params["quantity"], price=params.get("price"))
+            for params in orders
+        ]
+        if seqs:
+            with self._cond:
+                self._wait_durable(seqs[0], seqs[-1], [params["newClientOrderId"] for params in orders])
+
+    def _wait_durable(self, first_seq: int, last_seq: int, client_order_ids: List[str]) -> None:
+        """Waits for records first_seq..last_seq to be written; raises if any was not (caller holds _cond)."""
+        while self._synced_seq < last_seq and not self._closed:
+            self._cond.wait()
+        error = next((e for first, last, e in self._failed if first <= last_seq and last >= first_seq), None)
+        if error is None:
+            return
+        ts = int(time.time() * 1000)
+        for cid in client_order_ids:
+            self._apply({"seq": last_seq, "ts": ts, "event": "error", "cid": cid,
+                         "status": "REJECTED", "error": f"journal write failed: {error}"})
+        raise OSError(f"Order journal write failed, {', '.join(client_order_ids)} not sent: {error}") from error
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+                first, last = self._synced_seq + 1, self.seq
+            error = None
+            start = None
+            with self._io_lock:
+                try:
+                    start = self._file.tell()
+                    self._file.write(b"".join(batch))
+                    self._file.flush()
+                    if self.fsync:
+                        os.fsync(self._file.fileno())
+                except OSError as e:
+                    error = e
+                    logger.error(f"Order journal write failed: {e}")
+                    self._discard_tail(start)
+            with self._cond:
+                if error is not None:
+                    self._failed.append((first, last, error))
+                    self.write_errors += 1
+                    self.last_error = str(error)
+                self._synced_seq = max(self._synced_seq, last)
+                self.batches += 1
+                self.records_written += len(batch)
+                self._since_compact += len(batch)
+                self._cond.notify_all()
+            if self.compact_every and self._since_compact >= self.compact_every:
+                self.compact()
+
+    def _discard_tail(self, size: Optional[int]) -> None:
+        """Cuts a partly written batch off the file so later records do not land behind a torn line."""
+        if size is None:
+            return
+        try:
+            self._file.truncate(size)
+        except (OSError, ValueError) as e:
+            logger.error(f"Order journal could not discard a partial write: {e}")
+
+    def flush(self) -> None:
+        """Blocks until everything appended so far is on disk."""
+        with self._cond:
+            target = self.seq
+            while self._synced_seq < target and not self._closed:
+                self._cond.wait()
+
+    def compact(self) -> None:
+        """Writes a snapshot of live state and truncates the log."""
+        with self._io_lock:
+            with self._cond:
+                cutoff = (time.time() - self.retention_seconds) * 1000
+                keep = [
+                    dict(s) for s in self.orders.values()
+                    if s["status"] not in TERMINAL_STATUSES or s.get("updatedAt", 0) >= cutoff
+                ]
+                seq = self.seq
+                self._since_compact = 0
+                if len(keep) < len(self.orders):
+                    self.orders, self.by_order_id, self.by_symbol, self._created = {}, {}, defaultdict(set), []
+                    for state in keep:
+                        self._index(state)
+
+            tmp = f"{self.snapshot_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"seq": seq, "orders": keep}, f, separators=(",", ":"), default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            # Records still pending have seq <= snapshot seq and are skipped on replay
+            self._file.close()
+            self._file = open(self.path, "wb")
+
+        with self._cond:
+            self._synced_seq = max(self._synced_seq, seq)
+            self._cond.notify_all()
+        logger.info(f"Order journal compacted: {len(keep)} orders kept at seq {seq}")
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        with self._io_lock:
+            self._file.close()
+
+    # Lookups
+
+    def get(self, client_order_id: str) -> Optional[Dict[str, Any]]:
+        return self.orders.get(client_order_id)
+
+    def get_by_order_id(self, order_id: Any) -> Optional[Dict[str, Any]]:
+        cid = self.by_order_id.get(order_id)
+        return self.orders.get(cid) if cid else None
+
+    def for_symbol(self, symbol: str) -> List[Dict[str, Any]]:
+        return [self.orders[cid] for cid in self.by_symbol.get(symbol, ()) if cid in self.orders]
+
+    def between(self, start_ms: int, end_ms: int) -> List[Dict[str, Any]]:
+        """Orders created in [start_ms, end_ms)."""
+        lo = bisect.bisect_left(self._created, (start_ms, ""))
+        hi = bisect.bisect_left(self._created, (end_ms, ""))
+        return [self.orders[cid] for _, cid in self._created[lo:hi] if cid in self.orders]
+
+    def open_orders(self) -> List[Dict[str, Any]]:
+        """Orders whose final state is not known yet (including never-acknowledged submits)."""
+        return [s for s in self.orders.values() if s["status"] not in TERMINAL_STATUSES]
+
+    # Recovery
+
+    def recover(self, client) -> Dict[str, int]:
+        """
+        Reconciles non-terminal journal orders with the exchange.
+
+        For every symbol with such orders, open orders are fetched once; orders
+        missing from that list are queried by client id to learn their final
+        state, and ones the exchange has never seen are marked NOT_FOUND.
+        Open orders on those symbols that the journal does not know are
+        recorded as adopted.
+
+        Args:
+            client: BinanceClient (needs get_open_orders and query_order).
+
+        Returns:
+            Counts of checked, updated, not-found and adopted orders.
+        """
+        summary = {"checked": 0, "updated": 0, "not_found": 0, "adopted": 0}
+        pending = self.open_orders()
+        symbols = sorted({s["symbol"] for s in pending if s.get("symbol")})
+        for symbol in symbols:
+            try:
+                live = {o.get("clientOrderId"): o for o in client.get_open_orders(symbol)}
+            except Exception as e:
+                logger.error(f"Journal recovery: open orders for {symbol} failed: {e}")
+                continue
+            for state in [s for s in pending if s.get("symbol") == symbol]:
+                cid = state["clientOrderId"]
+                summary["checked"] += 1
+                exchange_order = live.pop(cid, None)
+                if exchange_order is None:
+                    try:
+                        exchange_order = client.query_order(symbol, orig_client_order_id=cid)
+                    except Exception as e:
+                        if getattr(e, "error_code", None) == ORDER_NOT_FOUND:
+                            self.append("update", cid, status="NOT_FOUND")
+                            summary["not_found"] += 1
+                        else:
+                            logger.error(f"Journal recovery: query {cid} failed: {e}")
+                        continue
+                self.append("update", cid, **response_fields(exchange_order))
+                summary["updated"] += 1
+            for cid, exchange_order in live.items():
+                if cid and cid not in self.orders:
+                    self.append("update", cid, adopted=True, **response_fields(exchange_order))
+                    summary["adopted"] += 1
+        self.flush()
+        logger.info(f"Journal recovery: {summary}")
+        return summary
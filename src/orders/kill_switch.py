@@ -0,0 +1,230 @@
+import asyncio
+import functools
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from ..config import CONFIG
+from ..logger import get_logger
+from ..metrics import METRICS
+from .rate_limiter import PRIORITY_KILL
+
+logger = get_logger(__name__)
+
+# A reduce-only order with nothing left to reduce: the position is already flat
+REDUCE_ONLY_REJECTED = -2022
+
+# Rounds of check-and-sweep after the first pass
+VERIFY_ROUNDS = 2
+
+def _clients(target) -> Dict[str, Any]:
+    """Account tag -> client for an AccountRouter, a dict of clients or one client."""
+    if hasattr(target, "workers"):
+        return {tag: worker.client for tag, worker in target.workers.items()}
+    if isinstance(target, dict):
+        return dict(target)
+    return {"default": target}
+
+def _stop_algos(call) -> List[Any]:
+    """Stops every running parent order and OCO trigger locally; returns awaitables cancelling live pegs."""
+    from .advanced.oco import disarm_all
+    from .advanced.parent import cancel_parent, list_parents
+    from .advanced.peg import FINAL_STATUSES, cancel_pegged_order, list_pegged_orders
+
+    stopped = 0
+    for parent in list_parents():
+        if parent["status"] == "running":
+            cancel_parent(parent["parent_id"])
+            stopped += 1
+    if stopped:
+        logger.warning(f"Kill switch stopped {stopped} parent orders")
+    disarmed = disarm_all()
+    if disarmed:
+        logger.warning(f"Kill switch disarmed {disarmed} OCO orders")
+
+    async def cancel_peg(peg_id):
+        try:
+            await call(cancel_pegged_order, peg_id)
+        except Exception as e:
+            logger.error(f"Kill switch: peg {peg_id} cancel failed ({e})")
+
+    return [cancel_peg(p["peg_id"]) for p in list_pegged_orders() if p["status"] not in FINAL_STATUSES]
+
+class _AccountSweep:
+    """Cancels and flattens one account; every request is issued as soon as its symbol is known."""
+
+    def __init__(self, tag: str, client, call: Callable, flatten: bool):
+        self.tag = tag
+        self.client = client
+        self.call = call
+        self.flatten = flatten
+        self.cancelled = set()
+        self.closed = set()
+        self.report = {"cancelled": [], "closed": [], "errors": [], "remaining": {}}
+
+    def _error(self, symbol: str, action: str, error: Exception) -> None:
+        logger.error(f"Kill switch [{self.tag}]: {action} {symbol} failed ({error})")
+        self.report["errors"].append({"symbol": symbol, "action": action, "error": str(error)})
+
+    async def cancel(self, symbol: str, again: bool = False) -> None:
+        if symbol in self.cancelled and not again:
+            return
+        self.cancelled.add(symbol)
+        try:
+            await self.call(self.client.cancel_all_open_orders, symbol, priority=PRIORITY_KILL)
+        except Exception as e:
+            self._error(symbol, "cancel_all", e)
+            return
+        if symbol not in self.report["cancelled"]:
+            self.report["cancelled"].append(symbol)
+
+    async def close(self, symbol: str, amount: float, again: bool = False) -> None:
+        if symbol in self.closed and not again:
+            return
+        self.closed.add(symbol)
+        side = "SELL" if amount > 0 else "BUY"
+        quantity = round(abs(amount), 8)
+        try:
+            response = await self.call(self.client.create_market_order, symbol, side, quantity, reduce_only=True, priority=PRIORITY_KILL)
+        except Exception as e:
+            if getattr(e, "error_code", None) != REDUCE_ONLY_REJECTED:
+                self._error(symbol, "close", e)
+            return
+        self.report["closed"].append({"symbol": symbol, "side": side, "quantity": quantity, "orderId": response.get("orderId")})
+
+    async def _open_orders(self) -> List[Dict[str, Any]]:
+        return await self.call(self.client.get_open_orders, None, priority=PRIORITY_KILL)
+
+    async def _positions(self) -> List[Dict[str, Any]]:
+        positions = await self.call(self.client.get_positions, priority=PRIORITY_KILL)
+        one_way = []
+        for p in positions:
+            if p.get("positionSide", "BOTH") == "BOTH":
+                one_way.append(p)
+            elif p["symbol"] not in self.closed:
+                # Hedge-mode legs need positionSide orders; reduceOnly is not accepted there
+                self.closed.add(p["symbol"])
+                self._error(p["symbol"], "close", ValueError(f"hedge-mode {p['positionSide']} position not flattened"))
+        return one_way
+
+    async def _discover_orders(self) -> None:
+        try:
+            orders = await self._open_orders()
+        except Exception as e:
+            self._error("*", "open_orders", e)
+            return
+        await asyncio.gather(*(self.cancel(s) for s in {o["symbol"] for o in orders}))
+
+    async def _discover_positions(self) -> None:
+        try:
+            positions = await self._positions()
+        except Exception as e:
+            self._error("*", "positions", e)
+            return
+        await asyncio.gather(*(self.close(p["symbol"], float(p["positionAmt"])) for p in positions))
+
+    async def run(self, verify: bool) -> Dict[str, Any]:
+        # First pass: what the risk engine already knows goes out immediately,
+        # alongside the exchange-wide lookups that catch everything else
+        risk = getattr(self.client, "risk", None)
+        known = risk.active_symbols() if risk is not None else {}
+        tasks = [self.cancel(s) for s, state in known.items() if state["open_orders"]]
+        tasks.append(self._discover_orders())
+        if self.flatten:
+            tasks += [self.close(s, state["position"]) for s, state in known.items() if state["position"]]
+            tasks.append(self._discover_positions())
+        await asyncio.gather(*tasks)
+
+        for round_no in range(VERIFY_ROUNDS + 1 if verify else 0):
+            try:
+                orders, positions = await asyncio.gather(self._open_orders(), self._positions() if self.flatten else _empty())
+            except Exception as e:
+                self._error("*", "verify", e)
+                break
+            if risk is not None and self.flatten:
+                amounts = {p["symbol"]: float(p["positionAmt"]) for p in positions}
+                for symbol in known:
+                    risk.set_position(symbol, amounts.get(symbol, 0.0))
+            remaining = {}
+            for o in orders:
+                remaining.setdefault(o["symbol"], {"open_orders": 0, "position": 0.0})["open_orders"] += 1
+            for p in positions:
+                remaining.setdefault(p["symbol"], {"open_orders": 0, "position": 0.0})["position"] = float(p["positionAmt"])
+            self.report["remaining"] = remaining
+            if not remaining or round_no == VERIFY_ROUNDS:
+                break
+            logger.warning(f"Kill switch [{self.tag}]: {len(remaining)} symbols still open; sweeping again")
+            tasks = [self.cancel(s, again=True) for s, state in remaining.items() if state["open_orders"]]
+            tasks += [self.close(s, state["position"], again=True) for s, state in remaining.items() if state["position"]]
+            await asyncio.gather(*tasks)
+        return self.report
+
+async def _empty() -> List[Any]:
+    return []
+
+async def panic_async(target, flatten: bool = False, stop_algos: bool = True, verify: bool = True,
+                      max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Kill switch: cancels every open order on every symbol of every account
+    and, with `flatten`, closes every position with reduce-only MARKET orders.
+
+    All requests go out concurrently at PRIORITY_KILL, ahead of anything
+    already queued on the rate limiter. Symbols the client's RiskEngine
+    knows about are cancelled/closed straight away while one open-orders and
+    one position lookup per account find the rest, so an account whose local
+    state is current is flat after one round trip however many symbols it
+    trades. With `verify`, the exchange is re-checked and leftovers are swept
+    again (at most VERIFY_ROUNDS times).
+
+    Args:
+        target: AccountRouter, dict of account tag -> client, or one client
+            (BinanceClient or AsyncBinanceClient).
+        flatten: Also close every position.
+        stop_algos: Stop running TWAP/VWAP/POV parents and pegged orders first,
+            so they do not place new orders behind the sweep.
+        verify: Re-check the exchange and report what is left.
+        max_workers: Threads for blocking client calls (default KILL_SWITCH_WORKERS).
+
+    Returns:
+        Per account: symbols cancelled, positions closed, errors and what is
+        still open after the sweep, plus the overall status and duration.
+    """
+    clients = _clients(target)
+    started = time.perf_counter()
+    logger.warning(f"KILL SWITCH: cancelling all orders{' and flattening positions' if flatten else ''} on {len(clients)} account(s)")
+    executor = ThreadPoolExecutor(max_workers or CONFIG.KILL_SWITCH_WORKERS, thread_name_prefix="kill-switch")
+    loop = asyncio.get_running_loop()
+
+    async def call(fn, *args, **kwargs):
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args, **kwargs)
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    try:
+        pegs = _stop_algos(call) if stop_algos else []
+        sweeps = [_AccountSweep(tag, client, call, flatten) for tag, client in clients.items()]
+        results = await asyncio.gather(*(s.run(verify) for s in sweeps), *pegs)
+    finally:
+        executor.shutdown(wait=False)
+
+    elapsed = time.perf_counter() - started
+    accounts = dict(zip(clients, results[:len(sweeps)]))
+    METRICS.inc("kill_switch_triggered")
+    METRICS.observe("kill_switch", elapsed, flatten=flatten)
+    if all(getattr(c, "dry_run", False) for c in clients.values()):
+        status = "dry-run"
+    elif any(r["errors"] or r["remaining"] for r in accounts.values()):
+        status = "incomplete"
+    else:
+        status = "completed"
+    logger.warning(
+        f"KILL SWITCH {status} in {elapsed * 1000:.1f}ms: "
+        f"{sum(len(r['cancelled']) for r in accounts.values())} symbols cancelled, "
+        f"{sum(len(r['closed']) for r in accounts.values())} positions closed"
+    )
+    return {"status": status, "action": "panic", "flatten": flatten, "seconds": elapsed, "accounts": accounts}
+
+def panic(target, flatten: bool = False, stop_algos: bool = True, verify: bool = True,
+          max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Blocking panic_async() for the CLI and the Flask API (must not be called from a running event loop)."""
+    return asyncio.run(panic_async(target, flatten, stop_algos, verify, max_workers))
@@ -0,0 +1,438 @@
+import inspect
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+from ..logger import get_logger
+from ..metrics import METRICS
+from ..utils.exchange_info import get_exchange_info_cache
+from ..utils.validation import safe_float, validate_symbol, validate_quantity, validate_price, validate_notional, quantize_order
+from .binance_client import build_market_params, build_limit_params
+
+logger = get_logger(__name__)
+
+ORDER_TYPES = ("MARKET", "LIMIT")
+
+class Order:
+    """
+    One order moving through an OrderPipeline.
+
+    Stages read and adjust the order in place (validation rounds quantity and
+    price to the exchange filters, risk attaches its reservation, submission
+    sets the response), so one object is all a pipeline run allocates.
+    """
+
+    __slots__ = ("symbol", "side", "type", "quantity", "price", "time_in_force", "reduce_only", "client_order_id", "account", "reservation", "response", "error", "done")
+
+    def __init__(
+        self,
+        symbol: str,
+        side: str,
+        type: str = "MARKET",
+        quantity: Any = None,
+        price: Any = None,
+        time_in_force: str = "GTC",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None,
+        account: Optional[str] = None
+    ):
+        self.symbol = symbol
+        self.side = side
+        self.type = type
+        self.quantity = quantity
+        self.price = price
+        self.time_in_force = time_in_force
+        self.reduce_only = reduce_only
+        self.client_order_id = client_order_id
+        self.account = account
+        self.reservation = None
+        self.response: Optional[Dict[str, Any]] = None
+        self.error: Optional[Exception] = None
+        # Number of stages that processed the order; their complete() hooks run on the way out
+        self.done = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], account: Optional[str] = None) -> "Order":
+        """
+        Builds an order from loosely typed input (API body, CSV/JSONL row).
+
+        Fields are normalized but not validated; values that are not numbers
+        are kept as given so ValidateStage can report them.
+        """
+        order_type = str(data.get("type", "MARKET")).upper()
+        quantity = data.get("quantity")
+        price = data.get("price") if order_type == "LIMIT" else None
+        return cls(
+            symbol=str(data.get("symbol", "")).upper(),
+            side=str(data.get("side", "")).upper(),
+            type=order_type,
+            quantity=safe_float(quantity, quantity),
+            price=safe_float(price, price),
+            time_in_force=data.get("timeInForce", "GTC"),
+            reduce_only=str(data.get("reduce_only", data.get("reduceOnly", False))).lower() in ("true", "1", "yes"),
+            client_order_id=data.get("newClientOrderId"),
+            account=data.get("account", account)
+        )
+
+    def params(self) -> Dict[str, Any]:
+        """Exchange order parameters (as built by build_market_params / build_limit_params)."""
+        if self.type == "MARKET":
+            return build_market_params(self.symbol, self.side, self.quantity, self.reduce_only, self.client_order_id)
+        return build_limit_params(self.symbol, self.side, self.quantity, self.price, self.time_in_force, self.reduce_only, self.client_order_id)
+
+    def result(self, index: int) -> Dict[str, Any]:
+        """Batch result entry: {"index", "status": "ok", "response"} or {"index", "status": "error", "error"[, "code"]}."""
+        if self.error is None:
+            return {"index": index, "status": "ok", "response": self.response}
+        result = {"index": index, "status": "error", "error": str(self.error)}
+        if isinstance(self.response, dict) and "code" in self.response:
+            result["code"] = self.response["code"]
+        return result
+
+class Stage:
+    """
+    One step of an OrderPipeline.
+
+    process() runs on the way in and rejects an order by raising ValueError;
+    complete() runs on the way out, in reverse stage order, for every stage
+    whose process() succeeded, with order.response or order.error set.
+    """
+
+    name = "stage"
+    # The stage that sends the order; its failures count as errors, not rejections
+    submits = False
+
+    def process(self, order: Order) -> Any:
+        pass
+
+    def process_batch(self, orders: List[Order], max_workers: int = 8) -> Any:
+        """Processes many orders; a failure marks that order's error instead of raising."""
+        for order in orders:
+            try:
+                self.process(order)
+            except Exception as e:
+                order.error = e
+
+    def complete(self, order: Order) -> None:
+        pass
+
+class ValidateStage(Stage):
+    """
+    Symbol, side, type, quantity and price checks, then the exchange filters
+    (status, lot/tick size, minNotional) when exchange info is cached, after
+    rounding quantity and price to step and tick size.
+
+    Args:
+        exchange_filters: Apply the cached exchange filters (off for parent
+            orders such as a TWAP total, which is sent in smaller slices).
+    """
+
+    name = "validate"
+
+    def __init__(self, exchange_filters: bool = True):
+        self.exchange_filters = exchange_filters
+
+    def process(self, order: Order) -> None:
+        error = self.check(order)
+        if error is not None:
+            logger.error(error)
+            raise ValueError(error)
+
+    def check(self, order: Order) -> Optional[str]:
+        """Validates (and rounds) `order`; returns the rejection message, or None."""
+        symbol = order.symbol
+        if not validate_symbol(symbol):
+            return f"Invalid symbol: {symbol}"
+        if order.side not in ("BUY", "SELL"):
+            return f"Invalid side: {order.side}. Must be BUY or SELL."
+        if order.type not in ORDER_TYPES:
+            return f"Invalid type: {order.type}. Must be MARKET or LIMIT."
+        if not validate_quantity(order.quantity):
+            return f"Invalid quantity: {order.quantity}"
+        market = order.type == "MARKET"
+        if not market and not validate_price(order.price):
+            return f"Invalid price: {order.price}"
+
+        filters = get_exchange_info_cache().get(symbol) if self.exchange_filters else None
+        if filters is None:
+            return None
+        order.quantity, price = quantize_order(order.quantity, None if market else order.price, filters)
+        if not validate_symbol(symbol, filters):
+            return f"Symbol not trading: {symbol} ({filters.status})"
+        if market:
+            if not validate_quantity(order.quantity, filters, market=True):
+                return f"Quantity {order.quantity} outside {symbol} lot size [{filters.market_min_qty}, {filters.market_max_qty}] step {filters.step_size}"
+            return None
+        order.price = price
+        if not validate_quantity(order.quantity, filters):
+            return f"Quantity {order.quantity} outside {symbol} lot size [{filters.min_qty}, {filters.max_qty}] step {filters.step_size}"
+        if not validate_price(price, filters):
+            return f"Price {price} outside {symbol} price filter [{filters.min_price}, {filters.max_price}]"
+        if not validate_notional(order.quantity, price, filters):
+            return f"Notional {order.quantity * price} below {symbol} minimum {filters.min_notional}"
+        return None
+
+class RiskStage(Stage):
+    """Pre-trade limits: reserves the order's exposure, then settles it from the response or releases it."""
+
+    name = "risk"
+
+    def __init__(self, risk):
+        self.risk = risk
+
+    def process(self, order: Order) -> None:
+        order.reservation = self.risk.pre_trade(order.symbol, order.side, order.quantity, order.price, order.reduce_only)
+
+    def complete(self, order: Order) -> None:
+        if order.reservation is None:
+            return
+        if order.error is None:
+            self.risk.settle(order.reservation, order.response)
+        else:
+            self.risk.release(order.reservation)
+
+class PublishStage(Stage):
+    """Publishes accepted orders to an EventBus (dashboard push)."""
+
+    name = "publish"
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def complete(self, order: Order) -> None:
+        if order.error is None and isinstance(order.response, dict):
+            self.bus.publish_order(order.response, order.account)
+
+class SubmitStage(Stage):
+    """
+    Sends orders with the client's create_* methods, one at a time or as
+    concurrent batchOrders calls of up to BATCH_SIZE orders. Works with
+    BinanceClient (threads) and AsyncBinanceClient (asyncio.gather).
+    """
+
+    name = "submit"
+    submits = True
+
+    def __init__(self, client):
+        self.client = client
+        self.is_async = inspect.iscoroutinefunction(client.create_market_order)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _executor(self, max_workers: int) -> ThreadPoolExecutor:
+        # Kept between batches; rebuilt only when a caller asks for a different width
+        with self._pool_lock:
+            if self._pool is None or self._pool._max_workers != max_workers:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-submit")
+            return self._pool
+
+    def process(self, order: Order) -> Any:
+        client = self.client
+        kwargs = {"client_order_id": order.client_order_id} if order.client_order_id else {}
+        if order.type == "MARKET":
+            response = client.create_market_order(order.symbol, order.side, order.quantity, order.reduce_only, **kwargs)
+        else:
+            response = client.create_limit_order(order.symbol, order.side, order.quantity, order.price, order.time_in_force, order.reduce_only, **kwargs)
+        if self.is_async:
+            return self._await(order, response)
+        order.response = response
+
+    @staticmethod
+    async def _await(order: Order, pending) -> None:
+        order.response = await pending
+
+    def process_batch(self, orders: List[Order], max_workers: int = 8) -> Any:
+        size = self.client.BATCH_SIZE
+        chunks = [orders[n:n + size] for n in range(0, len(orders), size)]
+        if not chunks:
+            return None
+        if self.is_async:
+            return self._batch_async(chunks)
+        if len(chunks) == 1 or max_workers <= 1:
+            futures = None
+        else:
+            pool = self._executor(max_workers)
+            futures = [pool.submit(self.client.create_batch_orders, [o.params() for o in chunk]) for chunk in chunks]
+        for n, chunk in enumerate(chunks):
+            try:
+                responses = futures[n].result() if futures else self.client.create_batch_orders([o.params() for o in chunk])
+            except Exception as e:
+                responses = [e] * len(chunk)
+            self._apply(chunk, responses)
+
+    async def _batch_async(self, chunks: List[List[Order]]) -> None:
+        import asyncio
+        results = await asyncio.gather(
+            *(self.client.create_batch_orders([o.params() for o in chunk]) for chunk in chunks),
+            return_exceptions=True
+        )
+        for chunk, responses in zip(chunks, results):
+            self._apply(chunk, [responses] * len(chunk) if isinstance(responses, Exception) else responses)
+
+    @staticmethod
+    def _apply(chunk: List[Order], responses: Sequence[Any]) -> None:
+        for order, response in zip(chunk, responses):
+            if isinstance(response, Exception):
+                order.error = response
+                continue
+            order.response = response
+            if "code" in response and "orderId" not in response:
+                # Rejected inside the batch; the rest of the batch still went through
+                order.error = ValueError(response.get("msg"))
+
+class OrderPipeline:
+    """
+    The one path every order takes: validation, risk, any extra stages, then
+    submission. The CLI, the REST APIs, batch files and the router all place
+    orders through a pipeline, and each stage's time is recorded in the
+    "order_stage" histogram.
+
+    Args:
+        client: BinanceClient or AsyncBinanceClient to submit with.
+        stages: Full stage list, replacing the default one.
+        extra_stages: Stages inserted before submission (e.g. PublishStage).
+    """
+
+    def __init__(self, client, stages: Optional[Sequence[Stage]] = None, extra_stages: Sequence[Stage] = ()):
+        self.client = client
+        if stages is None:
+            stages = [ValidateStage()]
+            risk = getattr(client, "risk", None)
+            if risk is not None:
+                stages.append(RiskStage(risk))
+            stages.extend(extra_stages)
+            stages.append(SubmitStage(client))
+        self.stages = list(stages)
+
+    def run(self, order: Order) -> Dict[str, Any]:
+        """
+        Runs one order through every stage.
+
+        Returns:
+            The client's response.
+
+        Raises:
+            ValueError: If a stage rejects the order (RiskError for risk limits).
+        """
+        self._received(order)
+        stage = None
+        try:
+            for stage in self.stages:
+                started = time.perf_counter()
+                stage.process(order)
+                METRICS.observe("order_stage", time.perf_counter() - started, stage=stage.name, symbol=order.symbol)
+                order.done += 1
+        except Exception as e:
+            self._failed(order, stage, e)
+            raise
+        finally:
+            self._complete(order)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s Order executed successfully: %s", order.type.title(), order.response)
+        return order.response
+
+    async def run_async(self, order: Order) -> Dict[str, Any]:
+        """run() for an AsyncBinanceClient; submission is awaited, the other stages run inline."""
+        self._received(order)
+        stage = None
+        try:
+            for stage in self.stages:
+                started = time.perf_counter()
+                pending = stage.process(order)
+                if pending is not None:
+                    await pending
+                METRICS.observe("order_stage", time.perf_counter() - started, stage=stage.name, symbol=order.symbol)
+                order.done += 1
+        except Exception as e:
+            self._failed(order, stage, e)
+            raise
+        finally:
+            self._complete(order)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s Order executed successfully: %s", order.type.title(), order.response)
+        return order.response
+
+    def run_batch(self, orders: List[Order], max_workers: int = 8) -> List[Order]:
+        """
+        Runs many orders stage by stage; submission goes out as concurrent
+        batchOrders calls. A failed order drops out and keeps its error.
+
+        Returns:
+            The same orders, each with response or error set.
+        """
+        live = orders
+        for stage in self.stages:
+            started = time.perf_counter()
+            stage.process_batch(live, max_workers)
+            live = self._advance(live, stage, started)
+        for order in orders:
+            self._complete(order)
+        return orders
+
+    async def run_batch_async(self, orders: List[Order]) -> List[Order]:
+        """run_batch() for an AsyncBinanceClient."""
+        live = orders
+        for stage in self.stages:
+            started = time.perf_counter()
+            pending = stage.process_batch(live)
+            if pending is not None:
+                await pending
+            live = self._advance(live, stage, started)
+        for order in orders:
+            self._complete(order)
+        return orders
+
+    def _advance(self, live: List[Order], stage: Stage, started: float) -> List[Order]:
+        METRICS.observe("batch_stage", time.perf_counter() - started, stage=stage.name)
+        survivors = []
+        for order in live:
+            if order.error is None:
+                order.done += 1
+                survivors.append(order)
+            else:
+                self._count_failure(order, stage, order.error)
+        return survivors
+
+    def _received(self, order: Order) -> None:
+        if order.type == "LIMIT":
+            logger.info("Received Limit Order Request: %s %s %s @ %s", order.side, order.quantity, order.symbol, order.price)
+        else:
+            logger.info("Received %s Order Request: %s %s %s", order.type.title(), order.side, order.quantity, order.symbol)
+
+    def _failed(self, order: Order, stage: Optional[Stage], error: Exception) -> None:
+        order.error = error
+        self._count_failure(order, stage, error)
+        if stage is not None and stage.submits:
+            logger.exception(f"Error executing {order.type.lower()} order for {order.symbol}")
+
+    @staticmethod
+    def _count_failure(order: Order, stage: Optional[Stage], error: Exception) -> None:
+        if isinstance(error, ValueError) and not (stage is not None and stage.submits):
+            METRICS.inc("order_rejections", type=order.type)
+        else:
+            METRICS.inc("order_errors", type=order.type, symbol=order.symbol)
+
+    def _complete(self, order: Order) -> None:
+        stages = self.stages
+        for i in range(order.done - 1, -1, -1):
+            try:
+                stages[i].complete(order)
+            except Exception:
+                logger.exception(f"Order stage {stages[i].name} failed to complete {order.symbol} order")
+
+_pipelines: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_pipelines_lock = threading.Lock()
+
+def get_pipeline(client) -> OrderPipeline:
+    """The default OrderPipeline for `client` (built once per client)."""
+    pipeline = _pipelines.get(client)
+    if pipeline is None:
+        with _pipelines_lock:
+            pipeline = _pipelines.get(client)
+            if pipeline is None:
+                pipeline = _pipelines[client] = OrderPipeline(client)
+    return pipeline
@@ -0,0 +1,312 @@
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Mapping, Optional
+from ..logger import get_logger
+from ..metrics import METRICS
+
+logger = get_logger(__name__)
+
+# Lower value = served first
+PRIORITY_KILL = -1  # kill switch: ahead of everything already queued
+PRIORITY_CANCEL = 0
+PRIORITY_ORDER = 1
+PRIORITY_QUERY = 2
+
+# (request weight, order count) per endpoint, from the USD-M futures API docs
+ENDPOINT_COST = {
+    "time": (1, 0),
+    "exchange_info": (1, 0),
+    "account": (5, 0),
+    "order": (0, 1),
+    "modify_order": (1, 1),
+    "batch_orders": (5, 1),
+    "cancel_order": (1, 0),
+    "cancel_all": (1, 0),
+    "open_orders": (1, 0),
+    "open_orders_all": (40, 0),  # no symbol
+    "query_order": (1, 0),
+    "position_risk": (5, 0),
+    "depth": (20, 0),
+    "klines": (5, 0),  # limit 1000
+    "agg_trades": (20, 0),
+    "listen_key": (1, 0),
+}
+
+# Bucket layout: (name, limit, window seconds, response header carrying server-side usage)
+DEFAULT_BUCKETS = (
+    ("weight_1m", 2400, 60, "x-mbx-used-weight-1m"),
+    ("orders_10s", 300, 10, "x-mbx-order-count-10s"),
+    ("orders_1m", 1200, 60, "x-mbx-order-count-1m"),
+)
+
+# Order counts are per account on Binance; request weight is per IP
+ORDER_BUCKETS = tuple(b for b in DEFAULT_BUCKETS if not b[0].startswith("weight"))
+
+class _LocalState:
+    """Bucket state for one process: [tokens, updated] per bucket plus a ban-until slot."""
+
+    def __init__(self, size: int):
+        self.values = [0.0] * size
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            yield self.values
+
+class _SharedState:
+    """
+    Bucket state in a small memory-mapped file, so every process on the host
+    draws from the same budget. Updates are serialized with flock.
+    """
+
+    def __init__(self, path: str, size: int):
+        import fcntl
+        self._fcntl = fcntl
+        self._fmt = f"{size}d"
+        nbytes = struct.calcsize(self._fmt)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < nbytes:
+            os.ftruncate(self._fd, nbytes)
+        self._map = mmap.mmap(self._fd, nbytes)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+            try:
+                values = list(struct.unpack_from(self._fmt, self._map))
+                yield values
+                struct.pack_into(self._fmt, self._map, 0, *values)
+            finally:
+                self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+class RateLimiter:
+    """
+    Token-bucket limiter for Binance request weight and order counts.
+
+    Each bucket refills continuously at limit/window and is re-synced from the
+    X-MBX-USED-WEIGHT-* / X-MBX-ORDER-COUNT-* response headers, which are the
+    exchange's view of our usage. Callers that must wait are queued by
+    priority, so cancels go out ahead of new orders and queries.
+
+    Args:
+        buckets: Bucket definitions, see DEFAULT_BUCKETS.
+        safety: Fraction of each limit we allow ourselves to use.
+        shared_path: Optional file to share the budget across processes.
+        clock: Wall-clock function (seconds); shared state requires a clock common to all processes.
+        ip_limiter: Limiter that request weight is drawn from instead, for an
+            extra account on the same IP (use with buckets=ORDER_BUCKETS).
+            Its weight usage headers and bans are forwarded to it.
+    """
+
+    def __init__(
+        self,
+        buckets=DEFAULT_BUCKETS,
+        safety: float = 0.9,
+        shared_path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        ip_limiter: Optional["RateLimiter"] = None
+    ):
+        self.buckets = [(name, limit * safety, window, header) for name, limit, window, header in buckets]
+        self.clock = clock
+        self.ip_limiter = ip_limiter
+        size = 2 * len(self.buckets) + 1
+        self._state = _SharedState(shared_path, size) if shared_path else _LocalState(size)
+        self._ban_slot = size - 1
+        with self._state.transaction() as values:
+            now = self.clock()
+            for i, (_, capacity, _, _) in enumerate(self.buckets):
+                if values[2 * i + 1] == 0.0:
+                    values[2 * i], values[2 * i + 1] = capacity, now
+
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+
+        self.requests = 0
+        self.waited_requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_usage: Dict[str, int] = {}
+
+    def _refill(self, values, now: float) -> None:
+        for i, (_, capacity, window, _) in enumerate(self.buckets):
+            tokens, updated = values[2 * i], values[2 * i + 1]
+            if now > updated:
+                values[2 * i] = min(capacity, tokens + (now - updated) * capacity / window)
+                values[2 * i + 1] = now
+
+    def _costs(self, weight: int, orders: int):
+        for name, _, _, _ in self.buckets:
+            yield weight if name.startswith("weight") else orders
+
+    def _try_take(self, weight: int, orders: int) -> float:
+        """Takes tokens if all buckets allow it. Returns 0 on success, else seconds until they would."""
+        with self._state.transaction() as values:
+            now = self.clock()
+            banned_for = values[self._ban_slot] - now
+            if banned_for > 0:
+                return banned_for
+            self._refill(values, now)
+            wait = 0.0
+            for i, cost in enumerate(self._costs(weight, orders)):
+                capacity, window = self.buckets[i][1], self.buckets[i][2]
+                deficit = cost - values[2 * i]
+                if deficit > 0:
+                    wait = max(wait, deficit * window / capacity)
+            if wait > 0:
+                return wait
+            if self.ip_limiter is not None and weight:
+                # Taken last, so weight is only drawn once our own buckets allow the request
+                wait = self.ip_limiter._try_take(weight, 0)
+                if wait > 0:
+                    return wait
+            for i, cost in enumerate(self._costs(weight, orders)):
+                values[2 * i] -= cost
+            return 0.0
+
+    def acquire(self, weight: int = 1, orders: int = 0, priority: int = PRIORITY_QUERY) -> float:
+        """
+        Blocks until the request fits in every bucket.
+
+        Args:
+            weight: Request weight.
+            orders: Number of orders the request places.
+            priority: PRIORITY_KILL, PRIORITY_CANCEL, PRIORITY_ORDER or PRIORITY_QUERY.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        start = time.monotonic()
+        with self._cond:
+            self.requests += 1
+            if not self._waiters and self._try_take(weight, orders) == 0:
+                return 0.0
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiters, ticket)
+            # A higher-priority arrival must re-evaluate ahead of the current head
+            self._cond.notify_all()
+            try:
+                while True:
+                    if self._waiters[0] == ticket:
+                        wait = self._try_take(weight, orders)
+                        if wait == 0:
+                            break
+                        self._cond.wait(timeout=wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+        waited = time.monotonic() - start
+        self.waited_requests += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    async def acquire_async(self, weight: int = 1, orders: int = 0, priority: int = PRIORITY_QUERY) -> float:
+        """acquire() for asyncio callers; only hops to a thread when it actually has to wait."""
+        with self._cond:
+            if not self._waiters and self._try_take(weight, orders) == 0:
+                self.requests += 1
+                return 0.0
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, self.acquire, weight, orders, priority)
+
+    def update_from_headers(self, headers: Mapping[str, Any]) -> None:
+        """Re-syncs buckets from the usage the exchange reports in response headers."""
+        usage = {}
+        for key, value in headers.items():
+            key = key.lower()
+            if key.startswith("x-mbx-used-weight") or key.startswith("x-mbx-order-count"):
+                try:
+                    usage[key] = int(value)
+                except (TypeError, ValueError):
+                    continue
+        if not usage:
+            return
+        if self.ip_limiter is not None:
+            self.ip_limiter.update_from_headers({k: v for k, v in usage.items() if k.startswith("x-mbx-used-weight")})
+        self.last_usage.update(usage)
+        with self._state.transaction() as values:
+            now = self.clock()
+            self._refill(values, now)
+            for i, (_, capacity, _, header) in enumerate(self.buckets):
+                if header in usage:
+                    values[2 * i] = capacity - usage[header]
+        with self._cond:
+            self._cond.notify_all()
+
+    def penalize(self, retry_after: float) -> None:
+        """Blocks all requests for `retry_after` seconds (after a 429 or 418)."""
+        logger.warning(f"Rate limited by exchange; backing off for {retry_after}s")
+        with self._state.transaction() as values:
+            values[self._ban_slot] = max(values[self._ban_slot], self.clock() + retry_after)
+        if self.ip_limiter is not None:
+            # A 418 bans the IP, and a 429 means more weight risks that ban
+            self.ip_limiter.penalize(retry_after)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._state.transaction() as values:
+            self._refill(values, self.clock())
+            tokens = {name: round(values[2 * i], 2) for i, (name, _, _, _) in enumerate(self.buckets)}
+        if self.ip_limiter is not None:
+            tokens = {**self.ip_limiter.metrics()["tokens"], **tokens}
+        with self._cond:
+            depth = len(self._waiters)
+        return {
+            "queue_depth": depth,
+            "requests": self.requests,
+            "waited_requests": self.waited_requests,
+            "total_wait_seconds": round(self.total_wait, 6),
+            "max_wait_seconds": round(self.max_wait, 6),
+            "tokens": tokens,
+            "exchange_usage": dict(self.last_usage)
+        }
+
+def call_limited(limiter: RateLimiter, endpoint: str, fn, priority: int = PRIORITY_QUERY, **params) -> Any:
+    """
+    Runs a connector call through `limiter`: waits for the endpoint's weight
+    and order count, backs off for Retry-After after a 418/429, and feeds
+    the X-MBX-* usage headers of the response back into it.
+
+    Returns:
+        The response data (connectors built with show_limit_usage wrap it).
+    """
+    weight, orders = ENDPOINT_COST[endpoint]
+    METRICS.observe("client_stage", limiter.acquire(weight, orders, priority), stage="rate_limit", endpoint=endpoint)
+    try:
+        # Signing happens inside the connector, so "request" covers sign + network + exchange
+        with METRICS.span("client_stage", stage="request", endpoint=endpoint):
+            response = fn(**params)
+    except Exception as e:
+        if getattr(e, "status_code", None) in (418, 429):
+            headers = getattr(e, "header", None) or {}
+            limiter.penalize(float(headers.get("Retry-After", 60)))
+        raise
+    if isinstance(response, dict) and "limit_usage" in response:
+        limiter.update_from_headers(response["limit_usage"])
+        return response["data"]
+    return response
+
+_default_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide limiter shared by every client (file-backed if RATE_LIMIT_SHARED_FILE is set)."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            from ..config import CONFIG
+            _default_limiter = RateLimiter(safety=CONFIG.RATE_LIMIT_SAFETY, shared_path=CONFIG.RATE_LIMIT_SHARED_FILE or None)
+        return _default_limiter
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from ..logger import get_logger
+from ..metrics import METRICS
+
+logger = get_logger(__name__)
+
+# Error classes, see classify_error()
+FATAL = "fatal"      # the exchange rejected the order; resending the same request fails again
+RETRY = "retry"      # the order was definitely not accepted; safe to resend
+UNKNOWN = "unknown"  # the order may exist; look it up by client id before resending
+
+# Binance error codes
+RATE_LIMITED_CODES = {-1003, -1015}
+UNKNOWN_OUTCOME_CODES = {-1001, -1006, -1007}
+DUPLICATE_CLIENT_ID = -4116
+ORDER_NOT_FOUND = -2013
+
+def classify_error(error: Exception) -> str:
+    """
+    Sorts an order-placement failure into FATAL, RETRY or UNKNOWN.
+
+    Timeouts, dropped connections, 5xx responses and the "unknown execution
+    status" codes leave the order's fate open. Rate-limit rejections never
+    reach the matching engine. Any other exchange error code is final.
+    """
+    code = getattr(error, "error_code", None)
+    status = getattr(error, "status_code", None)
+    if code in RATE_LIMITED_CODES or status in (418, 429):
+        return RETRY
+    if code in UNKNOWN_OUTCOME_CODES or code == DUPLICATE_CLIENT_ID:
+        return UNKNOWN
+    if status is not None and status >= 500:
+        return UNKNOWN
+    if code is not None or status is not None:
+        return FATAL
+    # requests' Timeout / ConnectionError (and socket errors) are OSErrors
+    if isinstance(error, OSError):
+        return UNKNOWN
+    return FATAL
+
+def client_order_id(*parts: Any, prefix: str = "tb") -> str:
+    """
+    Deterministic newClientOrderId for a logical order, e.g. (parent_id, slice_index).
+
+    The same parts always give the same id, so a resubmission (or a restarted
+    strategy) cannot create a second order while the first is still known.
+    """
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return f"{prefix}-{digest[:30]}"
+
+class RetryPolicy:
+    """
+    Backoff and hedging settings for order placement.
+
+    Args:
+        max_attempts: Sends per order, including the first.
+        base_delay: Backoff before the second attempt; doubles per attempt.
+        max_delay: Backoff cap.
+        hedge_after: Seconds to wait on the primary endpoint before sending the
+            same order (same client id) to the hedge endpoint. None disables hedging.
+        rng: Random source for the jitter.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 2.0,
+        hedge_after: Optional[float] = None,
+        rng: Optional[random.Random] = None
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_after = hedge_after
+        self.rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before attempt `attempt + 1` (attempt counts from 1)."""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+class OrderRetrier:
+    """
+    Sends an order with retries that cannot double-fill.
+
+    Every attempt carries the same newClientOrderId. After a failure with an
+    unknown outcome the order is looked up by that id first, and only resent
+    once the exchange reports it does not exist. With a hedge sender, a
+    request still pending after `policy.hedge_after` is raced against the same
+    request on the second endpoint; the exchange rejects whichever copy
+    arrives second as a duplicate.
+
+    Args:
+        policy: RetryPolicy.
+        sleep: Used for backoff (tests pass a recorder).
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, sleep: Callable[[float], None] = time.sleep):
+        self.policy = policy or RetryPolicy()
+        self.sleep = sleep
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def submit(
+        self,
+        params: Dict[str, Any],
+        send: Callable[[Dict[str, Any]], Dict[str, Any]],
+        lookup: Callable[[str, str], Optional[Dict[str, Any]]],
+        hedge_send: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Places `params` (which must carry newClientOrderId).
+
+        Args:
+            params: Order parameters.
+            send: Sends the order to the primary endpoint.
+            lookup: lookup(symbol, client_order_id) -> the order, or None if the
+                exchange does not know it. Errors propagate and are classified.
+            hedge_send: Sends the order to the hedge endpoint.
+
+        Returns:
+            The exchange's order response (or the looked-up order).
+        """
+        cid = params.get("newClientOrderId")
+        if not cid:
+            raise ValueError("Retried orders need a newClientOrderId")
+        symbol = params["symbol"]
+        outcome_unknown = False
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if outcome_unknown:
+                    existing = lookup(symbol, cid)
+                    if existing is not None:
+                        logger.info("Order %s found after failed attempt: %s", cid, existing.get("status"))
+                        METRICS.inc("order_retries", result="found")
+                        return existing
+                    outcome_unknown = False
+                return self._send(params, send, hedge_send)
+            except Exception as e:
+                kind, delay = self._failed(cid, attempt, e)
+                outcome_unknown = outcome_unknown or kind == UNKNOWN
+                self.sleep(delay)
+
+    async def submit_async(
+        self,
+        params: Dict[str, Any],
+        send: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        lookup: Callable[[str, str], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Dict[str, Any]:
+        """submit() for coroutine senders (AsyncBinanceClient); backoff uses asyncio.sleep and there is no hedging."""
+        cid = params.get("newClientOrderId")
+        if not cid:
+            raise ValueError("Retried orders need a newClientOrderId")
+        symbol = params["symbol"]
+        outcome_unknown = False
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if outcome_unknown:
+                    existing = await lookup(symbol, cid)
+                    if existing is not None:
+                        logger.info("Order %s found after failed attempt: %s", cid, existing.get("status"))
+                        METRICS.inc("order_retries", result="found")
+                        return existing
+                    outcome_unknown = False
+                return await send(params)
+            except Exception as e:
+                kind, delay = self._failed(cid, attempt, e)
+                outcome_unknown = outcome_unknown or kind == UNKNOWN
+                await asyncio.sleep(delay)
+
+    def _failed(self, cid: str, attempt: int, error: Exception) -> Tuple[str, float]:
+        """Classifies a failed attempt; re-raises it when it is final, else returns (kind, backoff)."""
+        kind = classify_error(error)
+        if kind == FATAL or attempt >= self.policy.max_attempts:
+            raise error
+        delay = self.policy.backoff(attempt)
+        METRICS.inc("order_retries", result=kind)
+        logger.warning("Order %s attempt %d failed (%s: %s); retrying in %.3fs", cid, attempt, kind, error, delay)
+        return kind, delay
+
+    def _send(self, params, send, hedge_send):
+        hedge_after = self.policy.hedge_after
+        if hedge_send is None or hedge_after is None:
+            return send(params)
+
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="order-hedge")
+        primary = self._pool.submit(send, params)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        METRICS.inc("order_hedges")
+        logger.info("Order %s slow after %.3fs; hedging", params["newClientOrderId"], hedge_after)
+        pending = {primary, self._pool.submit(hedge_send, params)}
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                errors.append(future.exception())
+        # A duplicate rejection means the other copy reached the exchange; report that one as unknown
+        errors.sort(key=lambda e: classify_error(e) != UNKNOWN)
+        raise errors[0]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -0,0 +1,350 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from ..logger import get_logger
+from ..metrics import METRICS
+
+logger = get_logger(__name__)
+
+# Exchange statuses of an order that may still fill
+_LIVE_STATUSES = ("NEW", "PARTIALLY_FILLED")
+
+class RiskError(ValueError):
+    """A pre-trade limit would be breached. `reason` names the limit."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+class RiskLimits:
+    """
+    Pre-trade limits. None disables a limit.
+
+    Args:
+        max_position: Max absolute position per symbol (base asset), counting
+            resting and in-flight orders as if they filled.
+        max_notional: Max absolute position value per symbol (quote asset), same worst case.
+        max_open_orders: Max resting orders per symbol.
+        price_band: Max relative distance of a limit price from the mark price (0.05 = 5%).
+        max_order_rate: Max orders per second across all symbols (burst of one second).
+        per_symbol: Symbol -> dict of overrides for max_position / max_notional / max_open_orders.
+    """
+
+    def __init__(
+        self,
+        max_position: Optional[float] = None,
+        max_notional: Optional[float] = None,
+        max_open_orders: Optional[int] = None,
+        price_band: Optional[float] = None,
+        max_order_rate: Optional[float] = None,
+        per_symbol: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        self.max_position = max_position
+        self.max_notional = max_notional
+        self.max_open_orders = max_open_orders
+        self.price_band = price_band
+        self.max_order_rate = max_order_rate
+        self.per_symbol = per_symbol or {}
+
+    @classmethod
+    def from_config(cls) -> "RiskLimits":
+        from ..config import CONFIG
+        return cls(
+            max_position=CONFIG.RISK_MAX_POSITION or None,
+            max_notional=CONFIG.RISK_MAX_NOTIONAL or None,
+            max_open_orders=CONFIG.RISK_MAX_OPEN_ORDERS or None,
+            price_band=CONFIG.RISK_PRICE_BAND or None,
+            max_order_rate=CONFIG.RISK_MAX_ORDER_RATE or None
+        )
+
+class _SymbolRisk:
+    """Running exposure for one symbol; every field is updated incrementally."""
+
+    __slots__ = ("position", "position_time", "pending_buy", "pending_sell", "open_orders", "mark", "max_position", "max_notional", "max_open_orders")
+
+    def __init__(self, position: float, limits: RiskLimits, overrides: Dict[str, Any]):
+        self.position = position
+        # Exchange time (ms) of the last absolute position from ACCOUNT_UPDATE; fills up to it are already in `position`
+        self.position_time = 0
+        self.pending_buy = 0.0
+        self.pending_sell = 0.0
+        self.open_orders = 0
+        self.mark = 0.0
+        self.max_position = overrides.get("max_position", limits.max_position)
+        self.max_notional = overrides.get("max_notional", limits.max_notional)
+        self.max_open_orders = overrides.get("max_open_orders", limits.max_open_orders)
+
+class Reservation:
+    """Exposure held for one order between pre_trade() and its final fill/cancel."""
+
+    __slots__ = ("symbol", "side", "quantity", "price", "reduce_only", "filled", "order_id", "state")
+
+    def __init__(self, symbol: str, side: str, quantity: float, price: Optional[float], reduce_only: bool, state: _SymbolRisk):
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.reduce_only = reduce_only
+        self.filled = 0.0
+        self.order_id = None
+        self.state = state
+
+class RiskEngine:
+    """
+    Pre-trade checks against exposure kept in memory.
+
+    pre_trade() checks an order and reserves its quantity as pending; settle()
+    turns the exchange response into position changes, keeps resting orders
+    pending and releases the rest. Later fills and cancels of resting orders
+    arrive through apply_event() (user-data ORDER_TRADE_UPDATE), and mark
+    prices through update_mark() or markPriceUpdate / bookTicker events. All
+    checks are arithmetic on per-symbol counters, so they cost microseconds.
+
+    Args:
+        limits: RiskLimits.
+        position_source: Callable symbol -> current position, used once per
+            symbol to seed its exposure (e.g. BinanceClient.get_position).
+        clock: Monotonic clock for the order-rate bucket.
+    """
+
+    def __init__(self, limits: Optional[RiskLimits] = None, position_source: Optional[Callable[[str], float]] = None, clock: Callable[[], float] = time.monotonic):
+        self.limits = limits or RiskLimits()
+        self.position_source = position_source
+        self.clock = clock
+        self.symbols: Dict[str, _SymbolRisk] = {}
+        # Mark prices of symbols without exposure state yet (the mark price stream covers every symbol)
+        self._marks: Dict[str, float] = {}
+        self.resting: Dict[Any, Reservation] = {}
+        self.rejections = 0
+        self._rate_tokens = self.limits.max_order_rate or 0.0
+        self._rate_updated = clock()
+        self._lock = threading.Lock()
+
+    def _state(self, symbol: str) -> _SymbolRisk:
+        state = self.symbols.get(symbol)
+        if state is None:
+            position = float(self.position_source(symbol)) if self.position_source else 0.0
+            # setdefault: a concurrent first order for the symbol may have seeded it already
+            state = self.symbols.setdefault(symbol, _SymbolRisk(position, self.limits, self.limits.per_symbol.get(symbol, {})))
+            if not state.mark:
+                state.mark = self._marks.pop(symbol, 0.0)
+        return state
+
+    def _reject(self, reason: str, message: str) -> None:
+        self.rejections += 1
+        METRICS.inc("risk_rejections", reason=reason)
+        logger.error("Risk check failed: %s", message)
+        raise RiskError(reason, message)
+
+    def pre_trade(self, symbol: str, side: str, quantity: float, price: Optional[float] = None, reduce_only: bool = False, protective: bool = False) -> Reservation:
+        """
+        Checks an order against every limit and reserves its exposure.
+
+        Args:
+            symbol, side, quantity: The order.
+            price: Limit price (None for market orders; the mark is used for notional).
+            reduce_only: Reduce-only orders skip the position and notional limits.
+            protective: A reduce-only exit that must go out (an OCO stop leg):
+                also skips the price band, order rate and open-order limits.
+
+        Returns:
+            Reservation to pass to settle() or release().
+
+        Raises:
+            RiskError: If a limit would be breached.
+        """
+        if symbol not in self.symbols:
+            # Seeding may call out to the account cache; keep it outside the lock
+            self._state(symbol)
+        with self._lock:
+            state = self.symbols[symbol]
+            rate = self.limits.max_order_rate
+            if rate and not protective:
+                now = self.clock()
+                tokens = min(rate, self._rate_tokens + (now - self._rate_updated) * rate)
+                self._rate_updated = now
+                if tokens < 1:
+                    self._rate_tokens = tokens
+                    self._reject("order_rate", f"Order rate above {rate}/s")
+                self._rate_tokens = tokens - 1
+
+            self._evaluate(state, symbol, side, quantity, price, reduce_only or protective, protective)
+            if side == "BUY":
+                state.pending_buy += quantity
+            else:
+                state.pending_sell += quantity
+        return Reservation(symbol, side, quantity, price, reduce_only, state)
+
+    def check(self, symbol: str, side: str, quantity: float, price: Optional[float] = None, reduce_only: bool = False) -> None:
+        """
+        The exposure and price checks of pre_trade() without reserving anything
+        or using up order rate (e.g. for a TWAP parent's total size).
+
+        Raises:
+            RiskError: If a limit would be breached.
+        """
+        if symbol not in self.symbols:
+            self._state(symbol)
+        with self._lock:
+            self._evaluate(self.symbols[symbol], symbol, side, quantity, price, reduce_only)
+
+    def _evaluate(self, state: _SymbolRisk, symbol: str, side: str, quantity: float, price: Optional[float], reduce_only: bool, protective: bool = False) -> None:
+        band = self.limits.price_band
+        mark = state.mark
+        if price is not None and mark and band and not protective and abs(price - mark) > band * mark:
+            self._reject("price_band", f"{symbol} price {price} is more than {band:.2%} from mark {mark}")
+
+        if price is not None and state.max_open_orders and not protective and state.open_orders >= state.max_open_orders:
+            self._reject("open_orders", f"{symbol} already has {state.open_orders} open orders (max {state.max_open_orders})")
+
+        if not reduce_only and (state.max_position or state.max_notional):
+            if side == "BUY":
+                worst = abs(state.position + state.pending_buy + quantity)
+            else:
+                worst = abs(state.position - state.pending_sell - quantity)
+            if state.max_position and worst > state.max_position:
+                self._reject("max_position", f"{symbol} position could reach {worst} (max {state.max_position})")
+            reference = price or mark
+            if state.max_notional and reference and worst * reference > state.max_notional:
+                self._reject("max_notional", f"{symbol} notional could reach {worst * reference:.2f} (max {state.max_notional})")
+
+    def _fill(self, reservation: Reservation, cumulative: float, event_time: int = 0) -> None:
+        delta = min(cumulative, reservation.quantity) - reservation.filled
+        if delta <= 0:
+            return
+        reservation.filled += delta
+        state = reservation.state
+        # An ACCOUNT_UPDATE at or after the fill already moved the position
+        counted = 0.0 if event_time and event_time <= state.position_time else delta
+        if reservation.side == "BUY":
+            state.position += counted
+            state.pending_buy -= delta
+        else:
+            state.position -= counted
+            state.pending_sell -= delta
+
+    def _finish(self, reservation: Reservation) -> None:
+        remainder = reservation.quantity - reservation.filled
+        state = reservation.state
+        if reservation.side == "BUY":
+            state.pending_buy = max(0.0, state.pending_buy - remainder)
+        else:
+            state.pending_sell = max(0.0, state.pending_sell - remainder)
+        reservation.filled = reservation.quantity
+        if reservation.order_id is not None and self.resting.pop(reservation.order_id, None) is not None:
+            state.open_orders -= 1
+
+    def settle(self, reservation: Reservation, response: Dict[str, Any]) -> None:
+        """Applies an order response: fills move into the position, resting orders stay pending."""
+        status = response.get("status")
+        with self._lock:
+            avg = float(response.get("avgPrice", 0) or 0)
+            if avg:
+                # The last fill stands in for the mark until a mark-price stream updates it
+                reservation.state.mark = avg
+            if status == "dry-run" or "executedQty" not in response:
+                self._fill(reservation, reservation.quantity)
+                return
+            event_time = int(response.get("updateTime") or 0)
+            self._fill(reservation, float(response.get("executedQty") or 0), event_time)
+            if status in _LIVE_STATUSES:
+                if reservation.price is None:
+                    # ACK response to a market order: it fills immediately
+                    self._fill(reservation, reservation.quantity, event_time)
+                    return
+                reservation.order_id = response.get("orderId")
+                if reservation.order_id is not None and reservation.order_id not in self.resting:
+                    self.resting[reservation.order_id] = reservation
+                    reservation.state.open_orders += 1
+                return
+            self._finish(reservation)
+
+    def release(self, reservation: Reservation) -> None:
+        """Drops what is left of a reservation (order failed, cancelled or expired)."""
+        with self._lock:
+            self._finish(reservation)
+
+    def update_order(self, order_id: Any, executed_qty: Any, status: Optional[str], event_time: int = 0) -> None:
+        """Applies the latest state of a resting order (cancel response, order query or stream update)."""
+        with self._lock:
+            reservation = self.resting.get(order_id)
+            if reservation is None:
+                return
+            self._fill(reservation, float(executed_qty or 0), event_time)
+            if status not in _LIVE_STATUSES:
+                self._finish(reservation)
+
+    def cancel_symbol(self, symbol: str) -> None:
+        """Releases every resting order on `symbol` (after a cancel-all)."""
+        with self._lock:
+            for reservation in [r for r in self.resting.values() if r.symbol == symbol]:
+                self._finish(reservation)
+
+    def set_position(self, symbol: str, position: float) -> None:
+        """Overwrites a tracked symbol's position with an exchange snapshot."""
+        with self._lock:
+            if symbol in self.symbols:
+                self.symbols[symbol].position = position
+
+    def active_symbols(self) -> Dict[str, Dict[str, float]]:
+        """Symbols with a non-zero position or resting orders, as far as the engine knows."""
+        with self._lock:
+            return {
+                symbol: {"position": state.position, "open_orders": state.open_orders}
+                for symbol, state in self.symbols.items()
+                if state.position or state.open_orders
+            }
+
+    def update_mark(self, symbol: str, price: float) -> None:
+        state = self.symbols.get(symbol)
+        if state is None:
+            # Not traded yet: keep the price without seeding (and fetching) a position
+            self._marks[symbol] = price
+        else:
+            state.mark = price
+
+    def apply_event(self, data: Dict[str, Any]) -> None:
+        """Applies a stream event (register with UserDataStream.add_listener or a market-data FanOut)."""
+        event = data.get("e")
+        if event == "ORDER_TRADE_UPDATE":
+            o = data.get("o", {})
+            self.update_order(o.get("i"), o.get("z", 0), o.get("X"), int(o.get("T") or data.get("E") or 0))
+        elif event == "ACCOUNT_UPDATE":
+            event_time = int(data.get("T") or data.get("E") or 0)
+            with self._lock:
+                for p in data.get("a", {}).get("P", []):
+                    state = self.symbols.get(p["s"])
+                    if p.get("ps", "BOTH") == "BOTH" and state is not None and event_time >= state.position_time:
+                        state.position = float(p.get("pa", 0))
+                        state.position_time = event_time
+        elif event == "markPriceUpdate":
+            self.update_mark(data["s"], float(data["p"]))
+        elif event == "bookTicker":
+            self.update_mark(data["s"], (float(data["b"]) + float(data["a"])) / 2)
+
+    def exposure(self, symbol: str) -> Dict[str, float]:
+        with self._lock:
+            state = self.symbols.get(symbol)
+            if state is None:
+                return {"position": 0.0, "pending_buy": 0.0, "pending_sell": 0.0, "open_orders": 0, "mark": self._marks.get(symbol, 0.0)}
+            return {
+                "position": state.position,
+                "pending_buy": state.pending_buy,
+                "pending_sell": state.pending_sell,
+                "open_orders": state.open_orders,
+                "mark": state.mark
+            }
+
+def submit_with_risk(client, symbol: str, side: str, quantity: float, price: Optional[float], send: Callable[[], Dict[str, Any]], reduce_only: bool = False, protective: bool = False) -> Dict[str, Any]:
+    """Runs send() between the client's pre-trade check and settlement (no-op for clients without `risk`)."""
+    risk = getattr(client, "risk", None)
+    if risk is None:
+        return send()
+    reservation = risk.pre_trade(symbol, side, quantity, price, reduce_only, protective)
+    try:
+        response = send()
+    except Exception:
+        risk.release(reservation)
+        raise
+    risk.settle(reservation, response)
+    return response
@@ -0,0 +1,183 @@
+import os
+import queue
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+from ..config import CONFIG
+from ..logger import get_logger
+from .binance_client import BinanceClient
+from .rate_limiter import ORDER_BUCKETS, RateLimiter, get_rate_limiter
+
+logger = get_logger(__name__)
+
+DEFAULT_ACCOUNT = "default"
+
+# Rate-limit buckets that count orders (per account on Binance; request weight is per IP)
+_ORDER_BUCKETS = tuple(name for name, _, _, _ in ORDER_BUCKETS)
+
+def load_accounts(dry_run: Optional[bool] = None) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Reads account credentials from the environment.
+
+    BINANCE_ACCOUNTS lists account tags (e.g. "main,arb,hedge"); each tag's
+    key and secret come from BINANCE_<TAG>_API_KEY / BINANCE_<TAG>_API_SECRET.
+    Without BINANCE_ACCOUNTS there is a single "default" account using
+    BINANCE_API_KEY / BINANCE_API_SECRET.
+
+    Raises:
+        ValueError: On a malformed tag, or missing credentials outside dry-run.
+    """
+    dry_run = CONFIG.DRY_RUN if dry_run is None else dry_run
+    tags = [t.strip() for t in CONFIG.BINANCE_ACCOUNTS.split(",") if t.strip()]
+    if not tags:
+        return {DEFAULT_ACCOUNT: {"key": CONFIG.BINANCE_API_KEY, "secret": CONFIG.BINANCE_API_SECRET}}
+
+    accounts = {}
+    for tag in tags:
+        if not re.fullmatch(r"[A-Za-z0-9_]+", tag):
+            raise ValueError(f"Invalid account tag: {tag!r} (letters, digits and underscores only)")
+        if tag in accounts:
+            raise ValueError(f"Duplicate account tag: {tag}")
+        key = os.getenv(f"BINANCE_{tag.upper()}_API_KEY")
+        secret = os.getenv(f"BINANCE_{tag.upper()}_API_SECRET")
+        if not dry_run and (not key or not secret):
+            raise ValueError(f"BINANCE_{tag.upper()}_API_KEY and BINANCE_{tag.upper()}_API_SECRET are required when DRY_RUN is false.")
+        accounts[tag] = {"key": key, "secret": secret}
+    return accounts
+
+class AccountWorker:
+    """
+    One account's client plus a FIFO submission queue served by its own thread,
+    so a slow or rate-limited account never holds up another.
+    """
+
+    def __init__(self, tag: str, client: BinanceClient):
+        self.tag = tag
+        self.client = client
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"account-{tag}", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[[BinanceClient], Any]) -> Future:
+        future: Future = Future()
+        with self._lock:
+            self.pending += 1
+        self._queue.put((fn, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            fn, future = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(self.client))
+                    ok = True
+                except BaseException as e:
+                    future.set_exception(e)
+                    ok = False
+            else:
+                ok = False
+            with self._lock:
+                self.pending -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def headroom(self) -> float:
+        """Orders this account can still send right now, minus what is already queued."""
+        tokens = self.client.rate_limiter.metrics()["tokens"]
+        return min(tokens.get(name, 0.0) for name in _ORDER_BUCKETS) - self.pending
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pending": self.pending, "completed": self.completed, "failed": self.failed, "headroom": round(self.headroom(), 2)}
+
+class AccountRouter:
+    """
+    Routes order work across accounts, each with its own key, rate-limit
+    budget and worker thread.
+
+    Work goes to the account named by its tag, or, without a tag, to the
+    account with the most order-rate headroom left.
+
+    Args:
+        clients: Account tag -> BinanceClient. Each should have its own order-count
+            buckets, drawing request weight from one limiter shared by the host.
+    """
+
+    def __init__(self, clients: Dict[str, BinanceClient]):
+        if not clients:
+            raise ValueError("AccountRouter needs at least one account")
+        self.workers = {tag: AccountWorker(tag, client) for tag, client in clients.items()}
+        self.default_tag = DEFAULT_ACCOUNT if DEFAULT_ACCOUNT in self.workers else next(iter(self.workers))
+        logger.info(f"Account router started with {len(self.workers)} account(s): {', '.join(self.workers)}")
+
+    @classmethod
+    def from_config(cls, dry_run: Optional[bool] = None) -> "AccountRouter":
+        """Builds one client per account from load_accounts()."""
+        clients = {}
+        for tag, creds in load_accounts(dry_run).items():
+            journal = None
+            if not (CONFIG.DRY_RUN if dry_run is None else dry_run) and CONFIG.ORDER_JOURNAL and tag != DEFAULT_ACCOUNT:
+                from .journal import OrderJournal
+                # One journal per key; clientOrderIds are only unique within an account
+                journal = OrderJournal(f"{CONFIG.ORDER_JOURNAL}.{tag}", fsync=CONFIG.ORDER_JOURNAL_FSYNC)
+            clients[tag] = BinanceClient(
+                creds["key"], creds["secret"], dry_run=dry_run,
+                # The single-account setup keeps the process-wide (optionally file-shared) limiter;
+                # other accounts count their own orders but share its per-IP request weight
+                rate_limiter=get_rate_limiter() if tag == DEFAULT_ACCOUNT else RateLimiter(ORDER_BUCKETS, safety=CONFIG.RATE_LIMIT_SAFETY, ip_limiter=get_rate_limiter()),
+                journal=journal
+            )
+        return cls(clients)
+
+    @property
+    def default_client(self) -> BinanceClient:
+        return self.workers[self.default_tag].client
+
+    def client(self, account: Optional[str] = None) -> BinanceClient:
+        return self.workers[self.route(account)].client
+
+    def route(self, account: Optional[str] = None) -> str:
+        """The tag that work for `account` (or untagged work) should go to."""
+        if account:
+            if account not in self.workers:
+                raise ValueError(f"Unknown account: {account}")
+            return account
+        if len(self.workers) == 1:
+            return self.default_tag
+        return max(self.workers.values(), key=AccountWorker.headroom).tag
+
+    def submit(self, fn: Callable[[BinanceClient], Any], account: Optional[str] = None) -> Future:
+        """Queues fn(client) on the chosen account's worker."""
+        return self.workers[self.route(account)].submit(fn)
+
+    def market_order(self, symbol: str, side: str, quantity: float, account: Optional[str] = None) -> Future:
+        from .market_orders import place_market_order
+        return self.submit(lambda c: place_market_order(c, symbol, side, quantity), account)
+
+    def limit_order(self, symbol: str, side: str, quantity: float, price: float, account: Optional[str] = None) -> Future:
+        from .limit_orders import place_limit_order
+        return self.submit(lambda c: place_limit_order(c, symbol, side, quantity, price), account)
+
+    def accounts(self) -> List[str]:
+        return list(self.workers)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {tag: worker.stats() for tag, worker in self.workers.items()}
+
+    def close(self) -> None:
+        for worker in self.workers.values():
+            worker.stop()
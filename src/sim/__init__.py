@@ -0,0 +1 @@
+# simulated exchange package
@@ -0,0 +1,139 @@
+import time
+from typing import Any, Dict, List, Optional
+from ..logger import get_logger
+from ..orders.binance_client import BinanceClient
+from .exchange import SimulatedExchange
+from .matching_engine import SimOrder
+
+logger = get_logger(__name__)
+
+class SimulatedBinanceClient:
+    """
+    Drop-in replacement for BinanceClient backed by a SimulatedExchange.
+
+    Responses have the shape of real USD-M futures responses (orderId, status,
+    executedQty, avgPrice, ...), so order functions, TWAP and OCO run their
+    live code paths against it. Several clients may share one exchange with
+    different account names to trade against each other.
+
+    Args:
+        exchange: Exchange to trade on (a private one is created if omitted).
+        account: Account name on that exchange.
+    """
+
+    BATCH_SIZE = BinanceClient.BATCH_SIZE
+
+    def __init__(self, exchange: Optional[SimulatedExchange] = None, account: str = "default"):
+        self.exchange = exchange or SimulatedExchange()
+        self.account = account
+        self.exchange.account(account)
+        # Live code paths are exercised; nothing here touches the network
+        self.dry_run = False
+        logger.info(f"Initializing SimulatedBinanceClient (Account: {account})")
+
+    def _order_response(self, order: SimOrder) -> Dict[str, Any]:
+        return {
+            "orderId": order.order_id,
+            "clientOrderId": order.client_order_id or f"sim{order.order_id}",
+            "symbol": order.symbol,
+            "side": order.side,
+            "positionSide": "BOTH",
+            "type": order.type,
+            "status": order.status,
+            "price": str(order.price or 0),
+            "avgPrice": str(order.avg_price),
+            "origQty": str(order.quantity),
+            "executedQty": str(order.filled),
+            "cumQuote": str(order.cost),
+            "timeInForce": order.time_in_force,
+            "reduceOnly": order.reduce_only,
+            "updateTime": self.exchange.time
+        }
+
+    def ping(self) -> Dict[str, Any]:
+        return {"serverTime": self.exchange.time or int(time.time() * 1000)}
+
+    def get_account(self) -> Dict[str, Any]:
+        exchange = self.exchange
+        acct = exchange.account(self.account)
+        unrealized = exchange.unrealized_pnl(acct)
+        return {
+            "assets": [{
+                "asset": exchange.quote_asset,
+                "walletBalance": str(acct.wallet),
+                "unrealizedProfit": str(unrealized),
+                "marginBalance": str(acct.wallet + unrealized),
+                "availableBalance": str(acct.wallet + min(unrealized, 0.0)),
+                "crossWalletBalance": str(acct.wallet),
+                "updateTime": exchange.time
+            }],
+            "positions": [
+                {
+                    "symbol": symbol,
+                    "positionSide": "BOTH",
+                    "positionAmt": str(amt),
+                    "entryPrice": str(entry),
+                    "unrealizedProfit": str((exchange.last_price.get(symbol, entry) - entry) * amt),
+                    "updateTime": exchange.time
+                }
+                for symbol, (amt, entry) in acct.positions.items() if amt
+            ],
+            "canDeposit": True,
+            "canTrade": True,
+            "canWithdraw": True,
+            "feeTier": 0,
+            "updateTime": exchange.time
+        }
+
+    def get_exchange_info(self) -> Dict[str, Any]:
+        return {"symbols": []}
+
+    def get_balance(self, asset: str = "USDT") -> float:
+        if asset != self.exchange.quote_asset:
+            return 0.0
+        return self.exchange.account(self.account).wallet
+
+    def get_position(self, symbol: str, position_side: str = "BOTH") -> float:
+        return self.exchange.account(self.account).position(symbol)
+
+    def create_market_order(self, symbol: str, side: str, quantity: float, reduce_only: bool = False, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        order = self.exchange.submit(self.account, symbol, side, "MARKET", float(quantity), reduce_only=reduce_only, client_order_id=client_order_id)
+        return self._order_response(order)
+
+    def create_limit_order(self, symbol: str, side: str, quantity: float, price: float, timeInForce: str = "GTC", reduce_only: bool = False, client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        order = self.exchange.submit(self.account, symbol, side, "LIMIT", float(quantity), float(price), timeInForce, reduce_only, client_order_id)
+        return self._order_response(order)
+
+    def create_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Same contract as BinanceClient.create_batch_orders."""
+        if len(orders) > self.BATCH_SIZE:
+            raise ValueError(f"batchOrders accepts at most {self.BATCH_SIZE} orders, got {len(orders)}")
+        responses = []
+        for params in orders:
+            price = params.get("price")
+            order = self.exchange.submit(
+                self.account, params["symbol"], params["side"], params.get("type", "MARKET"),
+                float(params["quantity"]), float(price) if price is not None else None,
+                params.get("timeInForce", "GTC"), str(params.get("reduceOnly", False)).lower() == "true",
+                params.get("newClientOrderId")
+            )
+            responses.append(self._order_response(order))
+        return responses
+
+    def modify_order(self, symbol: str, side: str, quantity: float, price: float, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        order = self.exchange.modify(self.account, symbol, float(quantity), float(price), order_id, orig_client_order_id)
+        if order is None:
+            return {"code": -2013, "msg": "Order does not exist."}
+        return self._order_response(order)
+
+    def query_order(self, symbol: str, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        order = self.exchange.lookup(self.account, symbol, order_id, orig_client_order_id)
+        if order is None:
+            return {"code": -2013, "msg": "Order does not exist."}
+        return self._order_response(order)
+
+    def cancel_order(self, symbol: str, order_id: Optional[int] = None, orig_client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        order = self.exchange.cancel(self.account, symbol, order_id, orig_client_order_id)
+        if order is None:
+            return {"code": -2011, "msg": "Unknown order sent."}
+        return self._order_response(order)
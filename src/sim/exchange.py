@@ -0,0 +1,319 @@
+import csv
+import itertools
+import json
+import math
+import random
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .matching_engine import (
+    MatchingEngine, SimOrder, EPSILON,
+    NEW, PARTIALLY_FILLED, FILLED, EXPIRED, REJECTED
+)
+
+Tick = Tuple[int, str, float]
+
+class SimAccount:
+    """Futures account inside the simulator: one quote-asset wallet and one-way positions."""
+
+    __slots__ = ("name", "wallet", "fees_paid", "realized_pnl", "positions")
+
+    def __init__(self, name: str, balance: float):
+        self.name = name
+        self.wallet = balance
+        self.fees_paid = 0.0
+        self.realized_pnl = 0.0
+        # symbol -> [positionAmt, entryPrice]
+        self.positions: Dict[str, List[float]] = {}
+
+    def position(self, symbol: str) -> float:
+        entry = self.positions.get(symbol)
+        return entry[0] if entry else 0.0
+
+class SimulatedExchange:
+    """
+    In-process USD-M futures exchange.
+
+    Orders from every account meet in one MatchingEngine per symbol. Liquidity
+    outside the simulation comes from ticks (historical trades or synthetic
+    prices) fed through feed_tick(): a tick trades through resting orders at
+    or better than its price, and the last tick price is where market orders
+    and marketable limit orders fill whatever the book cannot. There is no
+    margin or liquidation model; wallets only move by realized PnL and fees.
+
+    Args:
+        maker_fee: Fee rate charged to resting (maker) fills.
+        taker_fee: Fee rate charged to aggressive (taker) fills.
+        initial_balance: Quote-asset wallet for each new account.
+        quote_asset: Asset the wallet is held in.
+    """
+
+    def __init__(self, maker_fee: float = 0.0002, taker_fee: float = 0.0004, initial_balance: float = 10000.0, quote_asset: str = "USDT"):
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.initial_balance = initial_balance
+        self.quote_asset = quote_asset
+        self.engines: Dict[str, MatchingEngine] = {}
+        self.accounts: Dict[str, SimAccount] = {}
+        self.last_price: Dict[str, float] = {}
+        self.orders: Dict[int, SimOrder] = {}
+        self.client_ids: Dict[Tuple[str, str], int] = {}
+        self.time = 0
+        self.trades = 0
+        self._ids = itertools.count(1)
+
+    def engine(self, symbol: str) -> MatchingEngine:
+        engine = self.engines.get(symbol)
+        if engine is None:
+            engine = self.engines[symbol] = MatchingEngine(symbol)
+        return engine
+
+    def account(self, name: str = "default") -> SimAccount:
+        account = self.accounts.get(name)
+        if account is None:
+            account = self.accounts[name] = SimAccount(name, self.initial_balance)
+        return account
+
+    def unrealized_pnl(self, account: SimAccount, symbol: Optional[str] = None) -> float:
+        total = 0.0
+        for s, (amt, entry) in account.positions.items():
+            if amt and (symbol is None or s == symbol):
+                total += (self.last_price.get(s, entry) - entry) * amt
+        return total
+
+    def submit(
+        self,
+        account: str,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: Optional[float] = None,
+        time_in_force: str = "GTC",
+        reduce_only: bool = False,
+        client_order_id: Optional[str] = None
+    ) -> SimOrder:
+        """
+        Matches a new order and rests any GTC remainder.
+
+        Args:
+            account: Account name (created on first use).
+            symbol: Trading pair.
+            side: "BUY" or "SELL".
+            order_type: "MARKET" or "LIMIT".
+            quantity: Order quantity.
+            price: Limit price (LIMIT only).
+            time_in_force: "GTC", "IOC", "FOK" or "GTX" (post-only).
+            reduce_only: Clamp the order to the account's open position.
+            client_order_id: Optional client id, unique per account.
+
+        Returns:
+            The SimOrder, with status and fills already applied.
+        """
+        acct = self.accounts.get(account) or self.account(account)
+        order = SimOrder(next(self._ids), account, symbol, side, order_type, quantity, price,
+                         time_in_force, reduce_only, client_order_id, self.time)
+        self.orders[order.order_id] = order
+        if client_order_id:
+            self.client_ids[(account, client_order_id)] = order.order_id
+
+        is_limit = order_type == "LIMIT"
+        if quantity <= 0 or (is_limit and not price) or not (is_limit or order_type == "MARKET"):
+            order.status = REJECTED
+            return order
+        if reduce_only:
+            position = acct.position(symbol)
+            closable = -position if side == "BUY" else position
+            if closable <= EPSILON:
+                order.status = EXPIRED
+                return order
+            if quantity > closable:
+                order.quantity = quantity = closable
+
+        engine = self.engines.get(symbol) or self.engine(symbol)
+        buy = side == "BUY"
+        limit = price if is_limit else None
+        last = self.last_price.get(symbol)
+
+        if time_in_force != "GTC":
+            if time_in_force == "GTX" and is_limit:
+                best = engine.best_ask() if buy else engine.best_bid()
+                crosses_book = best is not None and (best <= limit if buy else best >= limit)
+                crosses_tape = last is not None and (last <= limit if buy else last >= limit)
+                if crosses_book or crosses_tape:
+                    order.status = EXPIRED
+                    return order
+            elif time_in_force == "FOK" and self._fillable(engine, side, quantity, limit, last) < quantity - EPSILON:
+                order.status = EXPIRED
+                return order
+
+        self._execute(acct, engine, order)
+        return order
+
+    def _execute(self, acct: SimAccount, engine: MatchingEngine, order: SimOrder) -> None:
+        """Matches the unfilled part of `order`, then fills, rests or expires what is left."""
+        symbol, side = order.symbol, order.side
+        buy = side == "BUY"
+        is_limit = order.type == "LIMIT"
+        limit = order.price if is_limit else None
+        last = self.last_price.get(symbol)
+        quantity = order.quantity - order.filled
+
+        filled = cost = 0.0
+        fills = engine.match(side, quantity, limit)
+        if fills:
+            settle, accounts, maker_fee, taker_fee = self._settle, self.accounts, self.maker_fee, self.taker_fee
+            for maker, qty, fill_price in fills:
+                filled += qty
+                cost += qty * fill_price
+                settle(accounts[maker.account], symbol, maker.side, qty, fill_price, maker_fee)
+                settle(acct, symbol, side, qty, fill_price, taker_fee)
+            self.trades += len(fills)
+
+        remaining = quantity - filled
+        if remaining > EPSILON and last is not None and (limit is None or (last <= limit if buy else last >= limit)):
+            # Whatever the book could not fill trades against outside liquidity
+            filled += remaining
+            cost += remaining * last
+            self._settle(acct, symbol, side, remaining, last, self.taker_fee)
+            self.trades += 1
+            remaining = 0.0
+        order.filled += filled
+        order.cost += cost
+
+        if remaining <= EPSILON:
+            order.status = FILLED
+        elif is_limit and (order.time_in_force == "GTC" or order.time_in_force == "GTX"):
+            order.status = PARTIALLY_FILLED if order.filled else NEW
+            engine.rest(order)
+        else:
+            order.status = EXPIRED
+
+    def _fillable(self, engine: MatchingEngine, side: str, quantity: float, limit: Optional[float], last: Optional[float]) -> float:
+        if last is not None and (limit is None or (last <= limit if side == "BUY" else last >= limit)):
+            return quantity
+        levels = engine.ask_levels if side == "BUY" else engine.bid_levels
+        total = 0.0
+        for price in sorted(levels, reverse=side != "BUY"):
+            if limit is not None and (price > limit if side == "BUY" else price < limit):
+                break
+            total += sum(o.quantity - o.filled for o in levels[price])
+            if total >= quantity:
+                break
+        return total
+
+    def lookup(self, account: str, symbol: str, order_id: Optional[int] = None, client_order_id: Optional[str] = None) -> Optional[SimOrder]:
+        """An order of `account` by exchange or client id (None if unknown or owned by another account)."""
+        if order_id is None and client_order_id:
+            order_id = self.client_ids.get((account, client_order_id))
+        order = self.orders.get(order_id)
+        if order is None or order.account != account or order.symbol != symbol:
+            return None
+        return order
+
+    def cancel(self, account: str, symbol: str, order_id: Optional[int] = None, client_order_id: Optional[str] = None) -> Optional[SimOrder]:
+        """Cancels a resting order. Returns None if it is unknown, filled or owned by another account."""
+        order = self.lookup(account, symbol, order_id, client_order_id)
+        if order is None:
+            return None
+        return self.engine(symbol).cancel(order.order_id)
+
+    def modify(self, account: str, symbol: str, quantity: float, price: float, order_id: Optional[int] = None, client_order_id: Optional[str] = None) -> Optional[SimOrder]:
+        """
+        Re-prices a resting LIMIT order (Binance modify-order): it keeps its id,
+        goes to the back of the queue at the new price, and matches first if
+        the new price crosses.
+
+        Returns:
+            The order, or None if it is not resting or the new quantity is not above what has filled.
+        """
+        order = self.lookup(account, symbol, order_id, client_order_id)
+        engine = self.engines.get(symbol)
+        if order is None or engine is None or order.order_id not in engine.resting or quantity <= order.filled + EPSILON or price <= 0:
+            return None
+        engine.cancel(order.order_id)
+        order.price = price
+        order.quantity = quantity
+        self._execute(self.accounts[account], engine, order)
+        return order
+
+    def open_orders(self, account: str, symbol: Optional[str] = None) -> List[SimOrder]:
+        engines = [self.engines[symbol]] if symbol in self.engines else ([] if symbol else self.engines.values())
+        return [o for engine in engines for o in engine.resting.values() if o.account == account]
+
+    def feed_tick(self, symbol: str, price: float, quantity: float = math.inf, timestamp: Optional[int] = None) -> int:
+        """
+        Applies an outside trade: resting bids at or above `price` and asks at or
+        below it are filled (as makers, at their own price) up to `quantity`.
+
+        Returns:
+            Number of resting orders that received a fill.
+        """
+        if timestamp is not None:
+            self.time = timestamp
+        self.last_price[symbol] = price
+        engine = self.engines.get(symbol)
+        if engine is None:
+            return 0
+        touched = 0
+        for side in ("SELL", "BUY"):
+            # An outside seller at `price` hits our bids; an outside buyer lifts our asks
+            for maker, qty, fill_price in engine.match(side, quantity, price):
+                self._settle(self.accounts[maker.account], symbol, maker.side, qty, fill_price, self.maker_fee)
+                self.trades += 1
+                touched += 1
+        return touched
+
+    def replay(self, ticks: Iterable[Tick]) -> int:
+        """Feeds (timestamp, symbol, price) ticks in order. Returns the number of ticks applied."""
+        count = 0
+        for timestamp, symbol, price in ticks:
+            self.feed_tick(symbol, price, timestamp=timestamp)
+            count += 1
+        return count
+
+    def _settle(self, account: SimAccount, symbol: str, side: str, qty: float, price: float, fee_rate: float) -> None:
+        fee = qty * price * fee_rate
+        account.wallet -= fee
+        account.fees_paid += fee
+        entry = account.positions.get(symbol)
+        if entry is None:
+            entry = account.positions[symbol] = [0.0, 0.0]
+        amt, entry_price = entry
+        signed = qty if side == "BUY" else -qty
+        new_amt = amt + signed
+        if amt == 0 or (amt > 0) == (signed > 0):
+            entry[1] = (entry_price * abs(amt) + price * qty) / abs(new_amt)
+        else:
+            closed = min(qty, abs(amt))
+            pnl = (price - entry_price) * closed * (1 if amt > 0 else -1)
+            account.wallet += pnl
+            account.realized_pnl += pnl
+            if abs(new_amt) <= EPSILON:
+                new_amt = 0.0
+                entry[1] = 0.0
+            elif (new_amt > 0) != (amt > 0):
+                entry[1] = price
+        entry[0] = new_amt
+
+def load_ticks(path: str) -> Iterator[Tick]:
+    """
+    Reads historical ticks from CSV (timestamp,symbol,price) or JSONL
+    ({"timestamp", "symbol", "price"} per line), the same formats as the OCO replay.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield int(row["timestamp"]), row["symbol"].upper(), float(row["price"])
+        else:
+            for line in f:
+                if line.strip():
+                    tick = json.loads(line)
+                    yield int(tick["timestamp"]), tick["symbol"].upper(), float(tick["price"])
+
+def synthetic_ticks(symbol: str, start_price: float, count: int, volatility: float = 0.0005, tick_size: float = 0.1,
+                    interval_ms: int = 100, start_time: int = 0, seed: Optional[int] = None) -> Iterator[Tick]:
+    """Random-walk ticks (log-normal steps), rounded to tick_size."""
+    rng = random.Random(seed)
+    price = start_price
+    for i in range(count):
+        price *= math.exp(rng.gauss(0.0, volatility))
+        yield start_time + i * interval_ms, symbol, round(round(price / tick_size) * tick_size, 10)
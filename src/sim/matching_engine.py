@@ -0,0 +1,157 @@
+import heapq
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+NEW = "NEW"
+PARTIALLY_FILLED = "PARTIALLY_FILLED"
+FILLED = "FILLED"
+CANCELED = "CANCELED"
+EXPIRED = "EXPIRED"
+REJECTED = "REJECTED"
+
+# Quantities below this are treated as zero (float dust from partial fills)
+EPSILON = 1e-12
+
+class SimOrder:
+    """An order inside the simulator. Kept lean: the engine creates one per submission."""
+
+    __slots__ = (
+        "order_id", "client_order_id", "account", "symbol", "side", "type", "price",
+        "quantity", "filled", "cost", "status", "time_in_force", "reduce_only", "time"
+    )
+
+    def __init__(self, order_id, account, symbol, side, order_type, quantity, price=None,
+                 time_in_force="GTC", reduce_only=False, client_order_id=None, time=0):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.account = account
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.price = price
+        self.quantity = quantity
+        self.filled = 0.0
+        self.cost = 0.0
+        self.status = NEW
+        self.time_in_force = time_in_force
+        self.reduce_only = reduce_only
+        self.time = time
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled
+
+    @property
+    def avg_price(self) -> float:
+        return self.cost / self.filled if self.filled else 0.0
+
+# (maker order, quantity, price)
+Fill = Tuple[SimOrder, float, float]
+
+class MatchingEngine:
+    """
+    Price-time priority limit order book for one symbol.
+
+    Each price level is a FIFO deque; best prices come from a heap per side
+    (bids stored negated) whose stale entries are dropped lazily.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bid_levels: Dict[float, deque] = {}
+        self.ask_levels: Dict[float, deque] = {}
+        self._bid_heap: List[float] = []
+        self._ask_heap: List[float] = []
+        self.resting: Dict[int, SimOrder] = {}
+
+    def best_bid(self) -> Optional[float]:
+        heap, levels = self._bid_heap, self.bid_levels
+        while heap and -heap[0] not in levels:
+            heapq.heappop(heap)
+        return -heap[0] if heap else None
+
+    def best_ask(self) -> Optional[float]:
+        heap, levels = self._ask_heap, self.ask_levels
+        while heap and heap[0] not in levels:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def match(self, side: str, quantity: float, limit: Optional[float] = None) -> List[Fill]:
+        """
+        Takes liquidity from the opposite side for an aggressor on `side`.
+
+        Args:
+            side: Aggressor side ("BUY" takes asks, "SELL" takes bids).
+            quantity: Quantity to take.
+            limit: Worst acceptable price, or None for no limit.
+
+        Returns:
+            Fills as (maker order, quantity, price), best price first.
+        """
+        fills = []
+        buy = side == "BUY"
+        levels = self.ask_levels if buy else self.bid_levels
+        heap = self._ask_heap if buy else self._bid_heap
+        remaining = quantity
+        while remaining > EPSILON and heap:
+            price = heap[0] if buy else -heap[0]
+            level = levels.get(price)
+            if level is None:
+                heapq.heappop(heap)
+                continue
+            if limit is not None and (price > limit if buy else price < limit):
+                break
+            while level and remaining > EPSILON:
+                maker = level[0]
+                available = maker.quantity - maker.filled
+                qty = available if available < remaining else remaining
+                maker.filled += qty
+                maker.cost += qty * price
+                remaining -= qty
+                fills.append((maker, qty, price))
+                if maker.quantity - maker.filled <= EPSILON:
+                    maker.status = FILLED
+                    level.popleft()
+                    del self.resting[maker.order_id]
+                else:
+                    maker.status = PARTIALLY_FILLED
+            if not level:
+                del levels[price]
+                heapq.heappop(heap)
+        return fills
+
+    def rest(self, order: SimOrder) -> None:
+        price = order.price
+        if order.side == "BUY":
+            level = self.bid_levels.get(price)
+            if level is None:
+                level = self.bid_levels[price] = deque()
+                heapq.heappush(self._bid_heap, -price)
+        else:
+            level = self.ask_levels.get(price)
+            if level is None:
+                level = self.ask_levels[price] = deque()
+                heapq.heappush(self._ask_heap, price)
+        level.append(order)
+        self.resting[order.order_id] = order
+
+    def cancel(self, order_id: int) -> Optional[SimOrder]:
+        order = self.resting.pop(order_id, None)
+        if order is None:
+            return None
+        levels = self.bid_levels if order.side == "BUY" else self.ask_levels
+        level = levels[order.price]
+        level.remove(order)
+        if not level:
+            # Heap entry is dropped lazily by best_bid/best_ask/match
+            del levels[order.price]
+        order.status = CANCELED
+        return order
+
+    def depth(self, levels: int = 10):
+        bids = sorted(self.bid_levels.items(), reverse=True)[:levels]
+        asks = sorted(self.ask_levels.items())[:levels]
+        return {
+            "bids": [(p, sum(o.quantity - o.filled for o in q)) for p, q in bids],
+            "asks": [(p, sum(o.quantity - o.filled for o in q)) for p, q in asks]
+        }
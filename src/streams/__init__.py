@@ -0,0 +1 @@
+# streams package
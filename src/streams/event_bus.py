@@ -0,0 +1,317 @@
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from ..logger import get_logger, add_log_handler
+
+logger = get_logger(__name__)
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """One Server-Sent Events message."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+class EventSubscriber:
+    """
+    One connected dashboard.
+
+    Undelivered events wait in `pending`, where a newer "order", "balance" or
+    "position" event overwrites the older one with the same key. Flushes happen
+    at most once per `min_interval`, so a burst of updates reaches a browser as
+    one batch holding only the latest state. When more than `max_pending`
+    events are waiting, the oldest are dropped and reported in a "dropped"
+    event.
+    """
+
+    def __init__(self, bus: "EventBus", min_interval: float, max_pending: int, wake: Optional[Callable[[], None]] = None):
+        self.bus = bus
+        self.min_interval = min_interval
+        self.max_pending = max_pending
+        self.pending: "OrderedDict[Any, Tuple[int, str, Any]]" = OrderedDict()
+        self.coalesced = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.last_flush = 0.0
+        self._unreported_drops = 0
+        self._cond = threading.Condition(bus._lock)
+        self._wake = wake
+
+    def _offer(self, seq: int, event: str, key: Any, data: Any) -> None:
+        # Called with the bus lock held
+        if key in self.pending:
+            self.coalesced += 1
+            del self.pending[key]
+        self.pending[key] = (seq, event, data)
+        while len(self.pending) > self.max_pending:
+            self.pending.popitem(last=False)
+            self.dropped += 1
+            self._unreported_drops += 1
+        self._cond.notify()
+        if self._wake is not None:
+            self._wake()
+
+    def _notify_closed(self) -> None:
+        self._cond.notify_all()
+        if self._wake is not None:
+            self._wake()
+
+    def drain(self) -> List[Tuple[int, str, Any]]:
+        """Takes every pending event (oldest first)."""
+        with self._cond:
+            events = list(self.pending.values())
+            self.pending.clear()
+            if self._unreported_drops:
+                events.append((0, "dropped", {"count": self._unreported_drops}))
+                self._unreported_drops = 0
+            self.delivered += len(events)
+            self.last_flush = time.monotonic()
+            return events
+
+    def wait(self, timeout: float) -> bool:
+        """Blocks until events are pending (or `timeout`), then waits out the rest of the throttle interval."""
+        with self._cond:
+            if not self.pending and not self._cond.wait_for(lambda: self.pending or self.bus.closed, timeout):
+                return False
+        delay = self.last_flush + self.min_interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+class EventBus:
+    """
+    In-process pub/sub from the bot to connected dashboards.
+
+    Producers call publish() (thread-safe, O(subscribers) dict updates);
+    the exchange's user-data stream is attached once per process with
+    attach_user_stream(), however many dashboards are connected. Each
+    subscriber is served by sse() (a generator for threaded servers) or
+    sse_async() (an async generator for ASGI servers).
+
+    Args:
+        min_interval: Minimum seconds between flushes to one subscriber.
+        max_pending: Max undelivered events per subscriber.
+        heartbeat: Seconds of silence before a keep-alive comment is sent.
+    """
+
+    def __init__(self, min_interval: float = 0.25, max_pending: int = 500, heartbeat: float = 15.0):
+        self.min_interval = min_interval
+        self.max_pending = max_pending
+        self.heartbeat = heartbeat
+        self.subscribers: List[EventSubscriber] = []
+        self.published = 0
+        self.closed = False
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._log_handler: Optional[logging.Handler] = None
+        self._streams: List[Any] = []
+
+    def subscribe(self, min_interval: Optional[float] = None, wake: Optional[Callable[[], None]] = None) -> EventSubscriber:
+        sub = EventSubscriber(self, self.min_interval if min_interval is None else min_interval, self.max_pending, wake)
+        with self._lock:
+            self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: EventSubscriber) -> None:
+        with self._lock:
+            if sub in self.subscribers:
+                self.subscribers.remove(sub)
+
+    def publish(self, event: str, data: Any, key: Any = None) -> int:
+        """
+        Queues an event for every subscriber.
+
+        Args:
+            event: Event name ("order", "fill", "balance", "position", "log", ...).
+            data: JSON-serializable payload.
+            key: Coalescing key; events with the same key replace each other until delivered.
+
+        Returns:
+            The event's sequence number.
+        """
+        with self._lock:
+            seq = next(self._seq)
+            self.published += 1
+            slot = (event, key) if key is not None else seq
+            for sub in self.subscribers:
+                sub._offer(seq, event, slot, data)
+        return seq
+
+    # Producers
+
+    def publish_order(self, response: Dict[str, Any], account: Optional[str] = None) -> None:
+        """Publishes an order response (REST reply or dry-run echo) as an "order" event."""
+        order_id = response.get("orderId") or response.get("clientOrderId")
+        data = dict(response, account=account) if account else response
+        self.publish("order", data, key=order_id)
+
+    def handle_user_event(self, data: Dict[str, Any]) -> None:
+        """Maps a user-data stream event to dashboard events (use as a UserDataStream listener)."""
+        event = data.get("e")
+        if event == "ORDER_TRADE_UPDATE":
+            o = data["o"]
+            self.publish("order", {
+                "orderId": o["i"], "clientOrderId": o.get("c"), "symbol": o["s"], "side": o.get("S"),
+                "type": o.get("o"), "status": o.get("X"), "price": o.get("p"), "origQty": o.get("q"),
+                "executedQty": o.get("z"), "avgPrice": o.get("ap"), "updateTime": o.get("T")
+            }, key=o["i"])
+            if o.get("x") == "TRADE":
+                self.publish("fill", {
+                    "orderId": o["i"], "symbol": o["s"], "side": o.get("S"),
+                    "price": o.get("L"), "quantity": o.get("l"), "time": o.get("T")
+                })
+        elif event == "ACCOUNT_UPDATE":
+            for b in data.get("a", {}).get("B", []):
+                self.publish("balance", {"asset": b["a"], "walletBalance": b.get("wb"), "crossWalletBalance": b.get("cw")}, key=b["a"])
+            for p in data.get("a", {}).get("P", []):
+                side = p.get("ps", "BOTH")
+                self.publish("position", {"symbol": p["s"], "positionSide": side, "positionAmt": p.get("pa"), "entryPrice": p.get("ep"), "unrealizedProfit": p.get("up")}, key=(p["s"], side))
+
+    def attach_user_stream(self, stream) -> None:
+        """Forwards a UserDataStream's events (the one upstream subscription for all dashboards)."""
+        if stream not in self._streams:
+            self._streams.append(stream)
+            stream.add_listener(self.handle_user_event)
+
+    def attach_logs(self, level: int = logging.INFO) -> None:
+        """Publishes bot log records at `level` and above as "log" events."""
+        if self._log_handler is not None:
+            return
+        bus = self
+
+        class _Handler(logging.Handler):
+            def emit(self, record):
+                if record.name == __name__:
+                    return
+                try:
+                    bus.publish("log", {"ts": record.created, "level": record.levelname, "logger": record.name, "msg": record.getMessage()})
+                except Exception:
+                    self.handleError(record)
+
+        self._log_handler = _Handler(level)
+        add_log_handler(self._log_handler)
+
+    # Consumers
+
+    def sse(self, sub: Optional[EventSubscriber] = None) -> Iterator[str]:
+        """SSE text for one subscriber, for threaded servers (Flask). Unsubscribes when closed."""
+        sub = sub or self.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while not self.closed:
+                if not sub.wait(self.heartbeat):
+                    yield ": keep-alive\n\n"
+                    continue
+                events = sub.drain()
+                if events:
+                    yield "".join(format_sse(event, data, seq or None) for seq, event, data in events)
+        finally:
+            sub.close()
+
+    async def sse_async(self, min_interval: Optional[float] = None):
+        """SSE text for one subscriber, for asyncio servers (Quart). Unsubscribes when cancelled."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass  # loop already closed; the generator is being torn down
+
+        sub = self.subscribe(min_interval, wake=wake)
+        try:
+            yield "retry: 3000\n\n"
+            while not self.closed:
+                try:
+                    await asyncio.wait_for(ready.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                delay = sub.last_flush + sub.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                ready.clear()
+                events = sub.drain()
+                if events:
+                    yield "".join(format_sse(event, data, seq or None) for seq, event, data in events)
+        finally:
+            sub.close()
+
+    def open(self) -> None:
+        """Accepts streams again after close() (server restart)."""
+        with self._lock:
+            self.closed = False
+
+    def close(self) -> None:
+        """Ends every stream (server shutdown)."""
+        with self._lock:
+            self.closed = True
+            for sub in self.subscribers:
+                sub._notify_closed()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subs = list(self.subscribers)
+            return {
+                "published": self.published,
+                "subscribers": len(subs),
+                "pending": sum(len(s.pending) for s in subs),
+                "coalesced": sum(s.coalesced for s in subs),
+                "dropped": sum(s.dropped for s in subs)
+            }
+
+def start_user_stream_thread(bus: Optional[EventBus], client=None):
+    """
+    Runs a UserDataStream on a background event loop, for threaded servers;
+    ASGI servers run the stream on their own loop.
+
+    Args:
+        bus: EventBus to forward dashboard events to (None for none).
+        client: BinanceClient whose account the stream follows. Its RiskEngine
+            (and AccountState) are kept current from the stream, which also
+            follows mark prices. None uses the configured default account.
+    """
+    import asyncio
+    from ..orders.async_client import AsyncBinanceClient
+    from .user_data import UserDataStream, attach_client_state
+
+    if client is None:
+        stream = UserDataStream(AsyncBinanceClient(journaled=False))
+    else:
+        listen_client = AsyncBinanceClient(client.key, client.secret, dry_run=False, base_url=client.base_url, journaled=False)
+        stream = UserDataStream(listen_client, mark_prices=True)
+        attach_client_state(stream, client)
+    if bus is not None:
+        bus.attach_user_stream(stream)
+
+    async def run():
+        await stream.client.open()
+        try:
+            await stream.run()
+        finally:
+            await stream.client.close()
+
+    thread = threading.Thread(target=lambda: asyncio.run(run()), name="user-data-stream", daemon=True)
+    thread.start()
+    logger.info("User data stream started")
+    return stream
+
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+
+def get_event_bus() -> EventBus:
+    """The process-wide EventBus."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            from ..config import CONFIG
+            _bus = EventBus(min_interval=CONFIG.API_EVENT_INTERVAL, max_pending=CONFIG.API_EVENT_MAX_PENDING)
+        return _bus
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any, List
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+class Subscription:
+    """
+    A consumer's bounded queue.
+
+    Policies:
+        "drop_oldest": a full queue discards its oldest message (slow consumers see gaps, never stall producers).
+        "block": the producer waits for space (backpressure on the stream).
+    """
+
+    def __init__(self, fanout: "FanOut", maxsize: int, policy: str):
+        if policy not in ("drop_oldest", "block"):
+            raise ValueError(f"Invalid policy: {policy}. Must be drop_oldest or block.")
+        self.fanout = fanout
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.policy = policy
+        self.dropped = 0
+
+    async def get(self) -> Any:
+        return await self.queue.get()
+
+    def get_nowait(self) -> Any:
+        return self.queue.get_nowait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.fanout.unsubscribe(self)
+
+class FanOut:
+    """Delivers each published message to every subscriber's bounded queue."""
+
+    def __init__(self):
+        self.subscribers: List[Subscription] = []
+        self.published = 0
+
+    def subscribe(self, maxsize: int = 1000, policy: str = "drop_oldest") -> Subscription:
+        sub = Subscription(self, maxsize, policy)
+        self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self.subscribers:
+            self.subscribers.remove(sub)
+
+    async def publish(self, message: Any) -> None:
+        self.published += 1
+        for sub in self.subscribers:
+            queue = sub.queue
+            if not queue.full():
+                queue.put_nowait(message)
+            elif sub.policy == "block":
+                await queue.put(message)
+            else:
+                queue.get_nowait()
+                sub.dropped += 1
+                queue.put_nowait(message)
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "subscribers": [
+                {"policy": s.policy, "depth": s.queue.qsize(), "maxsize": s.queue.maxsize, "dropped": s.dropped}
+                for s in self.subscribers
+            ]
+        }
@@ -0,0 +1,200 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from ..config import CONFIG
+from ..logger import get_logger
+from .fanout import FanOut
+from .order_book import OrderBook, BestPriceCache, OutOfSync
+
+logger = get_logger(__name__)
+
+SnapshotFetcher = Callable[[str], Awaitable[Dict[str, Any]]]
+
+class MarketDataStream:
+    """
+    Depth and best bid/ask ingestion for many symbols on one event loop.
+
+    Each symbol gets an OrderBook synced from a REST snapshot plus the
+    diff-depth stream, and a BestPriceCache entry from the bookTicker stream.
+    Every event is then published to `fanout` for downstream consumers.
+
+    Args:
+        symbols: Symbols to follow.
+        client: AsyncBinanceClient used for depth snapshots (ignored if snapshot_fetcher is given).
+        snapshot_fetcher: Async callable symbol -> depth snapshot. None means snapshots arrive
+            as {"type": "snapshot"} messages (replay mode).
+        ws_url: Websocket base URL.
+        depth_speed: Diff-depth update speed ("100ms", "250ms" or "500ms").
+        record_path: Optional JSONL file that every received message (and snapshot) is appended to.
+        best: BestPriceCache to update (shared between streams); a new one by default.
+        depth: Follow the diff-depth stream and keep OrderBooks (off = bookTicker only).
+        trades: Also subscribe to aggTrade streams (published to `fanout` as received).
+    """
+
+    MAX_STREAMS_PER_CONNECTION = 200
+    MAX_BUFFERED_DIFFS = 5000
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        client=None,
+        snapshot_fetcher: Optional[SnapshotFetcher] = None,
+        ws_url: Optional[str] = None,
+        depth_speed: str = "100ms",
+        record_path: Optional[str] = None,
+        best: Optional[BestPriceCache] = None,
+        depth: bool = True,
+        trades: bool = False
+    ):
+        self.symbols = [s.upper() for s in symbols]
+        self.books: Dict[str, OrderBook] = {s: OrderBook(s) for s in self.symbols}
+        self.best = best if best is not None else BestPriceCache()
+        self.fanout = FanOut()
+        self.ws_url = (ws_url or CONFIG.BINANCE_WS_URL).rstrip("/")
+        self.depth_speed = depth_speed
+        self.depth = depth
+        self.trades = trades
+        if snapshot_fetcher is None and client is not None:
+            snapshot_fetcher = lambda symbol: client.get_order_book(symbol, limit=1000)
+        self.snapshot_fetcher = snapshot_fetcher
+
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {s: [] for s in self.symbols}
+        self._resyncing = set()
+        self._record = open(record_path, "a", encoding="utf-8") if record_path else None
+        self._running = False
+        self.resyncs = 0
+
+    def streams(self) -> List[str]:
+        names = []
+        for symbol in self.symbols:
+            lower = symbol.lower()
+            if self.depth:
+                names.append(f"{lower}@depth@{self.depth_speed}")
+            names.append(f"{lower}@bookTicker")
+            if self.trades:
+                names.append(f"{lower}@aggTrade")
+        return names
+
+    async def handle_message(self, message: Dict[str, Any]) -> None:
+        """Processes one websocket (or replayed) message."""
+        if self._record is not None:
+            self._record.write(json.dumps(message) + "\n")
+
+        if message.get("type") == "snapshot":
+            self._apply_snapshot(message["symbol"], message["data"])
+            return
+
+        data = message.get("data", message)
+        event = data.get("e")
+        if event == "depthUpdate":
+            self._on_depth(data)
+        elif event == "bookTicker":
+            self.best.update_from_book_ticker(data)
+        await self.fanout.publish(data)
+
+    def _on_depth(self, data: Dict[str, Any]) -> None:
+        symbol = data["s"]
+        book = self.books.get(symbol)
+        if book is None:
+            return
+        if symbol in self._resyncing or not book.ready:
+            self._buffer(symbol, data)
+            return
+        try:
+            book.apply_diff(data)
+        except OutOfSync as e:
+            logger.warning(f"Order book out of sync: {e}")
+            self._buffer(symbol, data)
+            return
+        self._publish_best(book, data.get("E", 0))
+
+    def _buffer(self, symbol: str, data: Dict[str, Any]) -> None:
+        buffer = self._buffers[symbol]
+        buffer.append(data)
+        if len(buffer) > self.MAX_BUFFERED_DIFFS:
+            del buffer[0]
+        if self.snapshot_fetcher is not None and symbol not in self._resyncing:
+            self._resyncing.add(symbol)
+            asyncio.get_running_loop().create_task(self._resync(symbol))
+
+    async def _resync(self, symbol: str) -> None:
+        self.resyncs += 1
+        try:
+            snapshot = await self.snapshot_fetcher(symbol)
+        except Exception as e:
+            logger.error(f"Depth snapshot for {symbol} failed: {e}")
+            await asyncio.sleep(1)
+            self._resyncing.discard(symbol)
+            return
+        if self._record is not None:
+            self._record.write(json.dumps({"type": "snapshot", "symbol": symbol, "data": snapshot}) + "\n")
+        self._resyncing.discard(symbol)
+        self._apply_snapshot(symbol, snapshot)
+
+    def _apply_snapshot(self, symbol: str, snapshot: Dict[str, Any]) -> None:
+        book = self.books[symbol]
+        book.apply_snapshot(snapshot)
+        pending, self._buffers[symbol] = self._buffers[symbol], []
+        for data in pending:
+            try:
+                book.apply_diff(data)
+            except OutOfSync as e:
+                # Snapshot older than the buffered stream start; fetch another
+                logger.warning(f"Order book resync failed: {e}")
+                self._buffers[symbol] = [data]
+                if self.snapshot_fetcher is not None:
+                    self._resyncing.add(symbol)
+                    asyncio.get_running_loop().create_task(self._resync(symbol))
+                return
+        self._publish_best(book, 0)
+
+    def _publish_best(self, book: OrderBook, event_time: int) -> None:
+        bid, ask = book.best_bid(), book.best_ask()
+        if bid is not None and ask is not None:
+            self.best.update(book.symbol, bid[0], bid[1], ask[0], ask[1], event_time)
+
+    async def run(self) -> None:
+        """Connects (one websocket per MAX_STREAMS_PER_CONNECTION streams) and processes messages until stop()."""
+        try:
+            import aiohttp
+        except ImportError:
+            logger.error("aiohttp not installed. Streaming requires it.")
+            raise ImportError("Please install 'aiohttp' to use market data streams.")
+
+        self._running = True
+        streams = self.streams()
+        chunks = [streams[i:i + self.MAX_STREAMS_PER_CONNECTION] for i in range(0, len(streams), self.MAX_STREAMS_PER_CONNECTION)]
+        async with aiohttp.ClientSession() as session:
+            await asyncio.gather(*(self._run_connection(session, chunk) for chunk in chunks))
+
+    async def _run_connection(self, session, streams: List[str]) -> None:
+        import aiohttp
+        url = f"{self.ws_url}/stream?streams={'/'.join(streams)}"
+        backoff = 1.0
+        while self._running:
+            try:
+                async with session.ws_connect(url, heartbeat=30) as ws:
+                    logger.info(f"Market data connected: {len(streams)} streams")
+                    backoff = 1.0
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            await self.handle_message(json.loads(msg.data))
+                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+                        if not self._running:
+                            break
+            except Exception as e:
+                logger.error(f"Market data connection error: {e}")
+            if self._running:
+                # Books must be rebuilt from a new snapshot after a reconnect
+                for name in streams:
+                    if "@depth" in name:
+                        self.books[name.split("@")[0].upper()].reset()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def stop(self) -> None:
+        self._running = False
+        if self._record is not None:
+            self._record.close()
+            self._record = None
@@ -0,0 +1,167 @@
+import bisect
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+class OutOfSync(Exception):
+    """Raised when a depth diff does not chain onto the local book; a new snapshot is needed."""
+
+class _BookSide:
+    """One side of the book: price -> quantity plus a sorted price list for O(log n) best-price access."""
+
+    __slots__ = ("levels", "prices", "descending")
+
+    def __init__(self, descending: bool):
+        self.levels: Dict[float, float] = {}
+        self.prices: List[float] = []
+        self.descending = descending
+
+    def clear(self) -> None:
+        self.levels.clear()
+        self.prices.clear()
+
+    def set(self, price: float, quantity: float) -> None:
+        if quantity == 0:
+            if self.levels.pop(price, None) is not None:
+                i = bisect.bisect_left(self.prices, price)
+                if i < len(self.prices) and self.prices[i] == price:
+                    del self.prices[i]
+        else:
+            if price not in self.levels:
+                bisect.insort(self.prices, price)
+            self.levels[price] = quantity
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self.prices:
+            return None
+        price = self.prices[-1] if self.descending else self.prices[0]
+        return price, self.levels[price]
+
+    def top(self, depth: int) -> List[Tuple[float, float]]:
+        prices = self.prices[::-1][:depth] if self.descending else self.prices[:depth]
+        return [(p, self.levels[p]) for p in prices]
+
+class OrderBook:
+    """
+    Local depth book for one symbol, kept in sync from a REST snapshot plus
+    the diff-depth stream (USD-M futures rules: drop diffs with u < lastUpdateId,
+    the first applied diff must straddle lastUpdateId, and every following
+    diff's pu must equal the previous diff's u).
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = _BookSide(descending=True)
+        self.asks = _BookSide(descending=False)
+        self.last_update_id = 0
+        self.synced = False
+        self._snapshot_applied = False
+        self.updated_at = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """True once a snapshot has been applied and no gap has been detected since."""
+        return self._snapshot_applied
+
+    def reset(self) -> None:
+        """Marks the book as needing a fresh snapshot (e.g. after a reconnect)."""
+        self._snapshot_applied = False
+        self.synced = False
+
+    def apply_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        self.bids.clear()
+        self.asks.clear()
+        for price, qty in snapshot.get("bids", []):
+            self.bids.set(float(price), float(qty))
+        for price, qty in snapshot.get("asks", []):
+            self.asks.set(float(price), float(qty))
+        self.last_update_id = int(snapshot["lastUpdateId"])
+        self._snapshot_applied = True
+        self.synced = False
+        self.updated_at = time.time()
+
+    def apply_diff(self, event: Dict[str, Any]) -> bool:
+        """
+        Applies a depthUpdate event.
+
+        Returns:
+            True if applied, False if it predates the snapshot and was dropped.
+
+        Raises:
+            OutOfSync: If the event does not chain onto the book.
+        """
+        if not self._snapshot_applied:
+            raise OutOfSync(f"{self.symbol}: no snapshot")
+        first, final, prev_final = event["U"], event["u"], event.get("pu")
+
+        if final < self.last_update_id:
+            return False
+        if not self.synced:
+            if not first <= self.last_update_id <= final:
+                self._snapshot_applied = False
+                raise OutOfSync(f"{self.symbol}: first diff {first}-{final} does not cover snapshot {self.last_update_id}")
+            self.synced = True
+        elif prev_final != self.last_update_id:
+            self.synced = False
+            self._snapshot_applied = False
+            raise OutOfSync(f"{self.symbol}: gap, pu={prev_final} expected {self.last_update_id}")
+
+        for price, qty in event.get("b", []):
+            self.bids.set(float(price), float(qty))
+        for price, qty in event.get("a", []):
+            self.asks.set(float(price), float(qty))
+        self.last_update_id = final
+        self.updated_at = time.time()
+        return True
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        return self.asks.best()
+
+    def mid(self) -> Optional[float]:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def snapshot(self, depth: int = 10) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "lastUpdateId": self.last_update_id,
+            "bids": self.bids.top(depth),
+            "asks": self.asks.top(depth)
+        }
+
+class BestPriceCache:
+    """Latest best bid/ask per symbol, fed by bookTicker events or order book updates."""
+
+    __slots__ = ("quotes",)
+
+    def __init__(self):
+        # symbol -> (bid, bid_qty, ask, ask_qty, event_time_ms)
+        self.quotes: Dict[str, Tuple[float, float, float, float, int]] = {}
+
+    def update(self, symbol: str, bid: float, bid_qty: float, ask: float, ask_qty: float, event_time: int = 0) -> None:
+        self.quotes[symbol] = (bid, bid_qty, ask, ask_qty, event_time)
+
+    def update_from_book_ticker(self, event: Dict[str, Any]) -> None:
+        self.quotes[event["s"]] = (float(event["b"]), float(event["B"]), float(event["a"]), float(event["A"]), event.get("E", 0))
+
+    def get(self, symbol: str) -> Optional[Tuple[float, float, float, float, int]]:
+        return self.quotes.get(symbol)
+
+    def best_bid(self, symbol: str) -> Optional[float]:
+        quote = self.quotes.get(symbol)
+        return quote[0] if quote else None
+
+    def best_ask(self, symbol: str) -> Optional[float]:
+        quote = self.quotes.get(symbol)
+        return quote[2] if quote else None
+
+    def mid(self, symbol: str) -> Optional[float]:
+        quote = self.quotes.get(symbol)
+        return (quote[0] + quote[2]) / 2 if quote else None
@@ -0,0 +1,34 @@
+import asyncio
+import json
+from typing import Any
+
+async def replay_file(stream: Any, path: str, realtime: bool = False, speed: float = 1.0) -> int:
+    """
+    Feeds a recorded JSONL message file (as written with record_path) into a
+    MarketDataStream or UserDataStream.
+
+    Args:
+        stream: Object with an async handle_message(message) method.
+        path: Recorded message file.
+        realtime: Sleep between messages according to their event times ("E", ms).
+        speed: Playback speed multiplier when realtime is True.
+
+    Returns:
+        Number of messages replayed.
+    """
+    count = 0
+    last_event_time = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if realtime:
+                event_time = message.get("data", message).get("E")
+                if event_time is not None:
+                    if last_event_time is not None and event_time > last_event_time:
+                        await asyncio.sleep((event_time - last_event_time) / 1000 / speed)
+                    last_event_time = event_time
+            await stream.handle_message(message)
+            count += 1
+    return count
@@ -0,0 +1,194 @@
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..config import CONFIG
+from ..logger import get_logger
+from .fanout import FanOut
+
+logger = get_logger(__name__)
+
+FINAL_ORDER_STATUSES = ("FILLED", "CANCELED", "EXPIRED", "REJECTED", "EXPIRED_IN_MATCH")
+
+class UserDataStream:
+    """
+    User-data stream consumer keeping local order, balance and position state.
+
+    ORDER_TRADE_UPDATE events update `orders` (keyed by orderId) and
+    ACCOUNT_UPDATE events update `balances` / `positions`. Each event is also
+    passed to registered listeners (plain callables) and published to
+    `fanout`.
+
+    Args:
+        client: AsyncBinanceClient used to create and keep alive the listen key.
+        ws_url: Websocket base URL.
+        keep_closed_orders: How many finished orders to retain in `orders`.
+        mark_prices: Also follow the all-symbol mark price stream and pass its
+            markPriceUpdate events to the listeners (for RiskEngine marks).
+    """
+
+    KEEPALIVE_SECONDS = 30 * 60
+    MARK_PRICE_STREAM = "!markPrice@arr@1s"
+
+    def __init__(self, client=None, ws_url: Optional[str] = None, keep_closed_orders: int = 1000, mark_prices: bool = False):
+        self.client = client
+        self.ws_url = (ws_url or CONFIG.BINANCE_WS_URL).rstrip("/")
+        self.keep_closed_orders = keep_closed_orders
+        self.mark_prices = mark_prices
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.balances: Dict[str, Dict[str, float]] = {}
+        self.positions: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.fanout = FanOut()
+        self._closed: List[int] = []
+        self._running = False
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        self.listeners.append(listener)
+
+    async def handle_message(self, message: Any) -> None:
+        if isinstance(message, list):
+            # Array streams (mark prices) carry one event per symbol
+            for item in message:
+                await self.handle_message(item)
+            return
+        data = message.get("data", message)
+        event = data.get("e")
+        if event == "ORDER_TRADE_UPDATE":
+            self._on_order(data["o"])
+        elif event == "ACCOUNT_UPDATE":
+            self._on_account(data["a"])
+        elif event == "listenKeyExpired":
+            logger.warning("Listen key expired; reconnecting user data stream")
+        for listener in self.listeners:
+            try:
+                listener(data)
+            except Exception:
+                logger.exception("User data listener failed")
+        await self.fanout.publish(data)
+
+    def _on_order(self, o: Dict[str, Any]) -> None:
+        order_id = o["i"]
+        order = self.orders.setdefault(order_id, {"orderId": order_id})
+        order.update({
+            "symbol": o["s"],
+            "clientOrderId": o.get("c"),
+            "side": o.get("S"),
+            "type": o.get("o"),
+            "status": o.get("X"),
+            "price": float(o.get("p", 0)),
+            "origQty": float(o.get("q", 0)),
+            "executedQty": float(o.get("z", 0)),
+            "avgPrice": float(o.get("ap", 0)),
+            "lastFillQty": float(o.get("l", 0)),
+            "lastFillPrice": float(o.get("L", 0)),
+            "updateTime": o.get("T")
+        })
+        if order["status"] in FINAL_ORDER_STATUSES:
+            self._closed.append(order_id)
+            while len(self._closed) > self.keep_closed_orders:
+                self.orders.pop(self._closed.pop(0), None)
+
+    def _on_account(self, a: Dict[str, Any]) -> None:
+        for b in a.get("B", []):
+            self.balances[b["a"]] = {
+                "walletBalance": float(b.get("wb", 0)),
+                "crossWalletBalance": float(b.get("cw", 0))
+            }
+        for p in a.get("P", []):
+            self.positions[(p["s"], p.get("ps", "BOTH"))] = {
+                "positionAmt": float(p.get("pa", 0)),
+                "entryPrice": float(p.get("ep", 0)),
+                "unrealizedProfit": float(p.get("up", 0))
+            }
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            o for o in self.orders.values()
+            if o["status"] not in FINAL_ORDER_STATUSES and (symbol is None or o["symbol"] == symbol)
+        ]
+
+    async def _keepalive(self, listen_key: str) -> None:
+        while self._running:
+            await asyncio.sleep(self.KEEPALIVE_SECONDS)
+            try:
+                await self.client.keepalive_listen_key(listen_key)
+            except Exception as e:
+                logger.error(f"Listen key keepalive failed: {e}")
+
+    async def run(self) -> None:
+        """Creates a listen key, connects and processes events until stop(), reconnecting on errors."""
+        try:
+            import aiohttp
+        except ImportError:
+            logger.error("aiohttp not installed. Streaming requires it.")
+            raise ImportError("Please install 'aiohttp' to use user data streams.")
+
+        self._running = True
+        async with aiohttp.ClientSession() as session:
+            marks = asyncio.get_running_loop().create_task(self._run_mark_prices(session)) if self.mark_prices else None
+            try:
+                await self._run_user(session)
+            finally:
+                if marks is not None:
+                    marks.cancel()
+
+    async def _run_mark_prices(self, session) -> None:
+        import aiohttp
+        backoff = 1.0
+        while self._running:
+            try:
+                async with session.ws_connect(f"{self.ws_url}/ws/{self.MARK_PRICE_STREAM}", heartbeat=30) as ws:
+                    logger.info("Mark price stream connected")
+                    backoff = 1.0
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT or not self._running:
+                            break
+                        await self.handle_message(json.loads(msg.data))
+            except Exception as e:
+                logger.error(f"Mark price stream error: {e}")
+            if self._running:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    async def _run_user(self, session) -> None:
+        import aiohttp
+        backoff = 1.0
+        while self._running:
+            keepalive = None
+            try:
+                listen_key = (await self.client.new_listen_key())["listenKey"]
+                keepalive = asyncio.get_running_loop().create_task(self._keepalive(listen_key))
+                async with session.ws_connect(f"{self.ws_url}/ws/{listen_key}", heartbeat=30) as ws:
+                    logger.info("User data stream connected")
+                    backoff = 1.0
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        data = json.loads(msg.data)
+                        await self.handle_message(data)
+                        if data.get("e") == "listenKeyExpired" or not self._running:
+                            break
+            except Exception as e:
+                logger.error(f"User data stream error: {e}")
+            finally:
+                if keepalive is not None:
+                    keepalive.cancel()
+            if self._running:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def stop(self) -> None:
+        self._running = False
+
+def attach_client_state(stream: UserDataStream, client) -> None:
+    """
+    Keeps `client`'s RiskEngine (fills, cancels, positions, mark prices) and
+    AccountState (balances, positions) current from `stream`, and passes
+    take-profit fills and mark prices to its OCO manager.
+    """
+    from ..orders.advanced.oco import route_event
+
+    for state in (getattr(client, "risk", None), getattr(client, "account_state", None)):
+        if state is not None:
+            stream.add_listener(state.apply_event)
+    stream.add_listener(lambda data: route_event(client, data))
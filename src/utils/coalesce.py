@@ -0,0 +1,53 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class AsyncCoalescer:
+    """
+    Single-flight request coalescing with a short TTL cache.
+
+    Concurrent callers asking for the same key share one upstream call; the
+    result is then served from memory for `ttl` seconds. Errors are passed to
+    every waiter but never cached.
+
+    Args:
+        ttl: Seconds a successful result stays cached (0 disables caching, coalescing only).
+    """
+
+    def __init__(self, ttl: float = 0.5):
+        self.ttl = ttl
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            self.cache_hits += 1
+            return cached[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.calls += 1
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+        try:
+            value = await asyncio.shield(task)
+        finally:
+            self._inflight.pop(key, None)
+        self._cache[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, key: Hashable = None) -> None:
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"upstream_calls": self.calls, "cache_hits": self.cache_hits, "coalesced": self.coalesced}
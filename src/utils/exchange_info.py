@@ -0,0 +1,196 @@
+import json
+import math
+import os
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+from ..logger import get_logger
+
+logger = get_logger(__name__)
+
+def _decimals(step: str) -> int:
+    """Number of decimal places in an exchange step string ("0.0010" -> 3)."""
+    exponent = Decimal(step).normalize().as_tuple().exponent
+    return max(0, -exponent)
+
+class SymbolFilters:
+    """
+    Trading rules for one symbol, with precomputed quantizers.
+
+    Steps are stored as their inverse and decimal precision so rounding is a
+    multiply, floor and round on floats rather than Decimal arithmetic.
+    """
+
+    __slots__ = (
+        "symbol", "status", "tick_size", "step_size", "min_qty", "max_qty",
+        "market_min_qty", "market_max_qty", "min_price", "max_price", "min_notional",
+        "_qty_inv", "_qty_prec", "_price_inv", "_price_prec"
+    )
+
+    def __init__(self, info: Dict[str, Any]):
+        filters = {f["filterType"]: f for f in info.get("filters", [])}
+        price_filter = filters.get("PRICE_FILTER", {})
+        lot = filters.get("LOT_SIZE", {})
+        market_lot = filters.get("MARKET_LOT_SIZE", lot)
+        notional = filters.get("MIN_NOTIONAL", {})
+
+        self.symbol = info["symbol"]
+        self.status = info.get("status", "TRADING")
+
+        tick = price_filter.get("tickSize", "0")
+        step = lot.get("stepSize", "0")
+        self.tick_size = float(tick)
+        self.step_size = float(step)
+        self.min_qty = float(lot.get("minQty", 0))
+        self.max_qty = float(lot.get("maxQty", 0)) or math.inf
+        self.market_min_qty = float(market_lot.get("minQty", self.min_qty))
+        self.market_max_qty = float(market_lot.get("maxQty", 0)) or self.max_qty
+        self.min_price = float(price_filter.get("minPrice", 0))
+        self.max_price = float(price_filter.get("maxPrice", 0)) or math.inf
+        self.min_notional = float(notional.get("notional", notional.get("minNotional", 0)))
+
+        self._qty_inv = 1.0 / self.step_size if self.step_size else 0.0
+        self._qty_prec = _decimals(step) if self.step_size else 8
+        self._price_inv = 1.0 / self.tick_size if self.tick_size else 0.0
+        self._price_prec = _decimals(tick) if self.tick_size else 8
+
+    def round_quantity(self, quantity: float) -> float:
+        """Rounds a quantity down to the symbol's step size."""
+        if not self._qty_inv:
+            return quantity
+        return round(math.floor(quantity * self._qty_inv + 1e-9) / self._qty_inv, self._qty_prec)
+
+    def round_price(self, price: float) -> float:
+        """Rounds a price to the nearest tick."""
+        if not self._price_inv:
+            return price
+        return round(round(price * self._price_inv) / self._price_inv, self._price_prec)
+
+    def check_quantity(self, quantity: float, market: bool = False) -> bool:
+        low, high = (self.market_min_qty, self.market_max_qty) if market else (self.min_qty, self.max_qty)
+        if not low <= quantity <= high:
+            return False
+        if self._qty_inv:
+            steps = quantity * self._qty_inv
+            return abs(steps - round(steps)) < 1e-6
+        return True
+
+    def check_price(self, price: float) -> bool:
+        if not self.min_price <= price <= self.max_price:
+            return False
+        if self._price_inv:
+            ticks = price * self._price_inv
+            return abs(ticks - round(ticks)) < 1e-6
+        return True
+
+    def check_notional(self, quantity: float, price: float) -> bool:
+        return quantity * price >= self.min_notional
+
+class ExchangeInfoCache:
+    """
+    exchangeInfo-backed cache of SymbolFilters.
+
+    Loaded once on first use, refreshed after `ttl` seconds, and persisted to
+    `cache_path` so a fresh process can start from disk without a REST call.
+
+    Args:
+        loader: Callable returning the raw exchangeInfo dict (e.g. BinanceClient.get_exchange_info).
+        ttl: Seconds before the cache is considered stale.
+        cache_path: JSON file to persist to / load from. None disables persistence.
+    """
+
+    RETRY_SECONDS = 60
+
+    def __init__(self, loader: Optional[Callable[[], Dict[str, Any]]] = None, ttl: float = 3600, cache_path: Optional[str] = None):
+        self.loader = loader
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.symbols: Dict[str, SymbolFilters] = {}
+        self.loaded_at = 0.0
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> "ExchangeInfoCache":
+        """Builds a cache from an exchangeInfo JSON file, ignoring its age (for fixtures/offline use)."""
+        cache = cls(ttl=math.inf)
+        with open(path, "r", encoding="utf-8") as f:
+            cache.load(json.load(f))
+        cache._next_check = math.inf
+        return cache
+
+    def set_loader(self, loader: Callable[[], Dict[str, Any]]) -> None:
+        self.loader = loader
+        if not self.loaded_at:
+            self._next_check = 0.0
+
+    def load(self, info: Dict[str, Any], loaded_at: Optional[float] = None) -> None:
+        symbols = {s["symbol"]: SymbolFilters(s) for s in info.get("symbols", [])}
+        with self._lock:
+            self.symbols = symbols
+            self.loaded_at = loaded_at if loaded_at is not None else time.time()
+        logger.info(f"Exchange info loaded: {len(symbols)} symbols")
+
+    def _load_from_disk(self) -> bool:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        mtime = os.path.getmtime(self.cache_path)
+        if time.time() - mtime > self.ttl and self.loader is not None:
+            return False
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                self.load(json.load(f), loaded_at=mtime)
+            return True
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable exchange info cache {self.cache_path}: {e}")
+            return False
+
+    def refresh(self) -> bool:
+        """Fetches exchangeInfo through the loader and persists it. Returns False if no loader or the fetch failed."""
+        if self.loader is None:
+            return False
+        try:
+            info = self.loader()
+        except Exception as e:
+            logger.warning(f"Exchange info refresh failed: {e}")
+            return False
+        self.load(info)
+        if self.cache_path:
+            tmp = f"{self.cache_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(info, f)
+            os.replace(tmp, self.cache_path)
+        return True
+
+    def _ensure_fresh(self) -> None:
+        # Hot path: a single float comparison until the next scheduled check
+        if time.time() < self._next_check:
+            return
+        with self._lock:
+            if time.time() < self._next_check:
+                return
+            # Hold off further attempts while this one runs (or after it fails)
+            self._next_check = time.time() + min(self.ttl, self.RETRY_SECONDS)
+        if (self.loaded_at or not self._load_from_disk()) and not self.refresh():
+            return
+        self._next_check = self.loaded_at + self.ttl
+
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        """Returns the filters for `symbol`, or None if unknown or no exchange info is available."""
+        self._ensure_fresh()
+        return self.symbols.get(symbol)
+
+    def available(self) -> bool:
+        self._ensure_fresh()
+        return bool(self.symbols)
+
+_default_cache: Optional[ExchangeInfoCache] = None
+
+def get_exchange_info_cache() -> ExchangeInfoCache:
+    """Returns the process-wide cache, configured from EXCHANGE_INFO_CACHE / EXCHANGE_INFO_TTL."""
+    global _default_cache
+    if _default_cache is None:
+        from ..config import CONFIG
+        _default_cache = ExchangeInfoCache(ttl=CONFIG.EXCHANGE_INFO_TTL, cache_path=CONFIG.EXCHANGE_INFO_CACHE)
+    return _default_cache
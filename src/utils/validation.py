@@ -1,4 +1,5 @@
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
+from .exchange_info import SymbolFilters
 
 def safe_float(value: Any, default: Optional[float] = None) -> Optional[float]:
     """
@@ -16,7 +17,7 @@ def safe_float(value: Any, default: Optional[float] = None) -> Optional[float]:
     except (ValueError, TypeError):
         return default
 
-def validate_symbol(symbol: str) -> bool:
+def validate_symbol(symbol: str, filters: Optional[SymbolFilters] = None) -> bool:
     """
     Validates a trading symbol.
     
@@ -24,9 +25,11 @@ def validate_symbol(symbol: str) -> bool:
     - Must be alphanumeric
     - Must not contain spaces or slashes
     - Must be uppercase only
+    - If exchange filters are given, the symbol must be TRADING
     
     Args:
         symbol: The symbol string to validate.
+        filters: Optional SymbolFilters from the exchange info cache.
         
     Returns:
         True if valid, False otherwise.
@@ -41,38 +44,79 @@ def validate_symbol(symbol: str) -> bool:
         return False
     if not symbol.isupper():
         return False
+    if filters is not None and (filters.symbol != symbol or filters.status != "TRADING"):
+        return False
     return True
 
-def validate_quantity(quantity: Any) -> bool:
+def validate_quantity(quantity: Any, filters: Optional[SymbolFilters] = None, market: bool = False) -> bool:
     """
     Validates a trading quantity.
     
     Rules:
     - Must be a number
     - Must be greater than 0
+    - If exchange filters are given, must be within the lot size limits and on a step
     
     Args:
         quantity: The quantity to validate.
+        filters: Optional SymbolFilters from the exchange info cache.
+        market: Check against MARKET_LOT_SIZE instead of LOT_SIZE.
         
     Returns:
         True if valid, False otherwise.
     """
     val = safe_float(quantity)
-    return val is not None and val > 0
+    if val is None or val <= 0:
+        return False
+    return filters is None or filters.check_quantity(val, market)
 
-def validate_price(price: Any) -> bool:
+def validate_price(price: Any, filters: Optional[SymbolFilters] = None) -> bool:
     """
     Validates a trading price.
     
     Rules:
     - Must be a number
     - Must be greater than 0
+    - If exchange filters are given, must be within the price filter and on a tick
     
     Args:
         price: The price to validate.
+        filters: Optional SymbolFilters from the exchange info cache.
         
     Returns:
         True if valid, False otherwise.
     """
     val = safe_float(price)
-    return val is not None and val > 0
+    if val is None or val <= 0:
+        return False
+    return filters is None or filters.check_price(val)
+
+def validate_notional(quantity: float, price: float, filters: Optional[SymbolFilters] = None) -> bool:
+    """
+    Validates an order's notional value (quantity * price) against MIN_NOTIONAL.
+    
+    Args:
+        quantity: Order quantity.
+        price: Order price (or reference price for market orders).
+        filters: Optional SymbolFilters from the exchange info cache.
+        
+    Returns:
+        True if valid (or no filters are given), False otherwise.
+    """
+    return filters is None or filters.check_notional(quantity, price)
+
+def quantize_order(quantity: float, price: Optional[float], filters: Optional[SymbolFilters]) -> Tuple[float, Optional[float]]:
+    """
+    Rounds quantity down to the step size and price to the nearest tick.
+    
+    Args:
+        quantity: Order quantity.
+        price: Order price, or None for market orders.
+        filters: Optional SymbolFilters; without them the inputs are returned unchanged.
+        
+    Returns:
+        (quantity, price) tuple.
+    """
+    if filters is None:
+        return quantity, price
+    return filters.round_quantity(quantity), (filters.round_price(price) if price is not None else None)
@@ -0,0 +1,73 @@
+"""
+Minimal local stand-in for the Binance REST API, used by the test scripts.
+
+Routes are registered as (method, path) -> handler(query, headers), where the
+handler returns (status, body) or (status, body, extra_headers).
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+class _Server(ThreadingHTTPServer):
+    # Fan-out tests open dozens of connections at once; the default backlog of 5 drops SYNs
+    request_queue_size = 128
+    daemon_threads = True
+
+class StubBinanceServer:
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        self.client_ports = set()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without TCP_NODELAY each response waits on a delayed ACK
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                parsed = urlparse(self.path)
+                query = dict(parse_qsl(parsed.query))
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    query.update(dict(parse_qsl(self.rfile.read(length).decode())))
+                with stub._lock:
+                    stub.requests.append((self.command, parsed.path, query))
+                    stub.client_ports.add(self.client_address[1])
+                handler = stub.routes.get((self.command, parsed.path))
+                if handler is None:
+                    result = (404, {"code": -1, "msg": "not found"})
+                else:
+                    result = handler(query, self.headers)
+                status, body = result[0], result[1]
+                extra = result[2] if len(result) > 2 else {}
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for k, v in extra.items():
+                    self.send_header(k, str(v))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def route(self, method, path, handler):
+        self.routes[(method, path)] = handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
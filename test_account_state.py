@@ -0,0 +1,59 @@
+from src.orders.account_state import AccountState
+
+class SnapshotClient:
+    def __init__(self):
+        self.calls = 0
+        self.wallet = "1000"
+        self.position = "0"
+
+    def get_account(self):
+        self.calls += 1
+        return {
+            "assets": [{"asset": "USDT", "walletBalance": self.wallet, "availableBalance": "900"}, {"asset": "BNB", "walletBalance": "1"}],
+            "positions": [{"symbol": "BTCUSDT", "positionSide": "BOTH", "positionAmt": self.position, "entryPrice": "0", "updateTime": 0}]
+        }
+
+def test_loads_once_and_serves_from_memory():
+    client = SnapshotClient()
+    state = AccountState(client, ttl=60)
+    for _ in range(1000):
+        assert state.balance("USDT") == 1000.0
+        assert state.available("USDT") == 900.0
+        assert state.position("BTCUSDT") == 0.0
+    assert state.balance("ETH") == 0.0
+    assert client.calls == 1
+
+def test_incremental_updates_without_double_counting():
+    state = AccountState(SnapshotClient(), ttl=60)
+    state.sync()
+    state.apply_fill(1, "BTCUSDT", "BUY", 0.4, 100.0, event_time=10)
+    state.apply_fill(1, "BTCUSDT", "BUY", 1.0, 110.0, event_time=11)  # cumulative: only 0.6 new
+    assert state.position("BTCUSDT") == 1.0
+    state.apply_event({"e": "ACCOUNT_UPDATE", "E": 20, "a": {"B": [{"a": "USDT", "wb": "950", "cw": "950"}], "P": [{"s": "BTCUSDT", "pa": "1.0", "ep": "106", "ps": "BOTH"}]}})
+    # A late REST response for a fill already covered by ACCOUNT_UPDATE is ignored
+    state.apply_order_response({"orderId": 2, "symbol": "BTCUSDT", "side": "SELL", "executedQty": "0.5", "avgPrice": "120", "updateTime": 15})
+    assert state.position("BTCUSDT") == 1.0 and state.balance("USDT") == 950.0
+    state.apply_event({"e": "ORDER_TRADE_UPDATE", "E": 30, "o": {"i": 3, "s": "BTCUSDT", "S": "SELL", "z": "0.25", "ap": "120"}})
+    assert state.position("BTCUSDT") == 0.75
+
+def test_resync_on_ttl_reports_drift():
+    client = SnapshotClient()
+    state = AccountState(client, ttl=60)
+    state.sync()
+    client.wallet = "500"
+    state.synced_at -= 120
+    assert state.balance("USDT") == 500.0
+    assert client.calls == 2 and state.drift_events == 1
+
+def test_user_stream_feeds_account_state():
+    import asyncio
+    from types import SimpleNamespace
+    from src.streams.user_data import UserDataStream, attach_client_state
+    snapshot = SnapshotClient()
+    client = SimpleNamespace(account_state=AccountState(snapshot, ttl=60))
+    client.account_state.sync()
+    stream = UserDataStream()
+    attach_client_state(stream, client)
+    asyncio.run(stream.handle_message({"e": "ACCOUNT_UPDATE", "E": 5, "a": {"B": [{"a": "USDT", "wb": "750", "cw": "750"}], "P": [{"s": "BTCUSDT", "pa": "-2", "ep": "100", "ps": "BOTH"}]}}))
+    assert client.account_state.balance("USDT") == 750.0 and client.account_state.position("BTCUSDT") == -2.0
+    assert snapshot.calls == 1
@@ -0,0 +1,45 @@
+import asyncio
+from src.utils.coalesce import AsyncCoalescer
+
+def test_coalescer_shares_one_upstream_call():
+    async def run():
+        calls = []
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"serverTime": len(calls)}
+        reads = AsyncCoalescer(ttl=10)
+        results = await asyncio.gather(*(reads.get("ping", fetch) for _ in range(100)))
+        assert len(calls) == 1 and all(r == {"serverTime": 1} for r in results)
+        assert await reads.get("ping", fetch) == {"serverTime": 1}
+        assert reads.stats() == {"upstream_calls": 1, "cache_hits": 1, "coalesced": 99}
+    asyncio.run(run())
+
+def test_errors_are_not_cached():
+    async def run():
+        async def boom():
+            raise RuntimeError("down")
+        reads = AsyncCoalescer(ttl=10)
+        for _ in range(2):
+            try:
+                await reads.get("ping", boom)
+            except RuntimeError:
+                pass
+        assert reads.stats()["upstream_calls"] == 2
+    asyncio.run(run())
+
+def test_asgi_routes_dry_run():
+    from api.asgi import app
+
+    async def run():
+        async with app.test_app():
+            http = app.test_client()
+            ping = await (await http.get("/api/ping")).get_json()
+            assert ping["status"] == "ok" and ping["dry_run"] is True
+            balance = await (await http.get("/api/balance")).get_json()
+            assert balance == {"asset": "USDT", "balance": 10000.0}
+            order = await (await http.post("/api/limit", json={"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.001, "price": 45000})).get_json()
+            assert order["payload"]["type"] == "LIMIT"
+            batch = await (await http.post("/api/batch", json={"orders": [{"symbol": "BTCUSDT", "side": "SELL", "quantity": 0.001}] * 7})).get_json()
+            assert [r["status"] for r in batch["results"]] == ["ok"] * 7
+    asyncio.run(run())
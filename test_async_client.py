@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from src.orders.async_client import AsyncBinanceClient
+from stub_server import StubBinanceServer
+
+def _stub():
+    stub = StubBinanceServer()
+    stub.route("GET", "/fapi/v1/time", lambda q, h: (200, {"serverTime": 1}))
+    stub.route("GET", "/fapi/v2/account", lambda q, h: (200, {"assets": [{"asset": "USDT", "walletBalance": "123.5"}]}))
+    stub.route("POST", "/fapi/v1/order", lambda q, h: (200, {"orderId": 7, "symbol": q["symbol"], "signed": "signature" in q, "key": h.get("X-MBX-APIKEY")}))
+    return stub
+
+def test_dry_run_matches_sync_client():
+    async def run():
+        async with AsyncBinanceClient(dry_run=True) as client:
+            res = await client.create_limit_order("BTCUSDT", "BUY", 0.001, 45000)
+            assert res["status"] == "dry-run"
+            assert res["payload"]["price"] == "45000"
+            assert await client.get_balance() == 10000.0
+    asyncio.run(run())
+
+def test_live_requests_against_stub():
+    async def run():
+        with _stub() as stub:
+            async with AsyncBinanceClient("k", "s", dry_run=False, base_url=stub.url, pool_size=4) as client:
+                assert (await client.ping())["serverTime"] == 1
+                assert await client.get_balance("USDT") == 123.5
+                res = await client.create_market_order("BTCUSDT", "BUY", 0.001)
+                assert res["signed"] and res["key"] == "k"
+    asyncio.run(run())
+
+def test_concurrent_submission_reuses_pool():
+    async def run():
+        with _stub() as stub:
+            async with AsyncBinanceClient("k", "s", dry_run=False, base_url=stub.url, pool_size=4) as client:
+                orders = [{"type": "MARKET", "symbol": "BTCUSDT", "side": "BUY", "quantity": 0.001}] * 40
+                orders.append({"type": "STOP", "symbol": "BTCUSDT", "side": "BUY", "quantity": 0.001})
+                results = await client.submit_orders(orders)
+            assert all(r["orderId"] == 7 for r in results[:40])
+            assert isinstance(results[40], ValueError)
+            # 40 orders over a 4-connection keep-alive pool
+            assert len(stub.client_ports) <= 4
+    asyncio.run(run())
+
+def test_orders_are_journaled_and_retried_with_the_same_client_id(tmp_path):
+    from src.orders.journal import OrderJournal
+    from src.orders.retry import RetryPolicy
+
+    async def run():
+        with StubBinanceServer() as stub:
+            sent = []
+
+            def new_order(q, h):
+                sent.append(q["newClientOrderId"])
+                if len(sent) == 1:
+                    return 503, {"code": -1001, "msg": "Internal error; unable to process your request."}
+                return 200, {"orderId": 9, "symbol": q["symbol"], "status": "NEW", "clientOrderId": q["newClientOrderId"]}
+            stub.route("POST", "/fapi/v1/order", new_order)
+            stub.route("GET", "/fapi/v1/order", lambda q, h: (400, {"code": -2013, "msg": "Order does not exist."}))
+            stub.route("GET", "/fapi/v1/openOrders", lambda q, h: (200, []))
+            journal = OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False)
+            async with AsyncBinanceClient("k", "s", dry_run=False, base_url=stub.url, journal=journal,
+                                          retry_policy=RetryPolicy(base_delay=0.0)) as client:
+                assert client.timeout == 10.0
+                res = await client.create_limit_order("BTCUSDT", "BUY", 0.001, 45000)
+                with pytest.raises(RuntimeError) as info:
+                    await client.query_order("BTCUSDT", orig_client_order_id="missing")
+            assert res["orderId"] == 9 and len(sent) == 2 and sent[0] == sent[1]
+            assert journal.get(sent[0])["status"] == "NEW" and info.value.error_code == -2013
+            journal.close()
+    asyncio.run(run())
+
+def test_batch_orders_are_journaled_with_client_ids(tmp_path):
+    import json
+    from src.orders.journal import OrderJournal
+
+    async def run():
+        with StubBinanceServer() as stub:
+            sent = []
+
+            def batch_orders(q, h):
+                sent.extend(json.loads(q["batchOrders"]))
+                return 200, [{"orderId": 1, "symbol": "BTCUSDT", "status": "NEW", "clientOrderId": sent[0]["newClientOrderId"]},
+                             {"code": -2019, "msg": "Margin is insufficient."}]
+            stub.route("POST", "/fapi/v1/batchOrders", batch_orders)
+            stub.route("GET", "/fapi/v1/openOrders", lambda q, h: (200, []))
+            journal = OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False)
+            async with AsyncBinanceClient("k", "s", dry_run=False, base_url=stub.url, journal=journal) as client:
+                await client.create_batch_orders([
+                    {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.001},
+                    {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": 1, "price": 45000, "timeInForce": "GTC"},
+                ])
+            first, second = (o["newClientOrderId"] for o in sent)
+            assert journal.get(first)["status"] == "NEW" and journal.get(second)["status"] == "REJECTED"
+            journal.close()
+    asyncio.run(run())
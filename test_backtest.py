@@ -0,0 +1,63 @@
+import numpy as np
+from src.backtest.data import Klines, generate_klines, load_klines
+from src.backtest.strategies import twap_slippage, sweep_oco, first_crossings
+from src.backtest.sweep import run_sweep
+
+def _klines(bars=600, seed=3):
+    return Klines(generate_klines(bars, start_price=100.0, volatility=0.002, seed=seed))
+
+def test_csv_is_cached_and_memory_mapped(tmp_path):
+    klines = load_klines("fixtures/klines_BTCUSDT_1m.csv", cache_dir=str(tmp_path / "cache"))
+    assert len(klines) == 2880 and klines.bar_seconds == 60.0
+    assert isinstance(klines.close, np.memmap)
+    assert (tmp_path / "cache" / "meta.json").exists()
+
+def test_default_cache_lives_outside_the_tree(tmp_path, monkeypatch):
+    import os
+    from src.config import CONFIG
+    monkeypatch.setattr(CONFIG, "KLINE_CACHE_DIR", str(tmp_path))
+    assert len(load_klines("fixtures/klines_BTCUSDT_1m.csv")) == 2880
+    assert not os.path.exists("fixtures/klines_BTCUSDT_1m.csv.cache")
+    (cache,) = os.listdir(tmp_path)
+    assert cache.startswith("klines_BTCUSDT_1m.csv-") and os.path.isfile(tmp_path / cache / "meta.json")
+
+def test_twap_matches_naive_loop():
+    k = _klines()
+    costs = twap_slippage(k, slices=4, interval_seconds=180, side="BUY", entry_every=7)
+    typical = (k.high + k.low + k.close) / 3
+    for n, start in enumerate(range(0, len(k) - 9, 7)):
+        avg = typical[[start, start + 3, start + 6, start + 9]].mean()
+        assert abs(costs[n] - (avg - k.open[start]) / k.open[start] * 1e4) < 1e-6
+
+def test_first_crossings_match_scan():
+    k = _klines()
+    entries = np.arange(0, len(k) - 30, 5)
+    hits = first_crossings(k, entries, [0.004, 0.01], 30, upward=True)
+    for t, threshold in enumerate([0.004, 0.01]):
+        for n, e in enumerate(entries):
+            moves = k.high[e + 1:e + 31] / k.close[e] - 1
+            crossed = np.nonzero(moves >= threshold)[0]
+            assert hits[t, n] == (crossed[0] + 1 if len(crossed) else 31)
+
+def test_oco_sweep_outcomes_and_process_pool(tmp_path):
+    results = sweep_oco(_klines(), [0.002, 0.5], [0.5], [20], side="SELL", fee=0.0)
+    # An unreachable stop never triggers; a tight TP is hit most of the time
+    assert results[0]["stop_rate"] == 0.0 and results[0]["tp_rate"] > 0.3
+    assert results[1]["tp_rate"] == 0.0
+
+    grid = dict(tp_pcts=[0.002, 0.004, 0.008], stop_pcts=[0.002, 0.004], horizons=[30, 60], entry_every=10)
+    inline = run_sweep("fixtures/klines_BTCUSDT_1m.csv", "oco", workers=1, cache_dir=str(tmp_path / "c"), **grid)
+    pooled = run_sweep(str(tmp_path / "c"), "oco", workers=2, **grid)
+    key = lambda r: (r["tp_pct"], r["stop_pct"], r["horizon"])
+    assert sorted(inline, key=key) == sorted(pooled, key=key) and len(inline) == 12
+
+def test_oco_sweep_agrees_with_per_trade_returns():
+    from src.backtest.strategies import oco_returns, _entries
+    k = _klines(seed=5)
+    result = sweep_oco(k, [0.003], [0.004], [25], side="BUY", entry_every=3)[0]
+    entries = _entries(k, 25, 3)
+    tp_hits = first_crossings(k, entries, [0.003], 25, upward=False)[0]
+    stop_hits = first_crossings(k, entries, [0.004], 25, upward=True)[0]
+    returns, outcome = oco_returns(k, entries, tp_hits, stop_hits, 0.003, 0.004, 25, side="BUY")
+    assert abs(result["mean_return"] - returns.mean()) < 1e-12
+    assert result["win_rate"] == np.mean(returns > 0) and result["tp_rate"] == np.mean(outcome == 1)
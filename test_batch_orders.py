@@ -0,0 +1,44 @@
+import threading
+from src.orders.binance_client import BinanceClient
+from src.orders.batch_orders import place_batch_orders, load_orders_file
+
+class SlowBatchClient(BinanceClient):
+    def __init__(self):
+        super().__init__(dry_run=True)
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def create_batch_orders(self, orders):
+        import time
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return [{"orderId": n} if o["symbol"] != "ETHUSDT" else {"code": -2019, "msg": "Margin is insufficient."} for n, o in enumerate(orders)]
+
+def test_chunks_concurrently_and_keeps_order():
+    client = SlowBatchClient()
+    orders = [{"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.001}] * 40
+    orders[3] = {"symbol": "btc/usdt", "side": "BUY", "quantity": 1}
+    orders[7] = {"symbol": "ETHUSDT", "side": "SELL", "type": "LIMIT", "quantity": 1, "price": 3000}
+    results = place_batch_orders(client, orders)
+    assert [r["index"] for r in results] == list(range(40))
+    assert results[3]["status"] == "error" and "Invalid symbol" in results[3]["error"]
+    assert results[7] == {"index": 7, "status": "error", "error": "Margin is insufficient.", "code": -2019}
+    assert sum(r["status"] == "ok" for r in results) == 38
+    assert client.calls == 8 and client.peak > 1
+
+def test_load_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "orders.csv"
+    csv_path.write_text("symbol,side,type,quantity,price\nBTCUSDT,BUY,LIMIT,0.002,60000\nETHUSDT,SELL,MARKET,0.5,\n")
+    jsonl_path = tmp_path / "orders.jsonl"
+    jsonl_path.write_text('{"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.001}\n\n')
+    assert load_orders_file(str(csv_path))[1] == {"symbol": "ETHUSDT", "side": "SELL", "type": "MARKET", "quantity": "0.5"}
+    results = place_batch_orders(BinanceClient(dry_run=True), load_orders_file(str(csv_path)) + load_orders_file(str(jsonl_path)))
+    assert [r["status"] for r in results] == ["ok", "ok", "ok"]
+    assert results[0]["response"]["payload"]["price"] == "60000.0"
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from src.cli import main
+from src.daemon import BotDaemon, send_command
+
+def test_cli_import_defers_heavy_modules():
+    code = "import sys, src.cli; print(sorted(m for m in ('src.config', 'src.logger', 'src.orders.binance_client', 'asyncio') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+def test_cli_forwards_to_daemon(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "bot.sock")
+    monkeypatch.setenv("BOT_DAEMON_SOCKET", path)
+    daemon = BotDaemon(path)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.time() + 5
+    while not os.path.exists(path) and time.time() < deadline:
+        time.sleep(0.01)
+    assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+    try:
+        main(["--daemon", "--dry-run", "market", "BTCUSDT", "BUY", "0.01"])
+        # The daemon runs in this process, so its log lines share stdout
+        printed = capsys.readouterr().out
+        out, _ = json.JSONDecoder().raw_decode(printed[printed.index("{\n"):])
+        assert out["status"] == "dry-run" and out["payload"]["quantity"] == 0.01
+
+        try:
+            main(["market", "BTCUSDT", "BUY", "-1", "--daemon", "--dry-run"])
+        except SystemExit as e:
+            assert e.code == 1
+        assert "Invalid quantity" in capsys.readouterr().out
+        assert send_command({"command": "ping"}, path)["response"]["pid"] == os.getpid()
+    finally:
+        send_command({"command": "shutdown"}, path)
+        thread.join(timeout=5)
+    assert not os.path.exists(path)
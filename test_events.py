@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+from src.streams.event_bus import EventBus, format_sse
+
+def test_coalesces_latest_state_and_bounds_queue():
+    bus = EventBus(min_interval=0, max_pending=5)
+    sub = bus.subscribe()
+    for n in range(100):
+        bus.publish("order", {"orderId": 1, "executedQty": n}, key=1)
+    bus.handle_user_event({"e": "ORDER_TRADE_UPDATE", "o": {"i": 2, "s": "BTCUSDT", "S": "BUY", "X": "PARTIALLY_FILLED", "x": "TRADE", "z": "0.5", "l": "0.5", "L": "50000"}})
+    events = sub.drain()
+    assert [(e, d.get("orderId")) for _, e, d in events] == [("order", 1), ("order", 2), ("fill", 2)]
+    assert events[0][2]["executedQty"] == 99 and sub.coalesced == 99
+
+    for n in range(8):
+        bus.publish("log", {"msg": n})
+    events = sub.drain()
+    assert [d["msg"] for _, e, d in events if e == "log"] == [3, 4, 5, 6, 7]
+    assert events[-1][1:] == ("dropped", {"count": 3})
+    sub.close()
+    assert bus.stats()["subscribers"] == 0
+
+def test_sync_stream_is_throttled_per_client():
+    bus = EventBus(min_interval=0.1, heartbeat=5)
+    stream = bus.sse()
+    assert next(stream).startswith("retry:")
+    chunks = []
+    reader = threading.Thread(target=lambda: chunks.extend(stream))
+    reader.start()
+    deadline = time.monotonic() + 0.5
+    n = 0
+    while time.monotonic() < deadline:
+        bus.publish("balance", {"asset": "USDT", "walletBalance": n}, key="USDT")
+        n += 1
+        time.sleep(0.001)
+    time.sleep(0.15)
+    bus.close()
+    reader.join(timeout=2)
+    # Hundreds of updates arrive as a handful of flushes, the last holding the final value
+    assert 3 <= len(chunks) <= 8
+    assert chunks[-1].endswith(format_sse("balance", {"asset": "USDT", "walletBalance": n - 1}, n).split("\n", 1)[1])
+
+def test_asgi_streams_order_events():
+    from api.asgi import app, events
+
+    async def run():
+        async with app.test_app():
+            http = app.test_client()
+            async with http.request("/api/events") as connection:
+                assert (await connection.receive()).startswith(b"retry:")
+                await http.post("/api/market", json={"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.002})
+                body = b""
+                while b"event: order" not in body:
+                    body += await asyncio.wait_for(connection.receive(), 5)
+                assert b'"quantity":0.002' in body
+                assert events.stats()["subscribers"] == 1
+                await connection.disconnect()
+    asyncio.run(run())
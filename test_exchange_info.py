@@ -0,0 +1,48 @@
+import os
+import pytest
+from src.utils.exchange_info import ExchangeInfoCache
+from src.utils.validation import validate_symbol, validate_quantity, validate_price, validate_notional, quantize_order
+from src.orders.binance_client import BinanceClient
+from src.orders.limit_orders import place_limit_order
+import src.utils.exchange_info as exchange_info
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "exchange_info.json")
+
+def test_quantizers_and_filters():
+    btc = ExchangeInfoCache.from_file(FIXTURE).get("BTCUSDT")
+    assert quantize_order(0.0019, 45000.04, btc) == (0.001, 45000.0)
+    assert validate_quantity(0.001, btc) and not validate_quantity(0.0015, btc) and not validate_quantity(0.0001, btc)
+    assert validate_price(45000.1, btc) and not validate_price(45000.05, btc)
+    assert not validate_notional(0.001, 45000, btc) and validate_notional(0.003, 45000, btc)
+
+def test_symbol_status():
+    cache = ExchangeInfoCache.from_file(FIXTURE)
+    assert validate_symbol("ETHUSDT", cache.get("ETHUSDT"))
+    assert not validate_symbol("OLDUSDT", cache.get("OLDUSDT"))
+    assert cache.get("NOPEUSDT") is None
+
+def test_loader_persists_and_disk_cache_skips_loader(tmp_path):
+    import json
+    calls = []
+    def loader():
+        calls.append(1)
+        with open(FIXTURE) as f:
+            return json.load(f)
+    path = str(tmp_path / "info.json")
+    assert ExchangeInfoCache(loader, ttl=60, cache_path=path).get("DOGEUSDT").step_size == 1.0
+    assert ExchangeInfoCache(loader, ttl=60, cache_path=path).get("DOGEUSDT") is not None
+    assert len(calls) == 1
+
+def test_lookup_returns_the_cached_filters():
+    cache = ExchangeInfoCache.from_file(FIXTURE)
+    f = cache.get("BTCUSDT")
+    assert cache.get("BTCUSDT") is f
+    assert f.round_quantity(0.0123) == 0.012 and validate_quantity(f.round_quantity(0.0123), f)
+
+def test_limit_order_rejected_locally(monkeypatch):
+    monkeypatch.setattr(exchange_info, "_default_cache", ExchangeInfoCache.from_file(FIXTURE))
+    client = BinanceClient(dry_run=True)
+    res = place_limit_order(client, "BTCUSDT", "BUY", 0.0039, 45000.07)
+    assert res["payload"]["quantity"] == 0.003 and res["payload"]["price"] == "45000.1"
+    with pytest.raises(ValueError):
+        place_limit_order(client, "BTCUSDT", "BUY", 0.001, 45000)
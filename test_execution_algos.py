@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from src.backtest.execution import backtest_execution
+from src.orders.advanced.parent import get_parent, list_parents
+from src.orders.advanced.pov import PovExecution, TradeVolume, execute_pov
+from src.orders.advanced.scheduler import Scheduler, SimulatedClock
+from src.orders.advanced.twap import start_twap
+from src.orders.advanced.vwap import VolumeProfile, VwapExecution, execute_vwap
+from src.orders.binance_client import BinanceClient
+
+HOUR = 3600
+
+def _profile():
+    # Three days of 5m bars: 00:00-01:00 UTC trades 3x what 01:00-02:00 does, the rest of the day nothing
+    times = [(day * 86400 + m * 300) * 1000 for day in range(3) for m in range(24)]
+    volume = [30.0 if m < 12 else 10.0 for _ in range(3) for m in range(24)]
+    return VolumeProfile.from_klines(times, volume)
+
+def test_volume_profile_and_vwap_schedule():
+    profile = _profile()
+    assert profile.share(0, HOUR) == pytest.approx(0.75)
+    assert profile.share(HOUR / 2, HOUR / 2 + 5 * 60) == pytest.approx(0.0625)
+    # Across midnight: the 23:00 hour is empty, the next 00:00 hour carries 0.75
+    assert profile.share(86400 - HOUR, 86400 + HOUR) == pytest.approx(0.75)
+
+    sched = Scheduler(SimulatedClock())
+    vwap = VwapExecution(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 4.0, 2 * HOUR, 2, profile, start_time=86400, scheduler=sched).start()
+    sched.advance(2 * HOUR)
+    assert [f["requested"] for f in vwap.fills] == pytest.approx([3.0, 1.0])
+    assert vwap.status == "completed"
+
+    plan = execute_vwap(BinanceClient(dry_run=True), "BTCUSDT", "SELL", 8.0, 4 * HOUR, 4, profile=VolumeProfile([1.0] * 288))
+    assert plan["status"] == "dry-run" and plan["quantities"] == pytest.approx([2.0] * 4)
+
+def test_pov_follows_market_volume():
+    volume = TradeVolume(window_seconds=60)
+    sched = Scheduler(SimulatedClock())
+    pov = PovExecution(BinanceClient(dry_run=True), "BTCUSDT", "SELL", 3.0, 0.1, volume, interval_seconds=10, min_quantity=0.5, scheduler=sched)
+    volume.add("BTCUSDT", 100.0, 0)
+    pov.start()
+    sched.advance(0)
+    assert pov.slices_sent == 0 and pov.market_volume() == 0.0
+
+    volume.add("BTCUSDT", 4.0, 5000)
+    sched.advance(10)
+    assert pov.slices_sent == 0  # 0.4 is below min_quantity
+    volume.add("BTCUSDT", 16.0, 15000)
+    sched.advance(10)
+    assert pov.fills[-1]["requested"] == pytest.approx(2.0)
+    volume.add("BTCUSDT", 500.0, 25000)
+    sched.advance(10)
+    assert pov.status == "completed" and pov.filled_quantity == pytest.approx(3.0)
+    assert volume("BTCUSDT", 15) == 516.0
+
+    expiring = PovExecution(BinanceClient(dry_run=True), "ETHUSDT", "BUY", 1.0, 0.5, volume, 10, max_duration=30, scheduler=sched).start()
+    sched.advance(60)
+    assert expiring.status == "expired" and expiring.slices_sent == 0
+
+    with pytest.raises(ValueError):
+        execute_pov(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 1.0, 1.5)
+
+def test_parents_share_the_registry():
+    twap = start_twap(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 1.0, 2, 10, scheduler=Scheduler(SimulatedClock()))
+    assert get_parent(twap.twap_id) is twap
+    assert any(p["parent_id"] == twap.twap_id and p["twap_id"] == twap.twap_id for p in list_parents("twap"))
+
+def test_backtest_runs_many_parents_against_recorded_trades():
+    rng = np.random.default_rng(3)
+    n = 20000
+    trades = {
+        "time": (86400 + np.arange(n) * 0.5 * 1000).astype(np.int64),  # two trades a second from 00:00 UTC
+        "price": 30000 * np.exp(np.cumsum(rng.normal(0, 2e-5, n))),
+        "quantity": rng.exponential(0.5, n)
+    }
+    specs = [{"algo": "twap", "quantity": 2.0, "slices": 10, "interval": 60, "start": s} for s in range(0, 600, 60)]
+    specs += [{"algo": "vwap", "side": "SELL", "quantity": 2.0, "slices": 12, "duration": 3600, "profile": _profile()}]
+    specs += [{"algo": "pov", "quantity": 50.0, "rate": 0.05, "interval": 10}]
+    results = backtest_execution(trades, "BTCUSDT", specs, fee=0.0)
+
+    assert len(results) == 12
+    assert all(r["status"] == "completed" and r["filled"] == pytest.approx(2.0) for r in results[:11])
+    assert all(abs(r["slippage_bps"]) < 50 for r in results[:11])
+    pov = results[-1]
+    assert pov["status"] == "completed" and pov["filled"] == pytest.approx(50.0)
+    assert pov["participation"] == pytest.approx(0.05, rel=0.1)
@@ -0,0 +1,73 @@
+import hashlib
+import hmac
+import pytest
+from urllib.parse import urlencode
+import src.utils.exchange_info as exchange_info
+from binance.error import ClientError, ServerError
+from binance.um_futures import UMFutures
+from stub_server import StubBinanceServer
+from src.orders.binance_client import BinanceClient, FastOrderApi, build_limit_params
+from src.orders.journal import OrderJournal
+from src.orders.rate_limiter import RateLimiter
+from src.utils.exchange_info import ExchangeInfoCache
+
+SECRET = "s3cr3t"
+
+@pytest.fixture(autouse=True)
+def _own_exchange_info(monkeypatch):
+    # The live client points the process-wide exchange info loader at the stub
+    monkeypatch.setattr(exchange_info, "_default_cache", ExchangeInfoCache())
+
+def _verify(query):
+    # The signature must cover exactly the query string before it
+    payload, signature = query.rsplit("&signature=", 1)
+    return hmac.new(SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest() == signature
+
+def test_query_matches_connector_encoding_and_signature():
+    api = FastOrderApi(UMFutures("k", SECRET, base_url="https://fapi.binance.com"), SECRET)
+    params = build_limit_params("BTCUSDT", "BUY", 0.001, 65000.5, client_order_id="bot:a/b 1")
+    query = api.query(params)
+    assert _verify(query)
+    payload = query.rsplit("&signature=", 1)[0]
+    timestamp = payload.rsplit("=", 1)[1]
+    expected = urlencode({**params, "reduceOnly": "false", "timestamp": timestamp}, True)
+    assert payload == expected
+    # Same parameter names reuse the template
+    api.query(build_limit_params("ETHUSDT", "SELL", 1, 3000, client_order_id="x"))
+    assert len(api._templates) == 1
+    # None values are left out, as the connector does
+    payload = api.query({"symbol": "BTCUSDT", "orderId": 5, "origClientOrderId": None}).rsplit("&signature=", 1)[0]
+    assert payload.startswith("symbol=BTCUSDT&orderId=5&timestamp=") and "None" not in payload
+
+def test_parse_mirrors_connector_errors():
+    api = FastOrderApi(UMFutures("k", SECRET), SECRET)
+    result = api.parse(200, b'{"orderId": 7, "status": "NEW"}', {"x-mbx-order-count-10s": "3", "server": "x"})
+    assert result == {"limit_usage": {"x-mbx-order-count-10s": "3"}, "data": {"orderId": 7, "status": "NEW"}}
+    with pytest.raises(ClientError) as info:
+        api.parse(400, b'{"code": -2013, "msg": "Order does not exist."}', {})
+    assert info.value.error_code == -2013 and info.value.status_code == 400
+    with pytest.raises(ServerError):
+        api.parse(503, b"unavailable", {})
+
+def test_orders_round_trip_through_stub(tmp_path):
+    with StubBinanceServer() as stub:
+        def new_order(q, h):
+            assert h["X-MBX-APIKEY"] == "k"
+            return 200, {"orderId": 1, "symbol": q["symbol"], "status": "NEW", "executedQty": "0", "price": q["price"]}, {"X-MBX-ORDER-COUNT-10S": "1"}
+        stub.route("POST", "/fapi/v1/order", new_order)
+        stub.route("DELETE", "/fapi/v1/order", lambda q, h: (200, {"orderId": int(q["orderId"]), "status": "CANCELED", "executedQty": "0"}))
+        stub.route("GET", "/fapi/v1/order", lambda q, h: (400, {"code": -2013, "msg": "Order does not exist."}))
+        client = BinanceClient("k", SECRET, dry_run=False, base_url=stub.url, timeout=2.0, rate_limiter=RateLimiter(),
+                               journal=OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False))
+        assert isinstance(client.order_api, FastOrderApi)
+
+        placed = client.create_limit_order("BTCUSDT", "BUY", 0.001, 60000)
+        assert placed["orderId"] == 1 and placed["price"] == "60000"
+        assert client.cancel_order("BTCUSDT", order_id=1)["status"] == "CANCELED"
+        with pytest.raises(ClientError):
+            client.query_order("BTCUSDT", orig_client_order_id="missing")
+
+        signed = [r for r in stub.requests if r[1] == "/fapi/v1/order"]
+        assert len(signed) == 3
+        assert all(_verify(urlencode(query)) for _, _, query in signed)
+    assert client.rate_limiter.last_usage.get("x-mbx-order-count-10s") == 1
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from stub_server import StubBinanceServer
+from src.backtest.data import load_klines
+from src.backtest.download import HistoryDownloader, dataset_path, parse_time
+from src.backtest.store import ColumnStore
+from src.orders.rate_limiter import RateLimiter
+
+MINUTE = 60000
+START = parse_time("2024-01-01")
+
+def _kline(open_time, price):
+    return [open_time, str(price), str(price + 1), str(price - 1), str(price + 0.5), "12.5",
+            open_time + MINUTE - 1, "1000.0", 42, "6.0", "480.0", "0"]
+
+def _serve_klines(stub, bars):
+    history = {symbol: [_kline(START + i * MINUTE, base + i) for i in range(bars)] for symbol, base in (("BTCUSDT", 40000), ("ETHUSDT", 2000))}
+
+    def klines(query, headers):
+        start, end, limit = int(query["startTime"]), int(query["endTime"]), int(query["limit"])
+        rows = [r for r in history[query["symbol"]] if start <= r[0] <= end][:limit]
+        return 200, rows, {"X-MBX-USED-WEIGHT-1M": "5"}
+
+    stub.route("GET", "/fapi/v1/klines", klines)
+
+def _downloader(stub, root, **kwargs):
+    return HistoryDownloader(str(root), base_url=stub.url, rate_limiter=RateLimiter(), **kwargs)
+
+def test_store_round_trip_and_time_index(tmp_path):
+    for codec in ("zlib", "raw"):
+        store = ColumnStore(str(tmp_path / codec), "aggTrades", codec=codec)
+        for part in range(3):
+            ids = np.arange(part * 100, (part + 1) * 100)
+            store.append({"agg_id": ids, "price": 100 + ids * 0.01, "quantity": np.ones(100), "first_id": ids,
+                          "last_id": ids, "time": 1000 + ids * 10, "buyer_maker": ids % 2})
+        # Overlapping rows from a resumed download are dropped
+        assert store.append({"agg_id": [299], "price": [1.0], "quantity": [1.0], "first_id": [0], "last_id": [0], "time": [3990], "buyer_maker": [0]}) == 0
+
+        reopened = ColumnStore(str(tmp_path / codec))
+        assert reopened.rows == 300 and reopened.last_key == 299
+        window = reopened.read(start=1995, end=2505, columns=["price"])
+        assert np.allclose(window["price"], 100 + np.arange(100, 151) * 0.01)
+        assert list(window["time"][[0, -1]]) == [2000, 2500]
+        assert reopened.read(start=5000)["agg_id"].size == 0
+        mapped = reopened.mmap(["agg_id"])
+        assert isinstance(mapped["agg_id"], np.memmap) and mapped["agg_id"][-1] == 299
+    assert ColumnStore(str(tmp_path / "zlib")).stats()["bytes"] < ColumnStore(str(tmp_path / "raw")).stats()["bytes"]
+
+def test_downloads_symbols_concurrently_and_resumes(tmp_path):
+    with StubBinanceServer() as stub:
+        _serve_klines(stub, 2500)
+        result = _downloader(stub, tmp_path, chunk_rows=1000).download(["BTCUSDT", "ETHUSDT"], start="2024-01-01", end=START + 1800 * MINUTE)
+        assert result == {"BTCUSDT": {"rows": 1800, "total": 1800}, "ETHUSDT": {"rows": 1800, "total": 1800}}
+
+        stub.requests.clear()
+        result = _downloader(stub, tmp_path).download(["BTCUSDT"], end=START + 2500 * MINUTE)
+        assert result["BTCUSDT"] == {"rows": 700, "total": 2500}
+        assert int(stub.requests[0][2]["startTime"]) == START + 1799 * MINUTE + 1
+
+    path = dataset_path(str(tmp_path), "klines", "BTCUSDT", "1m")
+    store = ColumnStore(path)
+    assert store.stats()["chunks"] == 3
+    assert np.array_equal(np.diff(store.read()["open_time"]), np.full(2499, MINUTE))
+
+    klines = load_klines(path)
+    assert len(klines) == 2500 and klines.bar_seconds == 60.0
+    assert isinstance(klines.close, np.memmap) and klines.close[10] == 40010.5
+
+def test_agg_trades_page_by_id(tmp_path):
+    trades = [{"a": i, "p": str(100 + i % 7), "q": "0.5", "f": 2 * i, "l": 2 * i + 1, "T": START + 7200 * 1000 + i * 5, "m": i % 3 == 0} for i in range(2300)]
+
+    def agg_trades(query, headers):
+        if "fromId" in query:
+            rows = [t for t in trades if t["a"] >= int(query["fromId"])]
+        else:
+            rows = [t for t in trades if int(query["startTime"]) <= t["T"] <= int(query["endTime"])]
+        return 200, rows[:int(query["limit"])]
+
+    with StubBinanceServer() as stub:
+        stub.route("GET", "/fapi/v1/aggTrades", agg_trades)
+        result = _downloader(stub, tmp_path).download(["BTCUSDT"], kind="aggTrades", start=START, end=START + 7200 * 1000 + 2000 * 5)
+    assert result["BTCUSDT"] == {"rows": 2000, "total": 2000}
+    data = ColumnStore(dataset_path(str(tmp_path), "aggTrades", "BTCUSDT")).read()
+    assert np.array_equal(data["agg_id"], np.arange(2000))
+    assert data["buyer_maker"].sum() == sum(1 for t in trades[:2000] if t["m"])
+
+    with pytest.raises(ValueError):
+        parse_time("yesterday")
@@ -0,0 +1,161 @@
+import os
+import threading
+from src.orders.journal import OrderJournal, ORDER_NOT_FOUND
+
+class NotFound(Exception):
+    error_code = ORDER_NOT_FOUND
+
+class ExchangeStub:
+    def __init__(self, open_orders, history):
+        self.open = open_orders
+        self.history = history
+        self.queries = []
+
+    def get_open_orders(self, symbol=None):
+        return [o for o in self.open if o["symbol"] == symbol]
+
+    def query_order(self, symbol, order_id=None, orig_client_order_id=None):
+        self.queries.append(orig_client_order_id)
+        if orig_client_order_id not in self.history:
+            raise NotFound("Order does not exist.")
+        return self.history[orig_client_order_id]
+
+def test_replay_index_and_torn_tail(tmp_path):
+    path = str(tmp_path / "orders.jsonl")
+    journal = OrderJournal(path, fsync=False)
+    journal.append("submit", "a", durable=True, symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+    journal.append("ack", "a", orderId=11, status="FILLED", executedQty="0.01")
+    journal.append("submit", "b", symbol="ETHUSDT", side="SELL", type="LIMIT", quantity=1, price=2000)
+    journal.close()
+    with open(path, "ab") as f:
+        f.write(b'{"seq": 4, "cid": "c", "ev')  # crash mid-write
+
+    journal = OrderJournal(path, fsync=False)
+    assert journal.seq == 3
+    assert journal.get("a")["status"] == "FILLED"
+    assert journal.get_by_order_id(11)["clientOrderId"] == "a"
+    assert [o["clientOrderId"] for o in journal.for_symbol("ETHUSDT")] == ["b"]
+    assert [o["clientOrderId"] for o in journal.open_orders()] == ["b"]
+    assert len(journal.between(0, 2 ** 62)) == 2
+    journal.append("ack", "b", orderId=12, status="NEW")
+    journal.close()
+    assert OrderJournal(path, fsync=False).get("b")["orderId"] == 12
+
+def test_group_commit_and_compaction(tmp_path):
+    path = str(tmp_path / "orders.jsonl")
+    journal = OrderJournal(path, fsync=True, compact_every=0, retention_seconds=0)
+
+    def worker(n):
+        for i in range(50):
+            journal.append("submit", f"{n}-{i}", durable=True, symbol="BTCUSDT", quantity=1)
+            journal.append("ack", f"{n}-{i}", status="FILLED" if i % 2 else "NEW")
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    journal.flush()
+    assert journal.records_written == 800
+    assert journal.batches < 800
+
+    journal.compact()
+    assert os.path.getsize(path) == 0
+    assert len(journal.orders) == 200  # filled orders dropped, open ones kept
+    journal.append("ack", "0-0", status="CANCELED")
+    journal.close()
+
+    reopened = OrderJournal(path, fsync=False)
+    assert len(reopened.orders) == 200
+    assert reopened.get("0-0")["status"] == "CANCELED"
+    assert reopened.seq == 801
+
+def test_recover_reconciles_with_exchange(tmp_path):
+    journal = OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False)
+    for cid in ("resting", "filled", "lost"):
+        journal.append("submit", cid, symbol="BTCUSDT", side="BUY", type="LIMIT", quantity=1, price=100)
+    exchange = ExchangeStub(
+        open_orders=[
+            {"symbol": "BTCUSDT", "clientOrderId": "resting", "orderId": 1, "status": "PARTIALLY_FILLED", "executedQty": "0.5"},
+            {"symbol": "BTCUSDT", "clientOrderId": "manual", "orderId": 9, "status": "NEW"}
+        ],
+        history={"filled": {"symbol": "BTCUSDT", "clientOrderId": "filled", "orderId": 2, "status": "FILLED", "executedQty": "1"}}
+    )
+
+    summary = journal.recover(exchange)
+    assert summary == {"checked": 3, "updated": 2, "not_found": 1, "adopted": 1}
+    assert sorted(exchange.queries) == ["filled", "lost"]
+    assert journal.get("resting")["status"] == "PARTIALLY_FILLED"
+    assert journal.get("filled")["status"] == "FILLED"
+    assert journal.get("lost")["status"] == "NOT_FOUND"
+    assert journal.get("manual")["adopted"] is True
+    assert [o["clientOrderId"] for o in journal.open_orders()] == ["resting", "manual"]
+    journal.close()
+
+class FailingFile:
+    """Stands in for the journal file on a full or failing disk."""
+
+    def __init__(self):
+        self.truncated_to = None
+
+    def tell(self):
+        return 0
+
+    def write(self, data):
+        raise OSError(28, "No space left on device")
+
+    def flush(self):
+        pass
+
+    def truncate(self, size):
+        self.truncated_to = size
+
+    def close(self):
+        pass
+
+def test_failed_write_blocks_the_durable_submit(tmp_path):
+    import pytest
+    journal = OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False)
+    journal.append("submit", "a", durable=True, symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+    good, journal._file = journal._file, FailingFile()
+    with pytest.raises(OSError, match="not sent"):
+        journal.append("submit", "b", durable=True, symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+    assert journal.get("b")["status"] == "REJECTED" and journal.write_errors == 1
+    assert journal._file.truncated_to == 0
+    journal._file = good
+    journal.append("submit", "c", durable=True, symbol="BTCUSDT", side="BUY", type="MARKET", quantity=0.01)
+    journal.close()
+    assert [o["clientOrderId"] for o in OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False).open_orders()] == ["a", "c"]
+
+def test_unknown_outcomes_stay_open(tmp_path):
+    from binance.error import ClientError
+    from src.orders.binance_client import BinanceClient
+    client = BinanceClient(dry_run=True)
+    client.journal = OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False)
+    for cid, code in (("timeout", -1007), ("dupe", -4116), ("bad", -1111)):
+        client.journal.append("submit", cid, symbol="BTCUSDT")
+        client._journal_result({"newClientOrderId": cid}, error=ClientError(400, code, "msg", {}))
+    client._journal_result({"newClientOrderId": "lost"}, error=TimeoutError("read timed out"))
+    assert client.journal.get("bad")["status"] == "REJECTED"
+    assert {o["clientOrderId"] for o in client.journal.open_orders()} == {"timeout", "dupe", "lost"}
+    client.journal.close()
+
+def test_failed_write_blocks_the_whole_batch(tmp_path):
+    import pytest
+    from src.orders.binance_client import BinanceClient
+
+    class Exchange:
+        calls = 0
+
+        def new_batch_order(self, **params):
+            self.calls += 1
+            return []
+    client = BinanceClient(dry_run=True)
+    client.dry_run, client.client = False, Exchange()
+    client.journal = OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False)
+    client.journal._file = FailingFile()
+    orders = [{"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.001, "newClientOrderId": cid} for cid in ("a", "b")]
+    with pytest.raises(OSError, match="not sent"):
+        client.create_batch_orders(orders)
+    assert client.client.calls == 0
+    assert [client.journal.get(cid)["status"] for cid in ("a", "b")] == ["REJECTED", "REJECTED"]
+    client.journal.close()
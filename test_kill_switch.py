@@ -0,0 +1,142 @@
+import threading
+import time
+import pytest
+import src.utils.exchange_info as exchange_info
+from stub_server import StubBinanceServer
+from src.orders.advanced.scheduler import Scheduler, SimulatedClock
+from src.orders.advanced.twap import start_twap
+from src.orders.binance_client import BinanceClient
+from src.orders.journal import OrderJournal
+from src.orders.kill_switch import panic
+from src.orders.rate_limiter import RateLimiter
+from src.orders.risk import RiskEngine
+from src.utils.exchange_info import ExchangeInfoCache
+
+class OpenBookExchange(StubBinanceServer):
+    """Stub account with resting orders and positions; every request takes `delay` seconds."""
+
+    def __init__(self, orders, positions, delay=0.0):
+        super().__init__()
+        self.orders = dict(orders)  # symbol -> number of open orders
+        self.positions = dict(positions)  # symbol -> positionAmt
+        self.delay = delay
+        self.flat_at = []  # completion times of cancels and closes
+        self.closes = []
+        self._book_lock = threading.Lock()
+        self.route("GET", "/fapi/v1/openOrders", self._open_orders)
+        self.route("DELETE", "/fapi/v1/allOpenOrders", self._cancel_all)
+        self.route("GET", "/fapi/v3/positionRisk", self._position_risk)
+        self.route("POST", "/fapi/v1/order", self._new_order)
+
+    def _open_orders(self, q, h):
+        time.sleep(self.delay)
+        with self._book_lock:
+            return 200, [{"symbol": s, "orderId": i} for s, n in self.orders.items() for i in range(n)]
+
+    def _cancel_all(self, q, h):
+        time.sleep(self.delay)
+        with self._book_lock:
+            self.orders.pop(q["symbol"], None)
+            self.flat_at.append(time.perf_counter())
+        return 200, {"code": 200, "msg": "The operation of cancel all open order is done."}
+
+    def _position_risk(self, q, h):
+        time.sleep(self.delay)
+        with self._book_lock:
+            return 200, [{"symbol": s, "positionAmt": str(a), "positionSide": "BOTH"} for s, a in self.positions.items()]
+
+    def _new_order(self, q, h):
+        time.sleep(self.delay)
+        with self._book_lock:
+            amount = self.positions.get(q["symbol"], 0.0)
+            reduces = amount > 0 and q["side"] == "SELL" or amount < 0 and q["side"] == "BUY"
+            if q.get("reduceOnly", "").lower() != "true" or not reduces:
+                return 400, {"code": -2022, "msg": "ReduceOnly Order is rejected."}
+            self.closes.append((q["symbol"], q["side"], float(q["quantity"])))
+            left = abs(amount) - float(q["quantity"])
+            if left <= 1e-12:
+                del self.positions[q["symbol"]]
+            else:
+                self.positions[q["symbol"]] = left if amount > 0 else -left
+            self.flat_at.append(time.perf_counter())
+        return 200, {"orderId": len(self.closes), "symbol": q["symbol"], "side": q["side"], "status": "FILLED", "executedQty": q["quantity"], "avgPrice": "100"}
+
+@pytest.fixture(autouse=True)
+def _own_exchange_info(monkeypatch):
+    # Live clients point the process-wide exchange info loader at themselves; keep the stub out of later tests
+    monkeypatch.setattr(exchange_info, "_default_cache", ExchangeInfoCache())
+
+def _client(tmp_path, url, risk=None):
+    return BinanceClient(
+        "k", "s", dry_run=False, base_url=url, timeout=2.0, rate_limiter=RateLimiter(),
+        journal=OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False),
+        risk=risk or RiskEngine()
+    )
+
+def test_cancels_and_flattens_every_symbol_concurrently(tmp_path):
+    delay = 0.1
+    orders = {f"SYM{i}USDT": 2 for i in range(30)}
+    positions = {"SYM0USDT": 0.5, "SYM1USDT": -1.25, "ETHUSDT": 3.0}
+    with OpenBookExchange(orders, positions, delay) as stub:
+        report = panic(_client(tmp_path, stub.url), flatten=True)
+
+    # Nothing known locally: lookups, then every cancel/close at once, then the check
+    assert report["status"] == "completed" and report["seconds"] < 10 * delay
+    account = report["accounts"]["default"]
+    assert sorted(account["cancelled"]) == sorted(orders) and account["remaining"] == {}
+    assert stub.orders == {} and stub.positions == {}
+    assert sorted(stub.closes) == [("ETHUSDT", "SELL", 3.0), ("SYM0USDT", "SELL", 0.5), ("SYM1USDT", "BUY", 1.25)]
+    assert all(q["reduceOnly"].lower() == "true" for m, p, q in stub.requests if m == "POST")
+
+def test_known_exposure_is_flat_within_one_round_trip(tmp_path):
+    delay = 0.25
+    risk = RiskEngine()
+    for i in range(20):
+        resting = risk.pre_trade(f"SYM{i}USDT", "BUY", 1.0, price=100.0)
+        risk.settle(resting, {"orderId": i, "status": "NEW", "executedQty": "0"})
+    filled = risk.pre_trade("SYM0USDT", "SELL", 2.0)
+    risk.settle(filled, {"orderId": 99, "status": "FILLED", "executedQty": "2.0"})
+    assert risk.active_symbols()["SYM0USDT"] == {"position": -2.0, "open_orders": 1}
+
+    orders = {f"SYM{i}USDT": 1 for i in range(20)}
+    with OpenBookExchange(orders, {"SYM0USDT": -2.0}, delay) as stub:
+        started = time.perf_counter()
+        report = panic(_client(tmp_path, stub.url, risk), flatten=True)
+
+    assert report["status"] == "completed"
+    assert stub.orders == {} and stub.positions == {}
+    assert max(stub.flat_at) - started < 1.6 * delay
+    assert risk.active_symbols() == {}
+
+def test_dry_run_stops_running_parents():
+    twap = start_twap(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 1.0, 4, 60, scheduler=Scheduler(SimulatedClock()))
+    report = panic({"a": BinanceClient(dry_run=True), "b": BinanceClient(dry_run=True)}, flatten=True)
+    assert report["status"] == "dry-run" and report["action"] == "panic"
+    assert set(report["accounts"]) == {"a", "b"}
+    assert twap.status == "cancelled"
+
+def test_panic_disarms_oco_stops():
+    from src.orders.advanced.oco import get_oco_manager
+
+    class OcoClient:
+        dry_run = False
+
+        def __init__(self):
+            self.calls = []
+
+        def create_limit_order(self, symbol, side, quantity, price, timeInForce="GTC", reduce_only=False):
+            self.calls.append(("limit", symbol, side, price))
+            return {"orderId": len(self.calls)}
+
+        def cancel_order(self, symbol, order_id=None, orig_client_order_id=None):
+            self.calls.append(("cancel", symbol, order_id))
+            return {"orderId": order_id}
+
+    client = OcoClient()
+    manager = get_oco_manager(client)
+    pair = manager.submit("BTCUSDT", "SELL", 0.01, 110.0, 90.0, 89.5)
+    panic(BinanceClient(dry_run=True))
+    assert pair.status == "cancelled" and manager.open_count() == 0
+    # A tick through the stop after the panic must not send the stop-limit
+    assert manager.on_price("BTCUSDT", 80.0) == []
+    assert client.calls == [("limit", "BTCUSDT", "SELL", 110.0)]
@@ -4,3 +4,42 @@ log = get_logger(__name__)
 log.info("Logger test INFO")
 log.error("Logger test ERROR")
 print("Logger test completed.")
+
+def test_queue_mode_formats_json_off_the_caller_thread(tmp_path, monkeypatch):
+    import json
+    from src.logger import flush_logging
+    monkeypatch.setenv("BOT_LOG_MODE", "queue")
+    monkeypatch.setenv("BOT_LOG_FORMAT", "json")
+    logfile = str(tmp_path / "queue.log")
+    qlog = get_logger("test_logger.queue", logfile=logfile)
+    qlog.info("Order %s placed", 42, extra={"symbol": "BTCUSDT"})
+    flush_logging()
+    entry = json.loads(open(logfile, encoding="utf-8").read().splitlines()[-1])
+    assert entry["msg"] == "Order 42 placed" and entry["symbol"] == "BTCUSDT" and entry["level"] == "INFO"
+
+def test_full_queue_drops_info_but_not_errors():
+    import logging
+    import queue
+    from src.logger import BoundedQueueHandler
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), overflow="drop")
+    record = lambda level: logging.LogRecord("x", level, __file__, 1, "msg", (), None)
+    handler.emit(record(logging.INFO))
+    handler.emit(record(logging.INFO))
+    handler.emit(record(logging.INFO))
+    assert handler.dropped == 1
+    handler.queue.get_nowait()
+    handler.emit(record(logging.ERROR))
+    assert handler.queue.qsize() == 2 and handler.dropped == 1
+
+def test_mutable_args_are_rendered_at_call_time():
+    import logging
+    import queue
+    from src.logger import BoundedQueueHandler
+    handler = BoundedQueueHandler(queue.Queue(), overflow="drop")
+    book = {"qty": 1}
+    handler.emit(logging.LogRecord("x", logging.INFO, __file__, 1, "book %s, order %s", (book, 7), None))
+    handler.emit(logging.LogRecord("x", logging.INFO, __file__, 1, "order %s", (7,), None))
+    book["qty"] = 2
+    mutable, plain = handler.queue.get_nowait(), handler.queue.get_nowait()
+    assert mutable.getMessage() == "book {'qty': 1}, order 7" and mutable.args is None
+    assert plain.args == (7,)
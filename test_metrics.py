@@ -0,0 +1,40 @@
+import random
+import pytest
+from src.metrics import Histogram, Registry, METRICS
+from src.orders.binance_client import BinanceClient
+from src.orders.market_orders import place_market_order
+
+def test_histogram_percentiles_within_bucket_precision():
+    rng = random.Random(1)
+    values = sorted(rng.randint(1, 2_000_000) for _ in range(20000))
+    hist = Histogram()
+    for v in values:
+        hist.record(v)
+    for pct in (50, 90, 99, 99.9):
+        exact = values[int(len(values) * pct / 100) - 1]
+        assert abs(hist.percentile(pct) - exact) / exact < 0.05
+    assert hist.max == values[-1] and hist.count == len(values)
+
+def test_prometheus_text_and_error_counters():
+    registry = Registry()
+    with registry.span("order_stage", stage="submit", symbol="BTCUSDT"):
+        pass
+    with pytest.raises(ValueError):
+        with registry.span("order", type="MARKET", symbol="BTCUSDT"):
+            raise ValueError("bad quantity")
+    text = registry.render_prometheus({"log_records_dropped": 0})
+    assert '# TYPE bot_order_stage_seconds summary' in text
+    assert 'bot_order_stage_seconds_count{stage="submit",symbol="BTCUSDT"} 1' in text
+    assert 'bot_order_errors_total{error="ValueError",symbol="BTCUSDT",type="MARKET"} 1' in text
+    assert "bot_log_records_dropped 0" in text
+
+def test_order_path_records_stages_and_rejections():
+    METRICS.reset()
+    client = BinanceClient(dry_run=True)
+    place_market_order(client, "BTCUSDT", "BUY", 0.01)
+    with pytest.raises(ValueError):
+        place_market_order(client, "BTC USDT", "BUY", 0.01)
+    snapshot = METRICS.snapshot()
+    stages = {(h["name"], h["labels"].get("stage")) for h in snapshot["latency_us"]}
+    assert ("order_stage", "validate") in stages and ("order_stage", "submit") in stages
+    assert snapshot["counters"] == [{"name": "order_rejections", "labels": {"type": "MARKET"}, "value": 1}]
@@ -0,0 +1,83 @@
+from src.orders.advanced.oco import OcoManager, replay_ticks
+
+class RecordingClient:
+    dry_run = False
+
+    def __init__(self):
+        self.calls = []
+        self.next_id = 0
+
+    def create_limit_order(self, symbol, side, quantity, price, timeInForce="GTC", reduce_only=False):
+        self.next_id += 1
+        self.calls.append(("limit", symbol, side, price))
+        return {"orderId": self.next_id}
+
+    def cancel_order(self, symbol, order_id=None, orig_client_order_id=None):
+        self.calls.append(("cancel", symbol, order_id))
+        return {"orderId": order_id}
+
+def test_stop_cancels_tp_and_fires_stop_limit():
+    client = RecordingClient()
+    mgr = OcoManager(client)
+    pair = mgr.submit("BTCUSDT", "SELL", 0.01, 110.0, 90.0, 89.5)
+    assert mgr.on_price("BTCUSDT", 100.0) == []
+    assert mgr.on_price("BTCUSDT", 89.9) == [pair]
+    assert client.calls[1:] == [("cancel", "BTCUSDT", pair.tp_order_id), ("limit", "BTCUSDT", "SELL", 89.5)]
+    assert mgr.open_count() == 0
+
+def test_tp_drops_stop_for_buy_side():
+    client = RecordingClient()
+    mgr = OcoManager(client)
+    pair = mgr.submit("ETHUSDT", "BUY", 1, 90.0, 110.0, 111.0)
+    mgr.on_price("ETHUSDT", 89.0)
+    # Touching the take-profit is not a fill: the stop stays armed
+    assert pair.status == "open"
+    mgr.apply_event({"e": "ORDER_TRADE_UPDATE", "o": {"i": pair.tp_order_id, "X": "FILLED", "z": "1"}})
+    assert pair.status == "tp_filled"
+    mgr.on_price("ETHUSDT", 200.0)
+    assert len(client.calls) == 1
+
+def test_stop_closes_what_the_tp_left_after_a_touch():
+    client = RecordingClient()
+    client.create_limit_order = lambda symbol, side, quantity, price, **kw: client.calls.append(("limit", quantity, price)) or {"orderId": len(client.calls)}
+    mgr = OcoManager(client)
+    pair = mgr.submit("BTCUSDT", "SELL", 1.0, 110.0, 90.0, 89.5)
+    assert mgr.on_price("BTCUSDT", 110.5) == []
+    mgr.on_order_update({"i": pair.tp_order_id, "X": "PARTIALLY_FILLED", "z": "0.4"})
+    assert mgr.on_price("BTCUSDT", 89.0) == [pair]
+    assert pair.status == "stop_triggered"
+    assert client.calls[-1] == ("limit", 0.6, 89.5)
+
+def test_managers_are_per_client():
+    from src.orders.advanced.oco import get_oco_manager, route_event
+    a, b = RecordingClient(), RecordingClient()
+    assert get_oco_manager(a) is get_oco_manager(a)
+    assert get_oco_manager(a).client is a and get_oco_manager(b).client is b
+    pair = get_oco_manager(b).submit("BTCUSDT", "SELL", 0.01, 110.0, 90.0, 89.5)
+    route_event(a, {"e": "markPriceUpdate", "s": "BTCUSDT", "p": "80"})
+    assert pair.status == "open" and a.calls == []
+    route_event(b, {"e": "markPriceUpdate", "s": "BTCUSDT", "p": "80"})
+    assert pair.status == "stop_triggered" and b.calls[-1] == ("limit", "BTCUSDT", "SELL", 89.5)
+
+def test_replay_only_touches_crossed_levels(tmp_path):
+    client = RecordingClient()
+    mgr = OcoManager(client)
+    for i in range(5000):
+        mgr.submit("BTCUSDT", "SELL", 0.01, 200.0 + i * 0.01, 100.0 - i * 0.01, 99.0 - i * 0.01)
+    ticks = tmp_path / "ticks.csv"
+    ticks.write_text("timestamp,symbol,price\n" + "".join(f"{t},BTCUSDT,150\n" for t in range(10000)) + "10001,BTCUSDT,99.995\n")
+    assert replay_ticks(mgr, str(ticks)) == 10001
+    assert mgr.open_count("BTCUSDT") == 5000 - 1
+    # Only the crossed stop fired: its TP cancel and stop-limit
+    assert client.calls[5000:] == [("cancel", "BTCUSDT", 1), ("limit", "BTCUSDT", "SELL", 99.0)]
+
+def test_finished_pairs_are_pruned_after_retention():
+    from src.orders.advanced.parent import FINISHED_RETENTION
+    now = [0.0]
+    mgr = OcoManager(RecordingClient(), clock=lambda: now[0])
+    done = mgr.submit("BTCUSDT", "SELL", 0.01, 110.0, 90.0, 89.5)
+    mgr.cancel(done.oco_id)
+    live = mgr.submit("BTCUSDT", "SELL", 0.01, 120.0, 80.0, 79.5)
+    now[0] = FINISHED_RETENTION + 1
+    mgr.submit("BTCUSDT", "SELL", 0.01, 130.0, 70.0, 69.5)
+    assert done.oco_id not in mgr.pairs and live.oco_id in mgr.pairs and len(mgr.pairs) == 2
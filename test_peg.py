@@ -0,0 +1,186 @@
+import asyncio
+import time
+import pytest
+import src.orders.advanced.peg as peg_module
+import src.utils.exchange_info as exchange_info
+from src.orders.advanced.peg import PegEngine, place_pegged_order, start_pegged_order, list_pegged_orders, cancel_pegged_order
+from src.orders.async_client import AsyncBinanceClient
+from src.orders.binance_client import BinanceClient
+from src.orders.rate_limiter import RateLimiter
+from src.sim.client import SimulatedBinanceClient
+from src.sim.exchange import SimulatedExchange
+from src.streams.fanout import FanOut
+from src.streams.order_book import BestPriceCache
+from src.utils.exchange_info import ExchangeInfoCache
+from stub_server import StubBinanceServer
+
+class Book:
+    """A market maker quoting one bid and one ask on a simulated exchange, mirrored into a quote cache."""
+
+    def __init__(self, exchange, cache):
+        self.exchange = exchange
+        self.cache = cache
+        self.mm = SimulatedBinanceClient(exchange, "mm")
+
+    def quote(self, bid, ask):
+        for order in self.exchange.open_orders("mm", "BTCUSDT"):
+            self.mm.cancel_order("BTCUSDT", order_id=order.order_id)
+        self.mm.create_limit_order("BTCUSDT", "BUY", 1.0, bid)
+        self.mm.create_limit_order("BTCUSDT", "SELL", 1.0, ask)
+        engine = self.exchange.engine("BTCUSDT")
+        self.cache.update("BTCUSDT", engine.best_bid(), 1.0, engine.best_ask(), 1.0)
+
+async def _settled(engine):
+    # Sync clients are called on worker threads; wait for the amends in flight
+    while engine._tasks:
+        await asyncio.sleep(0.001)
+
+def test_chases_the_bid_with_debounce_and_cap():
+    async def run():
+        exchange, cache = SimulatedExchange(), BestPriceCache()
+        book = Book(exchange, cache)
+        book.quote(100.0, 101.0)
+        engine = PegEngine(SimulatedBinanceClient(exchange, "trader"), cache, min_interval=0.05, threshold_ticks=1)
+        peg = await engine.place("BTCUSDT", "BUY", 1.0, limit_price=100.8, tick_size=0.1)
+        resting = exchange.orders[peg.order_id]
+        assert peg.price == 100.0 and resting.status == "NEW" and resting.time_in_force == "GTX"
+
+        book.quote(100.3, 101.0)
+        engine.on_quote("BTCUSDT")
+        await _settled(engine)
+        assert peg.price == 100.3 and resting.price == 100.3 and peg.amends == 1
+
+        # A burst inside min_interval becomes one deferred amend at the latest price
+        for bid in (100.4, 100.5, 100.6):
+            book.quote(bid, 101.0)
+            engine.on_quote("BTCUSDT")
+        assert peg.amends == 1 and engine.deferred == 1
+        await asyncio.sleep(0.1)
+        await _settled(engine)
+        assert peg.price == 100.6 and peg.amends == 2
+
+        # Never above the cap, never at or through the ask
+        book.quote(101.5, 102.0)
+        await asyncio.sleep(0.06)
+        engine.on_quote("BTCUSDT")
+        await _settled(engine)
+        assert peg.price == 100.8
+        await engine.close()
+        assert peg.status == "CANCELED" and resting.status == "CANCELED"
+    asyncio.run(run())
+
+def test_mid_peg_detects_a_fill_when_an_amend_is_rejected():
+    async def run():
+        exchange, cache = SimulatedExchange(), BestPriceCache()
+        book = Book(exchange, cache)
+        book.quote(100.0, 101.0)
+        engine = PegEngine(SimulatedBinanceClient(exchange, "trader"), cache, min_interval=0.0)
+        peg = await engine.place("BTCUSDT", "SELL", 1.0, mode="mid", offset_ticks=1, tick_size=0.1)
+        assert peg.price == 100.6
+
+        SimulatedBinanceClient(exchange, "taker").create_limit_order("BTCUSDT", "BUY", 1.0, 100.6)
+        book.quote(100.2, 101.0)
+        engine.on_quote("BTCUSDT")
+        assert await engine.wait(peg.peg_id, timeout=1)
+        assert peg.status == "FILLED" and peg.executed_qty == 1.0 and engine.stats()["failed"] == 1
+        assert engine.stats()["live"] == 0
+    asyncio.run(run())
+
+def test_dry_run_returns_the_plan():
+    response = place_pegged_order(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 0.01, mode="mid", offset_ticks=2, limit_price=50000)
+    assert response["status"] == "dry-run" and response["payload"]["mode"] == "mid"
+
+class FakeMarketStream:
+    def __init__(self):
+        self.fanout = FanOut()
+        self.stopped = False
+
+    async def run(self):
+        await asyncio.Event().wait()
+
+    def stop(self):
+        self.stopped = True
+
+class FakeUserStream:
+    def __init__(self, client):
+        self.client = self
+        self.account = client
+        self.listeners = []
+
+    def add_listener(self, fn):
+        self.listeners.append(fn)
+
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def run(self):
+        await asyncio.Event().wait()
+
+@pytest.fixture
+def runtime(monkeypatch):
+    monkeypatch.setattr(exchange_info, "_default_cache", ExchangeInfoCache.from_file("fixtures/exchange_info.json"))
+    markets, users = {}, []
+    runtime = peg_module._PegRuntime(
+        market_stream=lambda symbol: markets.setdefault(symbol, FakeMarketStream()),
+        user_stream=lambda client: users.append(FakeUserStream(client)) or users[-1]
+    )
+    runtime.markets, runtime.users = markets, users
+    monkeypatch.setattr(peg_module, "_runtime", runtime)
+    monkeypatch.setattr(peg_module, "_active", {})
+    yield runtime
+    runtime.stop()
+
+def test_pegs_share_the_callers_engine_and_are_pruned(runtime, monkeypatch):
+    exchange = SimulatedExchange()
+    Book(exchange, runtime.quotes).quote(60000.0, 60001.0)
+    client = SimulatedBinanceClient(exchange, "trader")
+    first = start_pegged_order(client, "BTCUSDT", "BUY", 0.01)
+    second = start_pegged_order(client, "BTCUSDT", "BUY", 0.02, offset_ticks=1)
+    assert first["price"] == 60000.0 and second["price"] == 59999.9
+    # One engine and user-data stream for the account, one quote stream for the symbol
+    assert [e.client for e in runtime.engines.values()] == [client]
+    assert [u.account for u in runtime.users] == [client] and list(runtime.markets) == ["BTCUSDT"]
+
+    for response in (first, second):
+        assert cancel_pegged_order(response["peg_id"])["status"] == "CANCELED"
+    deadline = time.monotonic() + 2
+    while runtime._symbols and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert runtime.markets["BTCUSDT"].stopped and runtime.quotes.get("BTCUSDT") is None
+
+    assert len(list_pegged_orders()) == 2
+    monkeypatch.setattr(peg_module, "FINISHED_RETENTION", -1.0)
+    assert list_pegged_orders() == []
+    with pytest.raises(ValueError):
+        cancel_pegged_order(first["peg_id"])
+
+def test_start_raises_when_the_order_is_not_placed_in_time(runtime, monkeypatch):
+    monkeypatch.setattr(peg_module, "START_TIMEOUT", 0.2)
+    with pytest.raises(TimeoutError):
+        start_pegged_order(SimulatedBinanceClient(SimulatedExchange(), "trader"), "BTCUSDT", "BUY", 0.01)
+    deadline = time.monotonic() + 2
+    while runtime._symbols and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert runtime.markets["BTCUSDT"].stopped
+
+def test_async_client_opened_on_another_loop_drives_a_peg(runtime):
+    server_loop = asyncio.new_event_loop()
+    with StubBinanceServer() as stub:
+        stub.route("POST", "/fapi/v1/order", lambda q, h: (200, {"orderId": 11, "status": "NEW", "executedQty": "0", "price": q["price"]}))
+        stub.route("DELETE", "/fapi/v1/order", lambda q, h: (200, {"orderId": 11, "status": "CANCELED", "executedQty": "0"}))
+        client = AsyncBinanceClient("k", "s", dry_run=False, base_url=stub.url, rate_limiter=RateLimiter(), journaled=False)
+        # Opened on the "server" loop, as the ASGI app does; the peg runs on the peg loop
+        server_loop.run_until_complete(client.open())
+        try:
+            runtime.quotes.update("BTCUSDT", 60000.0, 1.0, 60001.0, 1.0)
+            started = start_pegged_order(client, "BTCUSDT", "BUY", 0.01)
+            assert started["order_id"] == 11 and started["price"] == 60000.0
+            assert cancel_pegged_order(started["peg_id"])["status"] == "CANCELED"
+            assert [r[0] for r in stub.requests if r[1] == "/fapi/v1/order"] == ["POST", "DELETE"]
+            assert runtime.engines[id(client)].client is not client
+        finally:
+            server_loop.run_until_complete(client.close())
+            server_loop.close()
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from src.metrics import METRICS
+from src.orders.async_client import AsyncBinanceClient
+from src.orders.binance_client import BinanceClient
+from src.orders.pipeline import Order, OrderPipeline, Stage, ValidateStage, RiskStage, SubmitStage, get_pipeline
+from src.orders.risk import RiskEngine, RiskLimits, RiskError
+
+class Recorder(Stage):
+    name = "record"
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def process(self, order):
+        self.calls.append(("process", order.symbol))
+
+    def complete(self, order):
+        self.calls.append(("complete", type(order.error).__name__ if order.error else "ok"))
+
+class FailingClient(BinanceClient):
+    def create_market_order(self, *args, **kwargs):
+        raise ConnectionError("timeout")
+
+def test_stages_run_in_order_and_unwind_on_failure():
+    calls = []
+    client = BinanceClient(dry_run=True, risk=RiskEngine(RiskLimits(max_position=1.0)))
+    pipeline = OrderPipeline(client, extra_stages=[Recorder(calls)])
+    assert [s.name for s in pipeline.stages] == ["validate", "risk", "record", "submit"]
+
+    order = Order("BTCUSDT", "BUY", "MARKET", 0.4)
+    assert pipeline.run(order)["payload"]["quantity"] == 0.4
+    assert calls == [("process", "BTCUSDT"), ("complete", "ok")] and order.done == 4
+    assert client.risk.exposure("BTCUSDT")["position"] == 0.4
+
+    # Rejected by risk: later stages never see the order
+    with pytest.raises(RiskError):
+        pipeline.run(Order("BTCUSDT", "BUY", "MARKET", 0.7))
+    assert len(calls) == 2
+
+    # A failed submission releases the risk reservation
+    failing = FailingClient(dry_run=True, risk=RiskEngine(RiskLimits(max_position=1.0)))
+    with pytest.raises(ConnectionError):
+        get_pipeline(failing).run(Order("BTCUSDT", "SELL", "MARKET", 0.5))
+    assert failing.risk.exposure("BTCUSDT")["pending_sell"] == 0.0
+    assert get_pipeline(failing) is get_pipeline(failing)
+
+def test_batch_drops_failures_per_order_and_times_stages():
+    METRICS.reset()
+    client = BinanceClient(dry_run=True, risk=RiskEngine(RiskLimits(max_position=0.05)))
+    raw = [{"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.01}] * 6 + [
+        {"symbol": "ETHUSDT", "side": "HOLD", "quantity": 1},
+        {"symbol": "ETHUSDT", "side": "SELL", "type": "LIMIT", "quantity": "0.5", "price": "3000", "reduceOnly": "true"}
+    ]
+    orders = get_pipeline(client).run_batch([Order.from_dict(o) for o in raw])
+    results = [o.result(i) for i, o in enumerate(orders)]
+    assert [r["status"] for r in results] == ["ok"] * 5 + ["error", "error", "ok"]
+    assert "position could reach" in results[5]["error"]
+    assert results[6]["error"] == "Invalid side: HOLD. Must be BUY or SELL."
+    assert results[7]["response"]["payload"] == {"symbol": "ETHUSDT", "side": "SELL", "type": "LIMIT", "quantity": 0.5, "price": "3000.0", "timeInForce": "GTC", "reduceOnly": True}
+    stages = {h["labels"]["stage"] for h in METRICS.snapshot()["latency_us"] if h["name"] == "batch_stage"}
+    assert stages == {"validate", "risk", "submit"}
+    rejections = {c["labels"]["type"]: c["value"] for c in METRICS.snapshot()["counters"] if c["name"] == "order_rejections"}
+    assert rejections == {"MARKET": 2}
+
+def test_async_client_uses_the_same_pipeline():
+    async def run():
+        client = AsyncBinanceClient(dry_run=True)
+        pipeline = OrderPipeline(client)
+        # Same stages as the sync client: the async client carries a RiskEngine too
+        assert [type(s) for s in pipeline.stages] == [ValidateStage, RiskStage, SubmitStage]
+        response = await pipeline.run_async(Order("BTCUSDT", "BUY", "LIMIT", 0.001, 45000, client_order_id="abc"))
+        assert response["payload"]["newClientOrderId"] == "abc"
+        with pytest.raises(ValueError):
+            await pipeline.run_async(Order("BTCUSDT", "BUY", "LIMIT", 0.001, -1))
+        batch = await pipeline.run_batch_async([Order("BTCUSDT", "SELL", "MARKET", 0.001) for _ in range(7)])
+        assert all(o.error is None and o.response["status"] == "dry-run" for o in batch)
+    asyncio.run(run())
+    assert [s.name for s in OrderPipeline(AsyncBinanceClient(dry_run=True)).stages] == [s.name for s in OrderPipeline(BinanceClient(dry_run=True)).stages]
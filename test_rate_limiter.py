@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.orders.rate_limiter import RateLimiter, PRIORITY_CANCEL, PRIORITY_QUERY, call_limited
+from src.orders.async_client import AsyncBinanceClient
+from stub_server import StubBinanceServer
+
+def _tiny(**kwargs):
+    return RateLimiter(buckets=(("weight_1m", 2, 0.2, "x-mbx-used-weight-1m"),), safety=1.0, **kwargs)
+
+def test_waits_when_bucket_empty_and_cancels_jump_the_queue():
+    limiter = _tiny()
+    limiter.acquire(2)
+    done = []
+    query = threading.Thread(target=lambda: (limiter.acquire(2, priority=PRIORITY_QUERY), done.append("query")))
+    cancel = threading.Thread(target=lambda: (limiter.acquire(2, priority=PRIORITY_CANCEL), done.append("cancel")))
+    query.start()
+    time.sleep(0.02)
+    cancel.start()
+    query.join()
+    cancel.join()
+    assert done == ["cancel", "query"]
+    metrics = limiter.metrics()
+    assert metrics["waited_requests"] == 2 and metrics["queue_depth"] == 0 and metrics["max_wait_seconds"] > 0.1
+
+def test_shared_file_budget(tmp_path):
+    path = str(tmp_path / "limits.bin")
+    a = _tiny(shared_path=path)
+    b = _tiny(shared_path=path)
+    a.acquire(2)
+    assert b.metrics()["tokens"]["weight_1m"] < 0.5
+
+def test_headers_resync_buckets():
+    limiter = RateLimiter()
+    with StubBinanceServer() as stub:
+        stub.route("GET", "/fapi/v1/time", lambda q, h: (200, {"serverTime": 1}, {"X-MBX-USED-WEIGHT-1M": "2000", "X-MBX-ORDER-COUNT-1M": "7"}))
+        stub.route("POST", "/fapi/v1/order", lambda q, h: (429, {"code": -1003, "msg": "Too many requests"}, {"Retry-After": "0.3"}))
+
+        async def run():
+            async with AsyncBinanceClient("k", "s", dry_run=False, base_url=stub.url, rate_limiter=limiter) as client:
+                await client.ping()
+                metrics = limiter.metrics()
+                assert metrics["exchange_usage"]["x-mbx-used-weight-1m"] == 2000
+                assert metrics["tokens"]["weight_1m"] < 2400 * 0.9 - 2000 + 5
+                try:
+                    await client.create_market_order("BTCUSDT", "BUY", 0.001)
+                except RuntimeError:
+                    pass
+                start = time.monotonic()
+                await client.ping()
+                assert time.monotonic() - start >= 0.25
+        asyncio.run(run())
+
+def test_call_limited_unwraps_usage_and_backs_off():
+    class Limited(Exception):
+        status_code, header = 429, {"Retry-After": "5"}
+
+    def rejected():
+        raise Limited()
+
+    limiter = RateLimiter()
+    data = call_limited(limiter, "klines", lambda **p: {"limit_usage": {"x-mbx-used-weight-1m": "100"}, "data": p})
+    assert data == {} and limiter.last_usage == {"x-mbx-used-weight-1m": 100}
+    with pytest.raises(Limited):
+        call_limited(limiter, "klines", rejected)
+    assert limiter._try_take(1, 0) > 4
@@ -0,0 +1,121 @@
+import threading
+import time
+import pytest
+from binance.error import ClientError
+from stub_server import StubBinanceServer
+from src.orders.binance_client import BinanceClient
+from src.orders.journal import OrderJournal
+from src.orders.retry import OrderRetrier, RetryPolicy, classify_error, client_order_id, FATAL, RETRY, UNKNOWN
+
+class FaultyExchange(StubBinanceServer):
+    """Stub order endpoint that applies one scripted fault per POST, then behaves."""
+
+    def __init__(self, faults=(), delay=0.0):
+        super().__init__()
+        self.faults = list(faults)
+        self.delay = delay
+        self.orders = {}
+        self.posts = 0
+        self._orders_lock = threading.Lock()
+        self.route("POST", "/fapi/v1/order", self._new_order)
+        self.route("GET", "/fapi/v1/order", self._query_order)
+        self.route("GET", "/fapi/v1/openOrders", lambda q, h: (200, []))
+
+    def _accept(self, q):
+        with self._orders_lock:
+            if q["newClientOrderId"] in self.orders:
+                return 400, {"code": -4116, "msg": "ClientOrderId is duplicated."}
+            order = {"orderId": len(self.orders) + 1, "clientOrderId": q["newClientOrderId"], "symbol": q["symbol"], "side": q["side"], "status": "FILLED", "executedQty": q["quantity"], "avgPrice": "100"}
+            self.orders[q["newClientOrderId"]] = order
+            return 200, order
+
+    def _new_order(self, q, h):
+        with self._orders_lock:
+            self.posts += 1
+            fault = self.faults.pop(0) if self.faults else None
+        time.sleep(self.delay)
+        if fault == "timeout_after_accept":
+            result = self._accept(q)
+            time.sleep(0.5)
+            return result
+        if fault == "503":
+            return 503, {"code": -1001, "msg": "Internal error; unable to process your request."}
+        if fault == "429":
+            return 429, {"code": -1003, "msg": "Too many requests."}, {"Retry-After": 0}
+        if fault == "reject":
+            return 400, {"code": -1111, "msg": "Precision is over the maximum defined for this asset."}
+        return self._accept(q)
+
+    def _query_order(self, q, h):
+        order = self.orders.get(q.get("origClientOrderId"))
+        if order is None:
+            return 400, {"code": -2013, "msg": "Order does not exist."}
+        return 200, order
+
+def _client(tmp_path, url, hedge_url="", hedge_after=None):
+    client = BinanceClient(
+        "k", "s", dry_run=False, base_url=url, timeout=0.25,
+        journal=OrderJournal(str(tmp_path / "orders.jsonl"), fsync=False),
+        retry_policy=RetryPolicy(max_attempts=4, base_delay=0.01, max_delay=0.05, hedge_after=hedge_after),
+        hedge_base_url=hedge_url
+    )
+    client.retrier.sleep = lambda delay: None
+    return client
+
+def test_classification_and_ids():
+    assert classify_error(ClientError(400, -1111, "precision", {})) == FATAL
+    assert classify_error(ClientError(429, -1003, "too many", {})) == RETRY
+    assert classify_error(ClientError(400, -4116, "duplicate", {})) == UNKNOWN
+    assert classify_error(TimeoutError("read timed out")) == UNKNOWN
+    assert classify_error(ValueError("bad input")) == FATAL
+    assert client_order_id("twap-1", 3) == client_order_id("twap-1", 3) != client_order_id("twap-1", 4)
+    assert len(client_order_id("x")) <= 36
+    delays = [RetryPolicy(base_delay=0.1, max_delay=0.3).backoff(n) for n in range(1, 6)]
+    assert all(0 <= d <= 0.3 for d in delays)
+
+def test_timeout_after_accept_is_found_not_resent(tmp_path):
+    with FaultyExchange(faults=["timeout_after_accept"]) as stub:
+        client = _client(tmp_path, stub.url)
+        res = client.create_market_order("BTCUSDT", "BUY", 0.01)
+        assert res["status"] == "FILLED"
+        assert stub.posts == 1 and len(stub.orders) == 1
+        assert client.journal.get(res["clientOrderId"])["status"] == "FILLED"
+
+def test_transient_errors_retry_with_same_client_id(tmp_path):
+    with FaultyExchange(faults=["503", "429"]) as stub:
+        client = _client(tmp_path, stub.url)
+        res = client.create_limit_order("BTCUSDT", "SELL", 0.01, 101, client_order_id="tb-fixed-id")
+        assert res["clientOrderId"] == "tb-fixed-id"
+        assert stub.posts == 3 and len(stub.orders) == 1
+        sent = {q.get("newClientOrderId") for m, p, q in stub.requests if m == "POST"}
+        assert sent == {"tb-fixed-id"}
+
+def test_fatal_error_is_not_retried(tmp_path):
+    with FaultyExchange(faults=["reject"]) as stub:
+        client = _client(tmp_path, stub.url)
+        with pytest.raises(ClientError):
+            client.create_market_order("BTCUSDT", "BUY", 0.01)
+        assert stub.posts == 1
+        assert client.journal.open_orders() == []
+
+def test_hedged_request_cuts_tail_latency(tmp_path):
+    with FaultyExchange(delay=0.2) as slow, FaultyExchange() as fast:
+        client = _client(tmp_path, slow.url, hedge_url=fast.url, hedge_after=0.02)
+        started = time.perf_counter()
+        res = client.create_market_order("BTCUSDT", "BUY", 0.01)
+        assert time.perf_counter() - started < 0.15
+        assert res["status"] == "FILLED"
+        assert len(fast.orders) == 1
+
+def test_retrier_gives_up_after_max_attempts():
+    calls = []
+
+    def send(params):
+        calls.append(params["newClientOrderId"])
+        raise ConnectionError("connection reset")
+
+    retrier = OrderRetrier(RetryPolicy(max_attempts=3), sleep=lambda d: None)
+    with pytest.raises(ConnectionError):
+        retrier.submit({"symbol": "BTCUSDT", "newClientOrderId": "tb-1"}, send, lambda symbol, cid: None)
+    # Each attempt after an unknown outcome is a lookup (not found here) and a resend
+    assert calls == ["tb-1", "tb-1", "tb-1"]
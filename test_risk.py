@@ -0,0 +1,118 @@
+import pytest
+from src.orders.binance_client import BinanceClient
+from src.orders.limit_orders import place_limit_order
+from src.orders.market_orders import place_market_order
+from src.orders.advanced.twap import execute_twap
+from src.orders.advanced.oco import OcoManager
+from src.orders.risk import RiskEngine, RiskError, RiskLimits
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _client(**limits):
+    return BinanceClient(dry_run=True, risk=RiskEngine(RiskLimits(**limits)))
+
+def test_position_and_notional_limits_count_pending_orders():
+    engine = RiskEngine(RiskLimits(max_position=1.0, max_notional=60000, per_symbol={"ETHUSDT": {"max_position": 10}}))
+    engine.update_mark("BTCUSDT", 50000)
+    first = engine.pre_trade("BTCUSDT", "BUY", 0.8)
+    with pytest.raises(RiskError) as e:
+        engine.pre_trade("BTCUSDT", "BUY", 0.3)  # 0.8 in flight + 0.3 > 1.0
+    assert e.value.reason == "max_position"
+    engine.release(first)
+    with pytest.raises(RiskError) as e:
+        engine.pre_trade("BTCUSDT", "BUY", 0.3, price=250000)
+    assert e.value.reason == "max_notional"
+    # Selling against a long, and reduce-only orders, are not capped by position
+    engine.settle(engine.pre_trade("BTCUSDT", "BUY", 1.0), {"status": "FILLED", "executedQty": "1.0"})
+    engine.settle(engine.pre_trade("BTCUSDT", "SELL", 1.5), {"status": "FILLED", "executedQty": "1.5"})
+    assert engine.exposure("BTCUSDT")["position"] == pytest.approx(-0.5)
+    engine.pre_trade("BTCUSDT", "SELL", 5, reduce_only=True)
+    assert engine.pre_trade("ETHUSDT", "BUY", 5)  # per-symbol override
+
+def test_price_band_open_orders_and_rate():
+    clock = FakeClock()
+    engine = RiskEngine(RiskLimits(price_band=0.05, max_open_orders=2, max_order_rate=3), clock=clock)
+    engine.pre_trade("BTCUSDT", "BUY", 1, price=1.0)  # no mark yet: band not enforced
+    engine.apply_event({"e": "markPriceUpdate", "s": "BTCUSDT", "p": "100"})
+    with pytest.raises(RiskError) as e:
+        engine.pre_trade("BTCUSDT", "BUY", 1, price=94)
+    assert e.value.reason == "price_band"
+
+    clock.now = 10
+    for order_id in (1, 2):
+        engine.settle(engine.pre_trade("BTCUSDT", "BUY", 1, price=99), {"status": "NEW", "orderId": order_id, "executedQty": "0"})
+    with pytest.raises(RiskError) as e:
+        engine.pre_trade("BTCUSDT", "BUY", 1, price=99)
+    assert e.value.reason == "open_orders"
+
+    clock.now = 20
+    engine.update_order(1, "0", "CANCELED")
+    for _ in range(3):
+        engine.pre_trade("BTCUSDT", "SELL", 1)
+    with pytest.raises(RiskError) as e:
+        engine.pre_trade("BTCUSDT", "SELL", 1)
+    assert e.value.reason == "order_rate"
+    clock.now = 21
+    engine.pre_trade("BTCUSDT", "SELL", 1)
+
+def test_resting_order_lifecycle_from_stream_events():
+    engine = RiskEngine(RiskLimits(max_position=2))
+    reservation = engine.pre_trade("BTCUSDT", "BUY", 1.5, price=100)
+    engine.settle(reservation, {"status": "PARTIALLY_FILLED", "orderId": 7, "executedQty": "0.5"})
+    assert engine.exposure("BTCUSDT") == {"position": 0.5, "pending_buy": 1.0, "pending_sell": 0.0, "open_orders": 1, "mark": 0.0}
+    engine.apply_event({"e": "ORDER_TRADE_UPDATE", "o": {"i": 7, "z": "1.0", "X": "PARTIALLY_FILLED"}})
+    engine.apply_event({"e": "ORDER_TRADE_UPDATE", "o": {"i": 7, "z": "1.2", "X": "CANCELED"}})
+    exposure = engine.exposure("BTCUSDT")
+    assert exposure["position"] == pytest.approx(1.2)
+    assert exposure["pending_buy"] == 0 and exposure["open_orders"] == 0
+    engine.apply_event({"e": "ACCOUNT_UPDATE", "a": {"P": [{"s": "BTCUSDT", "pa": "0.2", "ps": "BOTH"}]}})
+    assert engine.exposure("BTCUSDT")["position"] == pytest.approx(0.2)
+
+def test_order_paths_run_the_engine():
+    client = _client(max_position=0.01)
+    assert place_market_order(client, "BTCUSDT", "BUY", 0.01)["status"] == "dry-run"
+    with pytest.raises(ValueError):
+        place_market_order(client, "BTCUSDT", "BUY", 0.01)
+    with pytest.raises(RiskError):
+        place_limit_order(client, "BTCUSDT", "BUY", 0.001, 50000)
+    assert place_limit_order(client, "BTCUSDT", "SELL", 0.02, 50000)["status"] == "dry-run"
+    with pytest.raises(RiskError):
+        execute_twap(client, "BTCUSDT", "SELL", 0.05, 5, 1)
+
+    # OCO legs are reduce-only: they pass the position cap but still count as resting orders
+    client = _client(max_position=0.01, max_open_orders=1, price_band=0.01)
+    order_ids = iter(range(1, 10))
+    client.create_limit_order = lambda *a, **k: {"status": "NEW", "orderId": next(order_ids), "executedQty": "0"}
+    manager = OcoManager(client)
+    pair = manager.submit("BTCUSDT", "SELL", 1.0, 60000, 40000, 39900)
+    assert client.risk.exposure("BTCUSDT")["open_orders"] == 1
+    with pytest.raises(RiskError):
+        place_limit_order(client, "BTCUSDT", "SELL", 0.001, 61000)
+    # The protective stop goes out past the price band and the open-order cap
+    client.risk.update_mark("BTCUSDT", 39000)
+    manager.on_price("BTCUSDT", 39000)
+    assert pair.status == "stop_triggered" and pair.stop_order_id == 2
+
+def test_account_update_before_the_fill_is_not_counted_twice():
+    engine = RiskEngine(RiskLimits(max_position=1.5))
+    engine.set_position("BTCUSDT", 0.0)
+    market = engine.pre_trade("BTCUSDT", "BUY", 1.0)
+    # The stream reports the new position before the REST response comes back
+    engine.apply_event({"e": "ACCOUNT_UPDATE", "E": 1001, "T": 1000, "a": {"P": [{"s": "BTCUSDT", "pa": "1.0", "ps": "BOTH"}]}})
+    engine.settle(market, {"status": "FILLED", "orderId": 1, "executedQty": "1.0", "updateTime": 1000})
+    assert engine.exposure("BTCUSDT")["position"] == 1.0 and engine.exposure("BTCUSDT")["pending_buy"] == 0.0
+    engine.pre_trade("BTCUSDT", "BUY", 0.5)  # 1.0 + 0.5 fits; a double count would reject it
+
+    # Same for a resting order filled on the stream, and a later fill still counts
+    limit = engine.pre_trade("BTCUSDT", "SELL", 1.0, price=100, reduce_only=True)
+    engine.settle(limit, {"status": "NEW", "orderId": 2, "executedQty": "0", "updateTime": 1100})
+    engine.apply_event({"e": "ACCOUNT_UPDATE", "T": 1200, "a": {"P": [{"s": "BTCUSDT", "pa": "0.6", "ps": "BOTH"}]}})
+    engine.apply_event({"e": "ORDER_TRADE_UPDATE", "E": 1201, "o": {"i": 2, "z": "0.4", "X": "PARTIALLY_FILLED", "T": 1200}})
+    assert engine.exposure("BTCUSDT")["position"] == pytest.approx(0.6)
+    engine.apply_event({"e": "ORDER_TRADE_UPDATE", "E": 1301, "o": {"i": 2, "z": "1.0", "X": "FILLED", "T": 1300}})
+    assert engine.exposure("BTCUSDT")["position"] == pytest.approx(0.0)
@@ -0,0 +1,78 @@
+import threading
+import time
+import pytest
+from src.config import CONFIG
+from src.orders.binance_client import BinanceClient
+from src.orders.rate_limiter import ORDER_BUCKETS, RateLimiter
+from src.orders.router import AccountRouter, load_accounts
+
+def _router(tags):
+    return AccountRouter({tag: BinanceClient(dry_run=True, rate_limiter=RateLimiter()) for tag in tags})
+
+def test_load_accounts_from_env(monkeypatch):
+    monkeypatch.setattr(CONFIG, "BINANCE_ACCOUNTS", "main, arb")
+    monkeypatch.setenv("BINANCE_MAIN_API_KEY", "k1")
+    monkeypatch.setenv("BINANCE_MAIN_API_SECRET", "s1")
+    accounts = load_accounts(dry_run=True)
+    assert accounts["main"] == {"key": "k1", "secret": "s1"}
+    assert list(accounts) == ["main", "arb"]
+    with pytest.raises(ValueError):
+        load_accounts(dry_run=False)  # arb has no credentials
+    monkeypatch.setattr(CONFIG, "BINANCE_ACCOUNTS", "bad-tag")
+    with pytest.raises(ValueError):
+        load_accounts(dry_run=True)
+
+def test_routes_by_tag_and_headroom():
+    router = _router(["a", "b", "c"])
+    try:
+        res = router.market_order("BTCUSDT", "BUY", 0.01, account="b").result(timeout=5)
+        assert res["status"] == "dry-run"
+        assert router.stats()["b"]["completed"] == 1
+        with pytest.raises(ValueError):
+            router.route("zzz")
+        # Drain most of a's and c's order budget; untagged work goes to b
+        router.workers["a"].client.rate_limiter.acquire(0, 200)
+        router.workers["c"].client.rate_limiter.acquire(0, 100)
+        assert router.route() == "b"
+        futures = [router.limit_order("BTCUSDT", "SELL", 0.01, 50000) for _ in range(3)]
+        assert all(f.result(timeout=5)["status"] == "dry-run" for f in futures)
+    finally:
+        router.close()
+
+def test_accounts_do_not_block_each_other():
+    router = _router([f"acct{i}" for i in range(24)])
+    gate = threading.Event()
+    try:
+        stuck = router.submit(lambda c: gate.wait(5), account="acct0")
+        started = time.perf_counter()
+        results = [router.submit(lambda c: c.create_market_order("BTCUSDT", "BUY", 0.01), account=f"acct{i}") for i in range(1, 24)]
+        assert all(f.result(timeout=2)["status"] == "dry-run" for f in results)
+        assert time.perf_counter() - started < 1.0
+        assert not stuck.done()
+        queued = router.submit(lambda c: "after", account="acct0")
+        gate.set()
+        assert stuck.result(timeout=5) and queued.result(timeout=5) == "after"
+    finally:
+        router.close()
+
+def test_errors_come_back_on_the_future():
+    router = _router(["a"])
+    try:
+        with pytest.raises(ValueError):
+            router.market_order("BTCUSDT", "HOLD", 0.01).result(timeout=5)
+        assert router.stats()["a"]["failed"] == 1
+    finally:
+        router.close()
+
+def test_accounts_share_ip_weight_but_not_order_counts():
+    ip = RateLimiter(safety=1.0)
+    a = RateLimiter(ORDER_BUCKETS, safety=1.0, ip_limiter=ip)
+    b = RateLimiter(ORDER_BUCKETS, safety=1.0, ip_limiter=ip)
+    a.acquire(1000, 250)
+    b.acquire(1000, 0)
+    assert ip.metrics()["tokens"]["weight_1m"] < 401
+    assert b.metrics()["tokens"]["orders_10s"] > 299 and a.metrics()["tokens"]["orders_10s"] < 51
+    # Weight headers resync the shared bucket; order counts stay with the account
+    a.update_from_headers({"X-MBX-USED-WEIGHT-1M": "2300", "X-MBX-ORDER-COUNT-10S": "10"})
+    assert b.metrics()["tokens"]["weight_1m"] < 101
+    assert 289 < a.metrics()["tokens"]["orders_10s"] < 291 and ip.metrics()["tokens"]["orders_10s"] > 299
@@ -0,0 +1,48 @@
+from src.sim.exchange import SimulatedExchange, synthetic_ticks
+from src.sim.client import SimulatedBinanceClient
+from src.sim.matching_engine import MatchingEngine, SimOrder
+
+def test_price_time_priority_and_partial_fill():
+    engine = MatchingEngine("BTCUSDT")
+    first = SimOrder(1, "a", "BTCUSDT", "SELL", "LIMIT", 1.0, 101.0)
+    second = SimOrder(2, "b", "BTCUSDT", "SELL", "LIMIT", 1.0, 101.0)
+    better = SimOrder(3, "c", "BTCUSDT", "SELL", "LIMIT", 0.5, 100.0)
+    for o in (first, second, better):
+        engine.rest(o)
+    fills = engine.match("BUY", 1.2, 101.0)
+    assert [(m.order_id, q, p) for m, q, p in fills] == [(3, 0.5, 100.0), (1, 0.7, 101.0)]
+    assert first.status == "PARTIALLY_FILLED" and engine.best_ask() == 101.0
+    engine.cancel(1)
+    engine.cancel(2)
+    assert engine.best_ask() is None
+
+def test_accounts_trade_with_fees_and_pnl():
+    exchange = SimulatedExchange(maker_fee=0.0, taker_fee=0.001, initial_balance=1000.0)
+    maker = SimulatedBinanceClient(exchange, "maker")
+    taker = SimulatedBinanceClient(exchange, "taker")
+    resting = maker.create_limit_order("BTCUSDT", "SELL", 2.0, 100.0)
+    assert resting["status"] == "NEW"
+    fill = taker.create_market_order("BTCUSDT", "BUY", 1.0)
+    assert fill["status"] == "FILLED" and float(fill["avgPrice"]) == 100.0
+    assert taker.get_position("BTCUSDT") == 1.0 and maker.get_position("BTCUSDT") == -1.0
+    assert abs(taker.get_balance() - (1000.0 - 0.1)) < 1e-9
+
+    # An outside buyer at 110 lifts the rest of the ask at its own price
+    exchange.feed_tick("BTCUSDT", 110.0)
+    assert maker.get_position("BTCUSDT") == -2.0
+    closed = taker.create_market_order("BTCUSDT", "SELL", 5.0, reduce_only=True)
+    assert float(closed["executedQty"]) == 1.0 and taker.get_position("BTCUSDT") == 0.0
+    assert abs(exchange.accounts["taker"].realized_pnl - 10.0) < 1e-9
+
+def test_limit_rests_until_ticks_cross_it():
+    exchange = SimulatedExchange()
+    client = SimulatedBinanceClient(exchange)
+    exchange.feed_tick("ETHUSDT", 2000.0)
+    order = client.create_limit_order("ETHUSDT", "BUY", 1.0, 1990.0)
+    assert order["status"] == "NEW"
+    exchange.replay(synthetic_ticks("ETHUSDT", 2000.0, 50, volatility=0.0, seed=1))
+    assert client.get_position("ETHUSDT") == 0.0
+    exchange.feed_tick("ETHUSDT", 1989.0, quantity=0.4)
+    assert client.get_position("ETHUSDT") == 0.4
+    assert client.cancel_order("ETHUSDT", order["orderId"])["status"] == "CANCELED"
+    assert client.cancel_order("ETHUSDT", order["orderId"])["code"] == -2011
@@ -0,0 +1,102 @@
+import asyncio
+import json
+from src.streams.market_data import MarketDataStream
+from src.streams.user_data import UserDataStream
+from src.streams.fanout import FanOut
+from src.streams.replay import replay_file
+
+def _depth(U, u, pu, bids=(), asks=()):
+    return {"stream": "btcusdt@depth@100ms", "data": {"e": "depthUpdate", "E": u, "s": "BTCUSDT", "U": U, "u": u, "pu": pu, "b": list(bids), "a": list(asks)}}
+
+def test_replayed_book_sync(tmp_path):
+    messages = [
+        _depth(90, 95, 89, bids=[["99", "9"]]),             # buffered, then dropped as stale
+        {"type": "snapshot", "symbol": "BTCUSDT", "data": {"lastUpdateId": 100, "bids": [["100", "1"], ["99", "2"]], "asks": [["101", "1"], ["102", "3"]]}},
+        _depth(98, 105, 95, bids=[["100.5", "4"]]),         # straddles the snapshot
+        _depth(106, 110, 105, asks=[["101", "0"]]),         # removes best ask
+        {"stream": "btcusdt@bookTicker", "data": {"e": "bookTicker", "s": "BTCUSDT", "b": "100.5", "B": "4", "a": "102", "A": "3", "E": 111}},
+    ]
+    path = tmp_path / "md.jsonl"
+    path.write_text("\n".join(json.dumps(m) for m in messages))
+
+    async def run():
+        stream = MarketDataStream(["BTCUSDT"])
+        sub = stream.fanout.subscribe(maxsize=10)
+        assert await replay_file(stream, str(path)) == 5
+        book = stream.books["BTCUSDT"]
+        assert book.best_bid() == (100.5, 4.0) and book.best_ask() == (102.0, 3.0)
+        assert book.last_update_id == 110
+        assert stream.best.mid("BTCUSDT") == 101.25
+        assert sub.queue.qsize() == 4
+
+        # A gap (pu != last u) marks the book out of sync and buffers until the next snapshot
+        await stream.handle_message(_depth(120, 125, 115))
+        assert not book.ready
+    asyncio.run(run())
+
+def test_resync_fetches_snapshot():
+    async def run():
+        async def fetch(symbol):
+            return {"lastUpdateId": 10, "bids": [["1", "1"]], "asks": [["2", "1"]]}
+        stream = MarketDataStream(["BTCUSDT"], snapshot_fetcher=fetch)
+        await stream.handle_message(_depth(9, 12, 8, bids=[["1.5", "1"]]))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert stream.books["BTCUSDT"].best_bid() == (1.5, 1.0) and stream.resyncs == 1
+    asyncio.run(run())
+
+def test_fanout_policies():
+    async def run():
+        fanout = FanOut()
+        lossy = fanout.subscribe(maxsize=2)
+        for i in range(5):
+            await fanout.publish(i)
+        assert lossy.dropped == 3 and [lossy.get_nowait(), lossy.get_nowait()] == [3, 4]
+
+        blocking = fanout.subscribe(maxsize=1, policy="block")
+        await fanout.publish("a")
+        producer = asyncio.ensure_future(fanout.publish("b"))
+        await asyncio.sleep(0)
+        assert not producer.done()
+        assert await blocking.get() == "a"
+        await producer
+    asyncio.run(run())
+
+def test_user_data_state():
+    async def run():
+        stream = UserDataStream()
+        seen = []
+        stream.add_listener(seen.append)
+        await stream.handle_message({"e": "ORDER_TRADE_UPDATE", "o": {"s": "BTCUSDT", "i": 1, "c": "x", "S": "BUY", "o": "LIMIT", "X": "NEW", "p": "100", "q": "1", "z": "0"}})
+        assert len(stream.open_orders("BTCUSDT")) == 1
+        await stream.handle_message({"e": "ORDER_TRADE_UPDATE", "o": {"s": "BTCUSDT", "i": 1, "X": "FILLED", "z": "1", "ap": "100"}})
+        await stream.handle_message({"e": "ACCOUNT_UPDATE", "a": {"B": [{"a": "USDT", "wb": "950", "cw": "950"}], "P": [{"s": "BTCUSDT", "pa": "1", "ep": "100", "up": "0", "ps": "BOTH"}]}})
+        assert stream.open_orders() == [] and stream.orders[1]["executedQty"] == 1.0
+        assert stream.balances["USDT"]["walletBalance"] == 950.0
+        assert stream.positions[("BTCUSDT", "BOTH")]["positionAmt"] == 1.0
+        assert len(seen) == 3
+    asyncio.run(run())
+
+def test_user_stream_keeps_the_risk_engine_current():
+    from types import SimpleNamespace
+    from src.orders.risk import RiskEngine, RiskLimits, RiskError
+    from src.streams.user_data import attach_client_state
+
+    async def run():
+        client = SimpleNamespace(risk=RiskEngine(RiskLimits(max_open_orders=1)))
+        stream = UserDataStream(mark_prices=True)
+        attach_client_state(stream, client)
+        resting = client.risk.pre_trade("BTCUSDT", "BUY", 0.01, price=100.0)
+        client.risk.settle(resting, {"orderId": 5, "status": "NEW", "executedQty": "0"})
+        try:
+            client.risk.check("BTCUSDT", "BUY", 0.01, price=100.0)
+            assert False, "open-order limit not enforced"
+        except RiskError:
+            pass
+        # The resting order is cancelled on the exchange: the slot frees up again
+        await stream.handle_message({"e": "ORDER_TRADE_UPDATE", "o": {"s": "BTCUSDT", "i": 5, "X": "CANCELED", "z": "0"}})
+        client.risk.check("BTCUSDT", "BUY", 0.01, price=100.0)
+        await stream.handle_message([{"e": "markPriceUpdate", "s": "BTCUSDT", "p": "101.5"}, {"e": "markPriceUpdate", "s": "ETHUSDT", "p": "5.0"}])
+        assert client.risk.exposure("BTCUSDT")["mark"] == 101.5 and client.risk.exposure("ETHUSDT")["mark"] == 5.0
+        assert "ETHUSDT" not in client.risk.symbols
+    asyncio.run(run())
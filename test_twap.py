@@ -0,0 +1,134 @@
+import random
+import pytest
+import src.utils.exchange_info as exchange_info
+from src.orders.binance_client import BinanceClient
+from src.orders.advanced.scheduler import Scheduler, SimulatedClock
+from src.orders.advanced.twap import start_twap
+from src.orders.risk import RiskEngine
+from src.utils.exchange_info import ExchangeInfoCache
+
+class PartialFillClient:
+    """Fills half of every order."""
+    dry_run = False
+
+    def __init__(self):
+        self.orders = []
+
+    def create_market_order(self, symbol, side, quantity, reduce_only=False, client_order_id=None):
+        self.orders.append(quantity)
+        return {"status": "PARTIALLY_FILLED", "executedQty": str(quantity / 2)}
+
+def test_slices_fire_on_simulated_clock():
+    sched = Scheduler(SimulatedClock())
+    twap = start_twap(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 1.0, 4, 60, scheduler=sched)
+    sched.advance(0)
+    assert twap.slices_sent == 1
+    sched.advance(60 * 3)
+    progress = twap.progress()
+    assert progress["status"] == "completed"
+    assert abs(progress["filled_quantity"] - 1.0) < 1e-9
+
+def test_remainder_carries_into_next_slice():
+    client = PartialFillClient()
+    sched = Scheduler(SimulatedClock())
+    start_twap(client, "BTCUSDT", "BUY", 1.0, 2, 10, scheduler=sched)
+    sched.advance(10)
+    # first slice 0.5 fills 0.25, so the last slice asks for the remaining 0.75
+    assert client.orders == [0.5, 0.75]
+
+def test_cancel_and_jitter_and_participation():
+    sched = Scheduler(SimulatedClock())
+    twap = start_twap(
+        BinanceClient(dry_run=True), "BTCUSDT", "SELL", 10.0, 5, 100, scheduler=sched,
+        jitter=0.2, participation_rate=0.1, volume_source=lambda s, secs: 5.0, rng=random.Random(1)
+    )
+    sched.advance(0)
+    assert twap.fills[0]["requested"] == 0.5
+    twap.cancel()
+    sched.advance(1000)
+    assert twap.status == "cancelled" and twap.slices_sent == 1
+
+def test_many_parents_share_one_scheduler():
+    sched = Scheduler(SimulatedClock())
+    twaps = [start_twap(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 1.0, 10, 5, scheduler=sched, jitter=0.5) for _ in range(50)]
+    sched.advance(100)
+    assert all(t.status == "completed" for t in twaps)
+
+class FillingClient:
+    """Fills every order in full and records the quantities sent."""
+    dry_run = False
+
+    def __init__(self):
+        self.orders = []
+        self.risk = RiskEngine()
+
+    def create_market_order(self, symbol, side, quantity, reduce_only=False, client_order_id=None):
+        self.orders.append(quantity)
+        return {"status": "FILLED", "executedQty": str(quantity)}
+
+def test_children_are_rounded_to_the_lot_and_small_ones_wait(monkeypatch):
+    monkeypatch.setattr(exchange_info, "_default_cache", ExchangeInfoCache.from_file("fixtures/exchange_info.json"))
+    client = FillingClient()
+    sched = Scheduler(SimulatedClock())
+    twap = start_twap(client, "BTCUSDT", "BUY", 1.0, 3, 10, scheduler=sched)
+    sched.advance(20)
+    # 0.3333.. rounds down to 0.333; the cut-off rides along until the last child
+    assert client.orders == [0.333, 0.333, 0.334]
+    assert twap.status == "completed" and twap.filled_quantity == pytest.approx(1.0)
+
+    # At 30000 a 0.001 child is 30 USDT, under BTCUSDT's 100 USDT minNotional
+    client = FillingClient()
+    client.risk.update_mark("BTCUSDT", 30000.0)
+    twap = start_twap(client, "BTCUSDT", "SELL", 0.004, 4, 10, scheduler=sched)
+    sched.advance(30)
+    assert client.orders == [0.004]
+    assert [f["skipped"] for f in twap.fills] == ["below_min_notional"] * 3 + [None]
+
+class AckClient(FillingClient):
+    """Answers market orders with an ACK (status NEW) and reports the fill on query."""
+
+    def create_market_order(self, symbol, side, quantity, reduce_only=False, client_order_id=None):
+        self.orders.append(quantity)
+        return {"orderId": len(self.orders), "status": "NEW", "executedQty": "0"}
+
+    def query_order(self, symbol, order_id=None, orig_client_order_id=None):
+        return {"orderId": order_id, "status": "FILLED", "executedQty": str(self.orders[order_id - 1])}
+
+def test_capped_parent_ends_partial_and_counts_only_reported_fills():
+    sched = Scheduler(SimulatedClock())
+    client = PartialFillClient()
+    capped = start_twap(client, "BTCUSDT", "BUY", 1.0, 2, 10, scheduler=sched,
+                        participation_rate=0.1, volume_source=lambda s, secs: 1.0)
+    sched.advance(10)
+    assert capped.status == "partial"
+    assert capped.filled_quantity == pytest.approx(0.1) and capped.remaining_quantity == pytest.approx(0.9)
+
+    acked = start_twap(AckClient(), "BTCUSDT", "SELL", 1.0, 2, 10, scheduler=sched)
+    sched.advance(10)
+    assert acked.status == "completed" and acked.filled_quantity == pytest.approx(1.0)
+
+def test_finished_parents_leave_the_registry():
+    from src.orders.advanced import parent
+    sched = Scheduler(SimulatedClock())
+    done = start_twap(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 1.0, 1, 10, scheduler=sched)
+    running = start_twap(BinanceClient(dry_run=True), "BTCUSDT", "BUY", 1.0, 1000, 10, scheduler=sched)
+    sched.advance(0)
+    assert done.status == "completed" and parent.get_parent(done.parent_id) is done
+    sched.advance(parent.FINISHED_RETENTION + 10)
+    parent.list_parents()
+    assert parent.get_parent(done.parent_id) is None and parent.get_parent(running.parent_id) is running
+    running.cancel()
+
+def test_child_slices_carry_deterministic_client_ids():
+    from src.orders.retry import client_order_id
+
+    class IdClient(FillingClient):
+        def create_market_order(self, symbol, side, quantity, reduce_only=False, client_order_id=None):
+            self.orders.append(client_order_id)
+            return {"status": "FILLED", "executedQty": str(quantity)}
+
+    client = IdClient()
+    sched = Scheduler(SimulatedClock())
+    twap = start_twap(client, "BTCUSDT", "BUY", 1.0, 3, 10, scheduler=sched)
+    sched.advance(20)
+    assert client.orders == [client_order_id(twap.parent_id, n) for n in (1, 2, 3)]